@@ -4,11 +4,11 @@ from flask_limiter import Limiter
 from flask_limiter.util import get_remote_address
 from flask_talisman import Talisman
 import logging
-import redis
-from redis.exceptions import ConnectionError as RedisConnectionError, TimeoutError as RedisTimeoutError
 import os
 import sys
 
+from backend.database import db_session
+from backend.services.paypal_client import get_paypal_client
 from backend.main import (
     get_local_ip,
     get_server_ip,
@@ -16,42 +16,60 @@ from backend.main import (
     get_appropriate_origin,
     get_cors_headers,
     start_background_tasks,
+    start_sse_server,
+    start_static_events_publisher,
     handle_timezone_request,
     handle_events_request,
+    handle_events_batch_request,
+    handle_event_summary_request,
+    handle_event_summary_lookup_request,
+    handle_event_stream_request,
+    handle_event_changes_request,
+    handle_static_events_request,
     handle_cache_status_request,
     handle_cache_refresh_request,
+    handle_db_health_request,
+    handle_liveness_request,
+    handle_readiness_request,
+    handle_server_status_request,
     handle_subscription_request,
     handle_verification_request,
     handle_unsubscribe_request
 )
 
 # Configure logging
-log_dir = os.path.join(os.path.dirname(__file__), 'logs')
-os.makedirs(log_dir, exist_ok=True)
-
-log_file = os.path.join(log_dir, 'app.log')
 logger = logging.getLogger('FlaskApp')
+logger.setLevel(logging.INFO)
 
-# Create file handler
-file_handler = logging.FileHandler(log_file)
-file_handler.setLevel(logging.INFO)
+def setup_logging():
+    """Attach console and log file handlers; called from start_app() so imports don't write to logs/"""
+    if logger.handlers:
+        return
 
-# Create console handler
-console_handler = logging.StreamHandler()
-console_handler.setLevel(logging.INFO)
+    log_dir = os.path.join(os.path.dirname(__file__), 'logs')
+    os.makedirs(log_dir, exist_ok=True)
 
-# Create formatter
-formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-                            datefmt='%Y-%m-%d %H:%M:%S')
+    log_file = os.path.join(log_dir, 'app.log')
 
-# Add formatter to handlers
-file_handler.setFormatter(formatter)
-console_handler.setFormatter(formatter)
+    # Create file handler
+    file_handler = logging.FileHandler(log_file)
+    file_handler.setLevel(logging.INFO)
 
-# Add handlers to logger
-logger.addHandler(file_handler)
-logger.addHandler(console_handler)
-logger.setLevel(logging.INFO)
+    # Create console handler
+    console_handler = logging.StreamHandler()
+    console_handler.setLevel(logging.INFO)
+
+    # Create formatter
+    formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+                                datefmt='%Y-%m-%d %H:%M:%S')
+
+    # Add formatter to handlers
+    file_handler.setFormatter(formatter)
+    console_handler.setFormatter(formatter)
+
+    # Add handlers to logger
+    logger.addHandler(file_handler)
+    logger.addHandler(console_handler)
 
 app = Flask(__name__)
 
@@ -85,22 +103,15 @@ Talisman(app,
     content_security_policy_nonce_in=['script-src']
 )
 
-# Try to use Redis for rate limiting, fall back to memory if Redis is not available
+# Use Redis for rate limiting if enabled. The connection isn't checked here, so
+# startup never waits on Redis; if it's unreachable when a request arrives the
+# limiter falls back to in-memory counters until it comes back.
 storage_uri = "memory://"  # Default to memory storage
-try:
-    if os.getenv('USE_REDIS', 'false').lower() == 'true':
-        redis_client = redis.Redis(
-            host=os.getenv('REDIS_HOST', 'localhost'),
-            port=int(os.getenv('REDIS_PORT', 6379)),
-            db=0,
-            socket_timeout=2,
-            decode_responses=True
-        )
-        redis_client.ping()  # Test connection
-        storage_uri = f"redis://{os.getenv('REDIS_HOST', 'localhost')}:{os.getenv('REDIS_PORT', 6379)}/0"
-        logger.info("Using Redis for rate limiting")
-except (RedisConnectionError, RedisTimeoutError, ConnectionRefusedError) as e:
-    logger.warning(f"Redis not available, using memory storage: {str(e)}")
+storage_options = {}
+if os.getenv('USE_REDIS', 'false').lower() == 'true':
+    storage_uri = f"redis://{os.getenv('REDIS_HOST', 'localhost')}:{os.getenv('REDIS_PORT', 6379)}/0"
+    storage_options = {'socket_timeout': 2, 'socket_connect_timeout': 2}
+    logger.info("Using Redis for rate limiting")
 
 # Rate Limiting
 limiter = Limiter(
@@ -108,12 +119,19 @@ limiter = Limiter(
     key_func=get_remote_address,
     default_limits=["200 per day", "50 per hour"],
     storage_uri=storage_uri,
+    storage_options=storage_options,
+    in_memory_fallback_enabled=True,
     strategy="fixed-window"
 )
 
-# Get IP addresses and build allowed origins
-LOCAL_IPS = get_local_ip()
-SERVER_IP = get_server_ip() or "fxalert.co.uk"  # Fallback to domain name
+def __getattr__(name):
+    """Look up LOCAL_IPS and SERVER_IP on first use instead of at import."""
+    if name == 'LOCAL_IPS':
+        return get_local_ip()
+    if name == 'SERVER_IP':
+        return get_server_ip() or "fxalert.co.uk"  # Fallback to domain name
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 DOMAIN = "fxalert.co.uk"
 ALLOWED_ORIGINS = [
     "https://localhost:3000",
@@ -146,7 +164,7 @@ def add_cors_headers(response):
     response.headers['Access-Control-Allow-Methods'] = 'GET, POST, PUT, DELETE, OPTIONS'
     response.headers['Access-Control-Allow-Headers'] = 'Content-Type, Authorization, Accept, Origin, X-Requested-With'
     response.headers['Access-Control-Max-Age'] = '3600'
-    response.headers['Access-Control-Expose-Headers'] = 'Content-Type, Authorization'
+    response.headers['Access-Control-Expose-Headers'] = 'Content-Type, Authorization, X-Next-Cursor'
     
     # Add security headers
     response.headers['Strict-Transport-Security'] = 'max-age=31536000; includeSubDomains'
@@ -160,12 +178,25 @@ def add_cors_headers(response):
         
     return response
 
+def start_app():
+    """Start the app's background lifecycle (event store warm-up and updates).
+
+    Called by the server launchers once the app is imported; returns immediately.
+    """
+    setup_logging()
+    start_background_tasks()
+    start_sse_server()
+    start_static_events_publisher()
+
 @app.before_request
 def initialize_app():
-    """Initialize the application on first request"""
-    if not hasattr(app, '_got_first_request'):
-        start_background_tasks()
-        app._got_first_request = True
+    """Start the background lifecycle if the launcher didn't (doesn't block the request)"""
+    start_background_tasks()
+
+@app.teardown_appcontext
+def remove_db_session(exception=None):
+    """Return the request thread's database connection to the pool"""
+    db_session.remove()
 
 @app.route("/")
 @limiter.limit("60 per minute")
@@ -207,6 +238,50 @@ def get_events():
     response, status_code = handle_events_request()
     return response, status_code
 
+@app.route("/events/batch", methods=["POST", "OPTIONS"])
+@limiter.limit("60 per minute")  # One batch replaces several /events requests
+def get_events_batch():
+    """Resolve several event queries in one request"""
+    if request.method == "OPTIONS":
+        return "", 204
+    response, status_code = handle_events_batch_request()
+    return response, status_code
+
+@app.route("/events/summary")
+@limiter.limit("120 per minute")
+def get_event_summary_by_key():
+    """AI summary of an event by currency, title and listed time, for events without an id"""
+    response, status_code = handle_event_summary_lookup_request()
+    return response, status_code
+
+@app.route("/events/<int:event_id>/summary")
+@limiter.limit("120 per minute")
+def get_event_summary(event_id):
+    """AI summary of one event, fetched when the user expands it"""
+    response, status_code = handle_event_summary_request(event_id)
+    return response, status_code
+
+@app.route("/events/stream")
+@limiter.limit("30 per minute")
+def get_event_stream():
+    """Live snapshot and event updates as Server-Sent Events"""
+    response, status_code = handle_event_stream_request()
+    return response, status_code
+
+@app.route("/events/changes")
+@limiter.limit("120 per minute")
+def get_event_changes():
+    """Events inserted, updated or removed since a snapshot version"""
+    response, status_code = handle_event_changes_request()
+    return response, status_code
+
+@app.route("/events/static/<path:timezone>/<name>")
+@limiter.limit("120 per minute")
+def get_static_events(timezone, name):
+    """Events for a common query shape; the web server answers these from files when published"""
+    response, status_code = handle_static_events_request(timezone, name)
+    return response, status_code
+
 @app.route("/cache/status")
 @limiter.limit("30 per minute")  # Rate limit for cache status checks
 def cache_status():
@@ -221,6 +296,34 @@ def refresh_cache():
     response, status_code = handle_cache_refresh_request()
     return response, status_code
 
+@app.route("/health/db")
+@limiter.limit("30 per minute")
+def db_health():
+    """Check that the database is reachable"""
+    response, status_code = handle_db_health_request()
+    return response, status_code
+
+@app.route("/health/live")
+@limiter.exempt
+def liveness():
+    """Liveness probe"""
+    response, status_code = handle_liveness_request()
+    return response, status_code
+
+@app.route("/health/ready")
+@limiter.exempt
+def readiness():
+    """Readiness probe: 503 until the event store has warmed up"""
+    response, status_code = handle_readiness_request()
+    return response, status_code
+
+@app.route("/health/server")
+@limiter.limit("30 per minute")
+def server_status():
+    """Request queue and thread pool metrics for this worker"""
+    response, status_code = handle_server_status_request()
+    return response, status_code
+
 @app.route("/subscribe", methods=["POST", "OPTIONS"])
 @limiter.limit("10 per hour")  # Strict rate limit for subscriptions
 def subscribe():
@@ -266,25 +369,12 @@ def create_paypal_order():
             return {"error": "Invalid amount. Please provide a valid number."}, 400
         
         # Check if PayPal credentials are defined
-        paypal_client_id = os.environ.get('PAYPAL_CLIENT_ID')
-        paypal_client_secret = os.environ.get('PAYPAL_CLIENT_SECRET')
-        paypal_api_url = os.environ.get('PAYPAL_API_URL', 'https://api-m.paypal.com')
-        
-        if not paypal_client_id or not paypal_client_secret:
+        paypal = get_paypal_client()
+        if paypal is None:
             logger.error("PayPal credentials are not defined in environment variables")
             return {"error": "Payment configuration error"}, 500
         
         # Create PayPal order
-        import base64
-        import requests
-        
-        auth = base64.b64encode(f"{paypal_client_id}:{paypal_client_secret}".encode()).decode()
-        
-        headers = {
-            "Content-Type": "application/json",
-            "Authorization": f"Basic {auth}"
-        }
-        
         payload = {
             "intent": "CAPTURE",
             "purchase_units": [
@@ -298,11 +388,7 @@ def create_paypal_order():
             ]
         }
         
-        response = requests.post(
-            f"{paypal_api_url}/v2/checkout/orders",
-            headers=headers,
-            json=payload
-        )
+        response = paypal.create_order(payload)
         
         if response.status_code not in [200, 201]:
             logger.error(f"PayPal API error: {response.status_code}, {response.text}")
@@ -332,29 +418,13 @@ def capture_paypal_order():
         order_id = data['orderId']
         
         # Check if PayPal credentials are defined
-        paypal_client_id = os.environ.get('PAYPAL_CLIENT_ID')
-        paypal_client_secret = os.environ.get('PAYPAL_CLIENT_SECRET')
-        paypal_api_url = os.environ.get('PAYPAL_API_URL', 'https://api-m.paypal.com')
-        
-        if not paypal_client_id or not paypal_client_secret:
+        paypal = get_paypal_client()
+        if paypal is None:
             logger.error("PayPal credentials are not defined in environment variables")
             return {"error": "Payment configuration error"}, 500
         
         # Capture PayPal order
-        import base64
-        import requests
-        
-        auth = base64.b64encode(f"{paypal_client_id}:{paypal_client_secret}".encode()).decode()
-        
-        headers = {
-            "Content-Type": "application/json",
-            "Authorization": f"Basic {auth}"
-        }
-        
-        response = requests.post(
-            f"{paypal_api_url}/v2/checkout/orders/{order_id}/capture",
-            headers=headers
-        )
+        response = paypal.capture_order(order_id)
         
         if response.status_code not in [200, 201]:
             logger.error(f"PayPal API error: {response.status_code}, {response.text}")
@@ -506,6 +576,7 @@ def not_found(e):
 
 if __name__ == "__main__":
     try:
+        start_app()
         app.run(
             host="0.0.0.0",
             port=5000,
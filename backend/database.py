@@ -1,14 +1,16 @@
 import os
-from sqlalchemy import create_engine, and_, or_, text
+from sqlalchemy import create_engine, event, select, and_, or_, text
+from sqlalchemy.engine import make_url
 from sqlalchemy.orm import sessionmaker, scoped_session, declarative_base
 from sqlalchemy_utils import database_exists, create_database
 from datetime import datetime, timedelta
-from typing import List, Optional
+from typing import Iterator, List, Optional, Tuple
 import pytz
 import logging
 from dotenv import load_dotenv
 import socket
 import time
+import threading
 import pymysql
 
 # Load environment variables from the project root
@@ -46,175 +48,405 @@ db_config = {
     'raise_on_warnings': True
 }
 
-# Create database URL using PyMySQL
-DATABASE_URL = (
+# Create database URL using PyMySQL. DATABASE_URL can point at another
+# database instead, e.g. a SQLite file for benchmarks
+DATABASE_URL = os.getenv('DATABASE_URL') or (
     f"mysql+pymysql://{db_config['user']}:{db_config['password']}"
     f"@{db_config['host']}:{db_config['port']}/{db_config['database']}"
     "?charset=utf8mb4"
 )
 
-# Log the connection details (without password)
-logger.info(f"Connecting to database at {db_config['host']}:{db_config['port']}/{db_config['database']} as {db_config['user']}")
-
-try:
-    # Create engine with PyMySQL and additional settings
-    engine = create_engine(
-        DATABASE_URL,
-        pool_size=20,  # Larger pool size
-        max_overflow=30,  # Larger overflow
-        pool_timeout=60,  # Longer pool timeout
-        pool_recycle=300,  # Recycle connections every 5 minutes
-        pool_pre_ping=True,  # Enable automatic reconnection
-        connect_args={
-            'connect_timeout': 60,
-            'read_timeout': 3600,  # 1 hour read timeout
-            'write_timeout': 3600,  # 1 hour write timeout
-            'init_command': 'SET SESSION wait_timeout=28800',  # 8 hour server-side timeout
-            'client_flag': pymysql.constants.CLIENT.MULTI_STATEMENTS |
-                         pymysql.constants.CLIENT.CONNECT_WITH_DB,
-            'charset': 'utf8mb4'
+# Connection pool size follows the server's thread counts (see config/server.py)
+from config.server import DB_POOL_SIZE, DB_MAX_OVERFLOW
+DB_POOL_TIMEOUT = int(os.getenv('DB_POOL_TIMEOUT', '30'))  # seconds to wait for a free connection
+DB_POOL_RECYCLE = int(os.getenv('DB_POOL_RECYCLE', '300'))  # seconds
+
+# Engine and session settings
+DB_CONNECT_TIMEOUT = int(os.getenv('DB_CONNECT_TIMEOUT', '60'))
+DB_INIT_RETRIES = int(os.getenv('DB_INIT_RETRIES', '5'))
+DB_INIT_RETRY_DELAY = int(os.getenv('DB_INIT_RETRY_DELAY', '5'))  # seconds
+
+# The engine is created on first use rather than at import, so importing this
+# module (and anything that imports the models) never waits on MySQL
+_engine = None
+_engine_lock = threading.Lock()
+
+# Pool usage counters, updated from pool events
+_pool_metrics = {'connects': 0, 'checkouts': 0, 'peak_checked_out': 0}
+_pool_metrics_lock = threading.Lock()
+
+def _on_connect(dbapi_connection, connection_record):
+    with _pool_metrics_lock:
+        _pool_metrics['connects'] += 1
+
+def _on_checkout(dbapi_connection, connection_record, connection_proxy):
+    checked_out = _engine.pool.checkedout()
+    with _pool_metrics_lock:
+        _pool_metrics['checkouts'] += 1
+        _pool_metrics['peak_checked_out'] = max(_pool_metrics['peak_checked_out'], checked_out)
+
+def get_engine(create: bool = True):
+    """
+    Get the shared database engine, creating it on first use.
+
+    Creating the engine doesn't open a connection; the first connection is made
+    when a session first runs a query.
+
+    Args:
+        create: If False, return None instead of creating the engine
+
+    Returns:
+        The SQLAlchemy engine, or None if it hasn't been created and create is False
+    """
+    global _engine
+    if _engine is None and create:
+        with _engine_lock:
+            if _engine is None:
+                url = make_url(DATABASE_URL)
+                # Log the connection details (without password)
+                logger.info(f"Creating database engine for {url.render_as_string(hide_password=True)}")
+                try:
+                    if url.get_backend_name() == 'sqlite':
+                        connect_args = {'check_same_thread': False}
+                    else:
+                        connect_args = {
+                            'connect_timeout': DB_CONNECT_TIMEOUT,
+                            'read_timeout': 3600,  # 1 hour read timeout
+                            'write_timeout': 3600,  # 1 hour write timeout
+                            # 8 hour server-side timeouts, set on every new connection
+                            'init_command': 'SET SESSION wait_timeout=28800, interactive_timeout=28800',
+                            'client_flag': pymysql.constants.CLIENT.MULTI_STATEMENTS |
+                                         pymysql.constants.CLIENT.CONNECT_WITH_DB,
+                            'charset': 'utf8mb4'
+                        }
+                    engine = create_engine(
+                        url,
+                        pool_size=DB_POOL_SIZE,
+                        max_overflow=DB_MAX_OVERFLOW,
+                        pool_timeout=DB_POOL_TIMEOUT,
+                        pool_recycle=DB_POOL_RECYCLE,
+                        pool_pre_ping=True,  # Enable automatic reconnection
+                        connect_args=connect_args
+                    )
+                    event.listen(engine.pool, 'connect', _on_connect)
+                    event.listen(engine.pool, 'checkout', _on_checkout)
+                    _engine = engine
+                    logger.info(f"Database pool: size={DB_POOL_SIZE}, max_overflow={DB_MAX_OVERFLOW}, timeout={DB_POOL_TIMEOUT}s")
+                except Exception as e:
+                    logger.error(f"Error configuring database: {str(e)}")
+                    logger.error(f"Database URL (without password): {url.render_as_string(hide_password=True)}")
+                    raise
+    return _engine
+
+def __getattr__(name):
+    # Keep `from backend.database import engine` working without creating the
+    # engine at import time
+    if name == 'engine':
+        return get_engine()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+# Session factory; bound to the engine when the first session is created
+SessionLocal = sessionmaker(
+    autocommit=False,
+    autoflush=False,
+    expire_on_commit=False
+)
+
+def _create_session():
+    return SessionLocal(bind=get_engine())
+
+# Create scoped session with automatic cleanup
+db_session = scoped_session(
+    _create_session,
+    scopefunc=None
+)
+
+# Create base class for models
+Base = declarative_base()
+Base.query = db_session.query_property()
+
+def get_pool_status() -> Optional[dict]:
+    """
+    Connection pool usage for this process.
+
+    Returns:
+        Dict of pool counters, or None if the engine hasn't been created
+    """
+    engine = get_engine(create=False)
+    if engine is None:
+        return None
+    pool = engine.pool
+    with _pool_metrics_lock:
+        metrics = dict(_pool_metrics)
+    return {
+        'size': pool.size(),
+        'max_connections': DB_POOL_SIZE + DB_MAX_OVERFLOW,
+        'checked_out': pool.checkedout(),
+        'checked_in': pool.checkedin(),
+        'overflow': pool.overflow(),
+        **metrics
+    }
+
+def check_database_health() -> dict:
+    """
+    Check that the database accepts connections.
+
+    Returns:
+        Dict with 'status' ('ok' or 'error'), 'latency_ms' and, on failure, 'error'
+    """
+    started = time.monotonic()
+    try:
+        with get_engine().connect() as conn:
+            conn.execute(text("SELECT 1"))
+        return {
+            'status': 'ok',
+            'latency_ms': round((time.monotonic() - started) * 1000, 1),
+            'pool': get_pool_status()
         }
-    )
+    except Exception as e:
+        logger.error(f"Database health check failed: {str(e)}")
+        return {
+            'status': 'error',
+            'latency_ms': round((time.monotonic() - started) * 1000, 1),
+            'error': str(e),
+            'pool': get_pool_status()
+        }
+
+# Rows read per query when streaming long ranges
+EVENT_BATCH_SIZE = int(os.getenv('EVENT_BATCH_SIZE') or '500')
+
+# Columns returned for each event, in the same shape as ForexEvent.to_dict()
+EVENT_COLUMNS = (
+    'id', 'event_title', 'currency', 'impact', 'forecast', 'previous', 'actual',
+    'time', 'url', 'source', 'ai_summary', 'summary_generated_at', 'created_at', 'updated_at'
+)
+TIMESTAMP_COLUMNS = ('time', 'summary_generated_at', 'created_at', 'updated_at')
+# Default /events shape: the AI summary and bookkeeping timestamps are left out
+# (summaries are served by /events/<id>/summary)
+COMPACT_EVENT_COLUMNS = (
+    'id', 'event_title', 'currency', 'impact', 'forecast', 'previous', 'actual',
+    'time', 'url', 'source'
+)
+
+def build_events_query(
+    start_time: Optional[datetime] = None,
+    end_time: Optional[datetime] = None,
+    currencies: Optional[List[str]] = None,
+    impact_levels: Optional[List[str]] = None,
+    limit: Optional[int] = None,
+    columns: tuple = EVENT_COLUMNS,
+    after: Optional[Tuple[datetime, int]] = None
+):
+    """
+    Build a Core SELECT for filtered events that reads only the given columns.
     
-    # Test connection with retry logic
-    max_retries = 5
-    retry_delay = 5  # seconds
+    Args:
+        start_time: Start datetime for event range (UTC)
+        end_time: End datetime for event range (UTC)
+        currencies: List of currency codes to filter by
+        impact_levels: List of impact levels to filter by
+        limit: Maximum number of events to return
+        columns: Names of the forex_events columns to select
+        after: Keyset cursor; only events ordered after this (time, id) are returned
+        
+    Returns:
+        SQLAlchemy Select statement
+    """
+    from models.forex_event import ForexEvent
     
-    for attempt in range(max_retries):
-        try:
-            with engine.connect() as conn:
-                conn.execute(text("SELECT 1"))
-                # Set session variables for this connection
-                conn.execute(text("SET SESSION wait_timeout=28800"))  # 8 hours
-                conn.execute(text("SET SESSION interactive_timeout=28800"))  # 8 hours
-                logger.info("Database connection test successful")
-                break
-        except Exception as e:
-            if attempt < max_retries - 1:
-                logger.warning(f"Connection attempt {attempt + 1} failed, retrying in {retry_delay} seconds...")
-                time.sleep(retry_delay)
-                continue
-            else:
-                raise
+    table = ForexEvent.__table__
+    query = select(*[table.c[name] for name in columns])
+    logger.debug(f"Building database query with filters: start_time={start_time}, end_time={end_time}")
     
-    # Create database if it doesn't exist
-    if not database_exists(engine.url):
-        create_database(engine.url)
-        logger.info(f"Created database: {db_config['database']}")
+    # Apply time filter
+    if start_time:
+        query = query.where(table.c.time >= start_time)
+    if end_time:
+        query = query.where(table.c.time <= end_time)
     
-    # Create session factory with improved settings
-    SessionLocal = sessionmaker(
-        autocommit=False,
-        autoflush=False,
-        bind=engine,
-        expire_on_commit=False
-    )
+    # Apply currency filter
+    if currencies:
+        # Convert both the database values and input to uppercase for comparison
+        normalized_currencies = [c.strip().upper() for c in currencies if c.strip()]
+        query = query.where(table.c.currency.in_(normalized_currencies))
+        logger.debug(f"Added filter: currency in {normalized_currencies}")
     
-    # Create scoped session with automatic cleanup
-    db_session = scoped_session(
-        SessionLocal,
-        scopefunc=None
-    )
+    # Apply impact filter
+    if impact_levels:
+        # Handle non-economic events specially and normalize case
+        normalized_impacts = [imp.strip().title() for imp in impact_levels if imp.strip()]
+        
+        if 'Non-Economic' in normalized_impacts:
+            # Create a list of all other impact levels
+            other_impacts = [imp for imp in normalized_impacts if imp != 'Non-Economic']
+            
+            # Build an OR condition for non-economic events and other selected impacts
+            conditions = []
+            if other_impacts:
+                conditions.append(table.c.impact.in_(other_impacts))
+            conditions.append(~table.c.impact.in_(['High', 'Medium', 'Low']))
+            
+            query = query.where(or_(*conditions))
+            logger.debug(f"Added complex filter for Non-Economic and {other_impacts}")
+        else:
+            query = query.where(table.c.impact.in_(normalized_impacts))
+            logger.debug(f"Added filter: impact in {normalized_impacts}")
+    
+    # Keyset pagination: continue after the last (time, id) seen
+    if after:
+        after_time, after_id = after
+        query = query.where(or_(table.c.time > after_time, and_(table.c.time == after_time, table.c.id > after_id)))
+    
+    # Order by time, with the id making the order total for pagination
+    query = query.order_by(table.c.time, table.c.id)
+    
+    # Apply limit if specified
+    if limit:
+        query = query.limit(limit)
     
-    # Create base class for models
-    Base = declarative_base()
-    Base.query = db_session.query_property()
+    return query
 
-except Exception as e:
-    logger.error(f"Error configuring database: {str(e)}")
-    logger.error(f"Database URL (without password): mysql+pymysql://{db_config['user']}:***@{db_config['host']}:{db_config['port']}/{db_config['database']}")
-    raise
+def rows_to_event_dicts(rows: List[tuple], columns: tuple = EVENT_COLUMNS) -> List[dict]:
+    """
+    Convert result tuples to event dictionaries.
+    
+    Timestamps are formatted column by column, and each distinct value is only
+    formatted once: events released together share a time, and rows written by
+    the same update share created_at/updated_at.
+    """
+    if not rows:
+        return []
+    
+    column_values = list(zip(*rows))
+    for index, name in enumerate(columns):
+        if name in TIMESTAMP_COLUMNS:
+            values = column_values[index]
+            formatted = {value: value.isoformat() for value in set(values) if value is not None}
+            formatted[None] = None
+            column_values[index] = [formatted[value] for value in values]
+    
+    return [dict(zip(columns, values)) for values in zip(*column_values)]
 
 def get_filtered_events(
     start_time: Optional[datetime] = None,
     end_time: Optional[datetime] = None,
     currencies: Optional[List[str]] = None,
     impact_levels: Optional[List[str]] = None,
-    limit: Optional[int] = None
+    limit: Optional[int] = None,
+    columns: tuple = EVENT_COLUMNS
 ) -> List[dict]:
     """
     Get filtered forex events from the database.
     
+    Reads plain result tuples instead of building ForexEvent instances; with the
+    default columns the dictionaries have the same keys as ForexEvent.to_dict().
+    
     Args:
         start_time: Start datetime for event range (UTC)
         end_time: End datetime for event range (UTC)
         currencies: List of currency codes to filter by
         impact_levels: List of impact levels to filter by
         limit: Maximum number of events to return
+        columns: Names of the columns to select and return
         
     Returns:
         List of event dictionaries
     """
-    from models.forex_event import ForexEvent
-    
     try:
-        # Start with base query
-        query = db_session.query(ForexEvent)
-        logger.info(f"Building database query with filters: start_time={start_time}, end_time={end_time}")
-        
-        # Apply time filter
-        if start_time:
-            query = query.filter(ForexEvent.time >= start_time)
-            logger.info(f"Added filter: ForexEvent.time >= {start_time}")
-        if end_time:
-            query = query.filter(ForexEvent.time <= end_time)
-            logger.info(f"Added filter: ForexEvent.time <= {end_time}")
-        
-        # Apply currency filter
-        if currencies:
-            # Convert both the database values and input to uppercase for comparison
-            normalized_currencies = [c.strip().upper() for c in currencies if c.strip()]
-            query = query.filter(ForexEvent.currency.in_(normalized_currencies))
-            logger.info(f"Added filter: ForexEvent.currency in {normalized_currencies}")
-        
-        # Apply impact filter
-        if impact_levels:
-            # Handle non-economic events specially and normalize case
-            normalized_impacts = [imp.strip().title() for imp in impact_levels if imp.strip()]
-            logger.info(f"Normalized impact levels: {normalized_impacts}")
-            
-            if 'Non-Economic' in normalized_impacts:
-                # Create a list of all other impact levels
-                other_impacts = [imp for imp in normalized_impacts if imp != 'Non-Economic']
-                
-                # Build an OR condition for non-economic events and other selected impacts
-                conditions = []
-                if other_impacts:
-                    conditions.append(ForexEvent.impact.in_(other_impacts))
-                conditions.append(~ForexEvent.impact.in_(['High', 'Medium', 'Low']))
-                
-                query = query.filter(or_(*conditions))
-                logger.info(f"Added complex filter for Non-Economic and {other_impacts}")
-            else:
-                query = query.filter(ForexEvent.impact.in_(normalized_impacts))
-                logger.info(f"Added filter: ForexEvent.impact in {normalized_impacts}")
-        
-        # Order by time
-        query = query.order_by(ForexEvent.time)
-        
-        # Apply limit if specified
-        if limit:
-            query = query.limit(limit)
-            logger.info(f"Added result limit: {limit}")
-        
-        # Execute query
-        events = query.all()
-        logger.info(f"Database query returned {len(events)} events")
-        
-        # Debug output for first few events if available
-        if events:
-            logger.info(f"First event time: {events[0].time}, Last event time: {events[-1].time}")
-            for i, event in enumerate(events[:3]):  # Log first 3 events
-                logger.info(f"Event {i+1}: {event.event_title} at {event.time}")
-        
-        # Convert to dictionaries
-        return [event.to_dict() for event in events]
+        query = build_events_query(start_time, end_time, currencies, impact_levels, limit, columns)
+        rows = db_session.execute(query).all()
+        logger.info(f"Database query returned {len(rows)} events")
+        return rows_to_event_dicts(rows, columns)
         
     except Exception as e:
         logger.error(f"Error in get_filtered_events: {str(e)}")
         logger.error("Error details:", exc_info=True)
         return []
     
+def iter_filtered_events(
+    start_time: Optional[datetime] = None,
+    end_time: Optional[datetime] = None,
+    currencies: Optional[List[str]] = None,
+    impact_levels: Optional[List[str]] = None,
+    columns: tuple = EVENT_COLUMNS,
+    after: Optional[Tuple[datetime, int]] = None,
+    batch_size: int = EVENT_BATCH_SIZE
+) -> Iterator[dict]:
+    """
+    Yield filtered forex events in (time, id) order, reading batch_size rows per query.
+    
+    Each batch continues from the last row of the previous one, so memory use
+    doesn't grow with the size of the range. The id and time columns are always
+    selected, since they form the cursor.
+    
+    Args:
+        start_time: Start datetime for event range (UTC)
+        end_time: End datetime for event range (UTC)
+        currencies: List of currency codes to filter by
+        impact_levels: List of impact levels to filter by
+        columns: Names of the columns to select
+        after: Keyset cursor to start after, as (time, id)
+        batch_size: Rows read per query
+        
+    Yields:
+        Event dictionaries
+    """
+    selected = tuple(columns) + tuple(name for name in ('time', 'id') if name not in columns)
+    time_index, id_index = selected.index('time'), selected.index('id')
+    while True:
+        query = build_events_query(start_time, end_time, currencies, impact_levels, batch_size, selected, after)
+        rows = db_session.execute(query).all()
+        if not rows:
+            return
+        after = (rows[-1][time_index], rows[-1][id_index])
+        yield from rows_to_event_dicts(rows, selected)
+        if len(rows) < batch_size:
+            return
+
+def get_event_summary(event_id: int) -> Optional[dict]:
+    """
+    Get the AI summary of one event.
+    
+    Args:
+        event_id: ID of the forex event
+        
+    Returns:
+        Dict with id, ai_summary and summary_generated_at, or None if there is no such event
+    """
+    from models.forex_event import ForexEvent
+    
+    table = ForexEvent.__table__
+    columns = ('id', 'ai_summary', 'summary_generated_at')
+    query = select(*[table.c[name] for name in columns]).where(table.c.id == event_id)
+    row = db_session.execute(query).first()
+    return rows_to_event_dicts([row], columns)[0] if row else None
+
+def find_event_summary(currency: str, event_title: str, times: List[datetime]) -> Optional[dict]:
+    """
+    Get the AI summary of an event by currency, title and time, for events
+    that came from the weekly files and have no id.
+    
+    Args:
+        currency: Currency code of the event
+        event_title: Title of the event
+        times: Candidate UTC times of the event (a local time in the hour the
+            clocks go back matches two)
+        
+    Returns:
+        Dict with id, ai_summary and summary_generated_at, or None if there is no such event
+    """
+    from models.forex_event import ForexEvent
+    
+    table = ForexEvent.__table__
+    columns = ('id', 'ai_summary', 'summary_generated_at')
+    query = (
+        select(*[table.c[name] for name in columns])
+        .where(table.c.currency == currency, table.c.event_title == event_title, table.c.time.in_(times))
+        .order_by(table.c.id)
+    )
+    row = db_session.execute(query).first()
+    return rows_to_event_dicts([row], columns)[0] if row else None
+
 def get_events_by_date(date: datetime) -> List[dict]:
     """
     Get all events for a specific date.
@@ -276,7 +508,7 @@ def get_db():
     """
     Get database session.
     """
-    db = SessionLocal()
+    db = _create_session()
     try:
         yield db
     finally:
@@ -284,10 +516,26 @@ def get_db():
 
 def init_db():
     """
-    Initialize database tables.
+    Create the database if needed and initialize database tables.
+
+    Retries while the database is unreachable, so call this explicitly from
+    setup scripts rather than relying on it happening at import.
     """
-    Base.metadata.create_all(bind=engine)
-    logger.info("Initialized database tables")
+    engine = get_engine()
+    for attempt in range(DB_INIT_RETRIES):
+        try:
+            if not database_exists(engine.url):
+                create_database(engine.url)
+                logger.info(f"Created database: {db_config['database']}")
+            Base.metadata.create_all(bind=engine)
+            logger.info("Initialized database tables")
+            return
+        except Exception as e:
+            if attempt < DB_INIT_RETRIES - 1:
+                logger.warning(f"Database initialization attempt {attempt + 1} failed ({str(e)}), retrying in {DB_INIT_RETRY_DELAY} seconds...")
+                time.sleep(DB_INIT_RETRY_DELAY)
+            else:
+                raise
 
 def cleanup_db_resources():
     """Clean up database resources by removing the session and closing connections."""
@@ -297,7 +545,8 @@ def cleanup_db_resources():
             db_session.remove()
             logger.info("Database session removed")
         
-        # Dispose of the engine connections
+        # Dispose of the engine connections, if the engine was ever created
+        engine = get_engine(create=False)
         if engine:
             engine.dispose()
             logger.info("Database engine connections disposed")
@@ -0,0 +1,178 @@
+"""
+Change sets published by event ingestion.
+
+Processes that write forex_events (the calendar update, release alerts and AI
+summary jobs in the scheduler service) publish the release times of the events
+they changed. Readers in other processes compare the current version with the
+last one they saw and drop only cached results that cover a changed time.
+
+Change sets are kept in a small JSON file next to the other caches, replaced
+atomically on each write; only the most recent CHANGE_SET_HISTORY are kept.
+
+The event store also keeps a ring of event diffs, one per snapshot version
+(inserted, updated and removed events), so clients that know a snapshot
+version can ask for just what changed since (/events/changes). Only the most
+recent EVENT_DIFF_HISTORY are kept.
+"""
+import os
+import json
+import logging
+import tempfile
+import threading
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import pytz
+
+logger = logging.getLogger(__name__)
+
+# Get the absolute path of the project root
+project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+CHANGE_SET_FILE = os.getenv('EVENT_CHANGE_SET_FILE') or os.path.join(project_root, 'cache', 'event_change_sets.json')
+CHANGE_SET_HISTORY = int(os.getenv('EVENT_CHANGE_SET_HISTORY') or '50')
+EVENT_DIFF_FILE = os.getenv('EVENT_DIFF_FILE') or os.path.join(project_root, 'cache', 'event_diffs.json')
+EVENT_DIFF_HISTORY = int(os.getenv('EVENT_DIFF_HISTORY') or '48')
+
+_write_lock = threading.Lock()
+
+
+def _to_utc(value: datetime) -> datetime:
+    if value.tzinfo is None:
+        return pytz.UTC.localize(value)
+    return value.astimezone(pytz.UTC)
+
+
+def _write_log(log: Dict, path: str, prefix: str) -> None:
+    """Replace a log file atomically, so readers never see a partial write."""
+    directory = os.path.dirname(path)
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=prefix, suffix='.tmp')
+    with os.fdopen(fd, 'w', encoding='utf-8') as f:
+        json.dump(log, f)
+    os.replace(tmp_path, path)
+
+
+def read_change_log(path: str = CHANGE_SET_FILE) -> Dict:
+    """Read the change log, or an empty one if it doesn't exist yet."""
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {'version': 0, 'change_sets': []}
+    except Exception as e:
+        logger.error(f"Error reading event change sets: {str(e)}")
+        return {'version': 0, 'change_sets': []}
+
+
+def get_change_version(path: str = CHANGE_SET_FILE) -> int:
+    return read_change_log(path).get('version', 0)
+
+
+def publish_change_set(times: Iterable[datetime], path: str = CHANGE_SET_FILE) -> Optional[int]:
+    """Record that events at the given release times were inserted or updated.
+
+    Args:
+        times: Release times of the changed events
+        path: Change log file
+
+    Returns:
+        The new change version, or None if nothing changed or the write failed
+    """
+    times = [_to_utc(t) for t in times if t is not None]
+    if not times:
+        return None
+
+    with _write_lock:
+        log = read_change_log(path)
+        version = log.get('version', 0) + 1
+        change_sets = log.get('change_sets', [])
+        change_sets.append({
+            'version': version,
+            'published_at': datetime.now(pytz.UTC).isoformat(),
+            'start': min(times).isoformat(),
+            'end': max(times).isoformat(),
+            'count': len(times)
+        })
+        log = {'version': version, 'change_sets': change_sets[-CHANGE_SET_HISTORY:]}
+
+        try:
+            _write_log(log, path, '.event_change_sets_')
+        except Exception as e:
+            logger.error(f"Error publishing event change set: {str(e)}")
+            return None
+
+    logger.info(f"Published event change set {version} covering {len(times)} events")
+    return version
+
+
+def change_sets_since(version: int, path: str = CHANGE_SET_FILE) -> Tuple[int, Optional[List[Dict]]]:
+    """Change sets published after the given version.
+
+    Returns:
+        (current version, change sets) where change sets is None if some of the
+        changes since that version have already been dropped from the log
+    """
+    log = read_change_log(path)
+    current = log.get('version', 0)
+    change_sets = [c for c in log.get('change_sets', []) if c['version'] > version]
+    if current > version and (not change_sets or change_sets[0]['version'] != version + 1):
+        return current, None
+    return current, change_sets
+
+
+def read_event_diffs(path: str = EVENT_DIFF_FILE) -> List[Dict]:
+    """Read the event diff ring, oldest first, or an empty one if it doesn't exist yet."""
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f).get('diffs', [])
+    except FileNotFoundError:
+        return []
+    except Exception as e:
+        logger.error(f"Error reading event diffs: {str(e)}")
+        return []
+
+
+def publish_event_diff(version: int, previous_version: int, diff: Dict[str, List],
+                       path: str = EVENT_DIFF_FILE) -> bool:
+    """Record what changed between two snapshot versions.
+
+    Args:
+        version: Snapshot version the diff leads to
+        previous_version: Snapshot version the diff starts from
+        diff: Inserted, updated and removed events (see event_store.diff_events)
+        path: Diff ring file
+
+    Returns:
+        True if the diff was written
+    """
+    with _write_lock:
+        diffs = [d for d in read_event_diffs(path) if d['version'] < version]
+        diffs.append(dict(diff, version=version, previous_version=previous_version,
+                          published_at=datetime.now(pytz.UTC).isoformat()))
+        try:
+            _write_log({'diffs': diffs[-EVENT_DIFF_HISTORY:]}, path, '.event_diffs_')
+        except Exception as e:
+            logger.error(f"Error publishing event diff: {str(e)}")
+            return False
+    return True
+
+
+def event_diffs_since(version: int, current: int, path: str = EVENT_DIFF_FILE) -> Optional[List[Dict]]:
+    """Diffs leading from snapshot version to current, oldest first.
+
+    Returns:
+        The diffs, or None if they no longer connect the two versions (some
+        have aged out of the ring, or a snapshot was published without one)
+    """
+    if version == current:
+        return []
+    by_previous = {d['previous_version']: d for d in read_event_diffs(path)}
+    diffs = []
+    while version != current:
+        diff = by_previous.get(version)
+        if diff is None or diff['version'] > current:
+            return None
+        diffs.append(diff)
+        version = diff['version']
+    return diffs
@@ -1,20 +1,34 @@
 from datetime import datetime, timedelta
 import pytz
 import logging
-from typing import List, Dict
+from typing import Dict, Iterator, List, Tuple
 import json
 import os
 import gc
 
+from .snapshot import SnapshotReader, write_snapshot
+from .change_sets import event_diffs_since, publish_event_diff
+from ..services.event_stream import get_event_stream_hub
+
 logger = logging.getLogger(__name__)
 
 # In-memory store for events
 event_store = {
     'events': [],
     'last_updated': None,
-    'cache_status': 'uninitialized'  # possible values: uninitialized, updating, ready, error
+    'cache_status': 'uninitialized',  # possible values: uninitialized, updating, ready, error
+    'version': 0  # shared snapshot version the events came from
 }
 
+# Events written by whichever worker fetched last, shared by all workers
+snapshot_reader = SnapshotReader()
+
+# Called with no arguments after each store_events (e.g. to republish static files)
+store_listeners = []
+
+# Fields whose change marks an event as updated in the diff pushed to stream clients
+DIFF_FIELDS = ('actual', 'forecast', 'previous', 'impact')
+
 # Add at the top with other constants
 WEEKLY_STORAGE_DIR = 'weekly_events'
 
@@ -185,60 +199,63 @@ def load_weekly_events_by_date(specific_date: str) -> List[Dict]:
         logger.error(f"Error loading events for specific date {specific_date}: {str(e)}")
         return []
 
-def load_weekly_events_by_date_range(start_date: str, end_date: str) -> List[Dict]:
+def event_position(event: Dict) -> Tuple[str, int, str]:
     """
-    Load events for a date range from the appropriate weekly JSON files
+    Sort and pagination key of a stored event: (time, id, name).
+    Events from the weekly files may have no database id; they get id -1, so they
+    sort before the events with one at the same time, and their currency and
+    title break the tie. The parts always have the same types, so keys of mixed
+    events compare.
+    """
+    event_id = event.get('id')
+    if event_id is None:
+        return event['time'], -1, f"{event.get('currency', '')}:{event.get('event_title', '')}"
+    return event['time'], int(event_id), ''
+
+def iter_weekly_events_by_date_range(start_date: str, end_date: str) -> Iterator[Dict]:
+    """
+    Yield events for a date range from the weekly JSON files, ordered by event_position
+    Only one weekly file is held in memory at a time
     start_date, end_date: date strings in YYYY-MM-DD format
     """
-    try:
-        # Parse the date strings
-        start_date_obj = datetime.strptime(start_date, '%Y-%m-%d')
-        end_date_obj = datetime.strptime(end_date, '%Y-%m-%d')
-        
-        # Add UTC timezone if missing
-        if start_date_obj.tzinfo is None:
-            start_date_obj = pytz.UTC.localize(start_date_obj)
-        if end_date_obj.tzinfo is None:
-            end_date_obj = pytz.UTC.localize(end_date_obj)
-            
-        logger.info(f"Loading events for date range: {start_date} to {end_date}")
+    # Parse the date strings
+    start_date_obj = pytz.UTC.localize(datetime.strptime(start_date, '%Y-%m-%d'))
+    end_date_obj = pytz.UTC.localize(datetime.strptime(end_date, '%Y-%m-%d'))
+    
+    logger.info(f"Loading events for date range: {start_date} to {end_date}")
+    
+    # Step through the range a week at a time, starting from the Sunday of the first week
+    current_date = start_date_obj - timedelta(days=(start_date_obj.weekday() + 1) % 7)
+    seen_files = set()
+    previous_keys = set()
+    while current_date <= end_date_obj:
+        filename = find_week_file_by_date(max(current_date, start_date_obj))
+        current_date += timedelta(days=7)
+        if not filename or filename in seen_files:
+            continue
+        seen_files.add(filename)
         
-        # Calculate number of days in range
-        days_in_range = (end_date_obj - start_date_obj).days + 1
+        with open(os.path.join(WEEKLY_STORAGE_DIR, filename), 'r', encoding='utf-8') as f:
+            all_events = json.load(f)
         
-        # Initialize list for all events in the range
-        range_events = []
+        # Keep events inside the range, dropping duplicates (also across adjacent files)
+        week_events = {}
+        for event in all_events:
+            event_date = event['time'].split('T')[0]  # Extract date part from ISO format
+            event_key = f"{event['time']}-{event['event_title']}"
+            if start_date <= event_date <= end_date and event_key not in previous_keys:
+                week_events.setdefault(event_key, event)
+        previous_keys = set(week_events)
         
-        # Process each day in the range
-        current_date = start_date_obj
-        for _ in range(days_in_range):
-            current_date_str = current_date.strftime('%Y-%m-%d')
-            
-            # Find the appropriate weekly file for this date
-            filename = find_week_file_by_date(current_date)
-            if filename:
-                filepath = os.path.join(WEEKLY_STORAGE_DIR, filename)
-                
-                # Read all events from the file (if we haven't already)
-                with open(filepath, 'r', encoding='utf-8') as f:
-                    all_events = json.load(f)
-                
-                # Filter events for the current date
-                for event in all_events:
-                    event_date = event['time'].split('T')[0]  # Extract date part from ISO format
-                    event_date_obj = datetime.strptime(event_date, '%Y-%m-%d')
-                    
-                    # Check if the event falls within our range
-                    if start_date <= event_date <= end_date:
-                        # Add to list if not already present
-                        event_id = f"{event['time']}-{event['event_title']}"
-                        # Check if event is already in range_events
-                        if not any(f"{e['time']}-{e['event_title']}" == event_id for e in range_events):
-                            range_events.append(event)
-            
-            # Move to next day
-            current_date += timedelta(days=1)
-            
+        yield from sorted(week_events.values(), key=event_position)
+
+def load_weekly_events_by_date_range(start_date: str, end_date: str) -> List[Dict]:
+    """
+    Load events for a date range from the appropriate weekly JSON files
+    start_date, end_date: date strings in YYYY-MM-DD format
+    """
+    try:
+        range_events = list(iter_weekly_events_by_date_range(start_date, end_date))
         logger.info(f"Found {len(range_events)} events in date range {start_date} to {end_date}")
         return range_events
         
@@ -254,12 +271,17 @@ def store_events(events: List[Dict]) -> None:
     
     try:
         event_store['cache_status'] = 'updating'
+        previous_events, previous_version = event_store['events'], event_store['version']
         
         # Store events in memory
         event_store['events'] = events
         event_store['last_updated'] = datetime.now(pytz.UTC)
         event_store['cache_status'] = 'ready'
         
+        # Share them with the other workers and push the changes to stream clients
+        publish_snapshot()
+        publish_changes(previous_events, previous_version)
+        
         # Store events in weekly file
         store_weekly_events(events)
         
@@ -287,8 +309,123 @@ def store_events(events: List[Dict]) -> None:
         event_store['cache_status'] = 'error'
         logger.error(f"Error storing events: {str(e)}")
 
+def publish_snapshot() -> None:
+    """Write the in-memory events as the shared snapshot other workers attach to"""
+    version = write_snapshot(event_store['events'], event_store['last_updated'])
+    if version is not None:
+        event_store['version'] = version
+        snapshot_reader.adopt(version, event_store['events'], event_store['last_updated'])
+
+def sync_from_snapshot(force: bool = False) -> bool:
+    """Switch to the shared snapshot if another worker published a newer one"""
+    if not snapshot_reader.refresh(force=force) or snapshot_reader.version == event_store['version']:
+        return False
+    event_store['events'] = snapshot_reader.events
+    event_store['last_updated'] = snapshot_reader.last_updated
+    event_store['cache_status'] = 'ready'
+    previous_version, event_store['version'] = event_store['version'], snapshot_reader.version
+    # Pass on the diff the updater recorded, if it leads here from the version we had
+    diffs = event_diffs_since(previous_version, event_store['version']) if previous_version else None
+    notify_stream(merge_event_diffs(diffs) if diffs else None)
+    return True
+
+def event_identity(event: Dict) -> tuple:
+    """Key that identifies the same event across fetches"""
+    return (event.get('time'), event.get('currency'), event.get('event_title'))
+
+def diff_events(old_events: List[Dict], new_events: List[Dict]) -> Dict[str, List]:
+    """What changed between two event lists: inserted, updated (with old/new values) and removed"""
+    old_by_key = {event_identity(event): event for event in old_events or []}
+    inserted, updated, seen = [], [], set()
+    for event in new_events or []:
+        key = event_identity(event)
+        seen.add(key)
+        before = old_by_key.get(key)
+        if before is None:
+            inserted.append(event)
+            continue
+        changes = {field: [before.get(field), event.get(field)]
+                   for field in DIFF_FIELDS if before.get(field) != event.get(field)}
+        if changes:
+            updated.append({'event': event, 'changes': changes})
+    removed = [event for key, event in old_by_key.items() if key not in seen]
+    return {'inserted': inserted, 'updated': updated, 'removed': removed}
+
+def merge_event_diffs(diffs: List[Dict]) -> Dict[str, List]:
+    """Combine consecutive diffs (oldest first) into one diff from the first's start to the last's end"""
+    before, after = {}, {}
+    for diff in diffs:
+        for event in diff['inserted']:
+            key = event_identity(event)
+            before.setdefault(key, None)
+            after[key] = event
+        for update in diff['updated']:
+            key = event_identity(update['event'])
+            if key not in before:
+                old = dict(update['event'])
+                old.update({field: values[0] for field, values in update['changes'].items()})
+                before[key] = old
+            after[key] = update['event']
+        for event in diff['removed']:
+            key = event_identity(event)
+            before.setdefault(key, event)
+            after[key] = None
+
+    old_events = [event for event in before.values() if event is not None]
+    new_events = [event for event in after.values() if event is not None]
+    return diff_events(old_events, new_events)
+
+def publish_changes(previous_events: List[Dict], previous_version: int) -> None:
+    """Record what the new snapshot changed and push it to stream clients"""
+    diff = None
+    # A first load has nothing to diff against; clients holding an older version resync
+    if previous_events and event_store['version'] != previous_version:
+        try:
+            diff = diff_events(previous_events, event_store['events'])
+            publish_event_diff(event_store['version'], previous_version, diff)
+        except Exception as e:
+            logger.error(f"Error recording event changes: {str(e)}")
+    notify_stream(diff)
+    for listener in store_listeners:
+        try:
+            listener()
+        except Exception as e:
+            logger.error(f"Error in store listener: {str(e)}")
+
+def add_store_listener(listener) -> None:
+    """Call listener after each store_events"""
+    if listener not in store_listeners:
+        store_listeners.append(listener)
+
+def notify_stream(diff: Dict[str, List] = None) -> None:
+    """Tell stream clients about the current snapshot, and what changed if the diff is known"""
+    try:
+        hub = get_event_stream_hub()
+        version = event_store['version']
+        last_updated = event_store['last_updated']
+        hub.publish('snapshot', {
+            'version': version,
+            'last_updated': last_updated.isoformat() if last_updated else None,
+            'event_count': len(event_store['events'])
+        }, version)
+        if diff and (diff['inserted'] or diff['updated'] or diff['removed']):
+            hub.publish('diff', {
+                'version': version,
+                'inserted': diff['inserted'],
+                'updated': diff['updated'],
+                'removed': diff['removed']
+            }, version)
+    except Exception as e:
+        logger.error(f"Error notifying event stream: {str(e)}")
+
+# Workers that don't run the updater pick up new snapshots while stream clients are connected
+get_event_stream_hub().set_poller(sync_from_snapshot)
+
 def load_cached_events() -> bool:
-    """Load events from disk cache if available"""
+    """Load events from the shared snapshot, or the disk cache backup if there is none"""
+    if sync_from_snapshot(force=True) or (event_store['version'] and event_store['events']):
+        logger.info(f"Loaded {len(event_store['events'])} events from snapshot {event_store['version']}")
+        return True
     try:
         backup_file = os.path.join('cache', 'events_cache.json')
         if os.path.exists(backup_file):
@@ -308,11 +445,14 @@ def load_cached_events() -> bool:
 
 def get_cache_status() -> Dict:
     """Get current status of the event cache"""
+    sync_from_snapshot()
     return {
         'status': event_store['cache_status'],
+        'version': event_store['version'],
         'last_updated': event_store['last_updated'].isoformat() if event_store['last_updated'] else None,
         'event_count': len(event_store['events']),
-        'next_update': (event_store['last_updated'] + timedelta(hours=1)).isoformat() if event_store['last_updated'] else None
+        'next_update': (event_store['last_updated'] + timedelta(hours=1)).isoformat() if event_store['last_updated'] else None,
+        'snapshot': snapshot_reader.stats()
     }
 
 def convert_to_user_timezone(event: Dict, user_tz: pytz.timezone) -> Dict:
@@ -423,11 +563,17 @@ def clean_memory_cache():
         return False
 
 def save_events_to_cache(events):
-    """Save events to the cache."""
+    """Save events to the cache and share them with the other workers."""
     logger = logging.getLogger(__name__)
     try:
         global _events_cache
         _events_cache = events
+        previous_events, previous_version = event_store['events'], event_store['version']
+        event_store['events'] = events
+        event_store['last_updated'] = datetime.now(pytz.UTC)
+        event_store['cache_status'] = 'ready'
+        publish_snapshot()
+        publish_changes(previous_events, previous_version)
         logger.info(f"Saved {len(events)} events to cache")
         return True
     except Exception as e:
@@ -439,6 +585,8 @@ def get_cached_events():
     logger = logging.getLogger(__name__)
     try:
         global _events_cache
+        if sync_from_snapshot():
+            _events_cache = event_store['events']
         if '_events_cache' in globals() and _events_cache:
             logger.info(f"Retrieved {len(_events_cache)} events from cache")
             return _events_cache
@@ -1,9 +1,9 @@
-import requests
 from datetime import datetime, timedelta
 import time
 import logging
 import pytz
-from .event_store import store_events, event_store
+from .event_store import store_events, event_store, sync_from_snapshot
+from ..services.http_client import get_http_client
 
 # Configure logging
 logging.basicConfig(level=logging.DEBUG)
@@ -23,6 +23,8 @@ FF_ENDPOINTS = {
 
 def should_fetch_data():
     """Check if we should fetch new data based on last update time"""
+    # Another worker may have fetched already
+    sync_from_snapshot(force=True)
     if not event_store['last_updated']:
         return True
         
@@ -39,7 +41,7 @@ def fetch_forexfactory_events():
     try:
         for period, url in FF_ENDPOINTS.items():
             logger.info(f"Fetching {period} events from ForexFactory")
-            response = requests.get(url, headers=FOREXFACTORY_HEADERS, timeout=15)
+            response = get_http_client().get(url, headers=FOREXFACTORY_HEADERS, timeout=15)
             
             if response.status_code == 200:
                 data = response.json()
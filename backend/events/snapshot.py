@@ -0,0 +1,167 @@
+"""
+Shared event snapshot for multi-worker deployments.
+
+Every worker process (gunicorn, several waitress processes) used to fetch,
+parse and hold its own copy of the calendar. Now the process that fetches
+writes the events to a single snapshot file, and the other workers attach to
+it read-only through mmap. They only parse the payload again when the
+snapshot version changes.
+
+File layout: a fixed header (magic, version, last updated as a Unix timestamp,
+payload length) followed by the events as compact JSON. New snapshots are
+written to a temporary file and renamed over the old one, so readers never
+see a partial write.
+"""
+import os
+import json
+import mmap
+import time
+import struct
+import logging
+import tempfile
+import threading
+from datetime import datetime
+from typing import Dict, List, Optional
+
+import pytz
+
+logger = logging.getLogger(__name__)
+
+# Get the absolute path of the project root
+project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+SNAPSHOT_FILE = os.getenv('EVENT_SNAPSHOT_FILE') or os.path.join(project_root, 'cache', 'events_snapshot.bin')
+SNAPSHOT_CHECK_SECONDS = float(os.getenv('EVENT_SNAPSHOT_CHECK_SECONDS') or '1.0')
+
+SNAPSHOT_MAGIC = b'FXSNAP01'
+SNAPSHOT_HEADER = struct.Struct('<8sQdQ')  # magic, version, last updated, payload length
+
+_write_lock = threading.Lock()
+
+
+def read_snapshot_header(path: str = SNAPSHOT_FILE) -> Optional[Dict]:
+    """Version, last update time and payload length of a snapshot, or None if there isn't one."""
+    try:
+        with open(path, 'rb') as f:
+            header = f.read(SNAPSHOT_HEADER.size)
+    except FileNotFoundError:
+        return None
+    return _parse_header(header)
+
+
+def _parse_header(header: bytes) -> Optional[Dict]:
+    if len(header) < SNAPSHOT_HEADER.size:
+        return None
+    magic, version, last_updated, length = SNAPSHOT_HEADER.unpack_from(header)
+    if magic != SNAPSHOT_MAGIC:
+        return None
+    return {
+        'version': version,
+        'last_updated': datetime.fromtimestamp(last_updated, tz=pytz.UTC),
+        'length': length
+    }
+
+
+def write_snapshot(events: List[Dict], last_updated: datetime, path: str = SNAPSHOT_FILE) -> Optional[int]:
+    """Publish events as the new shared snapshot.
+
+    Returns:
+        The new snapshot version, or None if the write failed
+    """
+    payload = json.dumps(events, separators=(',', ':'), ensure_ascii=False).encode('utf-8')
+
+    with _write_lock:
+        current = read_snapshot_header(path)
+        version = (current['version'] if current else 0) + 1
+        header = SNAPSHOT_HEADER.pack(SNAPSHOT_MAGIC, version, last_updated.timestamp(), len(payload))
+
+        try:
+            directory = os.path.dirname(path)
+            os.makedirs(directory, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=directory, prefix='.events_snapshot_', suffix='.tmp')
+            with os.fdopen(fd, 'wb') as f:
+                f.write(header)
+                f.write(payload)
+            os.replace(tmp_path, path)
+        except Exception as e:
+            logger.error(f"Error writing event snapshot: {str(e)}")
+            return None
+
+    logger.info(f"Published event snapshot {version} with {len(events)} events")
+    return version
+
+
+class SnapshotReader:
+    """Read-only view of the shared snapshot, reloaded when its version changes."""
+
+    def __init__(self, path: str = SNAPSHOT_FILE, check_interval: float = SNAPSHOT_CHECK_SECONDS):
+        self.path = path
+        self.check_interval = check_interval
+        self.version = 0
+        self.events = None
+        self.last_updated = None
+        self._file_id = None
+        self._last_check = 0.0
+        self._lock = threading.Lock()
+        self._metrics = {'checks': 0, 'reloads': 0, 'errors': 0}
+
+    def refresh(self, force: bool = False) -> bool:
+        """Attach to a newer snapshot if one was published.
+
+        The file is stat'ed at most once per check_interval, and the payload is
+        only parsed when the header shows a different version.
+
+        Returns:
+            True if a newer snapshot was loaded
+        """
+        now = time.monotonic()
+        if not force and now - self._last_check < self.check_interval:
+            return False
+
+        with self._lock:
+            self._last_check = now
+            self._metrics['checks'] += 1
+            try:
+                stat = os.stat(self.path)
+            except FileNotFoundError:
+                return False
+            file_id = (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+            if file_id == self._file_id:
+                return False
+
+            try:
+                with open(self.path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                    header = _parse_header(mm[:SNAPSHOT_HEADER.size])
+                    if header is None:
+                        raise ValueError(f"{self.path} is not an event snapshot")
+                    self._file_id = file_id
+                    if header['version'] == self.version:
+                        return False
+                    start = SNAPSHOT_HEADER.size
+                    events = json.loads(mm[start:start + header['length']])
+            except Exception as e:
+                self._metrics['errors'] += 1
+                logger.error(f"Error reading event snapshot: {str(e)}")
+                return False
+
+            self.version = header['version']
+            self.last_updated = header['last_updated']
+            self.events = events
+            self._metrics['reloads'] += 1
+            logger.info(f"Attached to event snapshot {self.version} with {len(events)} events")
+            return True
+
+    def adopt(self, version: int, events: List[Dict], last_updated: datetime) -> None:
+        """Record a snapshot this process just wrote, so it isn't parsed back in."""
+        with self._lock:
+            self.version = version
+            self.events = events
+            self.last_updated = last_updated
+            self._file_id = None
+
+    def stats(self) -> Dict:
+        with self._lock:
+            metrics = dict(self._metrics)
+        metrics['version'] = self.version
+        metrics['path'] = self.path
+        return metrics
@@ -0,0 +1,55 @@
+"""
+Gunicorn settings for POSIX deployments:
+
+    gunicorn -c backend/gunicorn.conf.py app:app
+
+Worker, thread and queue settings come from backend.wsgi_server, the same as
+the cheroot launcher. With SERVER_PRELOAD_APP the app is imported and the event
+snapshot loaded once in the master before forking, so workers share those pages
+copy-on-write instead of each parsing their own copy.
+"""
+import os
+import gc
+import sys
+import logging
+
+# Add the root directory to Python path
+root_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, root_dir)
+
+from backend.wsgi_server import (
+    SERVER_HOST,
+    SERVER_PORT,
+    SERVER_PRELOAD_APP,
+    SERVER_REQUEST_QUEUE_SIZE,
+    SERVER_TIMEOUT,
+    SERVER_WORKERS,
+    WORKER_THREADS
+)
+
+logger = logging.getLogger('gunicorn.error')
+
+bind = f"{SERVER_HOST}:{SERVER_PORT}"
+workers = SERVER_WORKERS
+threads = WORKER_THREADS
+worker_class = 'gthread'
+backlog = SERVER_REQUEST_QUEUE_SIZE
+timeout = SERVER_TIMEOUT
+preload_app = SERVER_PRELOAD_APP
+
+
+def when_ready(server):
+    """Runs in the master before workers are forked"""
+    if not preload_app:
+        return
+    from backend.events import load_cached_events
+    if load_cached_events():
+        logger.info("Loaded event snapshot in the master for workers to share")
+    # Keep the garbage collector from touching (and so copying) the shared objects
+    gc.freeze()
+
+
+def post_fork(server, worker):
+    """Threads don't survive fork, so each worker starts its own background lifecycle"""
+    from app import start_app
+    start_app()
@@ -5,13 +5,24 @@ This package contains core functionality for the forex news notifier.
 from .timezone_handler import set_user_timezone, get_user_timezone, convert_to_local_time
 from .ip_handler import get_local_ip, get_server_ip, is_local_request
 from .cors_handler import build_allowed_origins, get_appropriate_origin, get_cors_headers
-from .fixed_cache_handler import start_background_tasks, stop_background_tasks, refresh_cache
+from .fixed_cache_handler import start_background_tasks, stop_background_tasks, refresh_cache, get_startup_status
+from ..services.event_stream import start_sse_server
 from .route_handler import (
     handle_timezone_request,
     handle_events_request,
+    handle_events_batch_request,
+    handle_event_summary_request,
+    handle_event_summary_lookup_request,
+    handle_event_stream_request,
+    handle_event_changes_request,
     handle_cache_status_request,
-    handle_cache_refresh_request
+    handle_cache_refresh_request,
+    handle_db_health_request,
+    handle_liveness_request,
+    handle_readiness_request,
+    handle_server_status_request
 )
+from .static_events import handle_static_events_request, start_static_events_publisher
 from .subscription_handler import (
     handle_subscription_request,
     handle_verification_request,
@@ -2,13 +2,25 @@ import logging
 import threading
 import time
 from datetime import datetime
-from ..events import fetch_events, event_store, load_cached_events
+from ..events import fetch_events, load_cached_events
+from ..events.event_store import event_store, sync_from_snapshot
+from ..services.leader_lock import UPDATER_FOLLOWER_POLL_SECONDS, get_updater_lock
 
 logger = logging.getLogger(__name__)
 
 def update_cache():
-    """Background task to update the event cache periodically"""
+    """Background task to update the event cache periodically.
+
+    Only the worker holding the updater lock fetches; the others attach to the
+    snapshot it publishes and keep trying for the lock in case the leader exits.
+    """
+    updater_lock = get_updater_lock()
     while True:
+        if not updater_lock.try_acquire():
+            if sync_from_snapshot(force=True):
+                logger.info(f"Picked up event snapshot {event_store['version']} from the updater process")
+            time.sleep(UPDATER_FOLLOWER_POLL_SECONDS)
+            continue
         try:
             logger.info("Updating event cache...")
             fetch_events()
@@ -26,6 +38,8 @@ def start_background_tasks():
     logger.info("Attempting to load events from cache...")
     if load_cached_events():
         logger.info("Successfully loaded events from cache")
+    elif not get_updater_lock().try_acquire():
+        logger.info("No cached events yet. Waiting for the updater process to publish a snapshot")
     else:
         # Initial fetch of events if cache load fails
         logger.info("Cache load failed. Performing initial event fetch...")
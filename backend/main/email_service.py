@@ -5,18 +5,20 @@ from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
 from datetime import datetime, timedelta
 from typing import List, Dict
+import time
 import pytz
 from dotenv import load_dotenv
 import ssl
 
 from ..database import db_session, get_filtered_events
 from models.email_subscription import EmailSubscription
-from backend.services.ai_summary_service import AISummaryService
-from models.forex_event import ForexEvent
 from .config import FRONTEND_URL
 
 logger = logging.getLogger(__name__)
 
+# Socket timeout for SMTP connections so one slow send can't stall a digest run
+SMTP_TIMEOUT = int(os.environ.get('SMTP_TIMEOUT', 15))
+
 def get_smtp_settings():
     """Get SMTP settings from environment variables."""
     # Get the absolute path of the project root
@@ -62,8 +64,8 @@ def create_smtp_connection():
         if not all([settings['host'], settings['username'], settings['password']]):
             raise ValueError("Missing SMTP configuration")
         
-        # Create server with extended timeout
-        server = smtplib.SMTP(settings['host'], settings['port'], timeout=30)
+        # Create server with a bounded timeout
+        server = smtplib.SMTP(settings['host'], settings['port'], timeout=SMTP_TIMEOUT)
         
         # Enable debug output
         server.set_debuglevel(1)
@@ -84,8 +86,12 @@ def create_smtp_connection():
         logger.error(f"Error type: {type(e).__name__}")
         raise
 
-def send_email(to_email: str, subject: str, html_content: str):
-    """Send an email using SMTP."""
+def send_email(to_email: str, subject: str, html_content: str, server: smtplib.SMTP = None):
+    """Send an email using SMTP.
+
+    Pass an open connection from create_smtp_connection to send several emails
+    over it; otherwise one is opened for this email and closed afterwards.
+    """
     try:
         settings = get_smtp_settings()
         
@@ -97,8 +103,11 @@ def send_email(to_email: str, subject: str, html_content: str):
         html_part = MIMEText(html_content, 'html')
         msg.attach(html_part)
         
-        with create_smtp_connection() as server:
+        if server is not None:
             server.send_message(msg)
+        else:
+            with create_smtp_connection() as server:
+                server.send_message(msg)
             
         logger.info(f"Email sent successfully to {to_email}")
         
@@ -270,6 +279,7 @@ def format_event_summary(event: Dict) -> str:
 
 def send_daily_update(subscription: EmailSubscription):
     """Send a daily update email."""
+    started = time.monotonic()
     try:
         # Get today's events for the subscribed currencies and impact levels
         now = datetime.now(pytz.UTC)
@@ -284,25 +294,14 @@ def send_daily_update(subscription: EmailSubscription):
             logger.info(f"No events to send for {subscription.email}")
             return
         
-        # Ensure AI summaries are generated for high-impact USD/GBP events
-        ai_service = AISummaryService()
-        
-        for event in events:
-            if (event['impact'] == 'High' and 
-                event['currency'] in ['USD', 'GBP'] and 
-                not event.get('ai_summary')):
-                try:
-                    summary = ai_service.generate_event_summary(event)
-                    if summary:
-                        event['ai_summary'] = summary
-                        # Update the database
-                        db_event = ForexEvent.query.get(event['id'])
-                        if db_event:
-                            db_event.ai_summary = summary
-                            db_event.summary_generated_at = now
-                            db_session.commit()
-                except Exception as e:
-                    logger.error(f"Error generating AI summary for event {event['event_title']}: {str(e)}")
+        # AI summaries are precomputed ahead of the digest window, never generated here
+        missing_summaries = [
+            event for event in events
+            if event['impact'] == 'High' and event['currency'] in ['USD', 'GBP'] and not event.get('ai_summary')
+        ]
+        if missing_summaries:
+            logger.warning(f"{len(missing_summaries)} high-impact events in the daily update for "
+                           f"{subscription.email} have no precomputed AI summary")
         
         # Convert events to user's timezone
         user_tz = pytz.timezone(subscription.timezone)
@@ -401,6 +400,8 @@ def send_daily_update(subscription: EmailSubscription):
         subscription.last_sent_at = now
         db_session.commit()
         
+        logger.info(f"Daily update for {subscription.email} sent in {time.monotonic() - started:.2f}s")
+        
     except Exception as e:
         logger.error(f"Error sending daily update to {subscription.email}: {str(e)}")
         raise
@@ -4,28 +4,36 @@ import time
 from datetime import datetime
 from ..events.fetch_events import fetch_forex_events
 from ..events.event_store import (
+    event_store,
     get_filtered_events, 
     get_cache_status, 
     store_events,
     load_cached_events,
     clean_memory_cache,
     save_events_to_cache,
-    get_cached_events
+    get_cached_events,
+    sync_from_snapshot
 )
+from ..services.leader_lock import UPDATER_FOLLOWER_POLL_SECONDS, get_updater_lock
 
 logger = logging.getLogger(__name__)
 
-# Create an event store dictionary to match what code is using
-event_store = {'events': []}
-
 def update_cache():
-    """Background task to update the event cache periodically"""
+    """Background task to update the event cache periodically.
+
+    Only the worker holding the updater lock fetches; the others attach to the
+    snapshot it publishes and keep trying for the lock in case the leader exits.
+    """
+    updater_lock = get_updater_lock()
     while True:
+        if not updater_lock.try_acquire():
+            if sync_from_snapshot(force=True):
+                logger.info(f"Picked up event snapshot {event_store['version']} from the updater process")
+            time.sleep(UPDATER_FOLLOWER_POLL_SECONDS)
+            continue
         try:
             logger.info("Updating event cache...")
-            events = fetch_forex_events()
-            event_store['events'] = events
-            store_events(events)
+            fetch_forex_events()
             logger.info(f"Cache updated successfully. Next update in 1 hour. Current cache size: {len(event_store['events'])} events")
             # Sleep for 1 hour
             time.sleep(3600)
@@ -34,34 +42,74 @@ def update_cache():
             # If there's an error, wait 5 minutes before retrying
             time.sleep(300)
 
-def start_background_tasks():
-    """Start background tasks for the application"""
+# Startup lifecycle state, reported by the liveness and readiness endpoints
+startup_state = {
+    'status': 'stopped',  # possible values: stopped, warming, ready, error
+    'started_at': None,
+    'ready_at': None,
+    'error': None
+}
+_startup_lock = threading.Lock()
+_background_thread = None
+
+def warm_up():
+    """Load events from the shared snapshot or disk cache, fetching only if nothing is cached"""
     # Try to load from cache first
     logger.info("Attempting to load events from cache...")
     if load_cached_events():
         logger.info("Successfully loaded events from cache")
+    elif not get_updater_lock().try_acquire():
+        logger.info("No cached events yet. Waiting for the updater process to publish a snapshot")
     else:
         # Initial fetch of events if cache load fails
         logger.info("Cache load failed. Performing initial event fetch...")
         try:
-            events = fetch_forex_events()
-            event_store['events'] = events
-            store_events(events)
+            fetch_forex_events()
             logger.info(f"Initial cache populated with {len(event_store['events'])} events")
         except Exception as e:
             logger.error(f"Error during initial event fetch: {str(e)}")
 
-    # Start background thread for periodic updates
-    update_thread = threading.Thread(target=update_cache, daemon=True)
-    update_thread.start()
+def _run_background_tasks():
+    try:
+        warm_up()
+        startup_state['status'] = 'ready'
+        startup_state['ready_at'] = datetime.now().isoformat()
+        logger.info("Event store warm-up finished")
+    except Exception as e:
+        startup_state['status'] = 'error'
+        startup_state['error'] = str(e)
+        logger.error(f"Error warming up event store: {str(e)}")
+    update_cache()
+
+def start_background_tasks():
+    """Warm the event store and start periodic updates in a background thread.
+
+    Returns immediately, so the server can take requests (served from the last
+    snapshot or the database) while the store warms up. Safe to call more than once.
+    """
+    global _background_thread
+    if startup_state['status'] != 'stopped':
+        return
+    with _startup_lock:
+        if startup_state['status'] != 'stopped':
+            return
+        startup_state['status'] = 'warming'
+        startup_state['started_at'] = datetime.now().isoformat()
+        _background_thread = threading.Thread(target=_run_background_tasks, name='event-store-warmup', daemon=True)
+        _background_thread.start()
     logger.info("Background update thread started")
 
+def get_startup_status() -> dict:
+    """Startup lifecycle state and whether the background thread is still running"""
+    status = dict(startup_state)
+    status['background_thread_alive'] = _background_thread is not None and _background_thread.is_alive()
+    return status
+
 def refresh_cache():
     """Force a refresh of the event cache"""
     try:
-        events = fetch_forex_events()
-        event_store['events'] = events
-        store_events(events)
+        if not fetch_forex_events():
+            return False, "Failed to fetch events"
         return True, None
     except Exception as e:
         error_msg = str(e)
@@ -69,6 +117,7 @@ def refresh_cache():
         return False, error_msg
 
 def stop_background_tasks():
-    """Stop background tasks (placeholder for future use)"""
-    logger.info("Stopping background tasks (not implemented)")
-    # Nothing to do yet as we're using daemon threads that will terminate with the main process 
\ No newline at end of file
+    """Stop background tasks and hand the updater role to another worker"""
+    logger.info("Stopping background tasks")
+    get_updater_lock().release()
+    # The update thread is a daemon and ends with the process 
\ No newline at end of file
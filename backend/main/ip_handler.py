@@ -1,40 +1,74 @@
+import os
+import time
 import logging
 import socket
-import requests
+import threading
+
+from ..services.http_client import get_http_client
 
 logger = logging.getLogger(__name__)
 
+# Static addresses skip discovery entirely (comma-separated for local IPs)
+SERVER_PUBLIC_IP = os.getenv('SERVER_PUBLIC_IP') or None
+SERVER_LOCAL_IPS = [ip.strip() for ip in (os.getenv('SERVER_LOCAL_IPS') or '').split(',') if ip.strip()]
+IP_DISCOVERY_TIMEOUT = float(os.getenv('IP_DISCOVERY_TIMEOUT') or '2.0')
+IP_DISCOVERY_RETRY_SECONDS = 300  # how long a failed public IP lookup is remembered
+
+DEFAULT_LOCAL_IP = "192.168.0.144"
+
+# Discovered addresses, looked up on first use rather than at import
+_discovered = {}
+_discovery_lock = threading.Lock()
+
 def get_local_ip() -> list:
     """Get the local IP address"""
+    if SERVER_LOCAL_IPS:
+        return list(SERVER_LOCAL_IPS)
+    with _discovery_lock:
+        if 'local_ips' not in _discovered:
+            _discovered['local_ips'] = _discover_local_ip()
+        return list(_discovered['local_ips'])
+
+def _discover_local_ip() -> list:
     try:
         # Try to get the local IP by creating a socket
         s = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        s.settimeout(IP_DISCOVERY_TIMEOUT)
         s.connect(("8.8.8.8", 80))  # Doesn't actually send any data
         local_ip = s.getsockname()[0]
         s.close()
-        
+
         # If we got a different local IP, add both
-        if local_ip != "192.168.0.144":
+        if local_ip != DEFAULT_LOCAL_IP:
             logger.info(f"Detected different local IP: {local_ip}")
-            return [local_ip, "192.168.0.144"]
+            return [local_ip, DEFAULT_LOCAL_IP]
         return [local_ip]
     except Exception as e:
         logger.error(f"Error getting local IP: {e}")
-        return ["192.168.0.144"]
+        return [DEFAULT_LOCAL_IP]
 
 def get_server_ip() -> str:
-    """Get the server's public IP address"""
-    try:
-        response = requests.get('https://api.ipify.org')
-        return response.text
-    except Exception as e:
-        logger.error(f"Error getting server IP: {e}")
-        return None
+    """Get the server's public IP address, or None if it can't be determined"""
+    if SERVER_PUBLIC_IP:
+        return SERVER_PUBLIC_IP
+    with _discovery_lock:
+        cached = _discovered.get('server_ip')
+        if cached and (cached[0] is not None or time.monotonic() - cached[1] < IP_DISCOVERY_RETRY_SECONDS):
+            return cached[0]
+        try:
+            response = get_http_client().get('https://api.ipify.org', timeout=IP_DISCOVERY_TIMEOUT)
+            response.raise_for_status()
+            server_ip = response.text.strip()
+        except Exception as e:
+            logger.error(f"Error getting server IP: {e}")
+            server_ip = None
+        _discovered['server_ip'] = (server_ip, time.monotonic())
+        return server_ip
 
 def is_local_request(request_addr: str, local_ips: list) -> bool:
     """Check if the request is coming from the local network"""
     return (
-        request_addr.startswith('127.') or 
-        request_addr.startswith('192.168.') or 
+        request_addr.startswith('127.') or
+        request_addr.startswith('192.168.') or
         request_addr in local_ips
-    ) 
\ No newline at end of file
+    )
@@ -1,16 +1,108 @@
+import os
+import json
+import base64
 import logging
+import itertools
 from datetime import datetime, timedelta
-from typing import Dict, List, Tuple, Union
-from flask import jsonify, request
+from typing import Callable, Dict, Iterator, List, Optional, Tuple, Union
+from flask import Response, current_app, jsonify, request, stream_with_context
 import pytz
 
 from .timezone_handler import set_user_timezone as set_tz, get_user_timezone, convert_to_local_time
-from ..database import get_filtered_events as db_get_filtered_events
+from ..database import (
+    COMPACT_EVENT_COLUMNS, EVENT_COLUMNS, check_database_health, find_event_summary, get_event_summary,
+    get_filtered_events as db_get_filtered_events, iter_filtered_events as db_iter_filtered_events
+)
 from ..events import get_cache_status, fetch_events
-from ..events.event_store import get_filtered_events as store_get_filtered_events
+from ..events.change_sets import event_diffs_since
+from ..events.event_store import (
+    event_store, event_position, get_filtered_events as store_get_filtered_events,
+    iter_weekly_events_by_date_range, merge_event_diffs, sync_from_snapshot
+)
+from .fixed_cache_handler import get_startup_status
+from ..services.event_stream import (
+    HEARTBEAT, RETRY_MS, SSE_HEARTBEAT_SECONDS, SSE_MAX_WSGI_CLIENTS, get_event_stream_hub, get_sse_server
+)
+from ..services.event_query_cache import QUERY_CACHE_ENABLED, get_event_query_cache
+from ..services.http_client import get_http_client
+from ..services.leader_lock import get_updater_lock
+from ..services.query_shapes import record_events_query
+from ..services.single_flight import get_single_flight, single_flight_stats
+from ..wsgi_server import get_server_stats
 
 logger = logging.getLogger(__name__)
 
+# Browser/CDN cache lifetime of /events/<id>/summary responses. Summaries are
+# written once, so this can be long; events still waiting for one are cached briefly.
+SUMMARY_CACHE_SECONDS = int(os.getenv('EVENT_SUMMARY_CACHE_SECONDS') or '3600')
+PENDING_SUMMARY_CACHE_SECONDS = 60
+# Most query specs accepted by one POST /events/batch
+EVENTS_BATCH_MAX_QUERIES = int(os.getenv('EVENTS_BATCH_MAX_QUERIES') or '10')
+# Largest date_range page, and the default when no limit= is given
+EVENTS_PAGE_SIZE_MAX = int(os.getenv('EVENTS_PAGE_SIZE_MAX') or '1000')
+NDJSON_MIMETYPE = 'application/x-ndjson'
+NDJSON_CHUNK_SIZE = 200  # events converted per step of an NDJSON stream
+
+# Concurrent identical /events requests share each expensive stage
+file_load_flight = get_single_flight('file_load')
+db_query_flight = get_single_flight('db_query')
+conversion_flight = get_single_flight('timezone_conversion')
+serialization_flight = get_single_flight('serialization')
+
+def serialize_events(events: List[Dict]) -> str:
+    """JSON body of an /events response.
+
+    The published static event files are written with this too, so a file and the
+    Flask fallback for the same shape are byte-for-byte identical whatever the
+    app's JSON settings.
+    """
+    return json.dumps(events, sort_keys=True, default=str)
+
+def build_events_response(request_key: Tuple, events: List[Dict], user_id: str, user_timezone: str,
+                          time_range: str) -> Response:
+    """Convert events to the user's timezone and serialize them, coalescing identical requests.
+
+    Users with the same timezone get the same output, so the timezone (not the
+    user ID) is part of the key.
+    """
+    key = request_key + (user_timezone,)
+    converted_events = convert_events(request_key, events, user_id, user_timezone, time_range)
+    body = serialization_flight.do(key, lambda: serialize_events(converted_events))
+    return Response(body, mimetype='application/json')
+
+def convert_events(request_key: Tuple, events: List[Dict], user_id: str, user_timezone: str,
+                   time_range: str) -> List[Dict]:
+    """Convert events to the user's timezone, coalescing identical requests."""
+    return conversion_flight.do(
+        request_key + (user_timezone,), lambda: convert_to_local_time(events, user_id, time_range, user_timezone)
+    )
+
+def parse_fields(value: Optional[str]) -> tuple:
+    """Columns selected by the fields= parameter.
+
+    No value gives the compact shape and 'all' every column. 'time' is always
+    included, since it is needed for the timezone conversion.
+
+    Raises:
+        ValueError: if a field isn't an event column
+    """
+    if not value:
+        return COMPACT_EVENT_COLUMNS
+    if value.strip() == 'all':
+        return EVENT_COLUMNS
+    requested = {name.strip() for name in value.split(',') if name.strip()}
+    unknown = requested - set(EVENT_COLUMNS)
+    if unknown:
+        raise ValueError(f"Unknown fields: {', '.join(sorted(unknown))}")
+    requested.add('time')
+    return tuple(name for name in EVENT_COLUMNS if name in requested)
+
+def project_events(events: List[Dict], fields: tuple) -> List[Dict]:
+    """Keep only the selected fields of each event."""
+    if fields == EVENT_COLUMNS:
+        return events
+    return [{name: event[name] for name in fields if name in event} for event in events]
+
 # Valid time ranges for filtering
 VALID_TIME_RANGES = ['24h', 'today', 'yesterday', 'tomorrow', 'week', 'previous_week', 'next_week', 'specific_date', 'date_range']
 
@@ -30,181 +122,367 @@ def handle_timezone_request() -> Tuple[Dict, int]:
         logger.exception("Error setting timezone")
         return {"error": str(e)}, 500
 
-def handle_events_request() -> Tuple[Union[Dict, List], int]:
-    """Handle event retrieval requests"""
-    try:
-        # Get query parameters
-        time_range = request.args.get('time_range', '24h')
-        user_id = request.args.get('userId', 'default')
-        selected_currencies = request.args.get('currencies', '').split(',') if request.args.get('currencies') else None
-        selected_impacts = request.args.get('impacts', '').split(',') if request.args.get('impacts') else None
-        specific_date = request.args.get('date')
-        # Add parameters for date range
-        start_date = request.args.get('start_date')
-        end_date = request.args.get('end_date')
-
-        # Process selected currencies and impacts
-        processed_currencies = None
-        if selected_currencies and any(c.strip() for c in selected_currencies):
-            processed_currencies = [c.strip().upper() for c in selected_currencies if c.strip()]
-            logger.info(f"Processed currencies: {processed_currencies}")
-            
-        processed_impacts = None
-        if selected_impacts and any(i.strip() for i in selected_impacts):
-            processed_impacts = [i.strip() for i in selected_impacts if i.strip()]
-            logger.info(f"Processed impacts: {processed_impacts}")
-        
-        # Check for time ranges that can use the local JSON files
-        if time_range in ['previous_week', 'week', 'next_week', 'specific_date', 'date_range']:
-            logger.info(f"Attempting to get events for {time_range} from local JSON files")
-            
-            try:
-                # Get user's timezone
-                user_timezone = get_user_timezone(user_id)
-                logger.info(f"User timezone from preferences: {user_timezone}")
-                
-                # Get events from event_store with all parameters
-                events = store_get_filtered_events(
-                    time_range=time_range,
-                    user_timezone=user_timezone,
-                    selected_currencies=processed_currencies,
-                    selected_impacts=processed_impacts,
-                    specific_date=specific_date,
-                    start_date=start_date,
-                    end_date=end_date
-                )
-                
-                if events and len(events) > 0:
-                    logger.info(f"Found {len(events)} events for {time_range} from local JSON files")
-                    
-                    # Convert times to user's timezone with proper DST handling
-                    converted_events = convert_to_local_time(events, user_id, time_range)
-                    return converted_events, 200
-                else:
-                    logger.warning(f"No events found in local JSON files for {time_range}, falling back to database")
-            except Exception as e:
-                logger.exception(f"Error getting events from local JSON files: {str(e)}")
-                logger.warning(f"Falling back to database query for {time_range} events")
-
-        # Get current time in UTC
-        now = datetime.now(pytz.UTC)
-        
-        # Default initialization of start_time and end_time
+def split_list(value: Union[str, List[str], None]) -> Optional[List[str]]:
+    """Comma-separated query string value or JSON list, with blanks removed."""
+    if not value:
+        return None
+    items = value.split(',') if isinstance(value, str) else value
+    items = [str(item).strip() for item in items if str(item).strip()]
+    return items or None
+
+def parse_events_query(params) -> Dict:
+    """Normalize /events query parameters (query string args or a batch query spec).
+
+    Requests with the same 'key' get the same events, whoever asks.
+
+    Raises:
+        ValueError: if fields names an unknown column
+    """
+    currencies = split_list(params.get('currencies'))
+    if currencies:
+        currencies = [c.upper() for c in currencies]
+        logger.info(f"Processed currencies: {currencies}")
+    impacts = split_list(params.get('impacts'))
+    if impacts:
+        logger.info(f"Processed impacts: {impacts}")
+
+    fields = params.get('fields')
+    if isinstance(fields, list):
+        fields = ','.join(fields)
+    query = {
+        'time_range': params.get('time_range', '24h'),
+        'currencies': currencies,
+        'impacts': impacts,
+        'specific_date': params.get('date'),
+        'start_date': params.get('start_date'),
+        'end_date': params.get('end_date'),
+        'fields': parse_fields(fields)
+    }
+    query['key'] = (
+        query['time_range'], query['specific_date'], query['start_date'], query['end_date'],
+        tuple(currencies or ()), tuple(impacts or ()), query['fields']
+    )
+    return query
+
+def calculate_time_window(time_range: str, specific_date: Optional[str], start_date: Optional[str],
+                          end_date: Optional[str], now: datetime) -> Tuple[datetime, datetime]:
+    """UTC start and end of the database query for a time range.
+
+    Raises:
+        ValueError: if a date is missing or malformed
+    """
+    # Default initialization of start_time and end_time
+    start_time = now
+    end_time = now + timedelta(days=1)
+
+    # Calculate time range
+    if time_range == '24h':
         start_time = now
         end_time = now + timedelta(days=1)
+    elif time_range == 'today':
+        start_time = now.replace(hour=0, minute=0, second=0, microsecond=0)
+        end_time = start_time + timedelta(days=1)
+    elif time_range == 'yesterday':
+        start_time = (now - timedelta(days=1)).replace(hour=0, minute=0, second=0, microsecond=0)
+        end_time = start_time + timedelta(days=1)
+    elif time_range == 'tomorrow':
+        start_time = (now + timedelta(days=1)).replace(hour=0, minute=0, second=0, microsecond=0)
+        end_time = start_time + timedelta(days=1)
+    elif time_range == 'week':
+        # Calculate days to previous Sunday for current week
+        if now.weekday() == 6:  # If today is Sunday
+            days_to_start = 0
+        else:
+            days_to_start = -(now.weekday() + 1)  # Go back to previous Sunday
+        week_start = now + timedelta(days=days_to_start)
+        start_time = week_start.replace(hour=0, minute=0, second=0, microsecond=0)
+        week_end = week_start + timedelta(days=6)  # Saturday
+        end_time = week_end.replace(hour=23, minute=59, second=59, microsecond=999999)
+    elif time_range == 'previous_week':
+        # Calculate days to previous Sunday, then go back one more week
+        if now.weekday() == 6:  # If today is Sunday
+            days_to_start = -7  # Go back one week
+        else:
+            days_to_start = -(now.weekday() + 1) - 7  # Go back to previous Sunday
+        week_start = now + timedelta(days=days_to_start)
+        start_time = week_start.replace(hour=0, minute=0, second=0, microsecond=0)
+        # End on Saturday of previous week
+        week_end = week_start + timedelta(days=6)  # Saturday
+        end_time = week_end.replace(hour=23, minute=59, second=59, microsecond=999999)
+        
+        logger.info(f"Calculated previous week: {start_time.date()} to {end_time.date()}")
+        logger.info(f"Previous week in ISO format: {start_time.isoformat()} to {end_time.isoformat()}")
+        logger.info(f"Current time: {now.isoformat()}, Weekday: {now.weekday()}")
+    elif time_range == 'next_week':
+        # Calculate days to next Sunday
+        if now.weekday() == 6:  # If today is Sunday
+            days_to_start = 7  # Go forward one week
+        else:
+            days_to_start = 6 - now.weekday()  # Days until next Sunday
+        week_start = now + timedelta(days=days_to_start)
+        start_time = week_start.replace(hour=0, minute=0, second=0, microsecond=0)
+        week_end = week_start + timedelta(days=6)  # Saturday
+        end_time = week_end.replace(hour=23, minute=59, second=59, microsecond=999999)
+    elif time_range == 'specific_date':
+        if not specific_date:
+            raise ValueError("No date provided for specific date filter")
+        try:
+            # Parse and validate the date
+            start_time = datetime.strptime(specific_date, '%Y-%m-%d')
+            if start_time.tzinfo is None:
+                start_time = pytz.UTC.localize(start_time)
+            
+            # Set end time to end of the selected day
+            end_time = start_time + timedelta(days=1) - timedelta(microseconds=1)
+        except ValueError as e:
+            if "does not match format" in str(e):
+                raise ValueError("Invalid date format. Please use YYYY-MM-DD")
+            raise
+    elif time_range == 'date_range':
+        if not start_date or not end_date:
+            raise ValueError("Both start date and end date are required for date range filter")
+        try:
+            # Parse and validate the dates
+            start_time = datetime.strptime(start_date, '%Y-%m-%d')
+            end_time = datetime.strptime(end_date, '%Y-%m-%d')
+            
+            if start_time.tzinfo is None:
+                start_time = pytz.UTC.localize(start_time)
+            if end_time.tzinfo is None:
+                end_time = pytz.UTC.localize(end_time)
+            
+            # Set end time to end of the selected day
+            end_time = end_time + timedelta(days=1) - timedelta(microseconds=1)
+            
+            # Ensure start_time is before end_time
+            if start_time > end_time:
+                raise ValueError("Start date must be before end date")
+            
+        except ValueError as e:
+            if "does not match format" in str(e):
+                raise ValueError("Invalid date format. Please use YYYY-MM-DD")
+            logger.error(f"Date range error: {str(e)}")
+            raise ValueError(f"Error processing date range: {str(e)}")
 
-        # Calculate time range
-        if time_range == '24h':
-            start_time = now
-            end_time = now + timedelta(days=1)
-        elif time_range == 'today':
-            start_time = now.replace(hour=0, minute=0, second=0, microsecond=0)
-            end_time = start_time + timedelta(days=1)
-        elif time_range == 'yesterday':
-            start_time = (now - timedelta(days=1)).replace(hour=0, minute=0, second=0, microsecond=0)
-            end_time = start_time + timedelta(days=1)
-        elif time_range == 'tomorrow':
-            start_time = (now + timedelta(days=1)).replace(hour=0, minute=0, second=0, microsecond=0)
-            end_time = start_time + timedelta(days=1)
-        elif time_range == 'week':
-            # Calculate days to previous Sunday for current week
-            if now.weekday() == 6:  # If today is Sunday
-                days_to_start = 0
-            else:
-                days_to_start = -(now.weekday() + 1)  # Go back to previous Sunday
-            week_start = now + timedelta(days=days_to_start)
-            start_time = week_start.replace(hour=0, minute=0, second=0, microsecond=0)
-            week_end = week_start + timedelta(days=6)  # Saturday
-            end_time = week_end.replace(hour=23, minute=59, second=59, microsecond=999999)
-        elif time_range == 'previous_week':
-            # Calculate days to previous Sunday, then go back one more week
-            if now.weekday() == 6:  # If today is Sunday
-                days_to_start = -7  # Go back one week
-            else:
-                days_to_start = -(now.weekday() + 1) - 7  # Go back to previous Sunday
-            week_start = now + timedelta(days=days_to_start)
-            start_time = week_start.replace(hour=0, minute=0, second=0, microsecond=0)
-            # End on Saturday of previous week
-            week_end = week_start + timedelta(days=6)  # Saturday
-            end_time = week_end.replace(hour=23, minute=59, second=59, microsecond=999999)
+    return start_time, end_time
+
+def load_events(query: Dict, user_timezone: str, now: Optional[datetime] = None,
+                store_loader: Optional[Callable[..., List[Dict]]] = None) -> Tuple[str, List[Dict]]:
+    """Events for a parsed query, from the weekly JSON files or the database.
+
+    Args:
+        query: Result of parse_events_query
+        user_timezone: The requesting user's timezone
+        now: Current UTC time the relative ranges are based on
+        store_loader: Loader for the weekly files, with the signature of (and
+            defaulting to) event_store.get_filtered_events
+
+    Returns:
+        ('file' or 'db', events in UTC)
+    """
+    time_range = query['time_range']
+    request_key = query['key']
+    store_loader = store_loader or store_get_filtered_events
+
+    # Check for time ranges that can use the local JSON files
+    if time_range in ['previous_week', 'week', 'next_week', 'specific_date', 'date_range']:
+        logger.info(f"Attempting to get events for {time_range} from local JSON files")
+        
+        try:
+            # Get events from event_store with all parameters
+            events = file_load_flight.do(request_key + (user_timezone,), lambda: project_events(store_loader(
+                time_range=time_range,
+                user_timezone=user_timezone,
+                selected_currencies=query['currencies'],
+                selected_impacts=query['impacts'],
+                specific_date=query['specific_date'],
+                start_date=query['start_date'],
+                end_date=query['end_date']
+            ), query['fields']))
             
-            logger.info(f"Calculated previous week: {start_time.date()} to {end_time.date()}")
-            logger.info(f"Previous week in ISO format: {start_time.isoformat()} to {end_time.isoformat()}")
-            logger.info(f"Current time: {now.isoformat()}, Weekday: {now.weekday()}")
-        elif time_range == 'next_week':
-            # Calculate days to next Sunday
-            if now.weekday() == 6:  # If today is Sunday
-                days_to_start = 7  # Go forward one week
+            if events and len(events) > 0:
+                logger.info(f"Found {len(events)} events for {time_range} from local JSON files")
+                return 'file', events
             else:
-                days_to_start = 6 - now.weekday()  # Days until next Sunday
-            week_start = now + timedelta(days=days_to_start)
-            start_time = week_start.replace(hour=0, minute=0, second=0, microsecond=0)
-            week_end = week_start + timedelta(days=6)  # Saturday
-            end_time = week_end.replace(hour=23, minute=59, second=59, microsecond=999999)
-        elif time_range == 'specific_date':
-            if not specific_date:
-                raise ValueError("No date provided for specific date filter")
-            try:
-                # Parse and validate the date
-                start_time = datetime.strptime(specific_date, '%Y-%m-%d')
-                if start_time.tzinfo is None:
-                    start_time = pytz.UTC.localize(start_time)
-                
-                # Set end time to end of the selected day
-                end_time = start_time + timedelta(days=1) - timedelta(microseconds=1)
-            except ValueError as e:
-                if "does not match format" in str(e):
-                    raise ValueError("Invalid date format. Please use YYYY-MM-DD")
-                raise
-        elif time_range == 'date_range':
-            if not start_date or not end_date:
-                raise ValueError("Both start date and end date are required for date range filter")
-            try:
-                # Parse and validate the dates
-                start_time = datetime.strptime(start_date, '%Y-%m-%d')
-                end_time = datetime.strptime(end_date, '%Y-%m-%d')
-                
-                if start_time.tzinfo is None:
-                    start_time = pytz.UTC.localize(start_time)
-                if end_time.tzinfo is None:
-                    end_time = pytz.UTC.localize(end_time)
-                
-                # Set end time to end of the selected day
-                end_time = end_time + timedelta(days=1) - timedelta(microseconds=1)
-                
-                # Ensure start_time is before end_time
-                if start_time > end_time:
-                    raise ValueError("Start date must be before end date")
-                
-            except ValueError as e:
-                if "does not match format" in str(e):
-                    raise ValueError("Invalid date format. Please use YYYY-MM-DD")
-                logger.error(f"Date range error: {str(e)}")
-                raise ValueError(f"Error processing date range: {str(e)}")
-
-        # Get filtered events from database
-        logger.info(f"Querying database for events between {start_time.isoformat()} and {end_time.isoformat()}")
-        logger.info(f"Time range: '{time_range}', Currencies: {processed_currencies}, Impacts: {processed_impacts}")
-        
-        filtered_events = db_get_filtered_events(
+                logger.warning(f"No events found in local JSON files for {time_range}, falling back to database")
+        except Exception as e:
+            logger.exception(f"Error getting events from local JSON files: {str(e)}")
+            logger.warning(f"Falling back to database query for {time_range} events")
+
+    start_time, end_time = calculate_time_window(
+        time_range, query['specific_date'], query['start_date'], query['end_date'], now or datetime.now(pytz.UTC)
+    )
+
+    # Get filtered events from database
+    logger.info(f"Querying database for events between {start_time.isoformat()} and {end_time.isoformat()}")
+    logger.info(f"Time range: '{time_range}', Currencies: {query['currencies']}, Impacts: {query['impacts']}")
+    
+    if QUERY_CACHE_ENABLED:
+        filtered_events = get_event_query_cache().get_or_load(
+            start_time, end_time, query['currencies'], query['impacts'],
+            loader=db_get_filtered_events, columns=query['fields']
+        )
+    else:
+        filtered_events = db_query_flight.do(request_key, lambda: db_get_filtered_events(
             start_time=start_time,
             end_time=end_time,
-            currencies=processed_currencies,
-            impact_levels=processed_impacts
-        )
-        
-        if not filtered_events:
-            logger.warning(f"No events found in database for {time_range} between {start_time} and {end_time}")
-        else:
-            logger.info(f"Found {len(filtered_events)} events in database for {time_range}")
-            if filtered_events:  # Double-check to avoid index error with empty list
-                logger.info(f"First event: {filtered_events[0]['event_title']} at {filtered_events[0]['time']}")
-                logger.info(f"Last event: {filtered_events[-1]['event_title']} at {filtered_events[-1]['time']}")
+            currencies=query['currencies'],
+            impact_levels=query['impacts'],
+            columns=query['fields']
+        ))
+    
+    if not filtered_events:
+        logger.warning(f"No events found in database for {time_range} between {start_time} and {end_time}")
+    else:
+        logger.info(f"Found {len(filtered_events)} events in database for {time_range}")
+        logger.info(f"First event: {filtered_events[0].get('event_title')} at {filtered_events[0]['time']}")
+        logger.info(f"Last event: {filtered_events[-1].get('event_title')} at {filtered_events[-1]['time']}")
+
+    return 'db', filtered_events
+
+def encode_cursor(event: Dict) -> str:
+    """Opaque cursor for the page after this (UTC, unprojected) event."""
+    payload = json.dumps(list(event_position(event)), separators=(',', ':'))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip('=')
+
+def decode_cursor(value: Optional[str]) -> Optional[Tuple[str, int, str]]:
+    """The event_position (time, id, name) from a cursor made by encode_cursor.
+
+    Raises:
+        ValueError: if the cursor is malformed
+    """
+    if not value:
+        return None
+    try:
+        event_time, event_id, name = json.loads(base64.urlsafe_b64decode(value + '=' * (-len(value) % 4)))
+        datetime.fromisoformat(event_time)
+    except Exception:
+        raise ValueError("Invalid cursor")
+    if type(event_id) is not int or not isinstance(name, str):
+        raise ValueError("Invalid cursor")
+    return event_time, event_id, name
+
+def parse_page_size(value: Optional[str]) -> int:
+    """Page size from the limit= parameter, capped at EVENTS_PAGE_SIZE_MAX."""
+    if not value:
+        return EVENTS_PAGE_SIZE_MAX
+    try:
+        limit = int(value)
+    except ValueError:
+        raise ValueError("limit must be a number")
+    if limit < 1:
+        raise ValueError("limit must be at least 1")
+    return min(limit, EVENTS_PAGE_SIZE_MAX)
+
+def wants_ndjson() -> bool:
+    """Whether the client explicitly asked for newline-delimited JSON."""
+    return any(mimetype == NDJSON_MIMETYPE for mimetype, _ in request.accept_mimetypes)
+
+def iter_date_range_events(query: Dict, after: Optional[Tuple[str, int, str]] = None) -> Iterator[Dict]:
+    """UTC events for a date_range query in (time, id) order, without holding the range in memory.
+
+    Reads the weekly JSON files one at a time, or pages through the database
+    if there are no files for the range. Events are unprojected, so they can
+    be turned into cursors.
+
+    Raises:
+        ValueError: if the dates or the cursor are invalid
+    """
+    start_time, end_time = calculate_time_window(
+        'date_range', None, query['start_date'], query['end_date'], datetime.now(pytz.UTC)
+    )
+    currencies, impacts = query['currencies'], query['impacts']
+
+    def matches(event):
+        return (not currencies or event['currency'] in currencies) and (not impacts or event['impact'] in impacts)
+
+    file_events = None
+    try:
+        file_events = (event for event in iter_weekly_events_by_date_range(query['start_date'], query['end_date'])
+                       if matches(event))
+        first = next(file_events, None)
+    except Exception as e:
+        logger.exception(f"Error getting events from local JSON files: {str(e)}")
+        first = None
+
+    if first is not None:
+        def from_files():
+            # The files are read in event_position order, so the cursor compares with the same key
+            for event in itertools.chain([first], file_events):
+                if after is None or event_position(event) > after:
+                    yield event
+        return from_files()
+
+    logger.warning("No events found in local JSON files for date_range, paging through the database")
+    db_after = None
+    if after:
+        if after[1] < 0:
+            raise ValueError("Invalid cursor")
+        db_after = (datetime.fromisoformat(after[0]), after[1])
+    return db_iter_filtered_events(start_time, end_time, currencies, impacts,
+                                   columns=query['fields'], after=db_after)
+
+def build_date_range_response(query: Dict, user_id: str, user_timezone: str) -> Response:
+    """A date_range response: one page of at most limit events, or an NDJSON stream.
+
+    JSON responses keep the /events list shape; when there are more events the
+    X-Next-Cursor header holds the cursor= value for the next page. NDJSON
+    responses stream the whole range unless a limit is given.
+    """
+    after = decode_cursor(request.args.get('cursor'))
+    limit = request.args.get('limit')
+    events = iter_date_range_events(query, after)
+    fields = query['fields']
+    time_range = query['time_range']
+
+    if wants_ndjson() and not limit:
+        def generate():
+            while True:
+                chunk = list(itertools.islice(events, NDJSON_CHUNK_SIZE))
+                if not chunk:
+                    return
+                for event in convert_to_local_time(project_events(chunk, fields), user_id, time_range):
+                    yield current_app.json.dumps(event) + '\n'
+        return Response(stream_with_context(generate()), mimetype=NDJSON_MIMETYPE)
+
+    page_size = parse_page_size(limit)
+    page = list(itertools.islice(events, page_size + 1))
+    next_cursor = encode_cursor(page[page_size - 1]) if len(page) > page_size else None
+    converted = convert_to_local_time(project_events(page[:page_size], fields), user_id, time_range)
+
+    if wants_ndjson():
+        response = Response([current_app.json.dumps(event) + '\n' for event in converted], mimetype=NDJSON_MIMETYPE)
+    else:
+        response = Response(current_app.json.dumps(converted), mimetype='application/json')
+    if next_cursor:
+        response.headers['X-Next-Cursor'] = next_cursor
+    return response
+
+def build_ndjson_response(request_key: Tuple, events: List[Dict], user_id: str, user_timezone: str,
+                          time_range: str) -> Response:
+    """Already-loaded events as newline-delimited JSON."""
+    converted_events = convert_events(request_key, events, user_id, user_timezone, time_range)
+    return Response((current_app.json.dumps(event) + '\n' for event in converted_events), mimetype=NDJSON_MIMETYPE)
+
+def handle_events_request() -> Tuple[Union[Dict, Response], int]:
+    """Handle event retrieval requests"""
+    try:
+        user_id = request.args.get('userId', 'default')
+        query = parse_events_query(request.args)
+        user_timezone = get_user_timezone(user_id)
+        logger.info(f"User timezone from preferences: {user_timezone}")
+        record_events_query(query, user_timezone)
+
+        # Long ranges are paged or streamed instead of built in memory
+        if query['time_range'] == 'date_range':
+            return build_date_range_response(query, user_id, user_timezone), 200
+
+        source, events = load_events(query, user_timezone)
 
         # Convert times to user's timezone with proper DST handling
-        converted_events = convert_to_local_time(filtered_events, user_id, time_range)
-        
-        return converted_events, 200
+        if wants_ndjson():
+            return build_ndjson_response((source,) + query['key'], events, user_id, user_timezone, query['time_range']), 200
+        return build_events_response((source,) + query['key'], events, user_id, user_timezone, query['time_range']), 200
             
     except ValueError as e:
         return {'error': str(e)}, 400
@@ -212,9 +490,232 @@ def handle_events_request() -> Tuple[Union[Dict, List], int]:
         logger.exception("Error processing events request")
         return {'error': str(e)}, 500
 
+def shared_store_loader() -> Callable[..., List[Dict]]:
+    """Weekly-file loader that reads each time range once and filters the shared copy.
+
+    Filtering matches event_store.get_filtered_events.
+    """
+    loaded = {}
+
+    def load(time_range, user_timezone, selected_currencies=None, selected_impacts=None,
+             specific_date=None, start_date=None, end_date=None):
+        range_key = (time_range, specific_date, start_date, end_date)
+        if range_key not in loaded:
+            loaded[range_key] = store_get_filtered_events(
+                time_range=time_range, user_timezone=user_timezone,
+                specific_date=specific_date, start_date=start_date, end_date=end_date
+            )
+        events = loaded[range_key]
+        if selected_currencies:
+            events = [event for event in events if event['currency'] in selected_currencies]
+        if selected_impacts:
+            events = [event for event in events if event['impact'] in selected_impacts]
+        return events
+
+    return load
+
+def handle_events_batch_request() -> Tuple[Union[Dict, Response], int]:
+    """Handle several event queries in one request.
+
+    The body is {"userId": ..., "queries": {"<name>": {<the /events parameters>}}}.
+    Every query is resolved with the same user timezone and the same current
+    time, and each weekly file range is loaded once. The response is
+    {"timezone": ..., "results": {"<name>": [events]}, "errors": {"<name>": message}};
+    a query that fails doesn't fail the others.
+    """
+    data = request.get_json(silent=True)
+    if not isinstance(data, dict) or not isinstance(data.get('queries'), dict) or not data['queries']:
+        return {'error': 'Expected a JSON object with a non-empty "queries" object'}, 400
+    queries = data['queries']
+    if len(queries) > EVENTS_BATCH_MAX_QUERIES:
+        return {'error': f'At most {EVENTS_BATCH_MAX_QUERIES} queries per batch'}, 400
+
+    try:
+        user_id = str(data.get('userId', 'default'))
+        user_timezone = get_user_timezone(user_id)
+        now = datetime.now(pytz.UTC)
+        store_loader = shared_store_loader()
+
+        results = {}
+        errors = {}
+        for name, spec in queries.items():
+            if not isinstance(spec, dict):
+                errors[name] = 'Query must be an object'
+                continue
+            try:
+                query = parse_events_query(spec)
+                source, events = load_events(query, user_timezone, now=now, store_loader=store_loader)
+                results[name] = convert_events((source,) + query['key'], events, user_id, user_timezone,
+                                               query['time_range'])
+            except ValueError as e:
+                errors[name] = str(e)
+
+        body = current_app.json.dumps({'timezone': user_timezone, 'results': results, 'errors': errors})
+        return Response(body, mimetype='application/json'), 200
+    except Exception as e:
+        logger.exception("Error processing events batch request")
+        return {'error': str(e)}, 500
+
+def summary_response(summary: Optional[Dict], missing: str) -> Tuple[Union[Dict, Response], int]:
+    """Response for an event summary, with cache validators"""
+    if summary is None:
+        return {'error': missing}, 404
+
+    response = jsonify(summary)
+    if summary['ai_summary']:
+        response.cache_control.max_age = SUMMARY_CACHE_SECONDS
+        response.set_etag(f"{summary['id']}-{summary['summary_generated_at']}")
+    else:
+        response.cache_control.max_age = PENDING_SUMMARY_CACHE_SECONDS
+    response.cache_control.public = True
+    response = response.make_conditional(request)
+    return response, response.status_code
+
+def handle_event_summary_request(event_id: int) -> Tuple[Union[Dict, Response], int]:
+    """Handle AI summary request for one event, with cache validators"""
+    try:
+        summary = get_event_summary(event_id)
+    except Exception as e:
+        logger.exception(f"Error loading summary for event {event_id}")
+        return {'error': str(e)}, 500
+    return summary_response(summary, f'Event {event_id} not found')
+
+def handle_event_summary_lookup_request() -> Tuple[Union[Dict, Response], int]:
+    """Handle AI summary request for an event as listed by /events or the static files.
+
+    Events from the weekly files have no id, so the event is looked up by
+    currency, event_title and its listed local time. The time is read in
+    timezone, or in the user's timezone for userId, as in the /events response.
+    """
+    currency = (request.args.get('currency') or '').upper()
+    event_title = request.args.get('event_title')
+    time = request.args.get('time')
+    if not (currency and event_title and time):
+        return {'error': 'currency, event_title and time are required'}, 400
+
+    user_timezone = request.args.get('timezone') or get_user_timezone(request.args.get('userId', 'default'))
+    if user_timezone not in pytz.all_timezones_set:
+        return {'error': f'Unknown timezone: {user_timezone}'}, 400
+    try:
+        local_time = datetime.strptime(time, '%Y-%m-%d %H:%M')
+    except ValueError:
+        return {'error': 'time must be YYYY-MM-DD HH:MM'}, 400
+
+    tz = pytz.timezone(user_timezone)
+    times = sorted({tz.localize(local_time, is_dst=is_dst).astimezone(pytz.UTC) for is_dst in (True, False)})
+    try:
+        summary = find_event_summary(currency, event_title, times)
+    except Exception as e:
+        logger.exception(f"Error loading summary for {currency} {event_title} at {time}")
+        return {'error': str(e)}, 500
+    return summary_response(summary, f'Event {currency} {event_title} at {time} not found')
+
+def filter_event_diff(diff: Dict[str, List], currencies: Optional[List[str]],
+                      impacts: Optional[List[str]]) -> Dict[str, List]:
+    """Keep the parts of a diff a filtered client sees.
+
+    An update that moves an event into or out of the filter (an impact
+    change) is reported as an insert or removal.
+    """
+    def matches(event: Dict) -> bool:
+        return ((not currencies or event.get('currency') in currencies) and
+                (not impacts or event.get('impact') in impacts))
+
+    inserted = [event for event in diff['inserted'] if matches(event)]
+    removed = [event for event in diff['removed'] if matches(event)]
+    updated = []
+    for update in diff['updated']:
+        event = update['event']
+        old = dict(event, **{field: values[0] for field, values in update['changes'].items()})
+        if matches(event) and matches(old):
+            updated.append(update)
+        elif matches(event):
+            inserted.append(event)
+        elif matches(old):
+            removed.append(old)
+    return {'inserted': inserted, 'updated': updated, 'removed': removed}
+
+def handle_event_changes_request() -> Tuple[Dict, int]:
+    """Handle a request for the events changed since a snapshot version
+
+    Clients that get resync: true (their version aged out of the diff ring, or
+    is unknown) reload /events and continue from the returned version.
+    """
+    try:
+        since = int(request.args['since'])
+    except (KeyError, ValueError):
+        return {'error': 'since must be a snapshot version'}, 400
+
+    try:
+        user_id = request.args.get('userId', 'default')
+        currencies = [c.upper() for c in split_list(request.args.get('currencies')) or []]
+        impacts = split_list(request.args.get('impacts'))
+
+        sync_from_snapshot()
+        version = event_store['version']
+        diffs = event_diffs_since(since, version) if since > 0 else None
+        if diffs is None:
+            return {'version': version, 'since': since, 'resync': True}, 200
+
+        diff = filter_event_diff(merge_event_diffs(diffs), currencies, impacts)
+
+        user_timezone = get_user_timezone(user_id)
+
+        def localize(events: List[Dict]) -> List[Dict]:
+            return convert_to_local_time(events, user_id, 'date_range', user_timezone)
+
+        # Converting sorts by time, so each updated event carries the position of its update
+        updated = localize([dict(update['event'], _update=i) for i, update in enumerate(diff['updated'])])
+        return {
+            'version': version,
+            'since': since,
+            'resync': False,
+            'inserted': localize(diff['inserted']),
+            'updated': [dict(diff['updated'][event.pop('_update')], event=event) for event in updated],
+            'removed': localize(diff['removed'])
+        }, 200
+    except Exception as e:
+        logger.exception("Error processing event changes request")
+        return {'error': str(e)}, 500
+
+def handle_event_stream_request() -> Tuple[Union[Dict, Response], int]:
+    """Push snapshot versions and event diffs as Server-Sent Events
+
+    Each client holds a WSGI thread, so only SSE_MAX_WSGI_CLIENTS are served here;
+    the dedicated SSE server (SSE_PORT) is the place for everyone else.
+    """
+    subscription = get_event_stream_hub().subscribe(kind='wsgi', limit=SSE_MAX_WSGI_CLIENTS)
+    if subscription is None:
+        server = get_sse_server()
+        response = jsonify({
+            'error': 'Too many stream clients',
+            'sse_port': server.port if server else None
+        })
+        response.headers['Retry-After'] = str(RETRY_MS // 1000)
+        return response, 503
+
+    def generate() -> Iterator[bytes]:
+        try:
+            yield f"retry: {RETRY_MS}\n\n".encode()
+            while True:
+                yield subscription.get(timeout=SSE_HEARTBEAT_SECONDS) or HEARTBEAT
+        finally:
+            subscription.close()
+
+    response = Response(generate(), mimetype='text/event-stream')
+    response.headers['Cache-Control'] = 'no-cache'
+    response.headers['X-Accel-Buffering'] = 'no'  # Don't let nginx buffer the stream
+    return response, 200
+
 def handle_cache_status_request() -> Tuple[Dict, int]:
     """Handle cache status request"""
-    return get_cache_status(), 200
+    status = get_cache_status()
+    if QUERY_CACHE_ENABLED:
+        status['query_cache'] = get_event_query_cache().stats()
+    status['coalescing'] = single_flight_stats()
+    status['updater'] = get_updater_lock().status()
+    status['stream'] = get_event_stream_hub().stats()
+    return status, 200
 
 def handle_cache_refresh_request() -> Tuple[Dict, int]:
     """Handle cache refresh request"""
@@ -228,4 +729,36 @@ def handle_cache_refresh_request() -> Tuple[Dict, int]:
         return {
             "error": str(e),
             "status": get_cache_status()
-        }, 500 
\ No newline at end of file
+        }, 500 
+
+def handle_db_health_request() -> Tuple[Dict, int]:
+    """Handle database health check request"""
+    health = check_database_health()
+    return health, 200 if health['status'] == 'ok' else 503
+
+def handle_liveness_request() -> Tuple[Dict, int]:
+    """Handle liveness check request: the process is serving and its background thread hasn't died"""
+    startup = get_startup_status()
+    alive = startup['status'] == 'stopped' or startup['background_thread_alive']
+    return {'status': 'ok' if alive else 'error', 'startup': startup}, 200 if alive else 503
+
+def handle_readiness_request() -> Tuple[Dict, int]:
+    """Handle readiness check request: warm-up has finished and the event store has events"""
+    startup = get_startup_status()
+    cache = get_cache_status()
+    ready = startup['status'] == 'ready' and cache['event_count'] > 0
+    return {
+        'status': 'ready' if ready else startup['status'],
+        'startup': startup,
+        'cache': cache
+    }, 200 if ready else 503
+
+def handle_server_status_request() -> Tuple[Dict, int]:
+    """Handle server status request: request queue, thread pool and outbound HTTP metrics"""
+    stats = get_server_stats()
+    if stats is None:
+        stats = {'status': 'unmanaged', 'message': 'Not running under the cheroot launcher'}
+    else:
+        stats['status'] = 'ok'
+    stats['outbound_http'] = get_http_client().stats()
+    return stats, 200
@@ -0,0 +1,345 @@
+"""
+Pre-rendered /events responses for the most requested query shapes.
+
+Most /events traffic is a few shapes: week, 24h and today in a handful of
+timezones, with all or the default currencies. The updater process writes the
+response for the STATIC_EVENTS_TOP_N most requested shapes into
+STATIC_EVENTS_DIR, already serialized and compressed:
+
+    <timezone>/<time_range>__<currencies>__<impacts>.json  (+ .json.gz, .json.br)
+
+e.g. Europe/London/week__all__all.json or America/New_York/24h__EUR,USD__High.json.
+nginx or IIS serves these for /events/static/... and forwards only misses to
+Flask, which answers the same URLs (handle_static_events_request).
+
+Shapes are counted by every worker (see backend.services.query_shapes), so
+the publisher sees the whole server's traffic. Requests nginx answers from a
+file never reach Flask, so set STATIC_EVENTS_ACCESS_LOG to the access log of
+the /events/static/ location and the publisher counts them from there (and
+Flask stops counting static URLs, which the log already has). Without the log,
+published shapes are pinned: their counts stop growing once nginx serves them,
+and dropping them for that would make them flap in and out of the top N.
+With the log, a published shape stays until it falls out of the top 2 * N.
+
+Files are written after each store_events and every
+STATIC_EVENTS_REFRESH_SECONDS (the relative ranges move with the clock). Each
+file is replaced with an atomic rename, and shapes that are no longer
+published are deleted.
+"""
+import os
+import re
+import json
+import gzip
+import time
+import logging
+import tempfile
+import threading
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple, Union
+from urllib.parse import unquote
+
+import pytz
+from flask import Response
+
+from ..events.event_store import add_store_listener, event_store
+from ..services.leader_lock import get_updater_lock
+from ..services.query_shapes import STATIC_FIELDS, STATIC_TIME_RANGES, Shape, get_query_shape_counter
+from .route_handler import build_events_response, load_events, parse_events_query, serialize_events
+from .timezone_handler import convert_to_local_time
+
+logger = logging.getLogger(__name__)
+
+# Get the absolute path of the project root
+project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+STATIC_EVENTS_DIR = os.getenv('STATIC_EVENTS_DIR') or os.path.join(project_root, 'cache', 'static_events')
+STATIC_EVENTS_TOP_N = int(os.getenv('STATIC_EVENTS_TOP_N') or '20')  # 0 disables publishing
+STATIC_EVENTS_REFRESH_SECONDS = float(os.getenv('STATIC_EVENTS_REFRESH_SECONDS') or '300')
+STATIC_EVENTS_ACCESS_LOG = os.getenv('STATIC_EVENTS_ACCESS_LOG') or ''  # nginx access log of /events/static/
+
+# Request line and status of a static events request in an nginx access log
+ACCESS_LOG_PATTERN = re.compile(r'"(?:GET|HEAD) /events/static/(\S+?)(?:\?\S*)? HTTP/[\d.]+" (\d{3}) ')
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+
+def shape_filename(time_range: str, currencies: Optional[List[str]], impacts: Optional[List[str]]) -> str:
+    """File name of a query shape; lists are sorted so each shape has one name."""
+    return '__'.join([
+        time_range,
+        ','.join(sorted(currencies)) if currencies else 'all',
+        ','.join(sorted(impacts)) if impacts else 'all'
+    ]) + '.json'
+
+
+def parse_shape(timezone: str, name: str) -> Shape:
+    """Query shape for a static URL.
+
+    Raises:
+        ValueError: if the timezone or name isn't a static shape
+    """
+    if timezone not in pytz.all_timezones_set:
+        raise ValueError(f"Unknown timezone: {timezone}")
+    parts = name[:-len('.json')].split('__') if name.endswith('.json') else []
+    if len(parts) != 3 or parts[0] not in STATIC_TIME_RANGES:
+        raise ValueError(f"Not a static events file: {name}")
+    currencies = () if parts[1] == 'all' else tuple(sorted(c.upper() for c in parts[1].split(',') if c))
+    impacts = () if parts[2] == 'all' else tuple(sorted(i for i in parts[2].split(',') if i))
+    return timezone, parts[0], currencies, impacts
+
+
+def shape_query(shape: Shape) -> Dict:
+    _, time_range, currencies, impacts = shape
+    return parse_events_query({
+        'time_range': time_range,
+        'currencies': ','.join(currencies),
+        'impacts': ','.join(impacts),
+        'fields': ','.join(STATIC_FIELDS)
+    })
+
+
+def render_shape(shape: Shape) -> bytes:
+    """The /events response body for a shape, serialized as the Flask fallback serializes it."""
+    timezone, time_range = shape[0], shape[1]
+    _, events = load_events(shape_query(shape), timezone)
+    converted = convert_to_local_time(events, 'static', time_range, timezone)
+    return serialize_events(converted).encode('utf-8')
+
+
+def write_atomic(path: str, data: bytes) -> None:
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), prefix='.static_', suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+    except Exception:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def write_variants(path: str, body: bytes) -> None:
+    """Write a file with its compressed variants; the uncompressed one goes last."""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    write_atomic(path + '.gz', gzip.compress(body, compresslevel=9, mtime=0))
+    if brotli is not None:
+        write_atomic(path + '.br', brotli.compress(body))
+    write_atomic(path, body)
+
+
+def read_manifest(directory: str = STATIC_EVENTS_DIR) -> Optional[Dict]:
+    try:
+        with open(os.path.join(directory, 'manifest.json'), 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
+    except Exception as e:
+        logger.error(f"Error reading static events manifest: {str(e)}")
+        return None
+
+
+def select_shapes(ranked: List[Tuple[Shape, int]], published: List[Shape], top_n: int,
+                  pin_published: bool) -> List[Tuple[Shape, int]]:
+    """The top N shapes, keeping already published shapes in their place.
+
+    Args:
+        ranked: (shape, request count) pairs, most requested first
+        published: Shapes in the current manifest
+        top_n: Number of shapes to publish
+        pin_published: Keep published shapes whatever their rank; otherwise they
+            stay while they rank within the top 2 * top_n
+    """
+    counts = dict(ranked)
+    contenders = {shape for shape, _ in ranked[:2 * top_n]}
+    selected = [shape for shape in published if pin_published or shape in contenders][:top_n]
+    for shape, _ in ranked:
+        if len(selected) >= top_n:
+            break
+        if shape not in selected:
+            selected.append(shape)
+    return [(shape, counts.get(shape, 0)) for shape in selected]
+
+
+def publish_static_events(directory: str = STATIC_EVENTS_DIR, top_n: int = STATIC_EVENTS_TOP_N,
+                          shapes: Optional[List[Tuple[Shape, int]]] = None,
+                          pin_published: Optional[bool] = None) -> Dict:
+    """Write the static files for the most requested shapes and delete the rest.
+
+    Args:
+        directory: Static events directory
+        top_n: Number of shapes to publish
+        shapes: (shape, request count) pairs to publish instead of the counted top N
+        pin_published: Keep the shapes already published (see select_shapes);
+            defaults to on unless nginx hits are counted from STATIC_EVENTS_ACCESS_LOG
+
+    Returns:
+        Manifest of the published shapes
+    """
+    started = time.perf_counter()
+    if shapes is None:
+        manifest = read_manifest(directory) or {'shapes': []}
+        published = [(entry['timezone'], entry['time_range'], tuple(entry['currencies']), tuple(entry['impacts']))
+                     for entry in manifest['shapes']]
+        if pin_published is None:
+            pin_published = not STATIC_EVENTS_ACCESS_LOG
+        shapes = select_shapes(get_query_shape_counter().top(2 * top_n), published, top_n, pin_published)
+    published = []
+    for shape, count in shapes:
+        timezone, time_range, currencies, impacts = shape
+        name = shape_filename(time_range, currencies, impacts)
+        path = os.path.join(directory, *timezone.split('/'), name)
+        try:
+            body = render_shape(shape)
+            write_variants(path, body)
+        except Exception as e:
+            logger.error(f"Error publishing static events {timezone}/{name}: {str(e)}")
+            continue
+        published.append({
+            'path': f"{timezone}/{name}",
+            'timezone': timezone,
+            'time_range': time_range,
+            'currencies': list(currencies),
+            'impacts': list(impacts),
+            'requests': count,
+            'bytes': len(body)
+        })
+
+    # Shapes that are no longer published go, so nginx/IIS sends them to Flask
+    keep = {os.path.join(directory, *entry['path'].split('/')) for entry in published}
+    for root, _, files in os.walk(directory):
+        for file_name in files:
+            path = os.path.join(root, file_name)
+            base = path[:-3] if path.endswith(('.gz', '.br')) else path
+            if base.endswith('.json') and base not in keep and file_name != 'manifest.json':
+                try:
+                    os.remove(path)
+                except OSError as e:
+                    logger.error(f"Error removing static events file {path}: {str(e)}")
+
+    manifest = {
+        'version': event_store['version'],
+        'generated_at': datetime.now(pytz.UTC).isoformat(),
+        'shapes': published
+    }
+    os.makedirs(directory, exist_ok=True)
+    write_atomic(os.path.join(directory, 'manifest.json'), json.dumps(manifest, indent=2).encode('utf-8'))
+    logger.info(f"Published {len(published)} static event files in {time.perf_counter() - started:.2f}s")
+    return manifest
+
+
+def handle_static_events_request(timezone: str, name: str) -> Tuple[Union[Dict, Response], int]:
+    """Handle a static events URL that nginx/IIS didn't have a file for (the long tail)"""
+    try:
+        shape = parse_shape(timezone, name)
+    except ValueError as e:
+        return {'error': str(e)}, 404
+    try:
+        if not STATIC_EVENTS_ACCESS_LOG:
+            get_query_shape_counter().record(shape)  # Otherwise counted from the access log
+        query = shape_query(shape)
+        source, events = load_events(query, timezone)
+        return build_events_response((source,) + query['key'], events, 'static', timezone, shape[1]), 200
+    except ValueError as e:
+        return {'error': str(e)}, 400
+    except Exception as e:
+        logger.exception("Error processing static events request")
+        return {'error': str(e)}, 500
+
+
+class AccessLogReader:
+    """Reads the static events requests appended to an nginx access log since the last read."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._inode = None
+        self._offset = None
+
+    def read(self) -> List[Shape]:
+        """Shapes of the successful static events requests logged since the last call.
+
+        The first call starts at the end of the log, so a restart doesn't count
+        the same lines twice. A rotated or truncated log is read from the start.
+        """
+        shapes = []
+        try:
+            stat = os.stat(self.path)
+        except OSError as e:
+            logger.error(f"Error reading static events access log: {str(e)}")
+            return shapes
+        if self._offset is None:
+            self._inode, self._offset = stat.st_ino, stat.st_size
+            return shapes
+        if stat.st_ino != self._inode or stat.st_size < self._offset:
+            self._inode, self._offset = stat.st_ino, 0
+        with open(self.path, 'rb') as f:
+            f.seek(self._offset)
+            data = f.read()
+        # Leave a partly written last line for the next read
+        end = data.rfind(b'\n') + 1
+        self._offset += end
+        for line in data[:end].decode('utf-8', errors='replace').splitlines():
+            match = ACCESS_LOG_PATTERN.search(line)
+            if not match or match.group(2) not in ('200', '304'):
+                continue
+            timezone, _, name = unquote(match.group(1)).rpartition('/')
+            try:
+                shapes.append(parse_shape(timezone, name))
+            except ValueError:
+                continue
+        return shapes
+
+
+class StaticEventsPublisher:
+    """Republishes the static files after each store and on a timer, in the updater process only."""
+
+    def __init__(self, refresh_seconds: float = STATIC_EVENTS_REFRESH_SECONDS,
+                 access_log: str = STATIC_EVENTS_ACCESS_LOG):
+        self.refresh_seconds = refresh_seconds
+        self.access_log = AccessLogReader(access_log) if access_log else None
+        self._stored = threading.Event()
+        self._thread = None
+        self.last_manifest = None
+
+    def notify(self) -> None:
+        """Called after store_events"""
+        self._stored.set()
+
+    def start(self) -> None:
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(target=self._run, name='static-events-publisher', daemon=True)
+            self._thread.start()
+
+    def _run(self) -> None:
+        while True:
+            self._stored.wait(self.refresh_seconds)
+            self._stored.clear()
+            if not get_updater_lock().is_leader:
+                continue
+            try:
+                if self.access_log is not None:
+                    counter = get_query_shape_counter()
+                    for shape in self.access_log.read():
+                        counter.record(shape)
+                self.last_manifest = publish_static_events()
+            except Exception as e:
+                logger.error(f"Error publishing static events: {str(e)}")
+
+
+_publisher = None
+_lock = threading.Lock()
+
+
+def start_static_events_publisher() -> Optional[StaticEventsPublisher]:
+    """Start republishing static files after each store_events; safe to call more than once."""
+    global _publisher
+    if STATIC_EVENTS_TOP_N <= 0:
+        return None
+    with _lock:
+        if _publisher is None:
+            _publisher = StaticEventsPublisher()
+            add_store_listener(_publisher.notify)
+        _publisher.start()
+        return _publisher
@@ -1,7 +1,7 @@
 import logging
 import secrets
 from datetime import datetime
-from typing import Dict, Tuple
+from typing import Dict, Optional, Tuple
 from flask import jsonify, request, render_template
 import pytz
 from sqlalchemy.exc import IntegrityError
@@ -16,6 +16,12 @@ def generate_verification_token() -> str:
     """Generate a secure verification token."""
     return secrets.token_urlsafe(32)
 
+def find_subscription_by_token(token: str) -> Optional[EmailSubscription]:
+    """Look up a subscription by its verification/unsubscribe token (a unique index lookup)."""
+    return EmailSubscription.query.filter(
+        EmailSubscription.verification_token == token
+    ).first()
+
 def handle_subscription_request() -> Tuple[Dict, int]:
     """Handle new subscription requests."""
     try:
@@ -56,6 +62,7 @@ def handle_subscription_request() -> Tuple[Dict, int]:
             timezone=data.get('timezone', 'UTC'),
             verification_token=generate_verification_token()
         )
+        subscription.set_interests()
         
         db_session.add(subscription)
         db_session.commit()
@@ -85,32 +92,24 @@ def handle_verification_request(token: str) -> Tuple[Dict, int]:
                 error='Invalid verification token format. Please check the link in your email.'
             ), 400
             
-        subscription = EmailSubscription.query.filter_by(
-            verification_token=token,
-            is_verified=False
-        ).first()
+        subscription = find_subscription_by_token(token)
+        
+        if subscription and subscription.is_verified:
+            logger.info(f"Token already verified: {token}")
+            return render_template('verify.html', 
+                success=True,
+                message='Your email is already verified. You are all set to receive updates!'
+            ), 200
         
         if not subscription:
-            # Check if the subscription exists but is already verified
-            already_verified = EmailSubscription.query.filter(
-                EmailSubscription.verification_token == token
-            ).first()
-            
-            if already_verified and already_verified.is_verified:
-                logger.info(f"Token already verified: {token}")
-                return render_template('verify.html', 
-                    success=True,
-                    message='Your email is already verified. You are all set to receive updates!'
-                ), 200
-            
             logger.error(f"Token not found: {token}")
             return render_template('verify.html', 
                 success=False, 
                 error='Invalid or expired verification token. The link may have expired or been used already.'
             ), 400
         
+        # The token is kept: it is also the unsubscribe token in every digest email
         subscription.is_verified = True
-        subscription.verification_token = None
         db_session.commit()
         
         logger.info(f"Successfully verified subscription for: {subscription.email}")
@@ -136,9 +135,7 @@ def handle_unsubscribe_request(token: str) -> Tuple[Dict, int]:
                 error='Invalid unsubscribe token format. Please check the link in your email.'
             ), 400
             
-        subscription = EmailSubscription.query.filter_by(
-            verification_token=token
-        ).first()
+        subscription = find_subscription_by_token(token)
         
         if not subscription:
             logger.error(f"Unsubscribe token not found: {token}")
@@ -148,7 +145,7 @@ def handle_unsubscribe_request(token: str) -> Tuple[Dict, int]:
             ), 400
         
         email = subscription.email  # Save email for logging
-        db_session.delete(subscription)
+        db_session.delete(subscription)  # Its interest rows are deleted with it
         db_session.commit()
         
         logger.info(f"Successfully unsubscribed: {email}")
@@ -65,7 +65,8 @@ def save_user_preferences(user_id: str, preferences: Dict) -> None:
         logger.error(f"Error saving preferences for user {user_id}: {str(e)}")
         raise
 
-def convert_to_local_time(events: List[Dict], user_id: str = 'default', time_range: str = None) -> List[Dict]:
+def convert_to_local_time(events: List[Dict], user_id: str = 'default', time_range: str = None,
+                          user_tz: Optional[str] = None) -> List[Dict]:
     """
     Convert event times from UTC to user's local timezone and sort by local time
     
@@ -73,6 +74,7 @@ def convert_to_local_time(events: List[Dict], user_id: str = 'default', time_ran
         events (List[Dict]): List of events with UTC times in ISO format
         user_id (str): The user identifier
         time_range (str): The time range filter being used (e.g., 'previous_week')
+        user_tz (str): Timezone to convert to, if already known; otherwise the user's preference
         
     Returns:
         List[Dict]: Events with times converted to user's timezone and sorted by time
@@ -81,7 +83,7 @@ def convert_to_local_time(events: List[Dict], user_id: str = 'default', time_ran
         logger.debug("No events to convert")
         return events
 
-    user_tz = get_user_timezone(user_id)
+    user_tz = user_tz or get_user_timezone(user_id)
     logger.info(f"Converting times to timezone: {user_tz} for user: {user_id}, time_range: {time_range}")
     
     # Determine if we should include past events based on time_range
@@ -10,7 +10,8 @@ root_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 sys.path.insert(0, root_dir)
 
 # Now we can import the Flask app from the root directory
-from app import app
+from app import app, start_app
+from backend.wsgi_server import SERVER_HOST, SERVER_PORT, SERVER_REQUEST_QUEUE_SIZE, SERVER_TIMEOUT, WORKER_THREADS
 
 # Configure logging
 logging.basicConfig(
@@ -46,15 +47,19 @@ if __name__ == '__main__':
         # Wrap the application in a logging middleware
         app_with_logging = TransLogger(app, setup_console_handler=True)
         
+        # Warm the event store in the background; the server takes requests right away
+        start_app()
+        
         logger.info('Starting Waitress server in production mode...')
         serve(
             app_with_logging,
-            host='0.0.0.0',
-            port=5000,
+            host=SERVER_HOST,
+            port=SERVER_PORT,
             url_scheme='https',
-            threads=4,
+            threads=WORKER_THREADS,
+            backlog=SERVER_REQUEST_QUEUE_SIZE,
             connection_limit=1000,
-            channel_timeout=30,
+            channel_timeout=SERVER_TIMEOUT,
             cleanup_interval=30,
             ssl_context=create_ssl_context()
         )
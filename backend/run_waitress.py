@@ -2,7 +2,6 @@ import os
 import sys
 import logging
 from logging.handlers import RotatingFileHandler
-from cheroot.wsgi import Server as WSGIServer
 from cheroot.ssl.builtin import BuiltinSSLAdapter
 from paste.translogger import TransLogger
 
@@ -69,7 +68,8 @@ logger.info('='*50)
 try:
     # Import Flask app
     logger.info('Importing Flask application...')
-    from app import app
+    from app import app, start_app
+    from backend.wsgi_server import SERVER_HOST, SERVER_PORT, build_cheroot_server
     
     # Verify CORS configuration - using a safer check
     try:
@@ -131,26 +131,25 @@ if __name__ == '__main__':
         
         # Create and configure the WSGI server
         logger.info('Creating WSGI server...')
-        server = WSGIServer(
-            ('0.0.0.0', 5000),
-            app_with_logging,
-            numthreads=4,
-            request_queue_size=100,
-            timeout=30
-        )
+        server, autoscaler = build_cheroot_server(app_with_logging)
         
         # Set up SSL
         ssl_adapter = create_ssl_adapter()
         if ssl_adapter:
             server.ssl_adapter = ssl_adapter
             logger.info('SSL configured successfully')
-            logger.info('Server will be available at https://0.0.0.0:5000')
+            logger.info(f'Server will be available at https://{SERVER_HOST}:{SERVER_PORT}')
         else:
             logger.error("Failed to configure SSL. Exiting.")
             sys.exit(1)
         
+        # Warm the event store in the background; the server takes requests right away
+        start_app()
+        
         # Start the server
         logger.info('Starting server...')
+        if autoscaler:
+            autoscaler.start()
         server.safe_start()
         
     except Exception as e:
@@ -1,13 +1,15 @@
-import requests
 from datetime import datetime, timedelta
 import pytz
 import logging
 from typing import List, Dict, Optional
 
+from backend.services.http_client import get_http_client
+
 logger = logging.getLogger(__name__)
 
 class ForexFactoryScraper:
     BASE_URL = "https://nfs.faireconomy.media/ff_calendar_thisweek.json"
+    REQUEST_TIMEOUT = 15
     
     def __init__(self):
         self.headers = {
@@ -16,46 +18,49 @@ class ForexFactoryScraper:
         }
     
     def get_calendar_data(self) -> List[Dict]:
-        """Get calendar data from ForexFactory."""
+        """Get calendar data from ForexFactory; returns [] if the feed can't be fetched."""
         try:
-            # Make API request
-            response = requests.get(self.BASE_URL, headers=self.headers)
-            response.raise_for_status()
-            
-            # Parse response
-            data = response.json()
-            
-            # Transform API data to our format
-            events = []
-            for event in data:
-                try:
-                    # Parse event time (data comes in Eastern Time)
-                    event_time = datetime.fromisoformat(event['date'])
-                    
-                    # Create event dictionary
-                    formatted_event = {
-                        'date': event_time.isoformat(),
-                        'country': event['country'],
-                        'impact': event['impact'],
-                        'title': event['title'],
-                        'forecast': event.get('forecast', ''),
-                        'previous': event.get('previous', ''),
-                        'actual': event.get('actual', ''),
-                        'url': ''  # API doesn't provide URLs
-                    }
-                    
-                    events.append(formatted_event)
-                    
-                except Exception as e:
-                    logger.error(f"Error processing event: {str(e)}")
-                    continue
-            
-            logger.info(f"Retrieved {len(events)} events from ForexFactory")
-            return events
-            
+            return self.fetch_calendar_data()
         except Exception as e:
             logger.error(f"Error fetching data from ForexFactory: {str(e)}")
             return []
+
+    def fetch_calendar_data(self) -> List[Dict]:
+        """Get calendar data from ForexFactory, raising if the request fails."""
+        # Make API request
+        response = get_http_client().get(self.BASE_URL, headers=self.headers, timeout=self.REQUEST_TIMEOUT)
+        response.raise_for_status()
+        
+        # Parse response
+        data = response.json()
+        
+        # Transform API data to our format
+        events = []
+        for event in data:
+            try:
+                # Parse event time (data comes in Eastern Time)
+                event_time = datetime.fromisoformat(event['date'])
+                
+                # Create event dictionary
+                formatted_event = {
+                    'date': event_time.isoformat(),
+                    'country': event['country'],
+                    'impact': event['impact'],
+                    'title': event['title'],
+                    'forecast': event.get('forecast', ''),
+                    'previous': event.get('previous', ''),
+                    'actual': event.get('actual', ''),
+                    'url': ''  # API doesn't provide URLs
+                }
+                
+                events.append(formatted_event)
+                
+            except Exception as e:
+                logger.error(f"Error processing event: {str(e)}")
+                continue
+        
+        logger.info(f"Retrieved {len(events)} events from ForexFactory")
+        return events
     
     def get_latest_events(self, days_ahead: int = 7) -> List[Dict]:
         """Get events for this week."""
@@ -3,8 +3,11 @@ import logging
 from typing import Dict, Optional
 from openai import OpenAI
 from datetime import datetime
+from urllib.parse import urlsplit
 from dotenv import load_dotenv
+from backend.services.http_client import get_http_client
 from backend.services.ssl_helper import configure_ssl
+from backend.services.summary_cache import get_summary_cache, summary_fingerprint
 
 # Get the absolute path of the project root
 project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -15,25 +18,51 @@ load_dotenv(env_path, override=True)
 
 logger = logging.getLogger(__name__)
 
+# Completions can take a while; this bounds how long a summary job waits on one
+OPENAI_TIMEOUT_SECONDS = float(os.getenv('OPENAI_TIMEOUT_SECONDS') or '60')
+
 class AISummaryService:
-    def __init__(self, api_key=None):
+    def __init__(self, api_key=None, client=None, base_url=None, cache=None, use_cache=True):
         """Initialize the AI summary service.
         
         Args:
             api_key (str, optional): OpenAI API key. If not provided, will try to get from environment.
+            client (optional): Pre-built OpenAI-compatible client. Useful for pointing the
+                service at a local fake completion server in tests.
+            base_url (str, optional): Override for the OpenAI API base URL. Falls back to
+                the OPENAI_BASE_URL environment variable.
+            cache (SummaryCache, optional): Summary cache to consult before calling the API.
+                Defaults to the shared on-disk cache.
+            use_cache (bool): Set to False to always call the API.
         """
         # Configure SSL for API calls
         configure_ssl()
         
+        self.model = os.getenv('OPENAI_MODEL', 'gpt-4')
+        self.cache = (cache or get_summary_cache()) if use_cache else None
+        
+        if client is not None:
+            self.api_key = api_key
+            self.client = client
+            self.api_host = urlsplit(str(getattr(client, 'base_url', ''))).netloc or 'api.openai.com'
+            return
+        
         # Get API key from environment if not provided
         self.api_key = api_key or os.getenv('OPENAI_API_KEY')
         
         if not self.api_key:
             raise ValueError("OpenAI API key is required. Provide it as an argument or set OPENAI_API_KEY environment variable.")
             
-        # Initialize OpenAI client
+        # Initialize OpenAI client. The SDK's own retries are off: SummaryPipeline
+        # retries with backoff under its rate limit, and would otherwise multiply them
         logger.info(f"Initializing OpenAI client with API key: {self.api_key[:3]}...{self.api_key[-4:]}")
-        self.client = OpenAI(api_key=self.api_key)
+        base_url = base_url or os.getenv('OPENAI_BASE_URL')
+        if base_url:
+            self.client = OpenAI(api_key=self.api_key, base_url=base_url, timeout=OPENAI_TIMEOUT_SECONDS,
+                                 max_retries=0)
+        else:
+            self.client = OpenAI(api_key=self.api_key, timeout=OPENAI_TIMEOUT_SECONDS, max_retries=0)
+        self.api_host = urlsplit(str(self.client.base_url)).netloc
         
     def generate_event_summary(self, event: Dict) -> Optional[str]:
         """Generate an AI summary for a forex event."""
@@ -42,74 +71,105 @@ class AISummaryService:
             if not self.should_generate_summary(event):
                 return None
 
-            # Construct the prompt
-            prompt = f"""
-            Please provide a comprehensive market analysis and prediction for this {event['currency']} forex economic event using smart money concepts and quarterly theory:
-            
-            Event: {event['event_title']}
-            Currency: {event['currency']}
-            Impact Level: {event['impact']}
-            Forecast: {event.get('forecast', 'N/A')}
-            Previous: {event.get('previous', 'N/A')}
-            
-            Please structure your response in these sections:
-            1. Event Context:
-               - Brief explanation of what this event measures and its importance
-               - Historical impact on the {event['currency']}
-               - Typical market reaction patterns
-            
-            2. Technical Analysis:
-               - Key quarterly levels for {event['currency']} pairs
-               - Important SMC (Smart Money Concepts) levels
-               - Potential liquidity areas and institutional interest zones
-               - Order block identification on 4H timeframe
-            
-            3. Scenario Analysis:
-               If Better Than Expected:
-               - Likely price behavior based on quarterly theory
-               - Key SMC resistance levels and breaker blocks
-               - Potential liquidity grabs and stop runs
-               
-               If Worse Than Expected:
-               - Likely price behavior based on quarterly theory
-               - Key SMC support levels and breaker blocks
-               - Potential liquidity grabs and stop runs
-            
-            4. Trading Strategy:
-               - Key entry zones based on order blocks
-               - Risk management using quarterly levels
-               - Best timeframes for execution (focus on 4H)
-               - Correlated pairs to monitor
-            
-            Focus on institutional order flow concepts and quarterly market structure.
-            Identify key SMC levels and potential manipulation zones.
+            # Recurring events with identical inputs reuse an earlier summary
+            cached = self.get_cached_summary(event)
+            if cached:
+                return cached
 
-            Please write your response in one paragraph and make it easy to read and understand, max words of 250-300. Don't put it in a list or bullet points, just write it out.
-            """
-            
-            # Call GPT-4 API
-            response = self.client.chat.completions.create(
-                model="gpt-4",  # Using standard GPT-4 model
-                messages=[
-                    {
-                        "role": "system", 
-                        "content": "You are an expert market analyst specializing in Smart Money Concepts (SMC) and quarterly theory. Your analysis focuses on institutional order flow, market structure, and manipulation concepts like liquidity grabs, breaker blocks, and order blocks. Provide detailed technical analysis with specific price zones and market structure levels."
-                    },
-                    {"role": "user", "content": prompt}
-                ],
-                max_tokens=1000,
-                temperature=0.7
-            )
-            
-            # Extract and return the summary
-            if response.choices and response.choices[0].message:
-                return response.choices[0].message.content.strip()
-            
-            return None
+            return self.request_summary(event)
             
         except Exception as e:
             logger.error(f"Error generating AI summary: {str(e)}")
             return None
+
+    def build_prompt(self, event: Dict) -> str:
+        """Build the analysis prompt for a forex event."""
+        prompt = f"""
+        Please provide a comprehensive market analysis and prediction for this {event['currency']} forex economic event using smart money concepts and quarterly theory:
+        
+        Event: {event['event_title']}
+        Currency: {event['currency']}
+        Impact Level: {event['impact']}
+        Forecast: {event.get('forecast', 'N/A')}
+        Previous: {event.get('previous', 'N/A')}
+        
+        Please structure your response in these sections:
+        1. Event Context:
+           - Brief explanation of what this event measures and its importance
+           - Historical impact on the {event['currency']}
+           - Typical market reaction patterns
+        
+        2. Technical Analysis:
+           - Key quarterly levels for {event['currency']} pairs
+           - Important SMC (Smart Money Concepts) levels
+           - Potential liquidity areas and institutional interest zones
+           - Order block identification on 4H timeframe
+        
+        3. Scenario Analysis:
+           If Better Than Expected:
+           - Likely price behavior based on quarterly theory
+           - Key SMC resistance levels and breaker blocks
+           - Potential liquidity grabs and stop runs
+           
+           If Worse Than Expected:
+           - Likely price behavior based on quarterly theory
+           - Key SMC support levels and breaker blocks
+           - Potential liquidity grabs and stop runs
+        
+        4. Trading Strategy:
+           - Key entry zones based on order blocks
+           - Risk management using quarterly levels
+           - Best timeframes for execution (focus on 4H)
+           - Correlated pairs to monitor
+        
+        Focus on institutional order flow concepts and quarterly market structure.
+        Identify key SMC levels and potential manipulation zones.
+
+        Please write your response in one paragraph and make it easy to read and understand, max words of 250-300. Don't put it in a list or bullet points, just write it out.
+        """
+        return prompt
+
+    def get_cached_summary(self, event: Dict) -> Optional[str]:
+        """Look up a previously generated summary for identical event inputs."""
+        if not self.cache:
+            return None
+        cached = self.cache.get(summary_fingerprint(self.build_prompt(event), self.model))
+        if cached:
+            logger.info(f"Using cached summary for {event.get('currency')} event: {event.get('event_title')}")
+        return cached
+
+    def request_summary(self, event: Dict) -> Optional[str]:
+        """Call the completion API for an event and store the result in the cache.
+
+        Unlike generate_event_summary, the cache is not consulted and API errors are
+        raised to the caller so that batch jobs can decide whether to retry.
+        """
+        prompt = self.build_prompt(event)
+        cache_key = summary_fingerprint(prompt, self.model)
+        
+        # Call GPT-4 API (the SDK pools its own connections; the shared client
+        # adds the latency histogram and circuit breaker)
+        response = get_http_client().call(self.api_host, lambda: self.client.chat.completions.create(
+            model=self.model,
+            messages=[
+                {
+                    "role": "system", 
+                    "content": "You are an expert market analyst specializing in Smart Money Concepts (SMC) and quarterly theory. Your analysis focuses on institutional order flow, market structure, and manipulation concepts like liquidity grabs, breaker blocks, and order blocks. Provide detailed technical analysis with specific price zones and market structure levels."
+                },
+                {"role": "user", "content": prompt}
+            ],
+            max_tokens=1000,
+            temperature=0.7
+        ))
+        
+        # Extract and return the summary
+        if response.choices and response.choices[0].message:
+            summary = response.choices[0].message.content.strip()
+            if self.cache:
+                self.cache.set(cache_key, summary)
+            return summary
+        
+        return None
             
     def should_generate_summary(self, event: Dict) -> bool:
         """Determine if we should generate a summary for this event."""
@@ -0,0 +1,303 @@
+"""
+Read-through cache for database event queries.
+
+The /events database fallback runs the same few queries over and over (24h,
+today, tomorrow, yesterday with a handful of currency/impact filters). Results
+are cached under a normalized key: start and end rounded out to
+QUERY_CACHE_BUCKET_SECONDS, plus the sorted currency and impact filters. Each
+caller gets the cached rows trimmed back to its exact start and end.
+
+Entries live in an in-process LRU and, when USE_REDIS is enabled, in Redis so
+other workers can reuse them. Entries covering a time that ingestion reports as
+changed (see backend.events.change_sets) are dropped, and concurrent misses for
+the same key run a single query.
+"""
+import os
+import json
+import time
+import logging
+import threading
+from collections import OrderedDict
+from datetime import datetime, timedelta
+from typing import Callable, Dict, List, Optional, Tuple
+
+import pytz
+
+from backend.events.change_sets import CHANGE_SET_FILE, change_sets_since, get_change_version
+from backend.services.single_flight import get_single_flight
+
+logger = logging.getLogger(__name__)
+
+# Cache settings, overridable from the environment
+QUERY_CACHE_ENABLED = os.getenv('QUERY_CACHE_ENABLED', 'true').lower() == 'true'
+QUERY_CACHE_TTL_SECONDS = int(os.getenv('QUERY_CACHE_TTL_SECONDS', '300'))
+QUERY_CACHE_MAX_ENTRIES = int(os.getenv('QUERY_CACHE_MAX_ENTRIES', '256'))
+QUERY_CACHE_BUCKET_SECONDS = int(os.getenv('QUERY_CACHE_BUCKET_SECONDS', '60'))
+QUERY_CACHE_SYNC_SECONDS = 1.0  # how often to check for new change sets
+QUERY_CACHE_REDIS_PREFIX = 'events:query'
+REDIS_RETRY_SECONDS = 30  # how long to skip Redis after an error
+
+
+def floor_time(value: datetime, seconds: int) -> datetime:
+    epoch = value.timestamp()
+    return datetime.fromtimestamp(epoch - epoch % seconds, tz=pytz.UTC)
+
+
+def ceil_time(value: datetime, seconds: int) -> datetime:
+    floored = floor_time(value, seconds)
+    return floored if floored.timestamp() == value.timestamp() else floored + timedelta(seconds=seconds)
+
+
+def normalize_query(start_time: datetime, end_time: datetime,
+                    currencies: Optional[List[str]], impact_levels: Optional[List[str]],
+                    bucket_seconds: int = QUERY_CACHE_BUCKET_SECONDS) -> Tuple:
+    """Normalize query parameters so equivalent requests share a cache key.
+
+    The time window is widened to whole buckets, so the query run on a miss
+    uses the bucketed window too.
+
+    Returns:
+        (key, start_time, end_time, currencies, impact_levels)
+    """
+    start = floor_time(start_time, bucket_seconds)
+    end = ceil_time(end_time, bucket_seconds)
+    currencies = sorted({c.strip().upper() for c in currencies or [] if c.strip()}) or None
+    impact_levels = sorted({i.strip().title() for i in impact_levels or [] if i.strip()}) or None
+    key = (
+        start.isoformat(),
+        end.isoformat(),
+        ','.join(currencies or []),
+        ','.join(impact_levels or [])
+    )
+    return key, start, end, currencies, impact_levels
+
+
+def parse_event_time(value: str) -> datetime:
+    event_time = datetime.fromisoformat(value)
+    # The database stores UTC without an offset
+    return event_time if event_time.tzinfo else event_time.replace(tzinfo=pytz.UTC)
+
+
+def trim_to_window(events: List[Dict], start_time: datetime, end_time: datetime) -> List[Dict]:
+    """The events with start_time <= time <= end_time.
+
+    events must be ordered by time (as the database query returns them), so only
+    the rows at either end that fall in the widened bucket are looked at. The list
+    itself is returned when nothing is cut.
+    """
+    if start_time.tzinfo is None:
+        start_time = start_time.replace(tzinfo=pytz.UTC)
+    if end_time.tzinfo is None:
+        end_time = end_time.replace(tzinfo=pytz.UTC)
+    first, last = 0, len(events)
+    while first < last and parse_event_time(events[first]['time']) < start_time:
+        first += 1
+    while last > first and parse_event_time(events[last - 1]['time']) > end_time:
+        last -= 1
+    if first == 0 and last == len(events):
+        return events
+    return events[first:last]
+
+
+class EventQueryCache:
+    """LRU cache of event query results with optional Redis second tier."""
+
+    def __init__(self, ttl_seconds: int = QUERY_CACHE_TTL_SECONDS,
+                 max_entries: int = QUERY_CACHE_MAX_ENTRIES,
+                 bucket_seconds: int = QUERY_CACHE_BUCKET_SECONDS,
+                 redis_client=None,
+                 change_set_path: str = CHANGE_SET_FILE,
+                 sync_interval: float = QUERY_CACHE_SYNC_SECONDS):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max(1, max_entries)
+        self.bucket_seconds = bucket_seconds
+        self.redis = redis_client
+        self.change_set_path = change_set_path
+        self.sync_interval = sync_interval
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._flight = get_single_flight('db_query')
+        self._version = get_change_version(change_set_path)
+        self._last_sync = time.monotonic()
+        self._redis_disabled_until = 0.0
+        self._metrics = {'hits': 0, 'misses': 0, 'redis_hits': 0, 'loads': 0, 'invalidated': 0}
+
+    def get_or_load(self, start_time: datetime, end_time: datetime,
+                    currencies: Optional[List[str]], impact_levels: Optional[List[str]],
+                    loader: Callable[..., List[Dict]], columns: Optional[tuple] = None) -> List[Dict]:
+        """Return cached events for the query, running loader on a miss.
+
+        If columns is given it is passed on to the loader and is part of the key;
+        it must include 'time'. The returned list may be shared between callers
+        and must not be modified.
+        """
+        self.sync_changes()
+        key, start, end, currencies, impact_levels = normalize_query(
+            start_time, end_time, currencies, impact_levels, self.bucket_seconds
+        )
+        extra = {}
+        if columns is not None:
+            key = key + (','.join(columns),)
+            extra['columns'] = columns
+
+        events = self._get_local(key)
+        if events is not None:
+            return trim_to_window(events, start_time, end_time)
+
+        def load():
+            # Another caller may have filled the entry while we waited for the lock
+            events = self._get_local(key, count=False)
+            if events is not None:
+                return events
+            version = self._version
+            events = self._get_redis(key, version)
+            if events is None:
+                events = loader(start_time=start, end_time=end, currencies=currencies,
+                                impact_levels=impact_levels, **extra)
+                with self._lock:
+                    self._metrics['loads'] += 1
+                self._set_redis(key, version, events)
+            # Don't keep a result that a change published during the query may have made stale
+            if self._version == version:
+                self._set_local(key, start, end, events)
+            return events
+
+        return trim_to_window(self._flight.do(key, load), start_time, end_time)
+
+    def _get_local(self, key: Tuple, count: bool = True) -> Optional[List[Dict]]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry['expires_at'] <= time.monotonic():
+                del self._entries[key]
+                entry = None
+            if entry is None:
+                if count:
+                    self._metrics['misses'] += 1
+                return None
+            self._entries.move_to_end(key)
+            if count:
+                self._metrics['hits'] += 1
+            return entry['events']
+
+    def _set_local(self, key: Tuple, start: datetime, end: datetime, events: List[Dict]) -> None:
+        with self._lock:
+            self._entries[key] = {
+                'start': start,
+                'end': end,
+                'events': events,
+                'expires_at': time.monotonic() + self.ttl_seconds
+            }
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def _redis_key(self, key: Tuple, version: int) -> str:
+        # The change version is part of the key, so entries written before a
+        # change are never read after it and simply expire
+        return f"{QUERY_CACHE_REDIS_PREFIX}:v{version}:" + '|'.join(key)
+
+    def _redis_available(self) -> bool:
+        return self.redis is not None and time.monotonic() >= self._redis_disabled_until
+
+    def _redis_error(self, error: Exception) -> None:
+        logger.warning(f"Redis query cache unavailable, using local cache only: {str(error)}")
+        self._redis_disabled_until = time.monotonic() + REDIS_RETRY_SECONDS
+
+    def _get_redis(self, key: Tuple, version: int) -> Optional[List[Dict]]:
+        if not self._redis_available():
+            return None
+        try:
+            data = self.redis.get(self._redis_key(key, version))
+        except Exception as e:
+            self._redis_error(e)
+            return None
+        if data is None:
+            return None
+        with self._lock:
+            self._metrics['redis_hits'] += 1
+        return json.loads(data)
+
+    def _set_redis(self, key: Tuple, version: int, events: List[Dict]) -> None:
+        if not self._redis_available():
+            return
+        try:
+            self.redis.set(self._redis_key(key, version), json.dumps(events), ex=self.ttl_seconds)
+        except Exception as e:
+            self._redis_error(e)
+
+    def sync_changes(self, force: bool = False) -> None:
+        """Drop entries affected by change sets published since the last check."""
+        now = time.monotonic()
+        if not force and now - self._last_sync < self.sync_interval:
+            return
+        self._last_sync = now
+
+        version, change_sets = change_sets_since(self._version, self.change_set_path)
+        if version == self._version:
+            return
+        if change_sets is None:
+            # Too far behind to know what changed
+            self.invalidate()
+        else:
+            for change_set in change_sets:
+                self.invalidate(
+                    datetime.fromisoformat(change_set['start']),
+                    datetime.fromisoformat(change_set['end'])
+                )
+        self._version = version
+
+    def invalidate(self, start: Optional[datetime] = None, end: Optional[datetime] = None) -> int:
+        """Drop entries whose window overlaps [start, end], or all entries if no range is given."""
+        with self._lock:
+            if start is None or end is None:
+                stale = list(self._entries)
+            else:
+                stale = [key for key, entry in self._entries.items()
+                         if entry['start'] <= end and entry['end'] >= start]
+            for key in stale:
+                del self._entries[key]
+            self._metrics['invalidated'] += len(stale)
+        if stale:
+            logger.info(f"Invalidated {len(stale)} cached event queries")
+        return len(stale)
+
+    def stats(self) -> Dict:
+        with self._lock:
+            metrics = dict(self._metrics)
+            metrics['size'] = len(self._entries)
+        metrics['version'] = self._version
+        lookups = metrics['hits'] + metrics['misses']
+        metrics['hit_rate'] = round(metrics['hits'] / lookups, 4) if lookups else 0.0
+        return metrics
+
+
+def create_redis_client():
+    """Redis client for the shared cache tier if USE_REDIS is enabled, else None."""
+    if os.getenv('USE_REDIS', 'false').lower() != 'true':
+        return None
+    try:
+        import redis
+        return redis.Redis(
+            host=os.getenv('REDIS_HOST', 'localhost'),
+            port=int(os.getenv('REDIS_PORT', 6379)),
+            db=0,
+            socket_timeout=0.5,
+            socket_connect_timeout=0.5
+        )
+    except Exception as e:
+        logger.warning(f"Redis not available for the query cache: {str(e)}")
+        return None
+
+
+_event_query_cache = None
+_event_query_cache_lock = threading.Lock()
+
+
+def get_event_query_cache() -> EventQueryCache:
+    """Return the process-wide event query cache."""
+    global _event_query_cache
+    if _event_query_cache is None:
+        with _event_query_cache_lock:
+            if _event_query_cache is None:
+                _event_query_cache = EventQueryCache(redis_client=create_redis_client())
+    return _event_query_cache
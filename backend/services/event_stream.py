@@ -0,0 +1,427 @@
+"""
+Server-Sent Events push channel for live calendar updates.
+
+Instead of polling /events and /cache/status for the hourly refresh, clients
+keep an EventSource open and are sent:
+
+- ``snapshot``: the event store moved to a new snapshot version
+- ``diff``: what ingestion changed (inserted and removed events, and updated
+  events with their old and new actual/forecast/previous/impact values)
+- ``resync``: the client fell behind and should reload /events
+
+Every message goes through an EventStreamHub, which formats it once and puts it
+on each subscriber's bounded queue. A subscriber that stops reading never
+blocks the publisher: when its queue is full the backlog is dropped and
+replaced by a single resync message.
+
+Subscribers are served in one of two ways:
+
+- SSEServer, a dedicated single-thread selector loop on SSE_PORT, holds any
+  number of clients without using WSGI threads (recommended)
+- /events/stream on the main app, which holds one WSGI thread per client and
+  is therefore capped at SSE_MAX_WSGI_CLIENTS, always below WORKER_THREADS
+"""
+import os
+import json
+import time
+import queue
+import socket
+import logging
+import selectors
+import threading
+from typing import Any, Callable, Dict, Optional
+
+from backend.wsgi_server import WORKER_THREADS
+
+logger = logging.getLogger(__name__)
+
+# Push channel settings, overridable from the environment
+SSE_QUEUE_SIZE = int(os.getenv('SSE_QUEUE_SIZE') or '100')
+SSE_HEARTBEAT_SECONDS = float(os.getenv('SSE_HEARTBEAT_SECONDS') or '15')
+# Each /events/stream client holds a request thread, so at least two threads
+# (WORKER_THREADS is gunicorn's count and cheroot's starting count) are always
+# left for everything else, whatever SSE_MAX_WSGI_CLIENTS asks for
+SSE_MAX_WSGI_CLIENTS = max(0, min(int(os.getenv('SSE_MAX_WSGI_CLIENTS') or WORKER_THREADS - 2),
+                                  WORKER_THREADS - 2))
+SSE_HOST = os.getenv('SSE_HOST') or '0.0.0.0'
+SSE_PORT = int(os.getenv('SSE_PORT') or '0')  # 0 disables the dedicated server
+SSE_CLIENT_BUFFER_BYTES = int(os.getenv('SSE_CLIENT_BUFFER_BYTES') or str(1024 * 1024))
+SSE_POLL_SECONDS = float(os.getenv('SSE_POLL_SECONDS') or '1.0')
+
+SSE_PATH = '/events/stream'
+HEARTBEAT = b': keepalive\n\n'
+RETRY_MS = 5000  # reconnect delay suggested to EventSource clients
+
+
+def format_sse(event_type: str, data: Any, event_id: Optional[int] = None) -> bytes:
+    """Encode one Server-Sent Events message."""
+    lines = []
+    if event_id is not None:
+        lines.append(f"id: {event_id}")
+    lines.append(f"event: {event_type}")
+    lines.append(f"data: {json.dumps(data, separators=(',', ':'), default=str)}")
+    return ('\n'.join(lines) + '\n\n').encode('utf-8')
+
+
+class Subscription:
+    """One subscriber's bounded message queue."""
+
+    def __init__(self, hub: 'EventStreamHub', kind: str, maxsize: int,
+                 notify: Optional[Callable[[], None]] = None):
+        self.hub = hub
+        self.kind = kind
+        self.queue = queue.Queue(maxsize)
+        self.notify = notify
+        self.overflows = 0
+
+    def get(self, timeout: Optional[float] = None) -> Optional[bytes]:
+        """Next message, or None if none arrived within timeout."""
+        try:
+            return self.queue.get(timeout=timeout)
+        except queue.Empty:
+            return None
+
+    def get_nowait(self) -> Optional[bytes]:
+        try:
+            return self.queue.get_nowait()
+        except queue.Empty:
+            return None
+
+    def close(self) -> None:
+        self.hub.unsubscribe(self)
+
+
+class EventStreamHub:
+    """Fan messages out to subscribers through bounded queues."""
+
+    def __init__(self, queue_size: int = SSE_QUEUE_SIZE, poll_seconds: float = SSE_POLL_SECONDS):
+        self.queue_size = max(2, queue_size)
+        self.poll_seconds = poll_seconds
+        self._subscriptions = set()
+        self._lock = threading.Lock()
+        self._poller = None
+        self._poll_thread = None
+        self.last_snapshot = None  # most recent snapshot message, sent to new subscribers
+        self.last_event_id = None
+        self._metrics = {'published': 0, 'delivered': 0, 'overflows': 0, 'subscribed': 0}
+
+    def set_poller(self, poll: Callable[[], Any]) -> None:
+        """Callable run every poll_seconds while anyone is subscribed.
+
+        Workers that don't run the updater use it to pick up snapshots published
+        by the one that does (adopting one publishes through the hub).
+        """
+        self._poller = poll
+
+    def subscribe(self, kind: str = 'wsgi', notify: Optional[Callable[[], None]] = None,
+                  limit: Optional[int] = None) -> Optional[Subscription]:
+        """Add a subscriber, or return None if limit subscribers of this kind already exist."""
+        subscription = Subscription(self, kind, self.queue_size, notify)
+        with self._lock:
+            if limit is not None and sum(1 for s in self._subscriptions if s.kind == kind) >= limit:
+                return None
+            self._subscriptions.add(subscription)
+            self._metrics['subscribed'] += 1
+            if self.last_snapshot is not None:
+                subscription.queue.put_nowait(self.last_snapshot)
+            if self._poller is not None and (self._poll_thread is None or not self._poll_thread.is_alive()):
+                self._poll_thread = threading.Thread(target=self._poll_loop, name='event-stream-poller',
+                                                     daemon=True)
+                self._poll_thread.start()
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        with self._lock:
+            self._subscriptions.discard(subscription)
+
+    def subscriber_count(self, kind: Optional[str] = None) -> int:
+        with self._lock:
+            return sum(1 for s in self._subscriptions if kind is None or s.kind == kind)
+
+    def publish(self, event_type: str, data: Any, event_id: Optional[int] = None) -> int:
+        """Queue a message for every subscriber.
+
+        Returns:
+            Number of subscribers it was queued for
+        """
+        message = format_sse(event_type, data, event_id)
+        with self._lock:
+            if event_type == 'snapshot':
+                self.last_snapshot = message
+            if event_id is not None:
+                self.last_event_id = event_id
+            subscriptions = list(self._subscriptions)
+            self._metrics['published'] += 1
+
+        overflows = 0
+        for subscription in subscriptions:
+            try:
+                subscription.queue.put_nowait(message)
+            except queue.Full:
+                # Drop the backlog; the client reloads instead of replaying it
+                while subscription.get_nowait() is not None:
+                    pass
+                subscription.queue.put_nowait(format_sse('resync', {'version': event_id}, event_id))
+                subscription.overflows += 1
+                overflows += 1
+            if subscription.notify:
+                subscription.notify()
+
+        with self._lock:
+            self._metrics['delivered'] += len(subscriptions)
+            self._metrics['overflows'] += overflows
+        return len(subscriptions)
+
+    def _poll_loop(self) -> None:
+        while self.subscriber_count():
+            try:
+                self._poller()
+            except Exception as e:
+                logger.error(f"Error checking for new event snapshots: {str(e)}")
+            time.sleep(self.poll_seconds)
+
+    def stats(self) -> Dict:
+        with self._lock:
+            metrics = dict(self._metrics)
+            kinds = {}
+            for subscription in self._subscriptions:
+                kinds[subscription.kind] = kinds.get(subscription.kind, 0) + 1
+        metrics['subscribers'] = kinds
+        metrics['last_event_id'] = self.last_event_id
+        return metrics
+
+
+class _Client:
+    __slots__ = ('sock', 'request', 'out', 'streaming')
+
+    def __init__(self, sock: socket.socket):
+        self.sock = sock
+        self.request = b''
+        self.out = bytearray()
+        self.streaming = False
+
+
+class SSEServer:
+    """Dedicated Server-Sent Events server: one thread, any number of clients.
+
+    Accepts ``GET /events/stream`` and then only writes; every client is a
+    non-blocking socket with an output buffer. Clients whose buffer grows past
+    buffer_bytes (they stopped reading) are disconnected.
+    """
+
+    def __init__(self, hub: EventStreamHub, host: str = SSE_HOST, port: int = SSE_PORT,
+                 buffer_bytes: int = SSE_CLIENT_BUFFER_BYTES,
+                 heartbeat_seconds: float = SSE_HEARTBEAT_SECONDS):
+        self.hub = hub
+        self.buffer_bytes = buffer_bytes
+        self.heartbeat_seconds = heartbeat_seconds
+        self._selector = selectors.DefaultSelector()
+        self._clients = {}
+        self._running = False
+        self._thread = None
+
+        self._listener = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self._listener.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        if hasattr(socket, 'SO_REUSEPORT'):
+            # Every worker process can serve the same port
+            self._listener.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEPORT, 1)
+        self._listener.bind((host, port))
+        self._listener.listen(128)
+        self._listener.setblocking(False)
+        self.port = self._listener.getsockname()[1]
+
+        # Publishing threads wake the loop through this pair
+        self._wake_read, self._wake_write = socket.socketpair()
+        self._wake_read.setblocking(False)
+        self._wake_write.setblocking(False)
+        self._subscription = hub.subscribe(kind='sse_server', notify=self._wake)
+
+    def _wake(self) -> None:
+        try:
+            self._wake_write.send(b'\0')
+        except (BlockingIOError, OSError):
+            pass
+
+    def start(self) -> threading.Thread:
+        self._running = True
+        self._selector.register(self._listener, selectors.EVENT_READ, 'accept')
+        self._selector.register(self._wake_read, selectors.EVENT_READ, 'wake')
+        self._thread = threading.Thread(target=self._run, name='sse-server', daemon=True)
+        self._thread.start()
+        logger.info(f"SSE server listening on port {self.port}")
+        return self._thread
+
+    def stop(self) -> None:
+        self._running = False
+        self._wake()
+        if self._thread:
+            self._thread.join(timeout=5)
+        self._subscription.close()
+
+    def client_count(self) -> int:
+        return sum(1 for client in list(self._clients.values()) if client.streaming)
+
+    def _run(self) -> None:
+        next_heartbeat = time.monotonic() + self.heartbeat_seconds
+        try:
+            while self._running:
+                timeout = max(0.0, next_heartbeat - time.monotonic())
+                for key, mask in self._selector.select(timeout):
+                    if key.data == 'accept':
+                        self._accept()
+                    elif key.data == 'wake':
+                        self._drain_wake()
+                    else:
+                        client = key.data
+                        if mask & selectors.EVENT_READ:
+                            self._read(client)
+                        if mask & selectors.EVENT_WRITE and client.sock in self._clients:
+                            self._flush(client)
+
+                self._broadcast_pending()
+                if time.monotonic() >= next_heartbeat:
+                    self._broadcast(HEARTBEAT)
+                    next_heartbeat = time.monotonic() + self.heartbeat_seconds
+        finally:
+            for client in list(self._clients.values()):
+                self._close(client)
+            self._selector.close()
+            self._listener.close()
+            self._wake_read.close()
+            self._wake_write.close()
+
+    def _accept(self) -> None:
+        try:
+            sock, _ = self._listener.accept()
+        except (BlockingIOError, OSError):
+            return
+        sock.setblocking(False)
+        client = _Client(sock)
+        self._clients[sock] = client
+        self._selector.register(sock, selectors.EVENT_READ, client)
+
+    def _drain_wake(self) -> None:
+        try:
+            while self._wake_read.recv(4096):
+                pass
+        except (BlockingIOError, OSError):
+            pass
+
+    def _read(self, client: _Client) -> None:
+        try:
+            data = client.sock.recv(4096)
+        except (BlockingIOError, InterruptedError):
+            return
+        except OSError:
+            data = b''
+        if not data:
+            self._close(client)
+            return
+        if client.streaming:
+            return  # Nothing more is expected from an EventSource
+        client.request += data
+        if b'\r\n\r\n' not in client.request:
+            if len(client.request) > 8192:
+                self._close(client)
+            return
+
+        request_line = client.request.split(b'\r\n', 1)[0].decode('latin-1').split()
+        path = request_line[1].split('?', 1)[0] if len(request_line) >= 2 else ''
+        if len(request_line) < 2 or request_line[0] != 'GET' or path != SSE_PATH:
+            client.out += (b'HTTP/1.1 404 Not Found\r\nContent-Length: 0\r\nConnection: close\r\n\r\n')
+            self._flush(client)
+            self._close(client)
+            return
+
+        client.streaming = True
+        client.out += (
+            b'HTTP/1.1 200 OK\r\n'
+            b'Content-Type: text/event-stream\r\n'
+            b'Cache-Control: no-cache\r\n'
+            b'Connection: keep-alive\r\n'
+            b'Access-Control-Allow-Origin: *\r\n'
+            b'X-Accel-Buffering: no\r\n\r\n'
+            + f"retry: {RETRY_MS}\n\n".encode()
+        )
+        if self.hub.last_snapshot is not None:
+            client.out += self.hub.last_snapshot
+        self._flush(client)
+
+    def _broadcast_pending(self) -> None:
+        while True:
+            message = self._subscription.get_nowait()
+            if message is None:
+                return
+            self._broadcast(message)
+
+    def _broadcast(self, message: bytes) -> None:
+        for client in list(self._clients.values()):
+            if not client.streaming:
+                continue
+            client.out += message
+            if len(client.out) > self.buffer_bytes:
+                logger.warning("Disconnecting SSE client that stopped reading")
+                self._close(client)
+                continue
+            self._flush(client)
+
+    def _flush(self, client: _Client) -> None:
+        if client.out:
+            try:
+                sent = client.sock.send(client.out)
+                del client.out[:sent]
+            except (BlockingIOError, InterruptedError):
+                pass
+            except OSError:
+                self._close(client)
+                return
+        events = selectors.EVENT_READ | (selectors.EVENT_WRITE if client.out else 0)
+        try:
+            self._selector.modify(client.sock, events, client)
+        except (KeyError, ValueError):
+            pass
+
+    def _close(self, client: _Client) -> None:
+        self._clients.pop(client.sock, None)
+        try:
+            self._selector.unregister(client.sock)
+        except (KeyError, ValueError):
+            pass
+        try:
+            client.sock.close()
+        except OSError:
+            pass
+
+
+_hub = None
+_hub_lock = threading.Lock()
+_server = None
+
+
+def get_event_stream_hub() -> EventStreamHub:
+    """Return the process-wide event stream hub."""
+    global _hub
+    with _hub_lock:
+        if _hub is None:
+            _hub = EventStreamHub()
+        return _hub
+
+
+def start_sse_server() -> Optional[SSEServer]:
+    """Start the dedicated SSE server if SSE_PORT is set; safe to call more than once."""
+    global _server
+    if not SSE_PORT:
+        return None
+    with _hub_lock:
+        if _server is None:
+            try:
+                _server = SSEServer(get_event_stream_hub())
+                _server.start()
+            except OSError as e:
+                logger.error(f"Could not start SSE server on port {SSE_PORT}: {str(e)}")
+                return None
+        return _server
+
+
+def get_sse_server() -> Optional[SSEServer]:
+    return _server
@@ -0,0 +1,239 @@
+"""
+Shared outbound HTTP client.
+
+Every call this app makes to another service (PayPal, ForexFactory, ipify,
+the OpenAI API) goes through one place, which gives each host:
+
+- a keep-alive connection pool (one requests.Session, one urllib3 pool per host)
+- default connect/read timeouts, so no call can hang a worker indefinitely
+- retries with backoff for idempotent requests on connection errors and 429/5xx
+- a latency histogram and error counts, reported by stats()
+- a circuit breaker: after HTTP_CIRCUIT_FAILURES consecutive failures, calls to
+  that host fail fast with CircuitOpenError for HTTP_CIRCUIT_RESET_SECONDS
+  before a single trial call is let through
+"""
+import os
+import time
+import logging
+import threading
+from typing import Any, Callable, Dict, Optional
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+logger = logging.getLogger(__name__)
+
+# Client settings, overridable from the environment
+HTTP_CONNECT_TIMEOUT = float(os.getenv('HTTP_CONNECT_TIMEOUT') or '5')
+HTTP_READ_TIMEOUT = float(os.getenv('HTTP_READ_TIMEOUT') or '15')
+HTTP_POOL_MAXSIZE = int(os.getenv('HTTP_POOL_MAXSIZE') or '10')
+HTTP_RETRIES = int(os.getenv('HTTP_RETRIES') or '2')
+HTTP_RETRY_BACKOFF = float(os.getenv('HTTP_RETRY_BACKOFF') or '0.5')
+HTTP_CIRCUIT_FAILURES = int(os.getenv('HTTP_CIRCUIT_FAILURES') or '5')
+HTTP_CIRCUIT_RESET_SECONDS = float(os.getenv('HTTP_CIRCUIT_RESET_SECONDS') or '30')
+
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+LATENCY_BUCKETS_MS = (10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+
+
+class CircuitOpenError(requests.ConnectionError):
+    """Raised instead of calling a host whose circuit breaker is open."""
+
+
+class CircuitBreaker:
+    """Consecutive-failure circuit breaker for one host."""
+
+    def __init__(self, failure_threshold: int = HTTP_CIRCUIT_FAILURES,
+                 reset_seconds: float = HTTP_CIRCUIT_RESET_SECONDS):
+        self.failure_threshold = failure_threshold
+        self.reset_seconds = reset_seconds
+        self.state = 'closed'  # possible values: closed, open, half_open
+        self.failures = 0
+        self.opened_at = None
+        self._lock = threading.Lock()
+
+    def allow(self) -> bool:
+        """Whether a call may go ahead now."""
+        with self._lock:
+            if self.state == 'closed':
+                return True
+            if self.state == 'open' and time.monotonic() - self.opened_at >= self.reset_seconds:
+                # Let one trial call through
+                self.state = 'half_open'
+                return True
+            return False
+
+    def record_success(self) -> None:
+        with self._lock:
+            self.state = 'closed'
+            self.failures = 0
+            self.opened_at = None
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self.failures += 1
+            if self.state == 'half_open' or self.failures >= self.failure_threshold:
+                self.state = 'open'
+                self.opened_at = time.monotonic()
+
+
+class LatencyHistogram:
+    """Cumulative latency histogram with fixed millisecond buckets."""
+
+    def __init__(self, buckets=LATENCY_BUCKETS_MS):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.count = 0
+        self.total_ms = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, value_ms: float) -> None:
+        index = next((i for i, bound in enumerate(self.buckets) if value_ms <= bound), len(self.buckets))
+        with self._lock:
+            self.counts[index] += 1
+            self.count += 1
+            self.total_ms += value_ms
+
+    def quantile(self, fraction: float) -> Optional[float]:
+        """Upper bound of the bucket holding the given quantile (None for the overflow bucket)."""
+        with self._lock:
+            if not self.count:
+                return None
+            target = fraction * self.count
+            seen = 0
+            for i, count in enumerate(self.counts):
+                seen += count
+                if seen >= target:
+                    return self.buckets[i] if i < len(self.buckets) else None
+        return None
+
+    def snapshot(self) -> Dict:
+        with self._lock:
+            buckets = {f"le_{bound}": count for bound, count in zip(self.buckets, self.counts)}
+            buckets['inf'] = self.counts[-1]
+            count, total = self.count, self.total_ms
+        return {
+            'count': count,
+            'mean_ms': round(total / count, 2) if count else None,
+            'p50_ms': self.quantile(0.50),
+            'p95_ms': self.quantile(0.95),
+            'buckets': buckets
+        }
+
+
+class _HostStats:
+    def __init__(self):
+        self.breaker = CircuitBreaker()
+        self.latency = LatencyHistogram()
+        self.errors = 0
+        self.rejected = 0
+
+
+class HttpClient:
+    """Pooled, instrumented HTTP client shared by all outbound calls."""
+
+    def __init__(self, connect_timeout: float = HTTP_CONNECT_TIMEOUT,
+                 read_timeout: float = HTTP_READ_TIMEOUT,
+                 pool_maxsize: int = HTTP_POOL_MAXSIZE,
+                 retries: int = HTTP_RETRIES,
+                 retry_backoff: float = HTTP_RETRY_BACKOFF):
+        self.timeout = (connect_timeout, read_timeout)
+        retry = Retry(
+            total=retries,
+            connect=retries,
+            read=retries,
+            status=retries,
+            backoff_factor=retry_backoff,
+            status_forcelist=RETRY_STATUSES,
+            allowed_methods=frozenset(['GET', 'HEAD', 'OPTIONS']),
+            respect_retry_after_header=True,
+            raise_on_status=False
+        )
+        adapter = HTTPAdapter(pool_connections=10, pool_maxsize=pool_maxsize, max_retries=retry)
+        self.session = requests.Session()
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+        self._hosts = {}
+        self._lock = threading.Lock()
+
+    def _host_stats(self, host: str) -> _HostStats:
+        with self._lock:
+            stats = self._hosts.get(host)
+            if stats is None:
+                stats = self._hosts[host] = _HostStats()
+            return stats
+
+    def call(self, host: str, func: Callable[[], Any], is_failure: Callable[[Any], bool] = None) -> Any:
+        """Run an outbound call to host under its circuit breaker and latency histogram.
+
+        Used directly for clients that manage their own connections (the OpenAI SDK).
+
+        Raises:
+            CircuitOpenError: if the host's breaker is open
+        """
+        stats = self._host_stats(host)
+        if not stats.breaker.allow():
+            stats.rejected += 1
+            raise CircuitOpenError(f"Circuit open for {host}, not calling it")
+
+        started = time.perf_counter()
+        try:
+            result = func()
+        except Exception:
+            stats.errors += 1
+            stats.breaker.record_failure()
+            raise
+        finally:
+            stats.latency.observe((time.perf_counter() - started) * 1000)
+
+        if is_failure is not None and is_failure(result):
+            stats.errors += 1
+            stats.breaker.record_failure()
+        else:
+            stats.breaker.record_success()
+        return result
+
+    def request(self, method: str, url: str, **kwargs) -> requests.Response:
+        """Send a request with the default timeouts; server errors count against the breaker."""
+        kwargs.setdefault('timeout', self.timeout)
+        host = urlsplit(url).netloc
+        return self.call(
+            host,
+            lambda: self.session.request(method, url, **kwargs),
+            is_failure=lambda response: response.status_code >= 500
+        )
+
+    def get(self, url: str, **kwargs) -> requests.Response:
+        return self.request('GET', url, **kwargs)
+
+    def post(self, url: str, **kwargs) -> requests.Response:
+        return self.request('POST', url, **kwargs)
+
+    def stats(self) -> Dict[str, Dict]:
+        """Latency, errors and breaker state per host."""
+        with self._lock:
+            hosts = dict(self._hosts)
+        return {
+            host: {
+                'latency': stats.latency.snapshot(),
+                'errors': stats.errors,
+                'rejected': stats.rejected,
+                'circuit': stats.breaker.state
+            }
+            for host, stats in hosts.items()
+        }
+
+
+_http_client = None
+_http_client_lock = threading.Lock()
+
+
+def get_http_client() -> HttpClient:
+    """Return the process-wide outbound HTTP client."""
+    global _http_client
+    with _http_client_lock:
+        if _http_client is None:
+            _http_client = HttpClient()
+        return _http_client
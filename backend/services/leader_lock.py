@@ -0,0 +1,119 @@
+"""
+File-lock leader election between worker processes.
+
+Only one worker should run the background event updater. Each process tries
+to take a non-blocking exclusive lock on a shared lock file; the one that
+gets it is the leader and holds the lock until it exits. The OS drops the
+lock when the leader dies, so a follower that retries later takes over.
+"""
+import os
+import logging
+import threading
+from typing import Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+# Get the absolute path of the project root
+project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+UPDATER_LOCK_FILE = os.getenv('UPDATER_LOCK_FILE') or os.path.join(project_root, 'cache', 'event_updater.lock')
+UPDATER_FOLLOWER_POLL_SECONDS = int(os.getenv('UPDATER_FOLLOWER_POLL_SECONDS') or '60')
+
+if os.name == 'nt':
+    import msvcrt
+
+    def _lock(fd: int) -> None:
+        os.lseek(fd, 0, os.SEEK_SET)
+        msvcrt.locking(fd, msvcrt.LK_NBLCK, 1)
+
+    def _unlock(fd: int) -> None:
+        os.lseek(fd, 0, os.SEEK_SET)
+        msvcrt.locking(fd, msvcrt.LK_UNLCK, 1)
+else:
+    import fcntl
+
+    def _lock(fd: int) -> None:
+        fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+
+    def _unlock(fd: int) -> None:
+        fcntl.flock(fd, fcntl.LOCK_UN)
+
+
+class LeaderLock:
+    """Non-blocking exclusive lock on a file, held while this process leads."""
+
+    def __init__(self, path: str = UPDATER_LOCK_FILE):
+        self.path = path
+        self._fd = None
+        self._lock = threading.Lock()
+
+    @property
+    def is_leader(self) -> bool:
+        return self._fd is not None
+
+    def try_acquire(self) -> bool:
+        """Become the leader if no other process holds the lock.
+
+        Returns:
+            True if this process is (or already was) the leader
+        """
+        with self._lock:
+            if self._fd is not None:
+                return True
+            fd = None
+            try:
+                os.makedirs(os.path.dirname(self.path), exist_ok=True)
+                fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+                _lock(fd)
+            except OSError:
+                if fd is not None:
+                    os.close(fd)
+                return False
+
+            # Record who holds the lock, for diagnosing a stuck leader
+            os.ftruncate(fd, 0)
+            os.lseek(fd, 0, os.SEEK_SET)
+            os.write(fd, str(os.getpid()).encode())
+            self._fd = fd
+            logger.info(f"Process {os.getpid()} is now the leader for {self.path}")
+            return True
+
+    def release(self) -> None:
+        with self._lock:
+            if self._fd is None:
+                return
+            try:
+                _unlock(self._fd)
+            except OSError as e:
+                logger.warning(f"Error releasing leader lock: {str(e)}")
+            os.close(self._fd)
+            self._fd = None
+            logger.info(f"Process {os.getpid()} released leadership of {self.path}")
+
+    def leader_pid(self) -> Optional[int]:
+        """PID written by the current leader, if any."""
+        try:
+            with open(self.path, 'r') as f:
+                return int(f.read().strip() or 0) or None
+        except (OSError, ValueError):
+            return None
+
+    def status(self) -> Dict:
+        return {
+            'is_leader': self.is_leader,
+            'leader_pid': os.getpid() if self.is_leader else self.leader_pid(),
+            'lock_file': self.path
+        }
+
+
+_updater_lock = None
+_updater_lock_guard = threading.Lock()
+
+
+def get_updater_lock() -> LeaderLock:
+    """Return the process-wide lock that decides which worker runs the event updater."""
+    global _updater_lock
+    with _updater_lock_guard:
+        if _updater_lock is None:
+            _updater_lock = LeaderLock()
+        return _updater_lock
@@ -0,0 +1,123 @@
+"""
+PayPal Orders API client.
+
+Requests authenticate with an OAuth access token fetched from
+/v1/oauth2/token with the client credentials. The token is cached until shortly
+before it expires instead of sending the client secret with every call, and is
+fetched again if PayPal rejects it early.
+
+Order calls send a PayPal-Request-Id, so PayPal treats a repeated call with the
+same id as the same request: a new id per created order, and one derived from
+the order id for its capture. That makes it safe to send a call again after a
+timeout, where the first attempt may already have gone through. Captures get a
+longer read timeout (PAYPAL_CAPTURE_TIMEOUT_SECONDS) than other calls, as
+PayPal can take a while to settle a payment.
+"""
+import os
+import time
+import uuid
+import logging
+import threading
+from typing import Dict, Optional, Tuple
+
+import requests
+
+from backend.services.http_client import HttpClient, get_http_client
+
+logger = logging.getLogger(__name__)
+
+PAYPAL_API_URL = os.getenv('PAYPAL_API_URL') or 'https://api-m.paypal.com'
+PAYPAL_CAPTURE_TIMEOUT_SECONDS = float(os.getenv('PAYPAL_CAPTURE_TIMEOUT_SECONDS') or '60')
+TOKEN_EXPIRY_MARGIN_SECONDS = 60  # refresh this long before PayPal says the token expires
+
+
+class PayPalClient:
+    """Create and capture PayPal orders with a cached access token."""
+
+    def __init__(self, client_id: str, client_secret: str, api_url: str = PAYPAL_API_URL,
+                 http: HttpClient = None):
+        self.client_id = client_id
+        self.client_secret = client_secret
+        self.api_url = api_url.rstrip('/')
+        self.http = http or get_http_client()
+        self._token = None
+        self._token_expires_at = 0.0
+        self._lock = threading.Lock()
+        self.token_requests = 0
+
+    def get_access_token(self, force_refresh: bool = False) -> str:
+        """Return a valid access token, fetching a new one if needed."""
+        with self._lock:
+            if not force_refresh and self._token and time.monotonic() < self._token_expires_at:
+                return self._token
+
+            response = self.http.post(
+                f"{self.api_url}/v1/oauth2/token",
+                auth=(self.client_id, self.client_secret),
+                headers={'Accept': 'application/json'},
+                data={'grant_type': 'client_credentials'}
+            )
+            self.token_requests += 1
+            if response.status_code != 200:
+                logger.error(f"PayPal token error: {response.status_code}, {response.text}")
+                response.raise_for_status()
+
+            data = response.json()
+            self._token = data['access_token']
+            lifetime = int(data.get('expires_in', 0))
+            self._token_expires_at = time.monotonic() + max(0, lifetime - TOKEN_EXPIRY_MARGIN_SECONDS)
+            logger.info(f"Fetched PayPal access token valid for {lifetime} seconds")
+            return self._token
+
+    def _post(self, path: str, request_id: str, payload: Optional[Dict] = None,
+              timeout: Optional[Tuple[float, float]] = None) -> requests.Response:
+        """POST an order call; every attempt carries the same PayPal-Request-Id."""
+        timeout = timeout or self.http.timeout
+        response = None
+        refreshed = resent = False
+        while True:
+            headers = {
+                'Content-Type': 'application/json',
+                'Authorization': f"Bearer {self.get_access_token(force_refresh=refreshed)}",
+                'PayPal-Request-Id': request_id
+            }
+            try:
+                response = self.http.post(f"{self.api_url}{path}", headers=headers, json=payload, timeout=timeout)
+            except (requests.Timeout, requests.ConnectionError) as e:
+                # PayPal answers a repeated request id with the first call's result
+                if resent:
+                    raise
+                resent = True
+                logger.warning(f"PayPal call {path} failed ({str(e)}), sending it again")
+                continue
+            # A token revoked or expired early gets one retry with a fresh token
+            if response.status_code != 401 or refreshed:
+                return response
+            refreshed = True
+
+    def create_order(self, payload: Dict, request_id: Optional[str] = None) -> requests.Response:
+        """Create an order; request_id defaults to a new id for this order."""
+        return self._post('/v2/checkout/orders', request_id or f"create-{uuid.uuid4()}", payload)
+
+    def capture_order(self, order_id: str) -> requests.Response:
+        """Capture an order; capturing the same order again returns the first capture."""
+        return self._post(f'/v2/checkout/orders/{order_id}/capture', f"capture-{order_id}",
+                          timeout=(self.http.timeout[0], PAYPAL_CAPTURE_TIMEOUT_SECONDS))
+
+
+_paypal_client = None
+_paypal_client_lock = threading.Lock()
+
+
+def get_paypal_client() -> Optional[PayPalClient]:
+    """Return the process-wide PayPal client, or None if credentials aren't configured."""
+    global _paypal_client
+    client_id = os.environ.get('PAYPAL_CLIENT_ID')
+    client_secret = os.environ.get('PAYPAL_CLIENT_SECRET')
+    if not client_id or not client_secret:
+        return None
+    with _paypal_client_lock:
+        if _paypal_client is None:
+            _paypal_client = PayPalClient(client_id, client_secret,
+                                          os.environ.get('PAYPAL_API_URL', PAYPAL_API_URL))
+        return _paypal_client
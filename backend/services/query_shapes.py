@@ -0,0 +1,122 @@
+"""
+Counts of the /events query shapes clients request.
+
+A shape is (timezone, time range, currencies, impacts) for the ranges that need
+no dates. Every worker counts the shapes it serves and writes its counts to its
+own file in QUERY_SHAPE_DIR; the static events publisher (backend.main.static_events)
+adds them up to find the most requested shapes. Files not updated within
+QUERY_SHAPE_WINDOW_SECONDS belong to exited processes and are removed.
+"""
+import os
+import json
+import time
+import logging
+import tempfile
+import threading
+from collections import Counter
+from typing import Dict, List, Optional, Tuple
+
+from backend.database import COMPACT_EVENT_COLUMNS
+
+logger = logging.getLogger(__name__)
+
+# Get the absolute path of the project root
+project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+QUERY_SHAPE_DIR = os.getenv('QUERY_SHAPE_DIR') or os.path.join(project_root, 'cache', 'query_shapes')
+QUERY_SHAPE_FLUSH_SECONDS = float(os.getenv('QUERY_SHAPE_FLUSH_SECONDS') or '60')
+QUERY_SHAPE_WINDOW_SECONDS = float(os.getenv('QUERY_SHAPE_WINDOW_SECONDS') or str(24 * 3600))
+
+# Ranges that need no dates; the others are left to Flask
+STATIC_TIME_RANGES = ('24h', 'today', 'yesterday', 'tomorrow', 'week', 'previous_week', 'next_week')
+# Columns in the static files: the compact shape. The events page fetches the
+# AI summary from /events/summary when a row is expanded
+STATIC_FIELDS = COMPACT_EVENT_COLUMNS
+
+Shape = Tuple[str, str, Tuple[str, ...], Tuple[str, ...]]  # timezone, time range, currencies, impacts
+
+
+class QueryShapeCounter:
+    """Counts requested shapes and shares the counts with the other workers through files."""
+
+    def __init__(self, directory: str = QUERY_SHAPE_DIR, flush_seconds: float = QUERY_SHAPE_FLUSH_SECONDS,
+                 window_seconds: float = QUERY_SHAPE_WINDOW_SECONDS):
+        self.directory = directory
+        self.flush_seconds = flush_seconds
+        self.window_seconds = window_seconds
+        self._counts = Counter()
+        self._lock = threading.Lock()
+        self._last_flush = time.monotonic()
+
+    @property
+    def path(self) -> str:
+        # Looked up on each flush, since gunicorn forks workers after import
+        return os.path.join(self.directory, f"shapes-{os.getpid()}.json")
+
+    def record(self, shape: Shape) -> None:
+        with self._lock:
+            self._counts[shape] += 1
+            due = time.monotonic() - self._last_flush >= self.flush_seconds
+        if due:
+            self.flush()
+
+    def flush(self) -> None:
+        """Write this process's counts to its shape file."""
+        with self._lock:
+            self._last_flush = time.monotonic()
+            counts = [[list(shape[:2]) + [list(shape[2]), list(shape[3])], count]
+                      for shape, count in self._counts.items()]
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=self.directory, prefix='.shapes_', suffix='.tmp')
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump(counts, f)
+            os.replace(tmp_path, self.path)
+        except Exception as e:
+            logger.error(f"Error writing query shape counts: {str(e)}")
+
+    def top(self, n: int) -> List[Tuple[Shape, int]]:
+        """Most requested shapes across the processes that wrote counts within the window."""
+        self.flush()
+        totals = Counter()
+        cutoff = time.time() - self.window_seconds
+        try:
+            names = os.listdir(self.directory)
+        except FileNotFoundError:
+            names = []
+        for name in names:
+            if not (name.startswith('shapes-') and name.endswith('.json')):
+                continue
+            path = os.path.join(self.directory, name)
+            try:
+                if os.path.getmtime(path) < cutoff:
+                    os.remove(path)  # Left by a process that has exited
+                    continue
+                with open(path, 'r', encoding='utf-8') as f:
+                    for (timezone, time_range, currencies, impacts), count in json.load(f):
+                        totals[(timezone, time_range, tuple(currencies), tuple(impacts))] += count
+            except Exception as e:
+                logger.error(f"Error reading query shape counts from {name}: {str(e)}")
+        return totals.most_common(n)
+
+
+def record_events_query(query: Dict, user_timezone: Optional[str]) -> None:
+    """Count an /events request towards the static shapes, if it has one."""
+    if (user_timezone and query['time_range'] in STATIC_TIME_RANGES
+            and set(query['fields']) == set(STATIC_FIELDS)):
+        get_query_shape_counter().record((
+            user_timezone, query['time_range'],
+            tuple(sorted(query['currencies'] or ())), tuple(sorted(query['impacts'] or ()))
+        ))
+
+
+_counter = None
+_lock = threading.Lock()
+
+
+def get_query_shape_counter() -> QueryShapeCounter:
+    global _counter
+    with _lock:
+        if _counter is None:
+            _counter = QueryShapeCounter()
+        return _counter
@@ -0,0 +1,505 @@
+"""
+Actual-value release alerts.
+
+The regular calendar update runs hourly, which is far too slow to tell anyone
+about a release. The release window poller fetches the calendar every
+RELEASE_FAST_POLL_SECONDS (never less than RELEASE_MIN_POLL_SECONDS, since the
+feed is rate limited) around scheduled high-impact events and rarely otherwise.
+Failed fetches back off exponentially and honour the feed's Retry-After. Each
+fetch is diffed against the previous one to find events whose `actual` value
+has just been published, and those are handed to the alert dispatcher.
+
+The dispatcher looks up interested subscribers for the event's (currency,
+impact) pair with one indexed query on subscription_interests and puts one
+delivery per recipient on a queue that a small pool of sender threads drains,
+so a release never waits on a loop over every subscriber. Each sender thread
+keeps one SMTP connection open while there are deliveries and closes it after
+RELEASE_ALERT_SMTP_IDLE_SECONDS without any. Each delivery records how long it
+took from the poll that saw the change to the alert being sent.
+
+Alerts are off unless RELEASE_ALERTS_ENABLED is set, since they go to every
+verified subscriber whose currencies and impact levels match, not only to
+digest times they picked. Every alert carries the subscription's unsubscribe
+link.
+"""
+import os
+import time
+import queue
+import logging
+import threading
+from datetime import datetime, timedelta
+from email.utils import parsedate_to_datetime
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+import pytz
+
+logger = logging.getLogger(__name__)
+
+# Poller and dispatcher defaults, overridable from the environment
+RELEASE_ALERTS_ENABLED = os.getenv('RELEASE_ALERTS_ENABLED', 'false').lower() == 'true'
+RELEASE_ALERT_IMPACTS = [i.strip() for i in os.getenv('RELEASE_ALERT_IMPACTS', 'High').split(',') if i.strip()]
+RELEASE_WINDOW_BEFORE_MINUTES = int(os.getenv('RELEASE_WINDOW_BEFORE_MINUTES', '2'))
+RELEASE_WINDOW_AFTER_MINUTES = int(os.getenv('RELEASE_WINDOW_AFTER_MINUTES', '15'))
+# The calendar feed is rate limited, so release windows never poll faster than this
+RELEASE_MIN_POLL_SECONDS = 30.0
+RELEASE_FAST_POLL_SECONDS = max(float(os.getenv('RELEASE_FAST_POLL_SECONDS', '30')), RELEASE_MIN_POLL_SECONDS)
+RELEASE_IDLE_POLL_SECONDS = float(os.getenv('RELEASE_IDLE_POLL_SECONDS', '300'))
+RELEASE_ALERT_WORKERS = int(os.getenv('RELEASE_ALERT_WORKERS', '4'))
+RELEASE_ALERT_SMTP_IDLE_SECONDS = float(os.getenv('RELEASE_ALERT_SMTP_IDLE_SECONDS', '30'))
+SUBSCRIBER_INDEX_REFRESH_SECONDS = int(os.getenv('SUBSCRIBER_INDEX_REFRESH_SECONDS', '300'))
+
+# Number of recent delivery latencies kept for percentiles
+LATENCY_SAMPLE_SIZE = 1000
+
+# (email, unsubscribe token) of one alert recipient
+Recipient = Tuple[str, Optional[str]]
+
+
+def event_key(event: Dict) -> Tuple[str, str, str]:
+    """Identity of a calendar entry across fetches."""
+    return (event.get('date', ''), event.get('country', ''), event.get('title', ''))
+
+
+def parse_event_time(event: Dict) -> Optional[datetime]:
+    """Scheduled release time of a feed event in UTC."""
+    try:
+        event_time = datetime.fromisoformat(event['date'].replace('Z', '+00:00'))
+    except (KeyError, ValueError, AttributeError):
+        return None
+    if event_time.tzinfo is None:
+        event_time = pytz.timezone('America/New_York').localize(event_time)
+    return event_time.astimezone(pytz.UTC)
+
+
+def find_new_actuals(previous: Dict[Tuple, Dict], current: Iterable[Dict]) -> List[Dict]:
+    """Events whose actual value is populated now but was empty in the previous fetch.
+
+    Events that weren't in the previous fetch at all are ignored, so the first
+    fetch after a restart doesn't alert on everything already released.
+    """
+    released = []
+    for event in current:
+        old = previous.get(event_key(event))
+        if old is not None and event.get('actual') and not old.get('actual'):
+            released.append(event)
+    return released
+
+
+def retry_after_seconds(error: Exception) -> Optional[float]:
+    """Seconds the server asked us to wait in the Retry-After header of a failed response."""
+    response = getattr(error, 'response', None)
+    header = response.headers.get('Retry-After') if response is not None else None
+    if not header:
+        return None
+    try:
+        return max(float(header), 0.0)
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(header)
+    except (TypeError, ValueError):
+        return None
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=pytz.UTC)
+    return max((retry_at - datetime.now(pytz.UTC)).total_seconds(), 0.0)
+
+
+def percentile(values: List[float], pct: float) -> Optional[float]:
+    if not values:
+        return None
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(round(pct / 100.0 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+class SubscriberIndex:
+    """Verified subscribers indexed by (currency, impact)."""
+
+    def __init__(self, loader: Optional[Callable[[], Iterable]] = None,
+                 refresh_seconds: int = SUBSCRIBER_INDEX_REFRESH_SECONDS,
+                 query: Callable[[str, str], List[str]] = None):
+        """
+        Args:
+            loader: Callable returning objects with email, verification_token, currencies
+                and impact_levels attributes, indexed in memory. Without one, each lookup queries the
+                subscription_interests table instead.
+            refresh_seconds: How long a loaded index is reused before reloading
+            query: Lookup used when there is no loader. Defaults to
+                find_interested_subscribers.
+        """
+        self.loader = loader
+        self.query = query or find_interested_subscribers
+        self.refresh_seconds = refresh_seconds
+        self._index = {}
+        self._loaded_at = None
+        self._lock = threading.Lock()
+
+    def build(self, subscriptions: Iterable) -> None:
+        index = {}
+        for subscription in subscriptions:
+            for currency in subscription.currencies or []:
+                for impact in subscription.impact_levels or []:
+                    index.setdefault((currency, impact), set()).add(
+                        (subscription.email, subscription.verification_token)
+                    )
+        with self._lock:
+            self._index = index
+            self._loaded_at = time.monotonic()
+        logger.info(f"Subscriber index built with {len(index)} currency/impact keys")
+
+    def refresh_if_stale(self) -> None:
+        if self.loader is None:
+            return
+        if self._loaded_at is not None and time.monotonic() - self._loaded_at < self.refresh_seconds:
+            return
+        try:
+            self.build(self.loader())
+        except Exception as e:
+            # Keep serving the previous index rather than dropping alerts
+            logger.error(f"Error refreshing subscriber index: {str(e)}")
+
+    def lookup(self, currency: str, impact: str) -> List[Recipient]:
+        if self.loader is None:
+            return self.query(currency, impact)
+        with self._lock:
+            return sorted(self._index.get((currency, impact), ()))
+
+
+def find_interested_subscribers(currency: str, impact: str) -> List[Recipient]:
+    """(email, unsubscribe token) of verified subscribers interested in the (currency, impact) pair."""
+    from sqlalchemy import select
+    from backend.database import db_session
+    from models.email_subscription import EmailSubscription, SubscriptionInterest
+    query = (
+        select(EmailSubscription.email, EmailSubscription.verification_token)
+        .join(SubscriptionInterest, SubscriptionInterest.subscription_id == EmailSubscription.id)
+        .where(
+            SubscriptionInterest.currency == currency,
+            SubscriptionInterest.impact == impact,
+            EmailSubscription.is_verified == True
+        )
+    )
+    try:
+        return sorted(set(tuple(row) for row in db_session.execute(query)))
+    finally:
+        db_session.remove()
+
+
+def open_smtp_connection() -> Any:
+    """Open the SMTP connection a sender thread reuses for its deliveries."""
+    from backend.main.email_service import create_smtp_connection
+    return create_smtp_connection()
+
+
+def send_release_email(recipient: Recipient, event: Dict, server: Any = None) -> None:
+    """Send a single release alert email over an open SMTP connection, if given."""
+    from backend.main.config import FRONTEND_URL
+    from backend.main.email_service import send_email
+
+    email, token = recipient
+    subject = f"{event.get('country')} {event.get('title')}: {event.get('actual')}"
+    html_content = f"""
+    <div style="font-family: Arial, sans-serif; padding: 20px; background: #1a1a1a; color: #e0e0e0;">
+        <h2 style="color: #fff;">{event.get('country')} {event.get('title')}</h2>
+        <p>Actual: <strong>{event.get('actual')}</strong></p>
+        <p>Forecast: {event.get('forecast') or 'N/A'} &middot; Previous: {event.get('previous') or 'N/A'}</p>
+        <p style="font-size: 12px; color: #888;">
+            To unsubscribe from these alerts,
+            <a href="{FRONTEND_URL}/unsubscribe/{token}" style="color: #2196F3;">click here</a>
+        </p>
+    </div>
+    """
+    send_email(email, subject, html_content, server=server)
+
+
+def close_smtp_connection(server: Any) -> None:
+    try:
+        server.quit()
+    except Exception:
+        pass
+
+
+class AlertDispatcher:
+    """Fan release alerts out to subscribers through a delivery queue."""
+
+    def __init__(self, subscriber_index: SubscriberIndex,
+                 sender: Callable[[Recipient, Dict, Any], None] = send_release_email,
+                 workers: int = RELEASE_ALERT_WORKERS,
+                 connect: Optional[Callable[[], Any]] = open_smtp_connection,
+                 idle_seconds: float = RELEASE_ALERT_SMTP_IDLE_SECONDS):
+        """
+        Args:
+            subscriber_index: Recipients for an event's (currency, impact)
+            sender: Sends one alert: sender(recipient, event, connection)
+            workers: Number of sender threads
+            connect: Opens the connection each sender thread reuses, or None to
+                pass None to the sender
+            idle_seconds: How long a sender thread keeps an unused connection
+        """
+        self.subscriber_index = subscriber_index
+        self.sender = sender
+        self.connect = connect
+        self.idle_seconds = idle_seconds
+        self.workers = max(1, workers)
+        self.deliveries = queue.Queue()
+        self._threads = []
+        self._lock = threading.Lock()
+        self._latencies = []
+        self._metrics = {'alerts': 0, 'queued': 0, 'sent': 0, 'failed': 0, 'connections': 0}
+
+    def start(self) -> None:
+        for i in range(self.workers):
+            thread = threading.Thread(target=self._worker, name=f'release-alert-{i}', daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    def stop(self, timeout: float = 5.0) -> None:
+        for _ in self._threads:
+            self.deliveries.put(None)
+        for thread in self._threads:
+            thread.join(timeout)
+        self._threads = []
+
+    def publish(self, event: Dict, detected_at: float) -> int:
+        """Queue an alert for every subscriber interested in the event.
+
+        Args:
+            event: Feed event with a newly populated actual value
+            detected_at: time.monotonic() of the poll that saw the change
+
+        Returns:
+            Number of deliveries queued
+        """
+        recipients = self.subscriber_index.lookup(event.get('country'), event.get('impact'))
+        for recipient in recipients:
+            self.deliveries.put((recipient, event, detected_at))
+        with self._lock:
+            self._metrics['alerts'] += 1
+            self._metrics['queued'] += len(recipients)
+        logger.info(f"Queued {len(recipients)} alerts for {event.get('country')} {event.get('title')} "
+                    f"(actual {event.get('actual')})")
+        return len(recipients)
+
+    def _open_connection(self) -> Any:
+        if self.connect is None:
+            return None
+        server = self.connect()
+        with self._lock:
+            self._metrics['connections'] += 1
+        return server
+
+    def _send(self, server: Any, recipient: Recipient, event: Dict) -> Any:
+        """Send one alert, reconnecting once if the kept connection has gone stale.
+
+        Returns:
+            The connection to keep using (None if it had to be dropped)
+        """
+        reused = server is not None
+        if server is None:
+            server = self._open_connection()
+        try:
+            self.sender(recipient, event, server)
+            return server
+        except Exception:
+            if server is not None:
+                close_smtp_connection(server)
+            if not reused:
+                raise
+        # The server may have closed the idle connection; try a fresh one once
+        server = self._open_connection()
+        try:
+            self.sender(recipient, event, server)
+            return server
+        except Exception:
+            if server is not None:
+                close_smtp_connection(server)
+            raise
+
+    def _worker(self) -> None:
+        server = None
+        while True:
+            try:
+                item = self.deliveries.get(timeout=self.idle_seconds if server is not None else None)
+            except queue.Empty:
+                close_smtp_connection(server)
+                server = None
+                continue
+            try:
+                if item is None:
+                    if server is not None:
+                        close_smtp_connection(server)
+                    return
+                recipient, event, detected_at = item
+                try:
+                    server = self._send(server, recipient, event)
+                except Exception as e:
+                    server = None
+                    with self._lock:
+                        self._metrics['failed'] += 1
+                    logger.error(f"Error sending release alert to {recipient[0]}: {str(e)}")
+                    continue
+                latency = time.monotonic() - detected_at
+                with self._lock:
+                    self._metrics['sent'] += 1
+                    self._latencies.append(latency)
+                    if len(self._latencies) > LATENCY_SAMPLE_SIZE:
+                        del self._latencies[0]
+            finally:
+                self.deliveries.task_done()
+
+    def stats(self) -> Dict:
+        """Delivery counts and change-to-send latency percentiles in seconds."""
+        with self._lock:
+            metrics = dict(self._metrics)
+            latencies = list(self._latencies)
+        metrics['pending'] = self.deliveries.qsize()
+        metrics['latency_p50'] = percentile(latencies, 50)
+        metrics['latency_p95'] = percentile(latencies, 95)
+        metrics['latency_max'] = max(latencies) if latencies else None
+        return metrics
+
+
+class ReleaseWindowPoller:
+    """Poll the calendar quickly around scheduled releases and publish new actuals."""
+
+    def __init__(self, fetch: Callable[[], List[Dict]], dispatcher: AlertDispatcher,
+                 impacts: Optional[List[str]] = None,
+                 window_before: timedelta = timedelta(minutes=RELEASE_WINDOW_BEFORE_MINUTES),
+                 window_after: timedelta = timedelta(minutes=RELEASE_WINDOW_AFTER_MINUTES),
+                 fast_interval: float = RELEASE_FAST_POLL_SECONDS,
+                 idle_interval: float = RELEASE_IDLE_POLL_SECONDS,
+                 on_release: Optional[Callable[[List[Dict]], None]] = None):
+        """
+        Args:
+            fetch: Callable returning the raw calendar feed (list of event dicts)
+            dispatcher: AlertDispatcher that delivers alerts
+            impacts: Impact levels that open a release window
+            window_before: How long before a scheduled release to start fast polling
+            window_after: How long after a scheduled release to keep fast polling
+            fast_interval: Seconds between polls inside a release window, at least
+                RELEASE_MIN_POLL_SECONDS
+            idle_interval: Maximum seconds between polls outside a release window
+                (failed fetches back off up to this, or longer if Retry-After says so)
+            on_release: Optional callback given each batch of released events,
+                e.g. to write the actual values to the database
+        """
+        self.fetch = fetch
+        self.dispatcher = dispatcher
+        self.impacts = set(impacts or RELEASE_ALERT_IMPACTS)
+        self.window_before = window_before
+        self.window_after = window_after
+        self.fast_interval = max(fast_interval, RELEASE_MIN_POLL_SECONDS)
+        self.idle_interval = max(idle_interval, self.fast_interval)
+        self.on_release = on_release
+        self.snapshot = {}
+        self.last_poll_at = None
+        self.polls = 0
+        self.failures = 0
+        self.retry_after = None
+        self._stop = threading.Event()
+        self._thread = None
+
+    def _release_times(self) -> List[datetime]:
+        times = []
+        for event in self.snapshot.values():
+            if event.get('impact') in self.impacts and not event.get('actual'):
+                event_time = parse_event_time(event)
+                if event_time:
+                    times.append(event_time)
+        return times
+
+    def next_interval(self, now: Optional[datetime] = None) -> float:
+        """Seconds to wait before the next poll.
+
+        Inside a release window this is the fast interval; otherwise we sleep until
+        the next window opens, capped at the idle interval. After failed fetches the
+        wait doubles per consecutive failure up to the idle interval, and is never
+        shorter than the feed's Retry-After.
+        """
+        now = now or datetime.now(pytz.UTC)
+        wait = self.idle_interval
+        for event_time in self._release_times():
+            opens = event_time - self.window_before
+            closes = event_time + self.window_after
+            if opens <= now <= closes:
+                wait = self.fast_interval
+                break
+            if opens > now:
+                wait = min(wait, (opens - now).total_seconds())
+        wait = max(self.fast_interval, wait)
+        if self.failures:
+            wait = max(wait, min(self.fast_interval * 2 ** self.failures, self.idle_interval))
+        return max(wait, self.retry_after or 0)
+
+    def poll_once(self) -> List[Dict]:
+        """Fetch the feed, publish alerts for new actuals and return the released events."""
+        self.polls += 1
+        try:
+            events = self.fetch()
+        except Exception as e:
+            self.failures += 1
+            self.retry_after = retry_after_seconds(e)
+            raise
+        detected_at = time.monotonic()
+        if not events:
+            # Keep the old snapshot so a failed fetch doesn't reset the diff
+            self.failures += 1
+            self.retry_after = None
+            return []
+        self.failures = 0
+        self.retry_after = None
+
+        released = find_new_actuals(self.snapshot, events) if self.snapshot else []
+        self.snapshot = {event_key(event): event for event in events}
+        previous_poll_at = self.last_poll_at
+        self.last_poll_at = detected_at
+
+        if not released:
+            return []
+
+        self.dispatcher.subscriber_index.refresh_if_stale()
+        for event in released:
+            if event.get('impact') in self.impacts:
+                self.dispatcher.publish(event, detected_at)
+        if previous_poll_at is not None:
+            logger.info(f"Detected {len(released)} new actual values; feed changed within the last "
+                        f"{detected_at - previous_poll_at:.1f}s")
+
+        if self.on_release:
+            try:
+                self.on_release(released)
+            except Exception as e:
+                logger.error(f"Error storing released actual values: {str(e)}")
+        return released
+
+    def run(self) -> None:
+        logger.info("Release window poller started")
+        self.dispatcher.subscriber_index.refresh_if_stale()
+        while not self._stop.is_set():
+            try:
+                self.poll_once()
+            except Exception as e:
+                logger.error(f"Error polling calendar for releases: {str(e)}")
+            self._stop.wait(self.next_interval())
+        logger.info("Release window poller stopped")
+
+    def start(self) -> threading.Thread:
+        self.dispatcher.start()
+        self._thread = threading.Thread(target=self.run, name='release-poller', daemon=True)
+        self._thread.start()
+        return self._thread
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout=5)
+        self.dispatcher.stop()
+
+    def stats(self) -> Dict:
+        return {
+            'polls': self.polls,
+            'tracked_events': len(self.snapshot),
+            'consecutive_failures': self.failures,
+            'next_interval_seconds': round(self.next_interval(), 1),
+            'alerts': self.dispatcher.stats()
+        }
@@ -0,0 +1,93 @@
+"""
+Single-flight call coalescing.
+
+When several threads ask for the same expensive result at the same time, only
+the first runs the computation; the others wait for it and share its result
+(or its exception). Each named flight counts calls and executions, so the
+fan-in ratio (calls per execution) shows how much work coalescing saved.
+"""
+import threading
+from typing import Any, Callable, Dict, Hashable
+
+
+class _Call:
+    __slots__ = ('done', 'result', 'error')
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    """Coalesce concurrent calls that share a key."""
+
+    def __init__(self, name: str = None):
+        self.name = name
+        self._calls = {}
+        self._lock = threading.Lock()
+        self._metrics = {'calls': 0, 'executions': 0, 'coalesced': 0, 'max_waiters': 0}
+        self._waiters = {}
+
+    def do(self, key: Hashable, func: Callable[[], Any]) -> Any:
+        """Run func for key, or wait for the call already running for key."""
+        with self._lock:
+            self._metrics['calls'] += 1
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = _Call()
+                self._calls[key] = call
+                self._waiters[key] = 0
+                self._metrics['executions'] += 1
+            else:
+                self._metrics['coalesced'] += 1
+                self._waiters[key] += 1
+                self._metrics['max_waiters'] = max(self._metrics['max_waiters'], self._waiters[key])
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = func()
+            return call.result
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+                del self._waiters[key]
+            call.done.set()
+
+    def stats(self) -> Dict:
+        """Call counts and the fan-in ratio (calls per execution)."""
+        with self._lock:
+            metrics = dict(self._metrics)
+            metrics['in_flight'] = len(self._calls)
+        executions = metrics['executions']
+        metrics['fan_in'] = round(metrics['calls'] / executions, 3) if executions else 0.0
+        return metrics
+
+
+_flights = {}
+_flights_lock = threading.Lock()
+
+
+def get_single_flight(name: str) -> SingleFlight:
+    """Return the process-wide flight group with the given name."""
+    with _flights_lock:
+        flight = _flights.get(name)
+        if flight is None:
+            flight = _flights[name] = SingleFlight(name)
+        return flight
+
+
+def single_flight_stats() -> Dict[str, Dict]:
+    """Stats for every named flight group."""
+    with _flights_lock:
+        flights = dict(_flights)
+    return {name: flight.stats() for name, flight in flights.items()}
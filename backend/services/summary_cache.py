@@ -0,0 +1,217 @@
+"""
+Persistent cache for AI event summaries.
+
+Entries are keyed by a hash of the exact prompt and model, so recurring events with
+the same title, currency, impact, forecast and previous value reuse the summary
+generated for an earlier week instead of calling the API again.
+
+Several processes (web workers, the scheduler service) share the file. Each save
+takes an exclusive lock on a sibling .lock file, merges the entries already on
+disk with its own and replaces the file atomically, so one process's save never
+drops summaries another process stored.
+"""
+import os
+import json
+import time
+import hashlib
+import logging
+import tempfile
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Dict, Iterator, Optional
+
+logger = logging.getLogger(__name__)
+
+# Get the absolute path of the project root
+project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+SUMMARY_CACHE_FILE = os.getenv('AI_SUMMARY_CACHE_FILE', os.path.join(project_root, 'cache', 'ai_summaries.json'))
+SUMMARY_CACHE_TTL_HOURS = float(os.getenv('AI_SUMMARY_CACHE_TTL_HOURS', str(7 * 24)))
+SUMMARY_CACHE_MAX_ENTRIES = int(os.getenv('AI_SUMMARY_CACHE_MAX_ENTRIES', '2000'))
+SUMMARY_CACHE_SAVE_INTERVAL = 30  # seconds between automatic saves to disk
+
+if os.name == 'nt':
+    import msvcrt
+
+    def _lock(fd: int) -> None:
+        os.lseek(fd, 0, os.SEEK_SET)
+        # Retries for about 10 seconds before raising
+        msvcrt.locking(fd, msvcrt.LK_LOCK, 1)
+
+    def _unlock(fd: int) -> None:
+        os.lseek(fd, 0, os.SEEK_SET)
+        msvcrt.locking(fd, msvcrt.LK_UNLCK, 1)
+else:
+    import fcntl
+
+    def _lock(fd: int) -> None:
+        fcntl.flock(fd, fcntl.LOCK_EX)
+
+    def _unlock(fd: int) -> None:
+        fcntl.flock(fd, fcntl.LOCK_UN)
+
+
+@contextmanager
+def file_lock(path: str) -> Iterator[None]:
+    """Hold an exclusive lock on path (created if missing) between processes."""
+    fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o644)
+    try:
+        _lock(fd)
+        try:
+            yield
+        finally:
+            _unlock(fd)
+    finally:
+        os.close(fd)
+
+
+def summary_fingerprint(prompt: str, model: str) -> str:
+    """Content address for a summary request."""
+    return hashlib.sha256(f"{model}\n{prompt}".encode('utf-8')).hexdigest()
+
+
+class SummaryCache:
+    """Thread-safe LRU cache with TTL, persisted to a JSON file."""
+
+    def __init__(self, path: Optional[str] = SUMMARY_CACHE_FILE,
+                 ttl_seconds: float = SUMMARY_CACHE_TTL_HOURS * 3600,
+                 max_entries: int = SUMMARY_CACHE_MAX_ENTRIES):
+        self.path = path
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max(1, max_entries)
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._dirty = False
+        self._last_save = 0.0
+        self._metrics = {'hits': 0, 'misses': 0, 'expired': 0, 'evictions': 0, 'stores': 0}
+        self._load()
+
+    def _read_file(self) -> OrderedDict:
+        """Unexpired entries saved on disk, least recently used first."""
+        entries = OrderedDict()
+        if not os.path.exists(self.path):
+            return entries
+        with open(self.path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        now = time.time()
+        for key, entry in data.get('entries', []):
+            if now - entry['created_at'] < self.ttl_seconds:
+                entries[key] = entry
+        return entries
+
+    def _load(self):
+        if not self.path:
+            return
+        try:
+            self._entries = self._read_file()
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+            if self._entries:
+                logger.info(f"Loaded {len(self._entries)} AI summaries from {self.path}")
+        except Exception as e:
+            logger.error(f"Error loading AI summary cache: {str(e)}")
+
+    def get(self, key: str) -> Optional[str]:
+        """Return the cached summary for key, or None on a miss."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self._metrics['misses'] += 1
+                return None
+            if time.time() - entry['created_at'] >= self.ttl_seconds:
+                del self._entries[key]
+                self._dirty = True
+                self._metrics['expired'] += 1
+                self._metrics['misses'] += 1
+                return None
+            self._entries.move_to_end(key)
+            self._metrics['hits'] += 1
+            return entry['summary']
+
+    def set(self, key: str, summary: str) -> None:
+        """Store a summary, evicting the least recently used entries if full."""
+        if not summary:
+            return
+        with self._lock:
+            self._entries[key] = {'summary': summary, 'created_at': time.time()}
+            self._entries.move_to_end(key)
+            self._metrics['stores'] += 1
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self._metrics['evictions'] += 1
+            self._dirty = True
+            should_save = time.monotonic() - self._last_save >= SUMMARY_CACHE_SAVE_INTERVAL
+        if should_save:
+            self.flush()
+
+    def flush(self) -> bool:
+        """Merge the cache into the file on disk and replace it atomically, if it has changed."""
+        if not self.path:
+            return False
+        with self._lock:
+            if not self._dirty:
+                return True
+            entries = OrderedDict(self._entries)
+            self._dirty = False
+            self._last_save = time.monotonic()
+        try:
+            cache_dir = os.path.dirname(self.path)
+            os.makedirs(cache_dir, exist_ok=True)
+            with file_lock(self.path + '.lock'):
+                try:
+                    on_disk = self._read_file()
+                except ValueError as e:
+                    logger.error(f"Ignoring unreadable AI summary cache file: {str(e)}")
+                    on_disk = OrderedDict()
+                # Summaries only other processes have are older in LRU order than
+                # ours; for keys both have, the newer summary wins
+                merged = OrderedDict((key, entry) for key, entry in on_disk.items() if key not in entries)
+                for key, entry in entries.items():
+                    disk_entry = on_disk.get(key)
+                    merged[key] = disk_entry if disk_entry and disk_entry['created_at'] > entry['created_at'] else entry
+                while len(merged) > self.max_entries:
+                    merged.popitem(last=False)
+
+                fd, tmp_path = tempfile.mkstemp(dir=cache_dir, prefix='.ai_summaries_', suffix='.tmp')
+                with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                    json.dump({'entries': list(merged.items())}, f, ensure_ascii=False)
+                os.replace(tmp_path, self.path)
+        except Exception as e:
+            logger.error(f"Error saving AI summary cache: {str(e)}")
+            with self._lock:
+                self._dirty = True
+            return False
+
+        # Pick up what the other processes stored, behind our own entries
+        with self._lock:
+            for key in reversed(merged):
+                if key not in self._entries:
+                    self._entries[key] = merged[key]
+                    self._entries.move_to_end(key, last=False)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return True
+
+    def stats(self) -> Dict:
+        """Cache size and hit-rate metrics."""
+        with self._lock:
+            metrics = dict(self._metrics)
+            metrics['size'] = len(self._entries)
+        lookups = metrics['hits'] + metrics['misses']
+        metrics['hit_rate'] = round(metrics['hits'] / lookups, 4) if lookups else 0.0
+        return metrics
+
+
+_summary_cache = None
+_summary_cache_lock = threading.Lock()
+
+
+def get_summary_cache() -> SummaryCache:
+    """Return the process-wide summary cache."""
+    global _summary_cache
+    if _summary_cache is None:
+        with _summary_cache_lock:
+            if _summary_cache is None:
+                _summary_cache = SummaryCache()
+    return _summary_cache
@@ -0,0 +1,213 @@
+"""
+Concurrent AI summary generation.
+
+Runs summary requests on a bounded thread pool, throttled by a token bucket so we
+stay under the API rate limit, retries transient failures with exponential backoff
+and commits results to the database in batches.
+"""
+import os
+import time
+import random
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime
+from typing import Dict, Iterable, Optional
+
+import pytz
+
+logger = logging.getLogger(__name__)
+
+# Pipeline defaults, overridable from the environment
+SUMMARY_WORKERS = int(os.getenv('SUMMARY_WORKERS', '4'))
+SUMMARY_REQUESTS_PER_MINUTE = int(os.getenv('SUMMARY_REQUESTS_PER_MINUTE', '60'))
+SUMMARY_MAX_RETRIES = int(os.getenv('SUMMARY_MAX_RETRIES', '3'))
+SUMMARY_COMMIT_BATCH_SIZE = int(os.getenv('SUMMARY_COMMIT_BATCH_SIZE', '10'))
+
+
+class TokenBucket:
+    """Thread-safe token bucket used to cap the request rate across workers."""
+
+    def __init__(self, rate_per_second: float, capacity: Optional[float] = None):
+        if rate_per_second <= 0:
+            raise ValueError("rate_per_second must be greater than 0")
+        self.rate = rate_per_second
+        self.capacity = capacity if capacity is not None else max(1.0, rate_per_second)
+        self._tokens = self.capacity
+        self._last_refill = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        elapsed = now - self._last_refill
+        self._tokens = min(self.capacity, self._tokens + elapsed * self.rate)
+        self._last_refill = now
+
+    def acquire(self):
+        """Block until a token is available, then consume it."""
+        while True:
+            with self._lock:
+                self._refill()
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.rate
+            time.sleep(wait)
+
+
+def is_retryable_error(error: Exception) -> bool:
+    """Decide whether an API error is worth retrying.
+
+    Rate limits (429), server errors (5xx) and errors without an HTTP status
+    (timeouts, dropped connections) are retried. Other client errors are not.
+    """
+    status_code = getattr(error, 'status_code', None)
+    if status_code is None:
+        response = getattr(error, 'response', None)
+        status_code = getattr(response, 'status_code', None)
+    if status_code is None:
+        return True
+    return status_code == 429 or status_code >= 500
+
+
+def event_to_summary_input(event) -> Dict:
+    """Convert a ForexEvent row to the dictionary the AI service expects."""
+    return {
+        'event_title': event.event_title,
+        'currency': event.currency,
+        'impact': event.impact,
+        'forecast': event.forecast,
+        'previous': event.previous,
+        'time': event.time.isoformat() if event.time else None
+    }
+
+
+class SummaryPipeline:
+    """Generate AI summaries for many events concurrently."""
+
+    def __init__(self, ai_service, db_session,
+                 max_workers: int = SUMMARY_WORKERS,
+                 requests_per_minute: int = SUMMARY_REQUESTS_PER_MINUTE,
+                 max_retries: int = SUMMARY_MAX_RETRIES,
+                 commit_batch_size: int = SUMMARY_COMMIT_BATCH_SIZE,
+                 backoff_base: float = 1.0,
+                 backoff_max: float = 30.0):
+        """
+        Args:
+            ai_service: AISummaryService (or anything with a request_summary(event) method)
+            db_session: SQLAlchemy session used to commit generated summaries
+            max_workers: Number of concurrent API requests
+            requests_per_minute: Upper bound on API requests per minute across all workers
+            max_retries: Retries per event for transient errors
+            commit_batch_size: Number of generated summaries per database commit
+            backoff_base: Initial retry delay in seconds, doubled on each attempt
+            backoff_max: Maximum retry delay in seconds
+        """
+        self.ai_service = ai_service
+        self.db_session = db_session
+        self.max_workers = max(1, max_workers)
+        self.max_retries = max(0, max_retries)
+        self.commit_batch_size = max(1, commit_batch_size)
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.rate_limiter = TokenBucket(requests_per_minute / 60.0, capacity=self.max_workers)
+
+    def _generate_with_retry(self, event_dict: Dict) -> Optional[str]:
+        """Request a summary, retrying transient failures with exponential backoff."""
+        # Cache hits don't touch the API, so they shouldn't spend rate limit tokens
+        get_cached_summary = getattr(self.ai_service, 'get_cached_summary', None)
+        if get_cached_summary:
+            cached = get_cached_summary(event_dict)
+            if cached:
+                return cached
+
+        attempt = 0
+        while True:
+            self.rate_limiter.acquire()
+            try:
+                return self.ai_service.request_summary(event_dict)
+            except Exception as e:
+                if attempt >= self.max_retries or not is_retryable_error(e):
+                    raise
+                delay = min(self.backoff_max, self.backoff_base * (2 ** attempt))
+                delay += random.uniform(0, delay / 2)
+                attempt += 1
+                logger.warning(f"Summary request for {event_dict.get('event_title')} failed ({str(e)}), "
+                               f"retry {attempt}/{self.max_retries} in {delay:.1f}s")
+                time.sleep(delay)
+
+    def _commit(self, stats: Dict) -> None:
+        try:
+            self.db_session.commit()
+            stats['commits'] += 1
+        except Exception as e:
+            logger.error(f"Error committing summary batch: {str(e)}")
+            self.db_session.rollback()
+            raise
+
+    def run(self, events: Iterable) -> Dict[str, int]:
+        """Generate and store summaries for the given ForexEvent rows.
+
+        ORM objects are only read and written on the calling thread; workers only
+        see plain dictionaries.
+
+        Returns:
+            Dict with counts of total, generated and failed events and commits made
+        """
+        events = list(events)
+        stats = {'total': len(events), 'generated': 0, 'failed': 0, 'commits': 0}
+        if not events:
+            return stats
+
+        started = time.monotonic()
+        pending = 0
+
+        with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='summary') as executor:
+            futures = {
+                executor.submit(self._generate_with_retry, event_to_summary_input(event)): event
+                for event in events
+            }
+
+            for future in as_completed(futures):
+                event = futures[future]
+                try:
+                    summary = future.result()
+                except Exception as e:
+                    stats['failed'] += 1
+                    logger.error(f"Error generating summary for event {event.event_title}: {str(e)}")
+                    continue
+
+                if not summary:
+                    stats['failed'] += 1
+                    logger.warning(f"Failed to generate summary for event: {event.event_title}")
+                    continue
+
+                event.ai_summary = summary
+                event.summary_generated_at = datetime.now(pytz.UTC)
+                stats['generated'] += 1
+                pending += 1
+                logger.info(f"Generated summary for {event.currency} event: {event.event_title}")
+
+                if pending >= self.commit_batch_size:
+                    try:
+                        self._commit(stats)
+                    except Exception:
+                        # A failed commit ends the run; don't wait for (or pay for)
+                        # the summaries still queued behind it
+                        for queued in futures:
+                            queued.cancel()
+                        raise
+                    pending = 0
+
+        if pending:
+            self._commit(stats)
+
+        duration = time.monotonic() - started
+        logger.info(f"Summary pipeline finished in {duration:.1f}s: {stats['generated']}/{stats['total']} generated, "
+                    f"{stats['failed']} failed, {stats['commits']} commits")
+
+        cache = getattr(self.ai_service, 'cache', None)
+        if cache:
+            cache.flush()
+            logger.info(f"AI summary cache: {cache.stats()}")
+        return stats
@@ -1,5 +1,5 @@
 from datetime import datetime
-from config.database import db_session, init_db
+from backend.database import db_session, init_db
 from models.forex_event import ForexEvent
 from models.user_preferences import UserEmailPreferences
 
@@ -0,0 +1,215 @@
+"""
+WSGI server settings, queue metrics and thread-pool autoscaling.
+
+Both launchers read their worker and thread counts from here instead of
+hard-coding them:
+
+- run_waitress.py runs a cheroot server. QueueMonitor records how long each
+  accepted connection waits for a worker thread, and ThreadAutoscaler grows or
+  shrinks the pool between SERVER_MIN_THREADS and SERVER_MAX_THREADS based on
+  the p95 of that wait.
+- gunicorn.conf.py forks SERVER_WORKERS processes with the same thread count
+  and, with SERVER_PRELOAD_APP, loads the app and the event snapshot once in
+  the master so workers share it copy-on-write (POSIX only).
+
+Use scripts/load_test_server.py to pick values for a given machine.
+"""
+import os
+import time
+import logging
+import threading
+from collections import deque
+from typing import Dict, Optional
+
+from config.server import WORKER_THREADS, SERVER_MIN_THREADS, SERVER_MAX_THREADS
+
+logger = logging.getLogger(__name__)
+
+# Server settings, overridable from the environment
+SERVER_HOST = os.getenv('SERVER_HOST') or '0.0.0.0'
+SERVER_PORT = int(os.getenv('SERVER_PORT') or '5000')
+SERVER_WORKERS = int(os.getenv('SERVER_WORKERS') or '1')
+SERVER_REQUEST_QUEUE_SIZE = int(os.getenv('SERVER_REQUEST_QUEUE_SIZE') or '100')
+SERVER_TIMEOUT = int(os.getenv('SERVER_TIMEOUT') or '30')
+SERVER_PRELOAD_APP = (os.getenv('SERVER_PRELOAD_APP') or 'true').lower() == 'true'
+
+# Autoscaling settings
+SERVER_AUTOSCALE = (os.getenv('SERVER_AUTOSCALE') or 'true').lower() == 'true'
+SERVER_SCALE_INTERVAL_SECONDS = float(os.getenv('SERVER_SCALE_INTERVAL_SECONDS') or '5')
+SERVER_TARGET_QUEUE_WAIT_MS = float(os.getenv('SERVER_TARGET_QUEUE_WAIT_MS') or '50')
+SERVER_SCALE_STEP = int(os.getenv('SERVER_SCALE_STEP') or '2')
+QUEUE_WAIT_SAMPLES = 1000  # recent waits kept for percentiles
+
+
+def percentile(values, fraction: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(round(fraction * (len(ordered) - 1))))
+    return ordered[index]
+
+
+class QueueMonitor:
+    """Measure how long accepted connections wait in a cheroot thread pool's queue."""
+
+    def __init__(self, pool, samples: int = QUEUE_WAIT_SAMPLES):
+        self.pool = pool
+        self._waits = deque(maxlen=samples)
+        self._lock = threading.Lock()
+        self._metrics = {'queued': 0, 'dequeued': 0, 'max_queue_depth': 0, 'max_wait_ms': 0.0}
+        self._put = pool.put
+        self._get = pool.get
+        # Workers call pool.get() and the server calls pool.put(conn)
+        pool.put = self.put
+        pool.get = self.get
+
+    def put(self, conn) -> None:
+        try:
+            conn.queued_at = time.monotonic()
+        except AttributeError:
+            pass
+        self._put(conn)
+        with self._lock:
+            self._metrics['queued'] += 1
+            self._metrics['max_queue_depth'] = max(self._metrics['max_queue_depth'], self.pool.qsize)
+
+    def get(self, *args, **kwargs):
+        conn = self._get(*args, **kwargs)
+        queued_at = getattr(conn, 'queued_at', None)
+        if queued_at is not None:
+            wait_ms = (time.monotonic() - queued_at) * 1000
+            with self._lock:
+                self._metrics['dequeued'] += 1
+                self._metrics['max_wait_ms'] = max(self._metrics['max_wait_ms'], wait_ms)
+                self._waits.append(wait_ms)
+        return conn
+
+    def recent_waits(self, clear: bool = False):
+        with self._lock:
+            waits = list(self._waits)
+            if clear:
+                self._waits.clear()
+        return waits
+
+    def stats(self) -> Dict:
+        waits = self.recent_waits()
+        with self._lock:
+            metrics = dict(self._metrics)
+        metrics.update({
+            'queue_depth': self.pool.qsize,
+            'threads': len(self.pool._threads),
+            'idle_threads': self.pool.idle,
+            'min_threads': self.pool.min,
+            'max_threads': self.pool.max,
+            'wait_p50_ms': round(percentile(waits, 0.50), 2),
+            'wait_p95_ms': round(percentile(waits, 0.95), 2)
+        })
+        metrics['max_wait_ms'] = round(metrics['max_wait_ms'], 2)
+        return metrics
+
+
+def decide_thread_change(wait_p95_ms: float, queue_depth: int, threads: int, idle: int,
+                         min_threads: int, max_threads: int,
+                         target_ms: float = SERVER_TARGET_QUEUE_WAIT_MS,
+                         step: int = SERVER_SCALE_STEP) -> int:
+    """How many threads to add (positive) or remove (negative) this interval.
+
+    Grow when connections wait longer than the target; shrink one thread at a
+    time when waits are far below it and threads sit idle.
+    """
+    if (wait_p95_ms > target_ms or queue_depth > threads) and threads < max_threads:
+        return min(step, max_threads - threads)
+    if wait_p95_ms < target_ms / 4 and queue_depth == 0 and idle > 1 and threads > min_threads:
+        return -1
+    return 0
+
+
+class ThreadAutoscaler:
+    """Periodically resize a cheroot thread pool from its measured queue wait."""
+
+    def __init__(self, monitor: QueueMonitor, interval: float = SERVER_SCALE_INTERVAL_SECONDS,
+                 target_ms: float = SERVER_TARGET_QUEUE_WAIT_MS):
+        self.monitor = monitor
+        self.interval = interval
+        self.target_ms = target_ms
+        self._stop = threading.Event()
+        self._thread = None
+        self._metrics = {'grown': 0, 'shrunk': 0, 'last_change': None}
+
+    def adjust(self) -> int:
+        pool = self.monitor.pool
+        if not pool._threads:
+            # The server hasn't started its pool yet
+            return 0
+        waits = self.monitor.recent_waits(clear=True)
+        change = decide_thread_change(
+            percentile(waits, 0.95), pool.qsize, len(pool._threads), pool.idle,
+            pool.min, pool.max, self.target_ms
+        )
+        if change > 0:
+            pool.grow(change)
+            self._metrics['grown'] += change
+        elif change < 0:
+            pool.shrink(-change)
+            self._metrics['shrunk'] -= change
+        if change:
+            self._metrics['last_change'] = change
+            logger.info(f"Resized server thread pool by {change:+d} to {len(pool._threads)} threads")
+        return change
+
+    def run(self) -> None:
+        while not self._stop.wait(self.interval):
+            try:
+                self.adjust()
+            except Exception as e:
+                logger.error(f"Error resizing server thread pool: {str(e)}")
+
+    def start(self) -> None:
+        self._thread = threading.Thread(target=self.run, name='thread-autoscaler', daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+
+    def stats(self) -> Dict:
+        return dict(self._metrics)
+
+
+# The server this process is running, if it was built here
+_server_state = {'server': None, 'monitor': None, 'autoscaler': None}
+
+
+def build_cheroot_server(wsgi_app, host: str = SERVER_HOST, port: int = SERVER_PORT,
+                         min_threads: int = SERVER_MIN_THREADS, max_threads: int = SERVER_MAX_THREADS,
+                         autoscale: bool = SERVER_AUTOSCALE):
+    """Create a cheroot server with queue metrics and, optionally, thread autoscaling.
+
+    Returns (server, autoscaler); the caller starts the autoscaler, if any, with the server.
+    """
+    from cheroot.wsgi import Server as WSGIServer
+
+    server = WSGIServer(
+        (host, port),
+        wsgi_app,
+        numthreads=min_threads,
+        max=max_threads if autoscale else min_threads,
+        request_queue_size=SERVER_REQUEST_QUEUE_SIZE,
+        timeout=SERVER_TIMEOUT
+    )
+    monitor = QueueMonitor(server.requests)
+    autoscaler = ThreadAutoscaler(monitor) if autoscale and max_threads > min_threads else None
+    _server_state.update(server=server, monitor=monitor, autoscaler=autoscaler)
+    logger.info(f"Server configured with {min_threads}-{max_threads if autoscale else min_threads} threads, "
+                f"queue size {SERVER_REQUEST_QUEUE_SIZE}, timeout {SERVER_TIMEOUT}s")
+    return server, autoscaler
+
+
+def get_server_stats() -> Optional[Dict]:
+    """Queue and thread metrics for the server in this process, or None if it isn't managed here."""
+    monitor = _server_state['monitor']
+    if monitor is None:
+        return None
+    stats = monitor.stats()
+    autoscaler = _server_state['autoscaler']
+    stats['autoscaler'] = autoscaler.stats() if autoscaler else None
+    return stats
@@ -3,7 +3,7 @@ import sys
 import logging
 from datetime import datetime, timedelta
 import pytz
-import pymysql
+from sqlalchemy import text
 
 # Set up logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
@@ -12,6 +12,8 @@ logger = logging.getLogger(__name__)
 # Add the current directory to path for imports
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
+from backend.database import get_engine
+
 def check_previous_week_events():
     """Test retrieving events for the previous week using direct database connection"""
     try:
@@ -34,34 +36,21 @@ def check_previous_week_events():
         
         logger.info(f"Previous week date range: {start_time.strftime('%Y-%m-%d')} to {end_time.strftime('%Y-%m-%d')}")
         
-        # Connect directly to the database
-        conn = pymysql.connect(
-            host='141.95.123.145',
-            user='forex_user',
-            password='UltraFX#736',
-            db='forex_db',
-            charset='utf8mb4',
-            connect_timeout=60
-        )
-        
-        logger.info("Database connection established successfully")
-        
-        # Create a cursor and execute the query
-        with conn.cursor(pymysql.cursors.DictCursor) as cursor:
-            # Format the date strings for SQL
-            start_str = start_time.strftime('%Y-%m-%d %H:%M:%S')
-            end_str = end_time.strftime('%Y-%m-%d %H:%M:%S')
+        # Query through the shared connection pool
+        with get_engine().connect() as conn:
+            logger.info("Database connection established successfully")
             
-            # Execute the query directly with SQL
-            query = """
+            query = text("""
             SELECT id, event_title, currency, impact, time, forecast, previous, actual
             FROM forex_events 
-            WHERE time BETWEEN %s AND %s
+            WHERE time BETWEEN :start_time AND :end_time
             ORDER BY time
-            """
+            """)
             
-            cursor.execute(query, (start_str, end_str))
-            events = cursor.fetchall()
+            events = conn.execute(query, {
+                'start_time': start_time.strftime('%Y-%m-%d %H:%M:%S'),
+                'end_time': end_time.strftime('%Y-%m-%d %H:%M:%S')
+            }).mappings().all()
             
             # Check results
             if events:
@@ -0,0 +1,29 @@
+"""
+Thread and connection pool sizing shared by the WSGI server and the database.
+
+backend.wsgi_server sizes its thread pool from these values and backend.database
+sizes the connection pool to match, so both read them from here rather than from
+each other.
+"""
+import os
+from dotenv import load_dotenv
+
+# Load environment variables from the project root
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+load_dotenv(os.path.join(project_root, '.env'))
+
+# Request-handling threads per server process; the autoscaler moves between
+# SERVER_MIN_THREADS and SERVER_MAX_THREADS
+WORKER_THREADS = int(os.getenv('WORKER_THREADS') or '4')
+SERVER_MIN_THREADS = int(os.getenv('SERVER_MIN_THREADS') or WORKER_THREADS)
+SERVER_MAX_THREADS = max(int(os.getenv('SERVER_MAX_THREADS') or WORKER_THREADS * 4), SERVER_MIN_THREADS)
+
+# Connection pool settings. Every process (web worker, scheduler service or
+# script) has exactly one engine, so the connections it can hold against MySQL
+# are bounded by DB_POOL_SIZE + DB_MAX_OVERFLOW. The pool defaults to one
+# connection per request-handling thread, and the overflow covers the threads
+# the autoscaler can add up to SERVER_MAX_THREADS plus DB_MAX_OVERFLOW spare for
+# background threads. Overflow connections are closed when they are returned,
+# so they only exist while the extra threads are busy.
+DB_POOL_SIZE = int(os.getenv('DB_POOL_SIZE') or WORKER_THREADS)
+DB_MAX_OVERFLOW = max(SERVER_MAX_THREADS - DB_POOL_SIZE, 0) + int(os.getenv('DB_MAX_OVERFLOW', '2'))
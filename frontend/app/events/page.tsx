@@ -2,7 +2,7 @@
 
 import React from 'react';
 import dynamic from 'next/dynamic';
-import { useEffect, useState, useMemo, useCallback } from 'react';
+import { useEffect, useState, useMemo, useCallback, useRef } from 'react';
 import { motion, AnimatePresence } from 'framer-motion';
 import { Card, CardContent, Typography, Box, Container, CircularProgress, Chip, Alert, Select, MenuItem, FormControl, IconButton, Table, TableBody, TableCell, TableContainer, TableHead, TableRow, Paper, SelectChangeEvent, TextField, Button, Menu, Popover, InputLabel } from '@mui/material';
 import TableViewIcon from '@mui/icons-material/TableView';
@@ -29,10 +29,23 @@ interface ForexEvent {
     previous: string;
     actual: string;
     timezone_abbr?: string;
-    ai_summary?: string;
     isNew: boolean;
 }
 
+// Key of an event's summary; events from the weekly files have no id
+const summaryKey = (event: ForexEvent) => `${event.currency}|${event.event_title}|${event.time}`;
+
+const getApiBaseUrl = (): string => {
+    if (typeof window !== 'undefined') {
+        if (window.location.hostname === 'localhost') {
+            return 'https://localhost:5000';
+        } else if (window.location.hostname === '192.168.0.144') {
+            return 'https://192.168.0.144:5000';
+        }
+    }
+    return 'https://fxalert.co.uk:5000';
+};
+
 interface GroupedEvents {
     displayDate: string;
     events: ForexEvent[];
@@ -239,6 +252,10 @@ function EventsPage() {
     const [anchorEl, setAnchorEl] = useState<null | HTMLElement>(null);
     const open = Boolean(anchorEl);
     const [expanded, setExpanded] = useState<Set<string>>(new Set());
+    // AI summaries fetched when a row is expanded: null when there is none, undefined while loading
+    const [summaries, setSummaries] = useState<Record<string, string | null | undefined>>({});
+    // Timezone the listed times are in: timezone=... for the static files, userId=... for /events
+    const summaryTimezoneParam = useRef<string>('');
     const router = useRouter();
     const [memoryUsage, setMemoryUsage] = useState<number | null>(null);
     const [isRangeSelectionActive, setIsRangeSelectionActive] = useState<boolean>(false);
@@ -262,9 +279,47 @@ function EventsPage() {
         });
     }, []);
 
-    const handleInfoButtonClick = useCallback((e: React.MouseEvent<HTMLButtonElement>, eventId: string) => {
+    const loadSummary = useCallback(async (event: ForexEvent) => {
+        const key = summaryKey(event);
+        if (key in summaries) {
+            return;
+        }
+        setSummaries(prev => ({ ...prev, [key]: undefined }));
+        let summary: string | null = null;
+        try {
+            const params = new URLSearchParams({
+                currency: event.currency,
+                event_title: event.event_title,
+                time: event.time
+            });
+            const response = await fetch(
+                `${getApiBaseUrl()}/events/summary?${params.toString()}&${summaryTimezoneParam.current}`,
+                { method: 'GET', mode: 'cors', credentials: 'include', headers: { 'Accept': 'application/json' } }
+            );
+            if (response.ok) {
+                const data = await response.json();
+                summary = data.ai_summary || null;
+            }
+        } catch (error) {
+            console.error('Error fetching event summary:', error);
+        }
+        setSummaries(prev => ({ ...prev, [key]: summary }));
+    }, [summaries]);
+
+    const handleInfoButtonClick = useCallback((e: React.MouseEvent<HTMLButtonElement>, eventId: string, event: ForexEvent) => {
+        if (!expanded.has(eventId)) {
+            loadSummary(event);
+        }
         handleExpandClick(eventId, e);
-    }, [handleExpandClick]);
+    }, [handleExpandClick, loadSummary, expanded]);
+
+    const summaryText = useCallback((event: ForexEvent) => {
+        const summary = summaries[summaryKey(event)];
+        if (summary === undefined) {
+            return 'Loading analysis...';
+        }
+        return summary || 'No additional information available.';
+    }, [summaries]);
 
     useEffect(() => {
         try {
@@ -392,18 +447,7 @@ function EventsPage() {
 
             const userId = localStorage.getItem('userId') || 'default';
             
-            let baseUrl;
-            if (typeof window !== 'undefined') {
-                if (window.location.hostname === 'localhost') {
-                    baseUrl = 'https://localhost:5000';
-                } else if (window.location.hostname === '192.168.0.144') {
-                    baseUrl = 'https://192.168.0.144:5000';
-                } else {
-                    baseUrl = 'https://fxalert.co.uk:5000';
-                }
-            } else {
-                baseUrl = 'https://fxalert.co.uk:5000';
-            }
+            const baseUrl = getApiBaseUrl();
 
             console.log('Using base URL for events:', baseUrl);
 
@@ -417,7 +461,24 @@ function EventsPage() {
             const currencyParam = selectedCurrencies.length > 0 ? `&currencies=${selectedCurrencies.join(',')}` : '';
             const impactParam = selectedImpacts.length > 0 ? `&impacts=${selectedImpacts.join(',')}` : '';
             
-            const url = `${baseUrl}/events?userId=${userId}&time_range=${timeRange}${dateParam}${currencyParam}${impactParam}`;
+            // Both URLs return the compact /events shape; summaries are fetched when a row is expanded.
+            // Ranges without dates use the static URLs, which the web server answers from
+            // pre-rendered files for the most requested shapes
+            const timezone = !selectedTimezone || selectedTimezone === 'auto'
+                ? Intl.DateTimeFormat().resolvedOptions().timeZone
+                : selectedTimezone;
+            const staticName = [
+                timeRange,
+                [...selectedCurrencies].sort().join(',') || 'all',
+                [...selectedImpacts].sort().join(',') || 'all'
+            ].join('__');
+            const isDated = timeRange === 'specific_date' || timeRange === 'date_range';
+            const url = isDated
+                ? `${baseUrl}/events?userId=${userId}&time_range=${timeRange}${dateParam}${currencyParam}${impactParam}`
+                : `${baseUrl}/events/static/${timezone}/${staticName}.json`;
+            summaryTimezoneParam.current = isDated
+                ? `userId=${encodeURIComponent(userId)}`
+                : `timezone=${encodeURIComponent(timezone)}`;
             console.log('Fetching events from:', url);
             
             const response = await fetch(url, {
@@ -476,7 +537,7 @@ function EventsPage() {
                 setIsUpdating(false);
             }, 300);
         }
-    }, [timeRange, selectedDate, selectedCurrencies, selectedImpacts, startDate, endDate]);
+    }, [timeRange, selectedDate, selectedCurrencies, selectedImpacts, selectedTimezone, startDate, endDate]);
 
     useEffect(() => {
         let timerRef: NodeJS.Timeout | null = null;
@@ -914,16 +975,14 @@ function EventsPage() {
                                                 <TableCell>{event.forecast || 'N/A'}</TableCell>
                                                 <TableCell>{event.previous || 'N/A'}</TableCell>
                                                 <TableCell>
-                                                    {event.ai_summary && (
-                                                        <IconButton
-                                                            size="small"
-                                                            onClick={(e) => handleInfoButtonClick(e, eventId)}
-                                                            aria-expanded={expanded.has(eventId)}
-                                                            aria-label="show more"
-                                                        >
-                                                            {expanded.has(eventId) ? <ExpandLessIcon /> : <ExpandMoreIcon />}
-                                                        </IconButton>
-                                                    )}
+                                                    <IconButton
+                                                        size="small"
+                                                        onClick={(e) => handleInfoButtonClick(e, eventId, event)}
+                                                        aria-expanded={expanded.has(eventId)}
+                                                        aria-label="show more"
+                                                    >
+                                                        {expanded.has(eventId) ? <ExpandLessIcon /> : <ExpandMoreIcon />}
+                                                    </IconButton>
                                                 </TableCell>
                                             </TableRow>
                                             <TableRow>
@@ -952,7 +1011,7 @@ function EventsPage() {
                                                                         AI Analysis
                                                                     </Typography>
                                                                     <Typography variant="body2" sx={{ whiteSpace: 'pre-line' }}>
-                                                                        {event.ai_summary}
+                                                                        {summaryText(event)}
                                                                     </Typography>
                                                                 </Box>
                                                             </motion.div>
@@ -969,7 +1028,7 @@ function EventsPage() {
                 </Table>
             </TableContainer>
         );
-    }, [events, groupedEventsByDate, expanded, getImpactColor, handleInfoButtonClick, formatEventTime]);
+    }, [events, groupedEventsByDate, expanded, getImpactColor, handleInfoButtonClick, summaryText, formatEventTime]);
 
     const GridView = () => {
         const groupedEvents = groupEventsByDate(events);
@@ -1094,7 +1153,7 @@ function EventsPage() {
                                             </CardContent>
                                             <CardActions sx={{ mt: 'auto', justifyContent: 'flex-end' }}>
                                                 <IconButton
-                                                    onClick={(e) => handleInfoButtonClick(e, eventId)}
+                                                    onClick={(e) => handleInfoButtonClick(e, eventId, event)}
                                                     aria-expanded={expanded.has(eventId)}
                                                     aria-label="show more"
                                                     sx={{
@@ -1123,7 +1182,7 @@ function EventsPage() {
                                                         >
                                                             <CardContent>
                                                                 <Typography paragraph>
-                                                                    {event.ai_summary || 'No additional information available.'}
+                                                                    {summaryText(event)}
                                                                 </Typography>
                                                             </CardContent>
                                                         </motion.div>
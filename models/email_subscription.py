@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, JSON, Boolean, DateTime, ForeignKey
+from sqlalchemy import Column, Integer, String, JSON, Boolean, DateTime, ForeignKey, Index
 from sqlalchemy.orm import relationship
 from datetime import datetime
 import pytz
@@ -17,10 +17,17 @@ class EmailSubscription(Base):
     weekly_day = Column(String(10))  # Day of week
     timezone = Column(String(50), nullable=False, default='UTC')
     is_verified = Column(Boolean, default=False)
-    verification_token = Column(String(100))
+    verification_token = Column(String(100), unique=True, index=True)  # Also the unsubscribe token
     created_at = Column(DateTime, default=lambda: datetime.now(pytz.UTC))
     updated_at = Column(DateTime, default=lambda: datetime.now(pytz.UTC), onupdate=lambda: datetime.now(pytz.UTC))
     last_sent_at = Column(DateTime)
+    # One row per (currency, impact) pair, so matching subscribers is an index lookup
+    interests = relationship('SubscriptionInterest', cascade='all, delete-orphan')
+    
+    def set_interests(self):
+        """Rebuild the interest rows from the currencies and impact_levels lists."""
+        pairs = {(currency, impact) for currency in self.currencies or [] for impact in self.impact_levels or []}
+        self.interests = [SubscriptionInterest(currency=currency, impact=impact) for currency, impact in sorted(pairs)]
     
     def to_dict(self):
         """Convert subscription to dictionary."""
@@ -37,4 +44,15 @@ class EmailSubscription(Base):
             'created_at': self.created_at.isoformat() if self.created_at else None,
             'updated_at': self.updated_at.isoformat() if self.updated_at else None,
             'last_sent_at': self.last_sent_at.isoformat() if self.last_sent_at else None
-        } 
\ No newline at end of file
+        } 
+
+
+class SubscriptionInterest(Base):
+    __tablename__ = 'subscription_interests'
+    __table_args__ = (
+        Index('ix_subscription_interests_currency_impact', 'currency', 'impact', 'subscription_id'),
+    )
+    
+    subscription_id = Column(Integer, ForeignKey('email_subscriptions.id', ondelete='CASCADE'), primary_key=True)
+    currency = Column(String(10), primary_key=True)
+    impact = Column(String(20), primary_key=True)
@@ -1,5 +1,5 @@
 from sqlalchemy import Column, Integer, String, Boolean, Time, JSON, DateTime
-from config.database import Base
+from backend.database import Base
 from datetime import datetime
 
 class UserEmailPreferences(Base):
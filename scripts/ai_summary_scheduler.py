@@ -44,7 +44,8 @@ def run_summary_generator():
         logger.info("Starting AI summary generation...")
         
         # Import and run the summary generation scripts
-        from scripts.generate_summaries import generate_missing_summaries, refresh_old_summaries
+        from scripts.generate_summaries import generate_missing_summaries, refresh_old_summaries, setup_logging
+        setup_logging()
         
         # Generate summaries for new events
         generate_missing_summaries()
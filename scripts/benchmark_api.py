@@ -0,0 +1,349 @@
+"""
+Benchmark the /events API end to end.
+
+Boots the real Flask app (app.py) under the cheroot server in a throwaway
+working directory with fixture week files (previous, current and next week),
+user timezone preferences and a seeded SQLite database standing in for MySQL.
+Clients then replay a weighted mix of /events query shapes: every value in
+VALID_TIME_RANGES, crossed with currency and impact filters. The app's
+background tasks (which fetch from ForexFactory) and event fetching are
+replaced with no-ops before the server starts, so nothing leaves the machine.
+
+Reports p50/p95/p99 latency and throughput per query shape and overall, plus
+the process RSS (server and clients share the process). Results can be saved
+as JSON and compared with an earlier run to spot regressions between commits.
+
+Usage:
+    python scripts/benchmark_api.py [--duration 30] [--clients 16] [--threads 8]
+        [--events-per-week 400] [--json results.json] [--compare baseline.json]
+"""
+import os
+import sys
+import json
+import time
+import random
+import logging
+import argparse
+import platform
+import tempfile
+import threading
+import subprocess
+import http.client
+from pathlib import Path
+from datetime import datetime, timedelta
+
+import psutil
+import pytz
+
+# Add the project root directory to Python path
+project_root = str(Path(__file__).parent.parent)
+sys.path.append(project_root)
+
+CURRENCIES = ['USD', 'EUR', 'GBP', 'JPY', 'AUD', 'CAD', 'CHF', 'NZD', 'CNY']
+IMPACTS = ['High', 'Medium', 'Low', 'Non-Economic']
+TITLES = ['CPI m/m', 'Core CPI m/m', 'Retail Sales m/m', 'Unemployment Rate', 'GDP q/q',
+          'Non-Farm Employment Change', 'Manufacturing PMI', 'Services PMI', 'Trade Balance']
+USER_TIMEZONES = ['Europe/London', 'America/New_York', 'Asia/Tokyo', 'Australia/Sydney']
+
+# Relative weight of each time range in the request mix
+TIME_RANGE_WEIGHTS = {
+    'week': 30,
+    'today': 15,
+    '24h': 15,
+    'tomorrow': 8,
+    'next_week': 7,
+    'yesterday': 5,
+    'previous_week': 5,
+    'specific_date': 5,
+    'date_range': 10
+}
+
+# Filters combined with each time range, with their relative weights
+FILTER_WEIGHTS = [
+    ({}, 40),
+    ({'currencies': 'USD'}, 20),
+    ({'currencies': 'USD,EUR,GBP'}, 15),
+    ({'impacts': 'High'}, 15),
+    ({'currencies': 'GBP', 'impacts': 'High,Medium'}, 10)
+]
+
+def week_start(value):
+    """Sunday starting the week that contains value, as the weekly files are named."""
+    days_to_start = 0 if value.weekday() == 6 else -(value.weekday() + 1)
+    return (value + timedelta(days=days_to_start)).replace(hour=0, minute=0, second=0, microsecond=0)
+
+def make_events(start, days, count, rng):
+    """Synthetic events released on the hour or half hour between start and start + days."""
+    events = []
+    for _ in range(count):
+        event_time = start + timedelta(minutes=30 * rng.randrange(days * 48))
+        events.append({
+            'time': event_time.isoformat(),
+            'currency': rng.choice(CURRENCIES),
+            'impact': rng.choice(IMPACTS),
+            'event_title': rng.choice(TITLES),
+            'forecast': f"{rng.uniform(-1, 3):.1f}%",
+            'previous': f"{rng.uniform(-1, 3):.1f}%",
+            'actual': None,
+            'source': 'forexfactory'
+        })
+    events.sort(key=lambda e: e['time'])
+    return events
+
+def write_fixtures(work_dir, now, events_per_week, rng):
+    """Week files for last, this and next week, plus user timezone preferences."""
+    from backend.events.event_store import get_week_filename
+
+    weekly_dir = os.path.join(work_dir, 'weekly_events')
+    os.makedirs(weekly_dir, exist_ok=True)
+    all_events = []
+    for offset in (-1, 0, 1):
+        start = week_start(now + timedelta(weeks=offset))
+        events = make_events(start, 7, events_per_week, rng)
+        all_events.extend(events)
+        with open(os.path.join(weekly_dir, get_week_filename(start)), 'w', encoding='utf-8') as f:
+            json.dump(events, f)
+
+    preferences_dir = os.path.join(work_dir, 'user_preferences')
+    os.makedirs(preferences_dir, exist_ok=True)
+    for i, timezone in enumerate(USER_TIMEZONES):
+        with open(os.path.join(preferences_dir, f'bench-user-{i}.json'), 'w') as f:
+            json.dump({'timezone': timezone, 'offset': 0}, f)
+    return all_events
+
+def seed_database(events):
+    """Create the tables in the SQLite stand-in and insert the fixture events."""
+    from sqlalchemy import insert
+    from backend.database import Base, get_engine
+    from models.forex_event import ForexEvent
+
+    engine = get_engine()
+    Base.metadata.create_all(bind=engine)
+    created = datetime(2024, 1, 1)
+    rows = [{
+        'event_title': e['event_title'],
+        'currency': e['currency'],
+        'impact': e['impact'],
+        'forecast': e['forecast'],
+        'previous': e['previous'],
+        'actual': None,
+        'time': datetime.fromisoformat(e['time']).replace(tzinfo=None),
+        'url': '',
+        'source': e['source'],
+        'created_at': created,
+        'updated_at': created
+    } for e in events]
+    with engine.begin() as conn:
+        conn.execute(insert(ForexEvent.__table__), rows)
+
+def build_mix(now):
+    """Every time range crossed with every filter set, weighted."""
+    from backend.main.route_handler import VALID_TIME_RANGES
+
+    shapes = []
+    for time_range in VALID_TIME_RANGES:
+        params = {'time_range': time_range}
+        if time_range == 'specific_date':
+            params['date'] = now.strftime('%Y-%m-%d')
+        elif time_range == 'date_range':
+            params['start_date'] = (now - timedelta(days=3)).strftime('%Y-%m-%d')
+            params['end_date'] = (now + timedelta(days=3)).strftime('%Y-%m-%d')
+        for filters, filter_weight in FILTER_WEIGHTS:
+            shape = dict(params, **filters)
+            name = '&'.join(f"{k}={v}" for k, v in shape.items())
+            shapes.append((name, TIME_RANGE_WEIGHTS.get(time_range, 1) * filter_weight))
+    return shapes
+
+def percentile(values, fraction):
+    if not values:
+        return None
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(fraction * (len(ordered) - 1))))]
+
+def summarize(latencies, elapsed):
+    return {
+        'requests': len(latencies),
+        'throughput_rps': round(len(latencies) / elapsed, 1) if elapsed else None,
+        'p50_ms': round(percentile(latencies, 0.50), 2) if latencies else None,
+        'p95_ms': round(percentile(latencies, 0.95), 2) if latencies else None,
+        'p99_ms': round(percentile(latencies, 0.99), 2) if latencies else None
+    }
+
+def run_clients(port, shapes, clients, duration, seed):
+    """Replay the weighted mix from several client threads for duration seconds."""
+    names = [name for name, _ in shapes]
+    weights = [weight for _, weight in shapes]
+    latencies = {name: [] for name in names}
+    errors = {}
+    lock = threading.Lock()
+    deadline = time.perf_counter() + duration
+
+    def client(index):
+        rng = random.Random(seed + index)
+        conn = http.client.HTTPConnection('127.0.0.1', port, timeout=30)
+        while time.perf_counter() < deadline:
+            name = rng.choices(names, weights)[0]
+            path = f"/events?{name}&userId=bench-user-{rng.randrange(len(USER_TIMEZONES))}"
+            started = time.perf_counter()
+            try:
+                conn.request('GET', path)
+                response = conn.getresponse()
+                response.read()
+                status = response.status
+            except (OSError, http.client.HTTPException) as e:
+                conn.close()
+                conn = http.client.HTTPConnection('127.0.0.1', port, timeout=30)
+                status = type(e).__name__
+            elapsed = (time.perf_counter() - started) * 1000
+            with lock:
+                if status == 200:
+                    latencies[name].append(elapsed)
+                else:
+                    errors[str(status)] = errors.get(str(status), 0) + 1
+        conn.close()
+
+    threads = [threading.Thread(target=client, args=(i,)) for i in range(clients)]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return latencies, errors, time.perf_counter() - started
+
+def sample_rss(stop, samples):
+    process = psutil.Process()
+    while not stop.is_set():
+        samples.append(process.memory_info().rss)
+        stop.wait(0.2)
+
+def git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=project_root,
+                              capture_output=True, text=True, timeout=10).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+def compare(results, baseline_path):
+    """Print the change in overall latency, throughput and RSS against an earlier run."""
+    with open(baseline_path, 'r', encoding='utf-8') as f:
+        baseline = json.load(f)
+    print(f"\nCompared with {baseline_path} (commit {baseline.get('commit')}):")
+    for key in ('p50_ms', 'p95_ms', 'p99_ms', 'throughput_rps'):
+        old, new = baseline['overall'].get(key), results['overall'].get(key)
+        if old and new:
+            print(f"  {key:>15}: {old:>10} -> {new:>10} ({(new - old) / old * 100:+.1f}%)")
+    old, new = baseline['rss_mb'].get('peak'), results['rss_mb'].get('peak')
+    if old and new:
+        print(f"  {'peak rss mb':>15}: {old:>10} -> {new:>10} ({(new - old) / old * 100:+.1f}%)")
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the /events API against local fixtures')
+    parser.add_argument('--duration', type=float, default=30, help='Seconds to replay the mix')
+    parser.add_argument('--warmup', type=float, default=3, help='Seconds of traffic before measuring')
+    parser.add_argument('--clients', type=int, default=16, help='Concurrent client connections')
+    parser.add_argument('--threads', type=int, default=8, help='Server threads')
+    parser.add_argument('--events-per-week', type=int, default=400, help='Events in each fixture week')
+    parser.add_argument('--seed', type=int, default=42, help='Random seed for fixtures and the mix')
+    parser.add_argument('--json', help='Write results to this file')
+    parser.add_argument('--compare', help='Earlier results file to compare against')
+    args = parser.parse_args()
+    output_path = os.path.abspath(args.json) if args.json else None
+    baseline_path = os.path.abspath(args.compare) if args.compare else None
+
+    original_cwd = os.getcwd()
+    with tempfile.TemporaryDirectory(prefix='fx_api_benchmark_') as work_dir:
+        try:
+            run_benchmark(args, work_dir, output_path, baseline_path)
+        finally:
+            # Close the SQLite file so the directory can be removed, and leave it
+            database = sys.modules.get('backend.database')
+            if database:
+                database.cleanup_db_resources()
+            os.chdir(original_cwd)
+
+def run_benchmark(args, work_dir, output_path, baseline_path):
+    # Keep every file the app touches inside the working directory
+    os.environ.update({
+        'DATABASE_URL': f"sqlite:///{os.path.join(work_dir, 'benchmark.db')}",
+        'EVENT_SNAPSHOT_FILE': os.path.join(work_dir, 'cache', 'events_snapshot.bin'),
+        'EVENT_CHANGE_SET_FILE': os.path.join(work_dir, 'cache', 'event_change_sets.json'),
+        'UPDATER_LOCK_FILE': os.path.join(work_dir, 'cache', 'event_updater.lock'),
+        'USE_REDIS': 'false'
+    })
+    os.chdir(work_dir)
+    logging.disable(logging.WARNING)
+
+    rng = random.Random(args.seed)
+    now = datetime.now(pytz.UTC)
+    events = write_fixtures(work_dir, now, args.events_per_week, rng)
+    seed_database(events)
+
+    import app as app_module
+    from app import app, limiter
+    from backend.main import route_handler
+    from backend.wsgi_server import build_cheroot_server
+    limiter.enabled = False
+    # The fixture files stand in for the feed. initialize_app runs before every
+    # request and would otherwise start the updater against ForexFactory
+    app_module.start_background_tasks = lambda: None
+    route_handler.fetch_events = lambda: None
+
+    rss_idle = psutil.Process().memory_info().rss
+    server, _ = build_cheroot_server(app, host='127.0.0.1', port=0,
+                                     min_threads=args.threads, max_threads=args.threads, autoscale=False)
+    server.prepare()
+    threading.Thread(target=server.serve, daemon=True).start()
+    port = server.bind_addr[1]
+
+    shapes = build_mix(now)
+    try:
+        run_clients(port, shapes, args.clients, args.warmup, args.seed)
+        rss_samples = []
+        stop = threading.Event()
+        sampler = threading.Thread(target=sample_rss, args=(stop, rss_samples), daemon=True)
+        sampler.start()
+        latencies, errors, elapsed = run_clients(port, shapes, args.clients, args.duration, args.seed + 1000)
+        stop.set()
+        sampler.join()
+    finally:
+        server.stop()
+
+    all_latencies = [value for values in latencies.values() for value in values]
+    results = {
+        'commit': git_commit(),
+        'recorded_at': datetime.now(pytz.UTC).isoformat(),
+        'python': platform.python_version(),
+        'settings': {
+            'duration': args.duration,
+            'clients': args.clients,
+            'threads': args.threads,
+            'events_per_week': args.events_per_week,
+            'seed': args.seed
+        },
+        'overall': summarize(all_latencies, elapsed),
+        'errors': errors,
+        'rss_mb': {
+            'idle': round(rss_idle / (1024 * 1024), 1),
+            'peak': round(max(rss_samples) / (1024 * 1024), 1) if rss_samples else None
+        },
+        'shapes': {name: summarize(values, elapsed) for name, values in latencies.items()}
+    }
+
+    overall = results['overall']
+    print(f"{overall['requests']} requests in {elapsed:.1f}s: {overall['throughput_rps']} req/s, "
+          f"p50 {overall['p50_ms']} ms, p95 {overall['p95_ms']} ms, p99 {overall['p99_ms']} ms, "
+          f"peak RSS {results['rss_mb']['peak']} MB, errors {sum(errors.values())}")
+    slowest = sorted(results['shapes'].items(), key=lambda item: item[1]['p95_ms'] or 0, reverse=True)[:5]
+    print("Slowest query shapes (p95):")
+    for name, stats in slowest:
+        print(f"  {stats['p95_ms']:>8} ms  {name}")
+
+    if output_path:
+        with open(output_path, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+        print(f"Results written to {output_path}")
+    if baseline_path:
+        compare(results, baseline_path)
+
+if __name__ == '__main__':
+    main()
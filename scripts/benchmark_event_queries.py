@@ -0,0 +1,156 @@
+"""
+Benchmark the event read path.
+
+Seeds a SQLite database with synthetic forex events and compares the Core read
+path used by backend.database.get_filtered_events against the previous ORM path
+(query ForexEvent instances, then call to_dict()) for throughput and peak
+memory.
+
+Usage:
+    python scripts/benchmark_event_queries.py [--rows 50000] [--repeat 3] [--json results.json]
+"""
+import os
+import sys
+import json
+import time
+import random
+import argparse
+import tempfile
+import tracemalloc
+from pathlib import Path
+from datetime import datetime, timedelta
+
+# Add the project root directory to Python path
+project_root = str(Path(__file__).parent.parent)
+sys.path.append(project_root)
+
+CURRENCIES = ['USD', 'EUR', 'GBP', 'JPY', 'AUD', 'CAD', 'CHF', 'NZD', 'CNY']
+IMPACTS = ['High', 'Medium', 'Low', 'Non-Economic']
+TITLES = ['CPI m/m', 'Core CPI m/m', 'Retail Sales m/m', 'Unemployment Rate', 'GDP q/q',
+          'Non-Farm Employment Change', 'Manufacturing PMI', 'Services PMI', 'Trade Balance']
+
+def seed_events(engine, rows):
+    """Insert synthetic events spread over a year, released in clusters."""
+    from sqlalchemy import insert
+    from models.forex_event import ForexEvent
+
+    random.seed(42)
+    start = datetime(2024, 1, 1)
+    created = datetime(2024, 1, 1, 0, 5)
+    batch = []
+    with engine.begin() as conn:
+        for i in range(rows):
+            # Events are released on the hour or half hour, several at a time
+            event_time = start + timedelta(minutes=30 * random.randrange(365 * 48))
+            batch.append({
+                'event_title': random.choice(TITLES),
+                'currency': random.choice(CURRENCIES),
+                'impact': random.choice(IMPACTS),
+                'forecast': f"{random.uniform(-1, 3):.1f}%",
+                'previous': f"{random.uniform(-1, 3):.1f}%",
+                'actual': f"{random.uniform(-1, 3):.1f}%",
+                'time': event_time,
+                'url': '',
+                'source': 'forexfactory',
+                'ai_summary': None,
+                'summary_generated_at': None,
+                'created_at': created + timedelta(hours=i // 500),
+                'updated_at': created + timedelta(hours=i // 500)
+            })
+            if len(batch) >= 5000:
+                conn.execute(insert(ForexEvent.__table__), batch)
+                batch = []
+        if batch:
+            conn.execute(insert(ForexEvent.__table__), batch)
+
+def orm_read(session_factory):
+    """The previous read path: hydrate ForexEvent instances, then to_dict()."""
+    from models.forex_event import ForexEvent
+
+    session = session_factory()
+    try:
+        events = session.query(ForexEvent).order_by(ForexEvent.time).all()
+        return [event.to_dict() for event in events]
+    finally:
+        session.close()
+
+def core_read():
+    """The current read path."""
+    from backend.database import get_filtered_events
+    return get_filtered_events()
+
+def measure(name, func, repeat):
+    timings = []
+    peaks = []
+    for _ in range(repeat):
+        result = None
+        tracemalloc.start()
+        started = time.perf_counter()
+        result = func()
+        timings.append(time.perf_counter() - started)
+        peaks.append(tracemalloc.get_traced_memory()[1])
+        tracemalloc.stop()
+    best = min(timings)
+    return {
+        'path': name,
+        'rows': len(result),
+        'best_seconds': round(best, 4),
+        'mean_seconds': round(sum(timings) / len(timings), 4),
+        'rows_per_second': int(len(result) / best) if best else None,
+        'peak_memory_mb': round(max(peaks) / (1024 * 1024), 2)
+    }, result
+
+def main():
+    parser = argparse.ArgumentParser(description='Compare ORM and Core event read paths')
+    parser.add_argument('--rows', type=int, default=50000, help='Number of events to seed')
+    parser.add_argument('--repeat', type=int, default=3, help='Runs per path')
+    parser.add_argument('--json', help='Write results to this file')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        # Point the shared engine at a throwaway SQLite database
+        os.environ['DATABASE_URL'] = f"sqlite:///{os.path.join(tmp_dir, 'benchmark.db')}"
+
+        import logging
+        from sqlalchemy.orm import sessionmaker
+        from backend.database import Base, get_engine, db_session, cleanup_db_resources
+        import models.forex_event  # noqa: F401 - registers the table
+
+        logging.getLogger('backend.database').setLevel(logging.WARNING)
+
+        engine = get_engine()
+        Base.metadata.create_all(bind=engine)
+        print(f"Seeding {args.rows} events...")
+        seed_events(engine, args.rows)
+
+        session_factory = sessionmaker(bind=engine, expire_on_commit=False)
+        orm_stats, orm_events = measure('orm', lambda: orm_read(session_factory), args.repeat)
+        db_session.remove()
+        core_stats, core_events = measure('core', core_read, args.repeat)
+
+        # Both paths must return the same payload
+        if orm_events != core_events:
+            raise SystemExit("Core and ORM read paths returned different events")
+
+        cleanup_db_resources()
+
+    results = {
+        'rows': args.rows,
+        'repeat': args.repeat,
+        'results': [orm_stats, core_stats],
+        'speedup': round(orm_stats['best_seconds'] / core_stats['best_seconds'], 2),
+        'memory_ratio': round(core_stats['peak_memory_mb'] / orm_stats['peak_memory_mb'], 2)
+    }
+
+    for stats in results['results']:
+        print(f"{stats['path']:>5}: {stats['rows']} rows, best {stats['best_seconds']}s "
+              f"({stats['rows_per_second']} rows/s), peak memory {stats['peak_memory_mb']} MB")
+    print(f"Core path is {results['speedup']}x faster and uses {results['memory_ratio']}x the peak memory")
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(results, f, indent=2)
+        print(f"Results written to {args.json}")
+
+if __name__ == "__main__":
+    main()
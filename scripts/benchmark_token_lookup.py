@@ -0,0 +1,162 @@
+"""
+Benchmark verification/unsubscribe token lookups.
+
+Seeds a SQLite database with synthetic email subscriptions, then times
+find_subscription_by_token (the lookup behind /verify/<token> and
+/unsubscribe/<token>) before and after creating the unique index on
+verification_token, for tokens that exist and tokens that don't.
+
+Usage:
+    python scripts/benchmark_token_lookup.py [--rows 1000000] [--lookups 2000] [--json results.json]
+"""
+import os
+import sys
+import json
+import time
+import random
+import secrets
+import argparse
+import tempfile
+from pathlib import Path
+from datetime import datetime
+
+# Add the project root directory to Python path
+project_root = str(Path(__file__).parent.parent)
+sys.path.append(project_root)
+
+CURRENCIES = ['USD', 'EUR', 'GBP', 'JPY', 'AUD', 'CAD', 'CHF', 'NZD']
+IMPACTS = ['High', 'Medium', 'Low', 'Non-Economic']
+INDEX_NAME = 'ix_email_subscriptions_verification_token'
+
+def seed_subscriptions(engine, rows):
+    """Insert synthetic subscriptions and return a sample of their tokens."""
+    from sqlalchemy import insert
+    from models.email_subscription import EmailSubscription
+
+    random.seed(42)
+    created = datetime(2024, 1, 1)
+    sample = []
+    batch = []
+    with engine.begin() as conn:
+        for i in range(rows):
+            token = secrets.token_urlsafe(32)
+            if i % max(1, rows // 10000) == 0:
+                sample.append(token)
+            batch.append({
+                'email': f"subscriber{i}@example.com",
+                'frequency': random.choice(['daily', 'weekly', 'both']),
+                'currencies': random.sample(CURRENCIES, 3),
+                'impact_levels': random.sample(IMPACTS, 2),
+                'daily_time': '08:00',
+                'weekly_day': 'Monday',
+                'timezone': 'UTC',
+                'is_verified': i % 5 != 0,
+                'verification_token': token,
+                'created_at': created,
+                'updated_at': created
+            })
+            if len(batch) >= 10000:
+                conn.execute(insert(EmailSubscription.__table__), batch)
+                batch = []
+        if batch:
+            conn.execute(insert(EmailSubscription.__table__), batch)
+    return sample
+
+def percentile(values, fraction):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+def measure(name, tokens):
+    """Time find_subscription_by_token for each token, in milliseconds."""
+    from backend.database import db_session
+    from backend.main.subscription_handler import find_subscription_by_token
+
+    timings = []
+    found = 0
+    started = time.perf_counter()
+    for token in tokens:
+        lookup_started = time.perf_counter()
+        if find_subscription_by_token(token) is not None:
+            found += 1
+        timings.append((time.perf_counter() - lookup_started) * 1000)
+        db_session.remove()
+    elapsed = time.perf_counter() - started
+    return {
+        'path': name,
+        'lookups': len(tokens),
+        'found': found,
+        'p50_ms': round(percentile(timings, 0.50), 3),
+        'p99_ms': round(percentile(timings, 0.99), 3),
+        'lookups_per_second': int(len(tokens) / elapsed) if elapsed else None
+    }
+
+def lookup_tokens(sample, count):
+    """Mix of real tokens and unknown ones (stale or mistyped links)."""
+    tokens = [random.choice(sample) for _ in range(count)]
+    for i in range(0, count, 10):
+        tokens[i] = secrets.token_urlsafe(32)
+    return tokens
+
+def main():
+    parser = argparse.ArgumentParser(description='Compare token lookups with and without the index')
+    parser.add_argument('--rows', type=int, default=1000000, help='Number of subscriptions to seed')
+    parser.add_argument('--lookups', type=int, default=2000, help='Lookups with the index')
+    parser.add_argument('--scan-lookups', type=int, default=20, help='Lookups without the index (full scans)')
+    parser.add_argument('--json', help='Write results to this file')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        # Point the shared engine at a throwaway SQLite database
+        os.environ['DATABASE_URL'] = f"sqlite:///{os.path.join(tmp_dir, 'benchmark.db')}"
+
+        import logging
+        from sqlalchemy import text
+        from backend.database import Base, get_engine, cleanup_db_resources
+        import models.email_subscription  # noqa: F401 - registers the table
+
+        logging.getLogger('backend.database').setLevel(logging.WARNING)
+
+        engine = get_engine()
+        Base.metadata.create_all(bind=engine)
+        # Start from the pre-migration schema: no index on the token
+        with engine.begin() as conn:
+            conn.execute(text(f"DROP INDEX {INDEX_NAME}"))
+
+        print(f"Seeding {args.rows} subscriptions...")
+        seed_started = time.perf_counter()
+        sample = seed_subscriptions(engine, args.rows)
+        print(f"Seeded in {time.perf_counter() - seed_started:.1f}s")
+
+        scan_stats = measure('scan', lookup_tokens(sample, args.scan_lookups))
+
+        # The migration: build the unique index on the populated table
+        index_started = time.perf_counter()
+        with engine.begin() as conn:
+            conn.execute(text(
+                f"CREATE UNIQUE INDEX {INDEX_NAME} ON email_subscriptions (verification_token)"
+            ))
+        index_seconds = time.perf_counter() - index_started
+
+        indexed_stats = measure('indexed', lookup_tokens(sample, args.lookups))
+        cleanup_db_resources()
+
+    results = {
+        'rows': args.rows,
+        'index_build_seconds': round(index_seconds, 2),
+        'results': [scan_stats, indexed_stats],
+        'p50_speedup': round(scan_stats['p50_ms'] / indexed_stats['p50_ms'], 1)
+    }
+
+    for stats in results['results']:
+        print(f"{stats['path']:>8}: {stats['lookups']} lookups ({stats['found']} found), "
+              f"p50 {stats['p50_ms']}ms, p99 {stats['p99_ms']}ms, {stats['lookups_per_second']} lookups/s")
+    print(f"Index built in {results['index_build_seconds']}s; "
+          f"indexed lookups are {results['p50_speedup']}x faster at p50")
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(results, f, indent=2)
+        print(f"Results written to {args.json}")
+
+if __name__ == "__main__":
+    main()
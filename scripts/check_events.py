@@ -7,7 +7,7 @@ import pytz
 project_root = str(Path(__file__).parent.parent)
 sys.path.append(project_root)
 
-from config.database import db_session
+from backend.database import db_session
 from models.forex_event import ForexEvent
 
 def main():
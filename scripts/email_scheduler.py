@@ -17,32 +17,52 @@ from models.email_subscription import EmailSubscription
 from backend.main.email_service import send_daily_update, send_weekly_update
 
 # Configure logging
-log_dir = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'logs')
-os.makedirs(log_dir, exist_ok=True)
-
-log_file = os.path.join(log_dir, 'scheduler.log')
 logger = logging.getLogger('EmailScheduler')
+logger.setLevel(logging.INFO)
 
-# Create file handler
-file_handler = logging.FileHandler(log_file)
-file_handler.setLevel(logging.INFO)
+def setup_logging():
+    """Attach console and log file handlers; called at startup so imports don't write to logs/"""
+    if logger.handlers:
+        return
 
-# Create console handler
-console_handler = logging.StreamHandler()
-console_handler.setLevel(logging.INFO)
+    log_dir = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'logs')
+    os.makedirs(log_dir, exist_ok=True)
 
-# Create formatter
-formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s', 
-                            datefmt='%Y-%m-%d %H:%M:%S')
+    log_file = os.path.join(log_dir, 'scheduler.log')
 
-# Add formatter to handlers
-file_handler.setFormatter(formatter)
-console_handler.setFormatter(formatter)
+    # Create file handler
+    file_handler = logging.FileHandler(log_file)
+    file_handler.setLevel(logging.INFO)
 
-# Add handlers to logger
-logger.addHandler(file_handler)
-logger.addHandler(console_handler)
-logger.setLevel(logging.INFO)
+    # Create console handler
+    console_handler = logging.StreamHandler()
+    console_handler.setLevel(logging.INFO)
+
+    # Create formatter
+    formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+                                datefmt='%Y-%m-%d %H:%M:%S')
+
+    # Add formatter to handlers
+    file_handler.setFormatter(formatter)
+    console_handler.setFormatter(formatter)
+
+    # Add handlers to logger
+    logger.addHandler(file_handler)
+    logger.addHandler(console_handler)
+
+# Daily digests go out every 30 minutes; a run that overshoots this budget would
+# make the scheduler skip the next window, so remaining sends are abandoned instead
+DIGEST_RUN_BUDGET_SECONDS = int(os.getenv('DIGEST_RUN_BUDGET_SECONDS', 25 * 60))
+
+def precompute_summaries():
+    """Generate AI summaries for the upcoming digest window before emails are sent."""
+    try:
+        from scripts.generate_summaries import precompute_digest_summaries
+        logger.info("Precomputing AI summaries for upcoming digests")
+        stats = precompute_digest_summaries()
+        logger.info(f"Summary precompute finished: {stats}")
+    except Exception as e:
+        logger.error(f"Error in summary precompute job: {str(e)}")
 
 def send_daily_updates():
     """Send daily updates to subscribed users."""
@@ -56,7 +76,13 @@ def send_daily_updates():
             (EmailSubscription.frequency == 'daily') | (EmailSubscription.frequency == 'both')
         ).all()
         
-        for subscription in subscriptions:
+        started = time.monotonic()
+        for index, subscription in enumerate(subscriptions):
+            elapsed = time.monotonic() - started
+            if elapsed > DIGEST_RUN_BUDGET_SECONDS:
+                logger.error(f"Daily update run exceeded its {DIGEST_RUN_BUDGET_SECONDS}s budget after {elapsed:.0f}s, "
+                             f"skipping {len(subscriptions) - index} remaining subscriptions")
+                break
             try:
                 # Convert current time to user's timezone
                 user_tz = pytz.timezone(subscription.timezone)
@@ -72,7 +98,7 @@ def send_daily_updates():
                 logger.error(f"Error sending daily update to {subscription.email}: {str(e)}")
                 continue
         
-        logger.info("Completed daily email updates")
+        logger.info(f"Completed daily email updates in {time.monotonic() - started:.2f}s")
         
     except Exception as e:
         logger.error(f"Error in daily update job: {str(e)}")
@@ -110,6 +136,19 @@ def start_email_scheduler():
     try:
         scheduler = BackgroundScheduler()
         
+        # Precompute AI summaries 15 minutes ahead of each daily update window
+        # so that sending never waits on the OpenAI API
+        scheduler.add_job(
+            precompute_summaries,
+            trigger=CronTrigger(minute='15,45'),
+            id='precompute_summaries',
+            name='Precompute AI summaries for digests',
+            replace_existing=True,
+            max_instances=1,
+            coalesce=True,
+            next_run_time=datetime.now(pytz.UTC)  # Also run once on startup
+        )
+        
         # Schedule daily updates to run every 30 minutes
         # (The function will check if it's the right time for each user)
         scheduler.add_job(
@@ -140,6 +179,7 @@ def start_email_scheduler():
         raise
 
 if __name__ == "__main__":
+    setup_logging()
     scheduler = start_email_scheduler()
     try:
         # Keep the script running
@@ -9,7 +9,6 @@ import sys
 import logging
 from datetime import datetime, timedelta
 import pytz
-import pymysql
 import json
 from pathlib import Path
 
@@ -22,6 +21,9 @@ current_dir = os.path.dirname(os.path.abspath(__file__))
 project_root = os.path.dirname(current_dir)
 sys.path.append(project_root)
 
+from sqlalchemy import text
+from backend.database import get_engine
+
 # Directory to store weekly event files
 WEEKLY_STORAGE_DIR = os.path.join(project_root, 'weekly_events')
 os.makedirs(WEEKLY_STORAGE_DIR, exist_ok=True)
@@ -53,31 +55,17 @@ def fetch_all_events_from_database() -> dict:
     Returns a dictionary with ISO week keys and event lists as values
     """
     try:
-        # Connect directly to the database
-        conn = pymysql.connect(
-            host='141.95.123.145',
-            user='forex_user',
-            password='UltraFX#736',
-            db='forex_db',
-            charset='utf8mb4',
-            connect_timeout=60
-        )
-        
-        # Create a cursor and execute the query
-        with conn.cursor(pymysql.cursors.DictCursor) as cursor:
+        # Query through the shared connection pool
+        with get_engine().connect() as conn:
             # Query all events, not just limited to specific dates
-            query = """
+            query = text("""
             SELECT id, event_title, currency, impact, time, forecast, previous, actual, 
                    source, url, ai_summary, created_at, updated_at
             FROM forex_events 
             ORDER BY time
-            """
-            
-            cursor.execute(query)
-            all_events = cursor.fetchall()
+            """)
             
-            # Close the connection
-            conn.close()
+            all_events = conn.execute(query).mappings().all()
             
             logger.info(f"Fetched {len(all_events)} events from database")
             
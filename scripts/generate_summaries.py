@@ -19,41 +19,59 @@ load_dotenv(env_path, override=True)
 
 # Get OpenAI API key
 OPENAI_API_KEY = os.getenv('OPENAI_API_KEY')
-if not OPENAI_API_KEY:
-    print("Error: OPENAI_API_KEY not found in environment variables")
-    sys.exit(1)
 
 # Configure logging
-log_dir = os.path.join(project_root, 'logs')
-os.makedirs(log_dir, exist_ok=True)
-
-log_file = os.path.join(log_dir, 'ai_summary.log')
 logger = logging.getLogger('AISummary')
+logger.setLevel(logging.INFO)
 
-# Create file handler
-file_handler = logging.FileHandler(log_file)
-file_handler.setLevel(logging.INFO)
+def setup_logging():
+    """Attach console and log file handlers; called at startup so imports don't write to logs/"""
+    if logger.handlers:
+        return
 
-# Create console handler
-console_handler = logging.StreamHandler()
-console_handler.setLevel(logging.INFO)
+    log_dir = os.path.join(project_root, 'logs')
+    os.makedirs(log_dir, exist_ok=True)
 
-# Create formatter
-formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-                            datefmt='%Y-%m-%d %H:%M:%S')
+    log_file = os.path.join(log_dir, 'ai_summary.log')
 
-# Add formatter to handlers
-file_handler.setFormatter(formatter)
-console_handler.setFormatter(formatter)
+    # Create file handler
+    file_handler = logging.FileHandler(log_file)
+    file_handler.setLevel(logging.INFO)
 
-# Add handlers to logger
-logger.addHandler(file_handler)
-logger.addHandler(console_handler)
-logger.setLevel(logging.INFO)
+    # Create console handler
+    console_handler = logging.StreamHandler()
+    console_handler.setLevel(logging.INFO)
+
+    # Create formatter
+    formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+                                datefmt='%Y-%m-%d %H:%M:%S')
+
+    # Add formatter to handlers
+    file_handler.setFormatter(formatter)
+    console_handler.setFormatter(formatter)
+
+    # Add handlers to logger
+    logger.addHandler(file_handler)
+    logger.addHandler(console_handler)
 
 from models.forex_event import ForexEvent
 from backend.database import db_session
 from backend.services.ai_summary_service import AISummaryService
+from backend.services.summary_pipeline import SummaryPipeline
+from backend.events.change_sets import publish_change_set
+
+# Days ahead of the current UTC day covered by the digest precompute
+DIGEST_PRECOMPUTE_DAYS = int(os.getenv('DIGEST_PRECOMPUTE_DAYS', '8'))
+
+def run_pipeline(ai_service, events):
+    """Generate summaries for events and publish the change to readers."""
+    previous = [event.ai_summary for event in events]
+    stats = SummaryPipeline(ai_service, db_session).run(events)
+    publish_change_set([
+        event.time for event, summary in zip(events, previous)
+        if event.ai_summary != summary
+    ])
+    return stats
 
 def generate_missing_summaries():
     """Generate AI summaries for events that don't have them."""
@@ -71,42 +89,17 @@ def generate_missing_summaries():
         
         logger.info(f"Found {len(events)} events needing summaries")
         
-        for event in events:
-            try:
-                # Convert event to dictionary for AI service
-                event_dict = {
-                    'event_title': event.event_title,
-                    'currency': event.currency,
-                    'impact': event.impact,
-                    'forecast': event.forecast,
-                    'previous': event.previous,
-                    'time': event.time.isoformat() if event.time else None
-                }
-                
-                # Generate summary
-                summary = ai_service.generate_event_summary(event_dict)
-                
-                if summary:
-                    event.ai_summary = summary
-                    event.summary_generated_at = datetime.now(pytz.UTC)
-                    db_session.commit()
-                    logger.info(f"Generated summary for {event.currency} event: {event.event_title}")
-                else:
-                    logger.warning(f"Failed to generate summary for event: {event.event_title}")
-                
-            except Exception as e:
-                logger.error(f"Error processing event {event.event_title}: {str(e)}")
-                import traceback
-                logger.error(f"Traceback: {traceback.format_exc()}")
-                db_session.rollback()
-                continue
-        
-        logger.info("Completed summary generation")
+        # Generate summaries concurrently and commit in batches
+        stats = run_pipeline(ai_service, events)
+        
+        logger.info(f"Completed summary generation: {stats['generated']} generated, {stats['failed']} failed")
+        return stats
         
     except Exception as e:
         logger.error(f"Error in generate_missing_summaries: {str(e)}")
         import traceback
         logger.error(f"Traceback: {traceback.format_exc()}")
+        db_session.rollback()
         return False
 
 def refresh_old_summaries():
@@ -125,43 +118,64 @@ def refresh_old_summaries():
         ).all()
         
         logger.info(f"Found {len(events)} events needing summary refresh")
-                
-        for event in events:
-            try:
-                # Convert event to dictionary
-                event_dict = {
-                    'event_title': event.event_title,
-                    'currency': event.currency,
-                    'impact': event.impact,
-                    'forecast': event.forecast,
-                    'previous': event.previous,
-                    'time': event.time.isoformat() if event.time else None
-                }
-                
-                # Generate new summary
-                summary = ai_service.generate_event_summary(event_dict)
-                
-                if summary:
-                    event.ai_summary = summary
-                    event.summary_generated_at = datetime.now(pytz.UTC)
-                    db_session.commit()
-                    logger.info(f"Refreshed summary for {event.currency} event: {event.event_title}")
-                
-            except Exception as e:
-                logger.error(f"Error refreshing summary for event {event.event_title}: {str(e)}")
-                import traceback
-                logger.error(f"Traceback: {traceback.format_exc()}")
-                db_session.rollback()
-                continue
-        
-        logger.info("Completed summary refresh")
+        
+        # Regenerate summaries concurrently and commit in batches
+        stats = run_pipeline(ai_service, events)
+        
+        logger.info(f"Completed summary refresh: {stats['generated']} refreshed, {stats['failed']} failed")
+        return stats
         
     except Exception as e:
         logger.error(f"Error in refresh_old_summaries: {str(e)}")
         import traceback
         logger.error(f"Traceback: {traceback.format_exc()}")
+        db_session.rollback()
+        return False
+
+def precompute_digest_summaries(start_time=None, end_time=None):
+    """Make sure eligible events in the upcoming digest window have summaries.
+    
+    Runs ahead of the email jobs so that sending digests only ever reads
+    summaries from the database. The default window starts at midnight UTC,
+    so it includes today's already-released events that daily digests still
+    list, and runs a week ahead to cover weekly digests.
+    """
+    try:
+        now = datetime.now(pytz.UTC)
+        start_time = start_time or now.replace(hour=0, minute=0, second=0, microsecond=0)
+        end_time = end_time or start_time + timedelta(days=DIGEST_PRECOMPUTE_DAYS)
+        
+        events = ForexEvent.query.filter(
+            ForexEvent.impact == 'High',
+            ForexEvent.currency.in_(['USD', 'GBP']),
+            ForexEvent.ai_summary.is_(None),
+            ForexEvent.time >= start_time,
+            ForexEvent.time <= end_time
+        ).all()
+        
+        logger.info(f"Found {len(events)} events without summaries in digest window "
+                    f"{start_time.isoformat()} to {end_time.isoformat()}")
+        
+        if not events:
+            return {'total': 0, 'generated': 0, 'failed': 0, 'commits': 0}
+        
+        ai_service = AISummaryService(OPENAI_API_KEY)
+        stats = run_pipeline(ai_service, events)
+        
+        logger.info(f"Completed digest summary precompute: {stats['generated']} generated, {stats['failed']} failed")
+        return stats
+        
+    except Exception as e:
+        logger.error(f"Error in precompute_digest_summaries: {str(e)}")
+        import traceback
+        logger.error(f"Traceback: {traceback.format_exc()}")
+        db_session.rollback()
         return False
 
 if __name__ == "__main__":
+    setup_logging()
+    if not OPENAI_API_KEY:
+        print("Error: OPENAI_API_KEY not found in environment variables")
+        sys.exit(1)
     generate_missing_summaries()
-    refresh_old_summaries() 
\ No newline at end of file
+    refresh_old_summaries()
@@ -9,7 +9,7 @@ from pathlib import Path
 project_root = str(Path(__file__).parent.parent)
 sys.path.append(project_root)
 
-from config.database import db_session, init_db
+from backend.database import db_session, init_db
 from models.forex_event import ForexEvent
 
 def parse_datetime(time_str: str) -> datetime:
@@ -0,0 +1,122 @@
+"""
+Load-test a running API server to pick thread and worker settings.
+
+Sends requests from an increasing number of concurrent clients and reports
+latency percentiles, throughput and errors for each level, together with the
+server's queue wait and thread count from /health/server. Run it against the
+server under each candidate SERVER_MIN_THREADS / SERVER_MAX_THREADS /
+SERVER_WORKERS setting and keep the one that holds p95 latency at the highest
+concurrency.
+
+Rate-limited (429) and 5xx responses count as errors; the per-client /events
+limit will dominate the results unless it is raised for the test.
+
+Usage:
+    python scripts/load_test_server.py --url https://localhost:5000 \
+        [--concurrency 4,8,16,32] [--duration 20] [--path "/events?time_range=week"] [--json results.json]
+"""
+import sys
+import json
+import time
+import argparse
+import threading
+from pathlib import Path
+
+import requests
+import urllib3
+
+# Add the project root directory to Python path
+project_root = str(Path(__file__).parent.parent)
+sys.path.append(project_root)
+
+from backend.wsgi_server import percentile
+
+DEFAULT_PATHS = [
+    '/events?time_range=week',
+    '/events?time_range=today&currencies=USD,EUR',
+    '/events?time_range=24h&impacts=High',
+    '/events?time_range=next_week&currencies=GBP&impacts=High,Medium'
+]
+
+def run_level(base_url, paths, concurrency, duration, verify):
+    """Run concurrency clients for duration seconds and collect their latencies."""
+    latencies = []
+    errors = []
+    lock = threading.Lock()
+    deadline = time.perf_counter() + duration
+
+    def client(index):
+        session = requests.Session()
+        session.verify = verify
+        i = index
+        while time.perf_counter() < deadline:
+            path = paths[i % len(paths)]
+            i += 1
+            started = time.perf_counter()
+            try:
+                response = session.get(base_url + path, timeout=30)
+                ok = response.status_code < 500 and response.status_code != 429
+                status = response.status_code
+            except requests.RequestException as e:
+                ok, status = False, type(e).__name__
+            elapsed = (time.perf_counter() - started) * 1000
+            with lock:
+                if ok:
+                    latencies.append(elapsed)
+                else:
+                    errors.append(status)
+
+    threads = [threading.Thread(target=client, args=(i,)) for i in range(concurrency)]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - started
+
+    try:
+        server = requests.get(base_url + '/health/server', verify=verify, timeout=10).json()
+    except (requests.RequestException, ValueError):
+        server = None
+
+    return {
+        'concurrency': concurrency,
+        'requests': len(latencies),
+        'errors': len(errors),
+        'error_kinds': sorted({str(e) for e in errors}),
+        'throughput_rps': round(len(latencies) / elapsed, 1),
+        'p50_ms': round(percentile(latencies, 0.50), 1),
+        'p95_ms': round(percentile(latencies, 0.95), 1),
+        'p99_ms': round(percentile(latencies, 0.99), 1),
+        'server': server
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--url', default='https://localhost:5000', help='Base URL of the running server')
+    parser.add_argument('--concurrency', default='4,8,16,32', help='Comma-separated client counts')
+    parser.add_argument('--duration', type=float, default=20, help='Seconds per concurrency level')
+    parser.add_argument('--path', action='append', help='Path to request (repeatable); defaults to an /events mix')
+    parser.add_argument('--verify', action='store_true', help='Verify TLS certificates')
+    parser.add_argument('--json', help='Write results to this file')
+    args = parser.parse_args()
+
+    if not args.verify:
+        urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
+
+    results = []
+    print(f"{'clients':>7} {'req/s':>8} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'errors':>7} {'queue p95':>10} {'threads':>8}")
+    for concurrency in [int(c) for c in args.concurrency.split(',')]:
+        result = run_level(args.url.rstrip('/'), args.path or DEFAULT_PATHS, concurrency, args.duration, args.verify)
+        results.append(result)
+        server = result['server'] or {}
+        print(f"{concurrency:>7} {result['throughput_rps']:>8} {result['p50_ms']:>8} {result['p95_ms']:>8} "
+              f"{result['p99_ms']:>8} {result['errors']:>7} {server.get('wait_p95_ms', '-'):>10} {server.get('threads', '-'):>8}")
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump({'url': args.url, 'duration': args.duration, 'results': results}, f, indent=2)
+        print(f"Results written to {args.json}")
+
+if __name__ == '__main__':
+    main()
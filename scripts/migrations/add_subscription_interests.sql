@@ -0,0 +1,21 @@
+USE forex_db;
+
+-- One row per (subscription, currency, impact), so finding the subscribers
+-- for an event is an index lookup instead of filtering every subscription's
+-- JSON currencies/impact_levels in Python. Requires MySQL 8 for JSON_TABLE.
+CREATE TABLE IF NOT EXISTS subscription_interests (
+    subscription_id INT NOT NULL,
+    currency VARCHAR(10) NOT NULL,
+    impact VARCHAR(20) NOT NULL,
+    PRIMARY KEY (subscription_id, currency, impact),
+    INDEX ix_subscription_interests_currency_impact (currency, impact, subscription_id),
+    CONSTRAINT fk_subscription_interests_subscription
+        FOREIGN KEY (subscription_id) REFERENCES email_subscriptions (id) ON DELETE CASCADE
+);
+
+-- Backfill from the existing JSON lists
+INSERT IGNORE INTO subscription_interests (subscription_id, currency, impact)
+SELECT s.id, c.currency, i.impact
+FROM email_subscriptions s
+JOIN JSON_TABLE(s.currencies, '$[*]' COLUMNS (currency VARCHAR(10) PATH '$')) c
+JOIN JSON_TABLE(s.impact_levels, '$[*]' COLUMNS (impact VARCHAR(20) PATH '$')) i;
@@ -0,0 +1,31 @@
+USE forex_db;
+
+-- /verify/<token> and /unsubscribe/<token> look subscriptions up by
+-- verification_token; without an index each click scans email_subscriptions.
+SET @dbname = 'forex_db';
+SET @tablename = 'email_subscriptions';
+
+-- Verified subscriptions used to have their token cleared, which left their
+-- digest unsubscribe links without one. Give them a fresh random token.
+UPDATE email_subscriptions
+SET verification_token = SHA2(CONCAT(id, ':', email, ':', RAND(), ':', NOW(6)), 256)
+WHERE verification_token IS NULL;
+
+-- Check and add the unique index
+SET @indexname = 'ix_email_subscriptions_verification_token';
+SET @indexexists = (
+    SELECT COUNT(*)
+    FROM information_schema.STATISTICS
+    WHERE TABLE_SCHEMA = @dbname
+    AND TABLE_NAME = @tablename
+    AND INDEX_NAME = @indexname
+);
+
+SET @sql = IF(
+    @indexexists = 0,
+    'CREATE UNIQUE INDEX ix_email_subscriptions_verification_token ON email_subscriptions (verification_token)',
+    'SELECT "ix_email_subscriptions_verification_token already exists"'
+);
+PREPARE stmt FROM @sql;
+EXECUTE stmt;
+DEALLOCATE PREPARE stmt;
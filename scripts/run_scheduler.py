@@ -6,7 +6,7 @@ import os
 from datetime import datetime
 from apscheduler.schedulers.background import BackgroundScheduler
 from apscheduler.triggers.cron import CronTrigger
-import pymysql
+from sqlalchemy.exc import DBAPIError
 from dotenv import load_dotenv
 
 # Add the project root directory to Python path
@@ -47,44 +47,28 @@ logger.setLevel(logging.INFO)
 def test_db_connection():
     """Test the database connection before starting the scheduler."""
     try:
-        # Get database configuration from environment variables
-        host = os.getenv('DB_HOST', '141.95.123.145')
-        port = int(os.getenv('DB_PORT', '3306'))
-        user = os.getenv('DB_USER', 'forex_user')
-        password = os.getenv('DB_PASSWORD', 'your_password_here')
-        database = os.getenv('DB_NAME', 'forex_db')
+        from sqlalchemy import text
+        from backend.database import db_config, get_engine
         
-        logger.info(f"Testing database connection to {host}:{port} as {user}")
+        logger.info(f"Testing database connection to {db_config['host']}:{db_config['port']} as {db_config['user']}")
         
-        # Try to connect
-        connection = pymysql.connect(
-            host=host,
-            port=port,
-            user=user,
-            password=password,
-            database=database,
-            connect_timeout=10,
-            charset='utf8mb4'
-        )
-        
-        # Test the connection
-        with connection.cursor() as cursor:
-            cursor.execute("SELECT VERSION()")
-            version = cursor.fetchone()
-            logger.info(f"Successfully connected to MySQL version: {version[0]}")
+        # Test the connection through the shared connection pool
+        with get_engine().connect() as connection:
+            version = connection.execute(text("SELECT VERSION()")).scalar()
+            logger.info(f"Successfully connected to MySQL version: {version}")
             
             # Test if we have the necessary permissions
-            cursor.execute("SHOW GRANTS")
-            grants = cursor.fetchall()
+            grants = connection.execute(text("SHOW GRANTS")).fetchall()
             logger.info("User permissions:")
             for grant in grants:
                 logger.info(grant[0])
         
-        connection.close()
         return True
         
-    except pymysql.Error as e:
-        error_code = e.args[0]
+    except DBAPIError as db_error:
+        # The underlying PyMySQL error carries the MySQL error code
+        e = db_error.orig
+        error_code = e.args[0] if e.args else None
         error_message = e.args[1] if len(e.args) > 1 else str(e)
         logger.error(f"MySQL Error [{error_code}]: {error_message}")
         
@@ -0,0 +1,390 @@
+"""
+Unified scheduler service.
+
+Hosts every periodic job (calendar updates, weekly event files, AI summaries,
+email digests and the optional Flask service restart) in a single process, so
+they share one database engine and connection pool instead of each script
+holding its own. Jobs run on bounded executors with per-job concurrency limits
+and misfire handling, and a small HTTP endpoint reports their status. The
+release window poller also runs here and sends actual-value alerts.
+
+Replaces running run_scheduler.py, schedule_updates.py, email_scheduler.py,
+ai_summary_scheduler.py, weekly_events_scheduler.py and
+service_restart_scheduler.py side by side.
+"""
+import sys
+import os
+import json
+import logging
+import threading
+from pathlib import Path
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import pytz
+from apscheduler.schedulers.blocking import BlockingScheduler
+from apscheduler.executors.pool import ThreadPoolExecutor
+from apscheduler.triggers.cron import CronTrigger
+from apscheduler.triggers.interval import IntervalTrigger
+from apscheduler.events import (
+    EVENT_JOB_SUBMITTED,
+    EVENT_JOB_EXECUTED,
+    EVENT_JOB_ERROR,
+    EVENT_JOB_MISSED,
+    EVENT_JOB_MAX_INSTANCES
+)
+from dotenv import load_dotenv
+
+# Add the project root directory to Python path
+project_root = str(Path(__file__).parent.parent)
+sys.path.append(project_root)
+
+# Load environment variables
+load_dotenv(os.path.join(project_root, '.env'))
+
+# Configure logging
+logger = logging.getLogger('SchedulerService')
+logger.setLevel(logging.INFO)
+
+# Jobs import their modules lazily, so their loggers are configured here by name
+LOG_FILES = {
+    'SchedulerService': 'scheduler_service.log',
+    'EmailScheduler': 'scheduler.log',
+    'AISummary': 'ai_summary.log'
+}
+
+def setup_logging():
+    """Attach console and log file handlers; called from main() so imports don't write to logs/"""
+    log_dir = os.path.join(project_root, 'logs')
+    os.makedirs(log_dir, exist_ok=True)
+
+    formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+                                datefmt='%Y-%m-%d %H:%M:%S')
+
+    for name, file_name in LOG_FILES.items():
+        job_logger = logging.getLogger(name)
+        job_logger.setLevel(logging.INFO)
+        if job_logger.handlers:
+            continue
+
+        # Create file handler
+        file_handler = logging.FileHandler(os.path.join(log_dir, file_name))
+        file_handler.setLevel(logging.INFO)
+        file_handler.setFormatter(formatter)
+
+        # Create console handler
+        console_handler = logging.StreamHandler()
+        console_handler.setLevel(logging.INFO)
+        console_handler.setFormatter(formatter)
+
+        job_logger.addHandler(file_handler)
+        job_logger.addHandler(console_handler)
+
+# Scheduler settings
+SCHEDULER_MAX_WORKERS = int(os.getenv('SCHEDULER_MAX_WORKERS', '4'))
+SCHEDULER_MISFIRE_GRACE_SECONDS = int(os.getenv('SCHEDULER_MISFIRE_GRACE_SECONDS', '300'))
+SCHEDULER_STATUS_HOST = os.getenv('SCHEDULER_STATUS_HOST', '127.0.0.1')
+SCHEDULER_STATUS_PORT = int(os.getenv('SCHEDULER_STATUS_PORT', '5051'))
+RELEASE_ALERTS_ENABLED = os.getenv('RELEASE_ALERTS_ENABLED', 'false').lower() == 'true'
+ENABLE_SERVICE_RESTART = (
+    os.getenv('SCHEDULER_ENABLE_SERVICE_RESTART') or ('true' if os.name == 'nt' else 'false')
+).lower() == 'true'
+
+# Per-job run statistics, updated from scheduler event listeners
+job_stats = {}
+job_stats_lock = threading.Lock()
+started_at = datetime.now(pytz.UTC)
+
+# Job functions import their implementations lazily so that a broken or slow
+# dependency in one job can't stop the service (or the other jobs) from starting
+
+def run_forex_update():
+    """Fetch the latest calendar from ForexFactory and update the database."""
+    from scripts.update_events import main as update_main
+    update_main()
+
+def run_weekly_events_update():
+    """Regenerate weekly event JSON files from 4 weeks back to 4 weeks ahead."""
+    from scripts.store_weekly_events import process_weeks
+    process_weeks(start_offset=-4, end_offset=4)
+
+def run_summary_generation():
+    """Generate AI summaries for upcoming events that don't have one."""
+    from scripts.generate_summaries import generate_missing_summaries
+    generate_missing_summaries()
+
+def run_summary_refresh():
+    """Regenerate AI summaries that are more than a week old."""
+    from scripts.generate_summaries import refresh_old_summaries
+    refresh_old_summaries()
+
+def run_summary_precompute():
+    """Fill AI summaries for the upcoming digest window before emails go out."""
+    from scripts.generate_summaries import precompute_digest_summaries
+    precompute_digest_summaries()
+
+def run_daily_updates():
+    """Send daily digests to subscribers whose delivery time is now."""
+    from scripts.email_scheduler import send_daily_updates
+    send_daily_updates()
+
+def run_weekly_updates():
+    """Send weekly digests to subscribers whose delivery day is today."""
+    from scripts.email_scheduler import send_weekly_updates
+    send_weekly_updates()
+
+def run_service_restart():
+    """Restart the Flask backend Windows service."""
+    from scripts.service_restart_scheduler import restart_flask_service
+    restart_flask_service()
+
+def store_released_actuals(events):
+    """Write actual values picked up by the release poller to the database."""
+    from scripts.update_events import compare_and_update_events
+    compare_and_update_events(events, None)
+
+def start_release_poller():
+    """Start the release window poller that sends actual-value alerts."""
+    from backend.scrapers.forexfactory import ForexFactoryScraper
+    from backend.services.release_alerts import AlertDispatcher, ReleaseWindowPoller, SubscriberIndex
+
+    poller = ReleaseWindowPoller(
+        fetch=ForexFactoryScraper().fetch_calendar_data,
+        dispatcher=AlertDispatcher(SubscriberIndex()),
+        on_release=store_released_actuals
+    )
+    poller.start()
+    return poller
+
+def _job_entry(job_id):
+    return job_stats.setdefault(job_id, {
+        'runs': 0,
+        'failures': 0,
+        'missed': 0,
+        'skipped_max_instances': 0,
+        'running': False,
+        'last_started': None,
+        'last_finished': None,
+        'last_duration_seconds': None,
+        'last_error': None
+    })
+
+def on_job_event(event):
+    """Record job lifecycle events for the status endpoint."""
+    now = datetime.now(pytz.UTC)
+    with job_stats_lock:
+        stats = _job_entry(event.job_id)
+        if event.code == EVENT_JOB_SUBMITTED:
+            stats['running'] = True
+            stats['last_started'] = now
+        elif event.code in (EVENT_JOB_EXECUTED, EVENT_JOB_ERROR):
+            stats['running'] = False
+            stats['runs'] += 1
+            stats['last_finished'] = now
+            if stats['last_started']:
+                stats['last_duration_seconds'] = round((now - stats['last_started']).total_seconds(), 3)
+            if event.code == EVENT_JOB_ERROR:
+                stats['failures'] += 1
+                stats['last_error'] = str(event.exception)
+                logger.error(f"Job {event.job_id} failed: {event.exception}")
+            else:
+                stats['last_error'] = None
+                logger.info(f"Job {event.job_id} completed in {stats['last_duration_seconds']}s")
+        elif event.code == EVENT_JOB_MISSED:
+            stats['missed'] += 1
+            logger.warning(f"Job {event.job_id} missed its run time {event.scheduled_run_time}")
+        elif event.code == EVENT_JOB_MAX_INSTANCES:
+            stats['skipped_max_instances'] += 1
+            logger.warning(f"Job {event.job_id} skipped: previous run still in progress")
+
+def get_pool_status():
+    """Connection pool usage of the shared database engine, if it has been created."""
+    database = sys.modules.get('backend.database')
+    return database.get_pool_status() if database else None
+
+def get_status(scheduler, release_poller=None):
+    """Build the status report served by the status endpoint."""
+    def iso(value):
+        return value.isoformat() if value else None
+
+    jobs = []
+    with job_stats_lock:
+        for job in scheduler.get_jobs():
+            stats = dict(_job_entry(job.id))
+            stats['last_started'] = iso(stats['last_started'])
+            stats['last_finished'] = iso(stats['last_finished'])
+            # Jobs added before the scheduler starts don't have defaults applied yet
+            jobs.append({
+                'id': job.id,
+                'name': job.name,
+                'executor': job.executor,
+                'max_instances': getattr(job, 'max_instances', None),
+                'next_run_time': iso(getattr(job, 'next_run_time', None)),
+                **stats
+            })
+
+    return {
+        'status': 'running' if scheduler.running else 'stopped',
+        'started_at': started_at.isoformat(),
+        'jobs': jobs,
+        'db_pool': get_pool_status(),
+        'release_alerts': release_poller.stats() if release_poller else None
+    }
+
+def start_status_server(scheduler, release_poller=None):
+    """Serve the scheduler status as JSON on a background thread."""
+    class StatusHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.rstrip('/') not in ('', '/status'):
+                self.send_response(404)
+                self.end_headers()
+                return
+            body = json.dumps(get_status(scheduler, release_poller)).encode('utf-8')
+            self.send_response(200)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            logger.debug(format % args)
+
+    try:
+        server = ThreadingHTTPServer((SCHEDULER_STATUS_HOST, SCHEDULER_STATUS_PORT), StatusHandler)
+        server.daemon_threads = True
+        thread = threading.Thread(target=server.serve_forever, name='scheduler-status', daemon=True)
+        thread.start()
+        logger.info(f"Scheduler status available at http://{SCHEDULER_STATUS_HOST}:{SCHEDULER_STATUS_PORT}/status")
+        return server
+    except Exception as e:
+        logger.error(f"Error starting scheduler status server: {str(e)}")
+        return None
+
+def create_scheduler():
+    """Create the scheduler with all jobs registered."""
+    scheduler = BlockingScheduler(
+        executors={
+            # Calendar fetches, weekly files and housekeeping
+            'default': ThreadPoolExecutor(SCHEDULER_MAX_WORKERS),
+            # AI summary jobs run one at a time; each run is already concurrent internally
+            'summaries': ThreadPoolExecutor(1),
+            # Digest sends run one at a time so a slow run can't double up on SMTP
+            'email': ThreadPoolExecutor(1)
+        },
+        job_defaults={
+            'coalesce': True,
+            'max_instances': 1,
+            'misfire_grace_time': SCHEDULER_MISFIRE_GRACE_SECONDS
+        },
+        timezone=pytz.UTC
+    )
+    now = datetime.now(pytz.UTC)
+
+    scheduler.add_job(
+        run_forex_update,
+        CronTrigger(minute=0),
+        id='forex_update',
+        name='Forex Calendar Update',
+        next_run_time=now  # Run immediately on start
+    )
+
+    scheduler.add_job(
+        run_weekly_events_update,
+        CronTrigger(hour=1, minute=0),
+        id='weekly_events',
+        name='Weekly Event Files Update',
+        next_run_time=now
+    )
+
+    scheduler.add_job(
+        run_summary_generation,
+        CronTrigger(minute=5),
+        id='generate_summaries',
+        name='Generate Missing AI Summaries',
+        executor='summaries'
+    )
+
+    scheduler.add_job(
+        run_summary_refresh,
+        CronTrigger(day_of_week='mon', hour=1, minute=30),
+        id='refresh_summaries',
+        name='Refresh Old AI Summaries',
+        executor='summaries'
+    )
+
+    # 15 minutes ahead of each daily digest window
+    scheduler.add_job(
+        run_summary_precompute,
+        CronTrigger(minute='15,45'),
+        id='precompute_summaries',
+        name='Precompute AI Summaries for Digests',
+        executor='summaries',
+        next_run_time=now
+    )
+
+    # Daily digests match subscribers on the exact minute, so a late run is useless
+    scheduler.add_job(
+        run_daily_updates,
+        CronTrigger(minute='*/30'),
+        id='daily_updates',
+        name='Send Daily Forex Updates',
+        executor='email',
+        misfire_grace_time=60
+    )
+
+    scheduler.add_job(
+        run_weekly_updates,
+        CronTrigger(hour=0, minute=0),
+        id='weekly_updates',
+        name='Send Weekly Forex Summaries',
+        executor='email'
+    )
+
+    if ENABLE_SERVICE_RESTART:
+        scheduler.add_job(
+            run_service_restart,
+            IntervalTrigger(hours=12),
+            id='flask_service_restart',
+            name='Flask Backend Service Restart'
+        )
+
+    scheduler.add_listener(
+        on_job_event,
+        EVENT_JOB_SUBMITTED | EVENT_JOB_EXECUTED | EVENT_JOB_ERROR | EVENT_JOB_MISSED | EVENT_JOB_MAX_INSTANCES
+    )
+    return scheduler
+
+def main():
+    setup_logging()
+    logger.info("Starting unified scheduler service")
+    scheduler = create_scheduler()
+
+    release_poller = None
+    if RELEASE_ALERTS_ENABLED:
+        try:
+            release_poller = start_release_poller()
+        except Exception as e:
+            logger.error(f"Error starting release window poller: {str(e)}")
+
+    status_server = start_status_server(scheduler, release_poller)
+
+    for job in scheduler.get_jobs():
+        logger.info(f"Registered job {job.id} ({job.name}) on executor '{job.executor}'")
+
+    try:
+        # Blocks until shutdown; no polling loop needed
+        scheduler.start()
+    except (KeyboardInterrupt, SystemExit):
+        logger.info("Shutting down scheduler service...")
+    finally:
+        if scheduler.running:
+            scheduler.shutdown()
+        if release_poller:
+            release_poller.stop()
+        if status_server:
+            status_server.shutdown()
+        database = sys.modules.get('backend.database')
+        if database and hasattr(database, 'cleanup_db_resources'):
+            database.cleanup_db_resources()
+
+if __name__ == "__main__":
+    main()
@@ -20,7 +20,6 @@ server_log = os.path.join(log_dir, 'server.log')
 flask_log = os.path.join(log_dir, 'flask.log')
 frontend_log = os.path.join(log_dir, 'frontend.log')
 event_scheduler_log = os.path.join(log_dir, 'event_scheduler.log')
-email_scheduler_log = os.path.join(log_dir, 'email_scheduler.log')
 
 # Configure main logger
 logger = logging.getLogger('ServerManager')
@@ -86,7 +85,6 @@ def setup_logger(name, log_file):
 flask_logger = setup_logger('Flask', flask_log)
 frontend_logger = setup_logger('Frontend', frontend_log)
 event_scheduler_logger = setup_logger('EventScheduler', event_scheduler_log)
-email_scheduler_logger = setup_logger('EmailScheduler', email_scheduler_log)
 
 # Store process handles
 processes = []
@@ -281,11 +279,11 @@ def start_flask_server(python_path):
         return None
 
 def start_scheduler(python_path):
-    """Start the event scheduler"""
+    """Start the scheduler service (event updates, AI summaries and emails)"""
     try:
-        logger.info("Starting event scheduler...")
+        logger.info("Starting scheduler service...")
         scheduler_process = subprocess.Popen(
-            [python_path, 'scripts/run_scheduler.py'],
+            [python_path, 'scripts/scheduler_service.py'],
             stdout=subprocess.PIPE,
             stderr=subprocess.PIPE,
             universal_newlines=True,
@@ -295,35 +293,12 @@ def start_scheduler(python_path):
         processes.append(scheduler_process)
         
         # Set up real-time logging
-        log_output(scheduler_process, 'EventScheduler', '[EventScheduler] ')
+        log_output(scheduler_process, 'EventScheduler', '[SchedulerService] ')
         
-        logger.info(f"Event scheduler started with PID {scheduler_process.pid}")
+        logger.info(f"Scheduler service started with PID {scheduler_process.pid}")
         return scheduler_process
     except Exception as e:
-        logger.error(f"Error starting scheduler: {str(e)}")
-        return None
-
-def start_email_scheduler(python_path):
-    """Start the email scheduler"""
-    try:
-        logger.info("Starting email scheduler...")
-        email_scheduler_process = subprocess.Popen(
-            [python_path, 'scripts/email_scheduler.py'],
-            stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE,
-            universal_newlines=True,
-            cwd=os.path.dirname(os.path.dirname(__file__)),
-            bufsize=1
-        )
-        processes.append(email_scheduler_process)
-        
-        # Set up real-time logging
-        log_output(email_scheduler_process, 'EmailScheduler', '[EmailScheduler] ')
-        
-        logger.info(f"Email scheduler started with PID {email_scheduler_process.pid}")
-        return email_scheduler_process
-    except Exception as e:
-        logger.error(f"Error starting email scheduler: {str(e)}")
+        logger.error(f"Error starting scheduler service: {str(e)}")
         return None
 
 def monitor_processes(python_path):
@@ -348,8 +323,6 @@ def monitor_processes(python_path):
                         processes[i] = start_scheduler(python_path)
                     elif i == 2:  # Frontend
                         processes[i] = setup_frontend()
-                    else:  # Email scheduler
-                        processes[i] = start_email_scheduler(python_path)
             
             time.sleep(5)  # Check every 5 seconds
             
@@ -391,13 +364,7 @@ def main():
             
         scheduler_process = start_scheduler(python_path)
         if not scheduler_process:
-            logger.error("Failed to start event scheduler")
-            stop_all_processes()
-            return
-            
-        email_scheduler_process = start_email_scheduler(python_path)
-        if not email_scheduler_process:
-            logger.error("Failed to start email scheduler")
+            logger.error("Failed to start scheduler service")
             stop_all_processes()
             return
         
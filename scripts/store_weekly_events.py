@@ -3,9 +3,9 @@ import sys
 import logging
 from datetime import datetime, timedelta
 import pytz
-import pymysql
 import json
 from pathlib import Path
+from sqlalchemy import text
 
 # Set up logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
@@ -14,6 +14,8 @@ logger = logging.getLogger(__name__)
 # Add the current directory to path for imports
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
+from backend.database import get_engine
+
 # Directory to store weekly event files
 WEEKLY_STORAGE_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'weekly_events')
 os.makedirs(WEEKLY_STORAGE_DIR, exist_ok=True)
@@ -63,33 +65,20 @@ def fetch_events_for_week(week_offset: int = 0) -> list:
         
         logger.info(f"Fetching events for week: {start_time.strftime('%Y-%m-%d')} to {end_time.strftime('%Y-%m-%d')}")
         
-        # Connect directly to the database
-        conn = pymysql.connect(
-            host='141.95.123.145',
-            user='forex_user',
-            password='UltraFX#736',
-            db='forex_db',
-            charset='utf8mb4',
-            connect_timeout=60
-        )
-        
-        # Create a cursor and execute the query
-        with conn.cursor(pymysql.cursors.DictCursor) as cursor:
-            # Format the date strings for SQL
-            start_str = start_time.strftime('%Y-%m-%d %H:%M:%S')
-            end_str = end_time.strftime('%Y-%m-%d %H:%M:%S')
-            
-            # Execute the query directly with SQL
-            query = """
+        # Query through the shared connection pool
+        with get_engine().connect() as conn:
+            query = text("""
             SELECT id, event_title, currency, impact, time, forecast, previous, actual, 
                    source, url, ai_summary, created_at, updated_at
             FROM forex_events 
-            WHERE time BETWEEN %s AND %s
+            WHERE time BETWEEN :start_time AND :end_time
             ORDER BY time
-            """
+            """)
             
-            cursor.execute(query, (start_str, end_str))
-            events = cursor.fetchall()
+            events = conn.execute(query, {
+                'start_time': start_time.strftime('%Y-%m-%d %H:%M:%S'),
+                'end_time': end_time.strftime('%Y-%m-%d %H:%M:%S')
+            }).mappings().all()
             
             # Convert to the correct format for JSON serialization
             formatted_events = []
@@ -106,9 +95,6 @@ def fetch_events_for_week(week_offset: int = 0) -> list:
                 }
                 formatted_events.append(formatted_event)
             
-            # Close the connection
-            conn.close()
-            
             logger.info(f"Found {len(formatted_events)} events for the week")
             return formatted_events
                 
@@ -123,31 +109,17 @@ def fetch_all_weeks_from_database() -> dict:
     Returns a dictionary with ISO week keys and event lists as values
     """
     try:
-        # Connect directly to the database
-        conn = pymysql.connect(
-            host='141.95.123.145',
-            user='forex_user',
-            password='UltraFX#736',
-            db='forex_db',
-            charset='utf8mb4',
-            connect_timeout=60
-        )
-        
-        # Create a cursor and execute the query
-        with conn.cursor(pymysql.cursors.DictCursor) as cursor:
+        # Query through the shared connection pool
+        with get_engine().connect() as conn:
             # Query all events, not just limited to specific dates
-            query = """
+            query = text("""
             SELECT id, event_title, currency, impact, time, forecast, previous, actual, 
                    source, url, ai_summary, created_at, updated_at
             FROM forex_events 
             ORDER BY time
-            """
-            
-            cursor.execute(query)
-            all_events = cursor.fetchall()
+            """)
             
-            # Close the connection
-            conn.close()
+            all_events = conn.execute(query).mappings().all()
             
             logger.info(f"Fetched {len(all_events)} events from database")
             
@@ -10,9 +10,10 @@ import logging
 project_root = str(Path(__file__).parent.parent)
 sys.path.append(project_root)
 
-from config.database import db_session, init_db
+from backend.database import db_session, init_db
 from models.forex_event import ForexEvent
 from backend.scrapers.forexfactory import ForexFactoryScraper
+from backend.events.change_sets import publish_change_set
 
 # Configure logging
 logging.basicConfig(
@@ -65,6 +66,7 @@ def compare_and_update_events(events_data, filepath):
         success_count = 0
         update_count = 0
         new_count = 0
+        changed_times = []
         
         for event_data in events_data:
             try:
@@ -101,6 +103,7 @@ def compare_and_update_events(events_data, filepath):
                     if updated:
                         existing_event.updated_at = datetime.now(pytz.UTC)
                         update_count += 1
+                        changed_times.append(event_time)
                         logger.info(f"Updated event: {event_data['title']} at {event_time}")
                         
                 else:
@@ -118,6 +121,7 @@ def compare_and_update_events(events_data, filepath):
                     )
                     db_session.add(new_event)
                     new_count += 1
+                    changed_times.append(event_time)
                     logger.info(f"Added new event: {event_data['title']} at {event_time}")
                 
                 success_count += 1
@@ -129,6 +133,9 @@ def compare_and_update_events(events_data, filepath):
         # Commit all changes
         db_session.commit()
         
+        # Let readers drop cached results covering the changed events
+        publish_change_set(changed_times)
+        
         logger.info(f"Successfully processed {success_count} events:")
         logger.info(f"- Updated {update_count} existing events")
         logger.info(f"- Added {new_count} new events")
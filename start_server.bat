@@ -213,17 +213,9 @@ start "Frontend Server" pwsh -NoExit -Command "^
         exit 1;^
     }"
 
-:: Start Event Scheduler in a new CMD window
-echo %YELLOW%Starting event scheduler...%RESET%
-start "Event Scheduler" cmd /k "cd /d %PROJECT_ROOT% && call %VENV_PATH%\Scripts\activate.bat && python %SCRIPTS_PATH%\run_scheduler.py"
-
-:: Start AI Summary Generator in a new CMD window with continuous loop
-echo %YELLOW%Starting AI summary generator (continuous mode)...%RESET%
-start "AI Summary Generator" cmd /k "cd /d %PROJECT_ROOT% && call %VENV_PATH%\Scripts\activate.bat && python %SCRIPTS_PATH%\ai_summary_scheduler.py"
-
-:: Start Email Scheduler in a new CMD window
-echo %YELLOW%Starting email scheduler...%RESET%
-start "Email Scheduler" cmd /k "cd /d %PROJECT_ROOT% && call %VENV_PATH%\Scripts\activate.bat && python %SCRIPTS_PATH%\email_scheduler.py"
+:: Start the unified scheduler service (event updates, AI summaries and emails) in a new CMD window
+echo %YELLOW%Starting scheduler service...%RESET%
+start "Scheduler Service" cmd /k "cd /d %PROJECT_ROOT% && call %VENV_PATH%\Scripts\activate.bat && python %SCRIPTS_PATH%\scheduler_service.py"
 
 echo.
 echo %GREEN%All components started in separate windows!%RESET%
@@ -239,9 +231,7 @@ pause > nul
 taskkill /F /FI "WINDOWTITLE eq Frontend Server*" > nul 2>&1
 taskkill /F /FI "WINDOWTITLE eq Backend Service Configuration*" > nul 2>&1
 taskkill /F /FI "WINDOWTITLE eq Backend Connectivity Test*" > nul 2>&1
-taskkill /F /FI "WINDOWTITLE eq Event Scheduler*" > nul 2>&1
-taskkill /F /FI "WINDOWTITLE eq AI Summary Generator*" > nul 2>&1
-taskkill /F /FI "WINDOWTITLE eq Email Scheduler*" > nul 2>&1
+taskkill /F /FI "WINDOWTITLE eq Scheduler Service*" > nul 2>&1
 
 :: Final pause to show any cleanup messages
 pause 
\ No newline at end of file
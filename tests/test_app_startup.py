@@ -0,0 +1,66 @@
+import os
+import sys
+import json
+import subprocess
+import unittest
+
+# Add project root to path
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(project_root)
+
+# Seconds allowed for `import app`, including Flask extensions and route handlers
+APP_IMPORT_TIME_BUDGET = float(os.getenv('APP_IMPORT_TIME_BUDGET', '5.0'))
+
+# Fails any network access during the import and records what was attempted
+IMPORT_SCRIPT = """
+import json, sys, time
+
+attempts = []
+
+def block_network(event, args):
+    if event in ('socket.connect', 'socket.getaddrinfo', 'socket.gethostbyname', 'socket.sendto'):
+        attempts.append(event + ' ' + repr(args[1:] if event == 'socket.connect' else args)[:120])
+        raise OSError('network disabled during startup test')
+
+sys.addaudithook(block_network)
+started = time.perf_counter()
+import app
+elapsed = time.perf_counter() - started
+print(json.dumps({'elapsed': elapsed, 'network_attempts': attempts}))
+"""
+
+
+class TestAppStartup(unittest.TestCase):
+    def run_import(self, **env):
+        env = dict(os.environ, **env)
+        result = subprocess.run(
+            [sys.executable, '-c', IMPORT_SCRIPT],
+            cwd=project_root, env=env, capture_output=True, text=True, timeout=120
+        )
+        self.assertEqual(result.returncode, 0, result.stderr[-2000:])
+        return json.loads(result.stdout.strip().splitlines()[-1])
+
+    def test_import_uses_no_network(self):
+        """Importing the app doesn't look up IPs or contact Redis or the database"""
+        # Unroutable addresses: any attempt to reach them would hang without the audit hook
+        stats = self.run_import(USE_REDIS='true', REDIS_HOST='10.255.255.1', DB_HOST='10.255.255.1')
+        self.assertEqual(stats['network_attempts'], [])
+        self.assertLess(stats['elapsed'], APP_IMPORT_TIME_BUDGET)
+
+    def test_static_addresses_skip_discovery(self):
+        """Configured addresses are used without any lookup"""
+        script = (
+            "import sys\n"
+            "sys.addaudithook(lambda event, args: (_ for _ in ()).throw(OSError(event))"
+            " if event in ('socket.connect', 'socket.getaddrinfo') else None)\n"
+            "from backend.main import get_local_ip, get_server_ip\n"
+            "print(get_server_ip(), ','.join(get_local_ip()))\n"
+        )
+        env = dict(os.environ, SERVER_PUBLIC_IP='203.0.113.7', SERVER_LOCAL_IPS='10.0.0.5, 10.0.0.6')
+        result = subprocess.run([sys.executable, '-c', script], cwd=project_root, env=env,
+                                capture_output=True, text=True, timeout=120)
+        self.assertEqual(result.returncode, 0, result.stderr[-2000:])
+        self.assertEqual(result.stdout.strip().splitlines()[-1], '203.0.113.7 10.0.0.5,10.0.0.6')
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,75 @@
+import os
+import sys
+import json
+import subprocess
+import unittest
+
+# Add project root to path
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(project_root)
+
+POOL_SCRIPT = """
+import json
+import sys
+import backend.database
+imports_server = 'backend.wsgi_server' in sys.modules
+import backend.wsgi_server
+import config.database
+from models.user_preferences import UserEmailPreferences
+from backend.models.user_preferences import UserEmailPreferences as BackendUserEmailPreferences
+
+engine = backend.database.get_engine()
+print(json.dumps({
+    'shared_engine': config.database.engine is engine,
+    'shared_base': config.database.Base is backend.database.Base,
+    'shared_session': config.database.db_session is backend.database.db_session,
+    'single_preferences_model': UserEmailPreferences is BackendUserEmailPreferences,
+    'pool': backend.database.get_pool_status(),
+    'server_max_threads': backend.wsgi_server.SERVER_MAX_THREADS,
+    'imports_server': imports_server
+}))
+"""
+
+
+def pool_status(**settings):
+    env = dict(os.environ, DB_HOST='127.0.0.1', DB_PORT='1', **settings)
+    for name in ('DB_POOL_SIZE', 'DB_MAX_OVERFLOW', 'SERVER_MIN_THREADS', 'SERVER_MAX_THREADS'):
+        if name not in settings:
+            env.pop(name, None)
+    result = subprocess.run(
+        [sys.executable, '-c', POOL_SCRIPT],
+        cwd=project_root, env=env, capture_output=True, text=True, timeout=60
+    )
+    if result.returncode != 0:
+        raise AssertionError(result.stderr)
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+class TestDatabasePool(unittest.TestCase):
+    def test_single_pool_sized_from_settings(self):
+        """Both database modules share one engine whose pool follows the configured size"""
+        status = pool_status(WORKER_THREADS='3', DB_MAX_OVERFLOW='1', SERVER_MAX_THREADS='6')
+
+        self.assertTrue(status['shared_engine'])
+        self.assertTrue(status['shared_base'])
+        self.assertTrue(status['shared_session'])
+        self.assertTrue(status['single_preferences_model'])
+        # The pool settings come from config.server, not from the WSGI server module
+        self.assertFalse(status['imports_server'])
+        self.assertEqual(status['pool']['size'], 3)
+        # 3 more for the autoscaled threads, 1 spare
+        self.assertEqual(status['pool']['max_connections'], 7)
+        # Creating the engine doesn't open connections
+        self.assertEqual(status['pool']['checked_out'], 0)
+        self.assertEqual(status['pool']['connects'], 0)
+
+    def test_pool_covers_autoscaled_threads(self):
+        """Every request thread the autoscaler can start gets a connection without waiting"""
+        for settings in ({}, {'WORKER_THREADS': '8'}, {'SERVER_MAX_THREADS': '40'},
+                         {'DB_POOL_SIZE': '2', 'DB_MAX_OVERFLOW': '0'}, {'DB_POOL_SIZE': '50'}):
+            with self.subTest(**settings):
+                status = pool_status(**settings)
+                self.assertGreaterEqual(status['pool']['max_connections'], status['server_max_threads'])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,105 @@
+import os
+import sys
+import unittest
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+from unittest import mock
+
+import pytz
+from sqlalchemy import create_engine
+from sqlalchemy.pool import StaticPool
+
+# Add project root to path
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(project_root)
+
+from backend import database
+from models.forex_event import ForexEvent
+from scripts import email_scheduler, generate_summaries
+
+
+class StubAIService:
+    def __init__(self):
+        self.requested = []
+
+    def request_summary(self, event):
+        self.requested.append(event['event_title'])
+        return f"Summary of {event['event_title']}"
+
+
+class TestDigestPrecompute(unittest.TestCase):
+    def setUp(self):
+        self.engine = create_engine('sqlite://', poolclass=StaticPool,
+                                    connect_args={'check_same_thread': False})
+        ForexEvent.__table__.create(self.engine)
+        self.ai_service = StubAIService()
+        for patch in (mock.patch.object(database, 'get_engine', return_value=self.engine),
+                      mock.patch.object(generate_summaries, 'AISummaryService', return_value=self.ai_service),
+                      mock.patch.object(generate_summaries, 'publish_change_set')):
+            patch.start()
+            self.addCleanup(patch.stop)
+        database.db_session.remove()
+        self.addCleanup(database.db_session.remove)
+
+    def add_event(self, title, time, currency='USD', impact='High', ai_summary=None):
+        database.db_session.add(ForexEvent(event_title=title, currency=currency, impact=impact, time=time,
+                                           ai_summary=ai_summary))
+
+    def test_precompute_window(self):
+        """Events from midnight UTC up to DIGEST_PRECOMPUTE_DAYS ahead get summaries; nothing else is requested"""
+        midnight = datetime.now(pytz.UTC).replace(hour=0, minute=0, second=0, microsecond=0, tzinfo=None)
+        self.add_event('Released today', midnight + timedelta(minutes=1))
+        self.add_event('Next week', midnight + timedelta(days=generate_summaries.DIGEST_PRECOMPUTE_DAYS - 1))
+        self.add_event('GBP CPI', midnight + timedelta(days=1), currency='GBP')
+        self.add_event('Yesterday', midnight - timedelta(hours=1))
+        self.add_event('Too far ahead', midnight + timedelta(days=generate_summaries.DIGEST_PRECOMPUTE_DAYS + 1))
+        self.add_event('Low impact', midnight + timedelta(days=1), impact='Low')
+        self.add_event('EUR event', midnight + timedelta(days=1), currency='EUR')
+        self.add_event('Summarized', midnight + timedelta(days=1), ai_summary='Already there')
+        database.db_session.commit()
+
+        stats = generate_summaries.precompute_digest_summaries()
+
+        self.assertEqual(sorted(self.ai_service.requested), ['GBP CPI', 'Next week', 'Released today'])
+        self.assertEqual((stats['total'], stats['generated'], stats['failed']), (3, 3, 0))
+        database.db_session.remove()
+        summarized = ForexEvent.query.filter(ForexEvent.ai_summary.isnot(None)).all()
+        self.assertEqual(len(summarized), 4)
+
+    def test_empty_window_skips_ai_service(self):
+        stats = generate_summaries.precompute_digest_summaries()
+        self.assertEqual(stats, {'total': 0, 'generated': 0, 'failed': 0, 'commits': 0})
+        self.assertEqual(self.ai_service.requested, [])
+
+
+class TestDigestRunBudget(unittest.TestCase):
+    def test_daily_run_stops_at_budget(self):
+        """Sends that would start after DIGEST_RUN_BUDGET_SECONDS are abandoned"""
+        now = datetime.now(pytz.UTC)
+        subscriptions = [SimpleNamespace(email=f"user{i}@example.com", timezone='UTC',
+                                         daily_time=now.strftime('%H:%M')) for i in range(5)]
+        subscription_model = mock.Mock()
+        subscription_model.query.filter.return_value.all.return_value = subscriptions
+
+        # Each send takes ten minutes of the 25 minute budget
+        clock = [1000.0]
+        sent = []
+
+        def send(subscription):
+            sent.append(subscription.email)
+            clock[0] += 600
+
+        fixed_datetime = mock.Mock(wraps=datetime)
+        fixed_datetime.now.return_value = now
+        with mock.patch.object(email_scheduler, 'EmailSubscription', subscription_model), \
+                mock.patch.object(email_scheduler, 'send_daily_update', side_effect=send), \
+                mock.patch.object(email_scheduler, 'datetime', fixed_datetime), \
+                mock.patch.object(email_scheduler, 'DIGEST_RUN_BUDGET_SECONDS', 25 * 60), \
+                mock.patch.object(email_scheduler, 'time', SimpleNamespace(monotonic=lambda: clock[0])):
+            email_scheduler.send_daily_updates()
+
+        self.assertEqual(sent, ['user0@example.com', 'user1@example.com', 'user2@example.com'])
+
+
+if __name__ == '__main__':
+    unittest.main()
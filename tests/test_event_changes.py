@@ -0,0 +1,105 @@
+import os
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+from flask import Flask
+
+# Add project root to path
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(project_root)
+
+from backend.events import change_sets, event_store
+from backend.main import route_handler
+
+CPI = {'time': '2024-03-12T12:30:00+00:00', 'currency': 'USD', 'impact': 'High',
+       'event_title': 'CPI m/m', 'forecast': '0.4%', 'previous': '0.3%', 'actual': ''}
+GDP = {'time': '2024-03-13T07:00:00+00:00', 'currency': 'GBP', 'impact': 'Medium',
+       'event_title': 'GDP m/m', 'forecast': '0.2%', 'previous': '-0.1%', 'actual': ''}
+PPI = {'time': '2024-03-14T12:30:00+00:00', 'currency': 'USD', 'impact': 'High',
+       'event_title': 'PPI m/m', 'forecast': '0.3%', 'previous': '0.3%', 'actual': ''}
+
+
+class TestEventChanges(unittest.TestCase):
+    def setUp(self):
+        tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp_dir.cleanup)
+        self.path = os.path.join(tmp_dir.name, 'event_diffs.json')
+
+        # Snapshots 1 -> 2 -> 3: CPI is released, GDP is revised to Low impact, PPI is added
+        self.versions = [[CPI, GDP], [dict(CPI, actual='0.5%'), GDP],
+                         [dict(CPI, actual='0.5%'), dict(GDP, impact='Low'), PPI]]
+        for version in (2, 3):
+            diff = event_store.diff_events(self.versions[version - 2], self.versions[version - 1])
+            change_sets.publish_event_diff(version, version - 1, diff, path=self.path)
+
+    def test_ring_ages_out(self):
+        self.assertEqual([d['version'] for d in change_sets.event_diffs_since(1, 3, path=self.path)], [2, 3])
+        self.assertEqual(change_sets.event_diffs_since(3, 3, path=self.path), [])
+        with mock.patch.object(change_sets, 'EVENT_DIFF_HISTORY', 2):
+            change_sets.publish_event_diff(4, 3, {'inserted': [], 'updated': [], 'removed': []}, path=self.path)
+        self.assertIsNone(change_sets.event_diffs_since(1, 4, path=self.path))
+        self.assertEqual(len(change_sets.event_diffs_since(2, 4, path=self.path)), 2)
+
+    def test_merged_diffs_match_direct_diff(self):
+        merged = event_store.merge_event_diffs(change_sets.event_diffs_since(1, 3, path=self.path))
+        self.assertEqual(merged, event_store.diff_events(self.versions[0], self.versions[2]))
+
+    def request(self, query_string, convert=lambda events, *args: events):
+        app = Flask(__name__)
+        with app.test_request_context('/events/changes', query_string=query_string), \
+                mock.patch.object(route_handler, 'sync_from_snapshot'), \
+                mock.patch.dict(route_handler.event_store, {'version': 3}), \
+                mock.patch.object(route_handler, 'event_diffs_since',
+                                  lambda since, current: change_sets.event_diffs_since(since, current, path=self.path)), \
+                mock.patch.object(route_handler, 'get_user_timezone', return_value='America/New_York'), \
+                mock.patch.object(route_handler, 'convert_to_local_time', convert):
+            return route_handler.handle_event_changes_request()
+
+    def test_changes_since_version(self):
+        body, status = self.request({'since': '1'})
+        self.assertEqual(status, 200)
+        self.assertFalse(body['resync'])
+        self.assertEqual(body['version'], 3)
+        self.assertEqual(body['inserted'], [PPI])
+        self.assertEqual(body['removed'], [])
+        self.assertEqual({u['event']['event_title']: u['changes'] for u in body['updated']}, {
+            'CPI m/m': {'actual': ['', '0.5%']},
+            'GDP m/m': {'impact': ['Medium', 'Low']}
+        })
+
+    def test_changes_converted_per_list(self):
+        """The timezone is looked up once and each list is converted in one call"""
+        calls = []
+
+        def convert(events, user_id, time_range, user_tz):
+            calls.append((len(events), user_tz))
+            # Converting sorts by time; reverse to check updates are matched back
+            return [dict(event, time=f"local {event['time']}") for event in reversed(events)]
+
+        body, _ = self.request({'since': '1'}, convert)
+        self.assertEqual(calls, [(2, 'America/New_York'), (1, 'America/New_York'), (0, 'America/New_York')])
+        self.assertEqual({u['event']['event_title']: (u['event']['time'], u['changes']) for u in body['updated']}, {
+            'CPI m/m': (f"local {CPI['time']}", {'actual': ['', '0.5%']}),
+            'GDP m/m': (f"local {GDP['time']}", {'impact': ['Medium', 'Low']})
+        })
+        self.assertNotIn('_update', body['updated'][0]['event'])
+
+    def test_filtered_changes(self):
+        """GDP leaving the Medium filter is reported as removed"""
+        body, _ = self.request({'since': '1', 'impacts': 'Medium'})
+        self.assertEqual(body['inserted'], [])
+        self.assertEqual(body['updated'], [])
+        self.assertEqual(body['removed'], [GDP])
+
+    def test_resync(self):
+        for since in ('0', '5'):
+            body, status = self.request({'since': since})
+            self.assertEqual((status, body['resync'], body['version']), (200, True, 3))
+        _, status = self.request({'since': 'latest'})
+        self.assertEqual(status, 400)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,103 @@
+import os
+import sys
+import unittest
+from datetime import datetime
+from unittest import mock
+
+from flask import Flask
+from sqlalchemy import create_engine
+from sqlalchemy.pool import StaticPool
+
+# Add project root to path
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(project_root)
+
+from backend import database
+from backend.main import route_handler
+from models.forex_event import ForexEvent
+
+
+class TestEventFields(unittest.TestCase):
+    def setUp(self):
+        self.engine = create_engine('sqlite://', poolclass=StaticPool,
+                                    connect_args={'check_same_thread': False})
+        ForexEvent.__table__.create(self.engine)
+        patch = mock.patch.object(database, 'get_engine', return_value=self.engine)
+        patch.start()
+        self.addCleanup(patch.stop)
+        database.db_session.remove()
+        self.addCleanup(database.db_session.remove)
+
+        summarized = ForexEvent(event_title='CPI m/m', currency='USD', impact='High',
+                                time=datetime(2024, 3, 12, 12, 30), ai_summary='Inflation is expected to...')
+        summarized.summary_generated_at = datetime(2024, 3, 11, 9, 0)
+        database.db_session.add_all([
+            summarized,
+            ForexEvent(event_title='GDP q/q', currency='GBP', impact='High', time=datetime(2024, 3, 13, 7, 0))
+        ])
+        database.db_session.commit()
+        self.app = Flask(__name__)
+
+    def test_fields_parameter(self):
+        """No fields gives the compact shape; unknown fields are rejected"""
+        self.assertNotIn('ai_summary', route_handler.parse_fields(None))
+        self.assertEqual(route_handler.parse_fields('all'), database.EVENT_COLUMNS)
+        self.assertEqual(route_handler.parse_fields('ai_summary, currency'), ('currency', 'time', 'ai_summary'))
+        with self.assertRaises(ValueError):
+            route_handler.parse_fields('currency,password')
+
+    def test_compact_query_skips_summary_columns(self):
+        """The compact shape doesn't select the summary or bookkeeping columns"""
+        sql = str(database.build_events_query(columns=database.COMPACT_EVENT_COLUMNS))
+        for name in ('ai_summary', 'summary_generated_at', 'created_at', 'updated_at'):
+            self.assertNotIn(name, sql)
+
+        events = database.get_filtered_events(columns=database.COMPACT_EVENT_COLUMNS)
+        self.assertEqual(len(events), 2)
+        self.assertEqual(set(events[0]), set(database.COMPACT_EVENT_COLUMNS))
+
+    def test_summary_endpoint_is_cacheable(self):
+        """Summaries carry cache headers and revalidate with a 304"""
+        with self.app.test_request_context():
+            response, status = route_handler.handle_event_summary_request(1)
+        self.assertEqual(status, 200)
+        self.assertEqual(response.get_json()['ai_summary'], 'Inflation is expected to...')
+        self.assertEqual(response.cache_control.max_age, route_handler.SUMMARY_CACHE_SECONDS)
+        etag = response.headers['ETag']
+
+        with self.app.test_request_context(headers={'If-None-Match': etag}):
+            response, status = route_handler.handle_event_summary_request(1)
+        self.assertEqual(status, 304)
+
+        with self.app.test_request_context():
+            response, status = route_handler.handle_event_summary_request(2)
+            self.assertEqual(status, 200)
+            self.assertEqual(response.cache_control.max_age, route_handler.PENDING_SUMMARY_CACHE_SECONDS)
+            _, status = route_handler.handle_event_summary_request(99)
+            self.assertEqual(status, 404)
+
+    def summary_by_key(self, **args):
+        with self.app.test_request_context('/events/summary', query_string=args):
+            return route_handler.handle_event_summary_lookup_request()
+
+    def test_summary_by_listed_time(self):
+        """Events without an id are found by currency, title and the time they were listed at"""
+        response, status = self.summary_by_key(currency='usd', event_title='CPI m/m',
+                                               time='2024-03-12 08:30', timezone='America/New_York')
+        self.assertEqual(status, 200)
+        self.assertEqual(response.get_json()['id'], 1)
+        self.assertEqual(response.cache_control.max_age, route_handler.SUMMARY_CACHE_SECONDS)
+
+        with mock.patch.object(route_handler, 'get_user_timezone', return_value='Europe/London'):
+            response, status = self.summary_by_key(currency='USD', event_title='CPI m/m',
+                                                   time='2024-03-12 12:30', userId='user-1')
+        self.assertEqual(response.get_json()['ai_summary'], 'Inflation is expected to...')
+
+        _, status = self.summary_by_key(currency='USD', event_title='CPI m/m',
+                                        time='2024-03-12 12:30', timezone='America/New_York')
+        self.assertEqual(status, 404)
+        _, status = self.summary_by_key(currency='USD', event_title='CPI m/m', time='12:30', timezone='UTC')
+        self.assertEqual(status, 400)
+
+if __name__ == '__main__':
+    unittest.main()
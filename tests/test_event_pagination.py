@@ -0,0 +1,140 @@
+import os
+import sys
+import json
+import tempfile
+import unittest
+from datetime import datetime, timedelta
+from unittest import mock
+
+from flask import Flask
+from sqlalchemy import create_engine
+from sqlalchemy.pool import StaticPool
+
+# Add project root to path
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(project_root)
+
+from backend import database
+from backend.events import event_store
+from backend.main import route_handler
+from models.forex_event import ForexEvent
+
+FIRST_SUNDAY = datetime(2024, 3, 3)
+
+
+class TestEventPagination(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp_dir.cleanup)
+        self.engine = create_engine('sqlite://', poolclass=StaticPool,
+                                    connect_args={'check_same_thread': False})
+        ForexEvent.__table__.create(self.engine)
+        patches = [
+            mock.patch.object(event_store, 'WEEKLY_STORAGE_DIR', self.tmp_dir.name),
+            mock.patch.object(database, 'get_engine', return_value=self.engine),
+            mock.patch.object(route_handler, 'get_user_timezone', return_value='UTC')
+        ]
+        for patch in patches:
+            patch.start()
+            self.addCleanup(patch.stop)
+        database.db_session.remove()
+        self.addCleanup(database.db_session.remove)
+
+        self.app = Flask(__name__)
+        self.app.add_url_rule('/events', 'events', lambda: route_handler.handle_events_request())
+
+    def write_weeks(self, weeks, per_day):
+        """Weekly files with per_day events a day, two of them released at the same time."""
+        for week in range(weeks):
+            start = FIRST_SUNDAY + timedelta(weeks=week)
+            events = []
+            for day in range(7):
+                for i in range(per_day):
+                    released = start + timedelta(days=day, hours=8 + i // 2)
+                    events.append({'time': released.isoformat() + '+00:00', 'currency': ['USD', 'EUR'][i % 2],
+                                   'impact': 'High', 'event_title': f'Event {i}', 'forecast': '', 'previous': ''})
+            filename = f"week_{start:%Y%m%d}_to_{start + timedelta(days=6):%Y%m%d}.json"
+            with open(os.path.join(self.tmp_dir.name, filename), 'w') as f:
+                json.dump(events, f)
+
+    def fetch_pages(self, url):
+        events, pages = [], 0
+        with self.app.test_client() as client:
+            while url:
+                response = client.get(url)
+                self.assertEqual(response.status_code, 200, response.get_data(as_text=True))
+                events.extend(response.get_json())
+                pages += 1
+                cursor = response.headers.get('X-Next-Cursor')
+                url = f"{url.split('&cursor=')[0]}&cursor={cursor}" if cursor else None
+        return events, pages
+
+    def test_pages_through_weekly_files(self):
+        """Cursor pages cover the range once each, in order, across file boundaries"""
+        self.write_weeks(weeks=3, per_day=4)
+        events, pages = self.fetch_pages('/events?time_range=date_range&start_date=2024-03-05'
+                                         '&end_date=2024-03-19&limit=10')
+
+        self.assertEqual(len(events), 15 * 4)
+        self.assertEqual(pages, 6)
+        keys = [(e['time'], e['currency']) for e in events]
+        self.assertEqual(keys, sorted(keys))
+        self.assertEqual(len(set(keys)), len(keys))
+
+    def test_pages_through_shared_timestamp(self):
+        """Events at one time are paged by id as numbers, also across a digit boundary"""
+        start = FIRST_SUNDAY + timedelta(days=2)
+        released = (start + timedelta(hours=12, minutes=30)).isoformat() + '+00:00'
+        events = [{'id': event_id, 'time': released, 'currency': 'USD', 'impact': 'High',
+                   'event_title': f'Event {event_id}', 'forecast': '', 'previous': ''}
+                  for event_id in (11, 9, 10, 8)]
+        events.append({'time': released, 'currency': 'EUR', 'impact': 'High',
+                       'event_title': 'No id', 'forecast': '', 'previous': ''})
+        filename = f"week_{FIRST_SUNDAY:%Y%m%d}_to_{FIRST_SUNDAY + timedelta(days=6):%Y%m%d}.json"
+        with open(os.path.join(self.tmp_dir.name, filename), 'w') as f:
+            json.dump(events, f)
+
+        events, pages = self.fetch_pages('/events?time_range=date_range&start_date=2024-03-05'
+                                         '&end_date=2024-03-05&limit=2&fields=id,event_title')
+        self.assertEqual(pages, 3)
+        self.assertEqual([e.get('id') for e in events], [None, 8, 9, 10, 11])
+
+    def test_ndjson_streams_whole_range(self):
+        """NDJSON without a limit streams every event, one per line"""
+        self.write_weeks(weeks=2, per_day=3)
+        with self.app.test_client() as client:
+            response = client.get('/events?time_range=date_range&start_date=2024-03-03&end_date=2024-03-16'
+                                  '&currencies=USD', headers={'Accept': 'application/x-ndjson'})
+            lines = response.get_data(as_text=True).splitlines()
+
+        self.assertEqual(response.mimetype, 'application/x-ndjson')
+        self.assertNotIn('X-Next-Cursor', response.headers)
+        self.assertEqual(len(lines), 14 * 2)
+        self.assertTrue(all(json.loads(line)['currency'] == 'USD' for line in lines))
+
+    def test_database_keyset_pages(self):
+        """Without weekly files the range is paged through the database by (time, id)"""
+        released = datetime(2024, 3, 5, 12, 30)
+        database.db_session.add_all([
+            ForexEvent(event_title=f'Event {i}', currency='USD', impact='High',
+                       time=released + timedelta(hours=i // 3))  # three events share each time
+            for i in range(20)
+        ])
+        database.db_session.commit()
+
+        streamed = list(database.iter_filtered_events(columns=('id', 'time'), batch_size=4))
+        self.assertEqual([e['id'] for e in streamed], list(range(1, 21)))
+
+        events, pages = self.fetch_pages('/events?time_range=date_range&start_date=2024-03-05'
+                                         '&end_date=2024-03-06&limit=6&fields=id,event_title')
+        self.assertEqual(pages, 4)
+        self.assertEqual([e['id'] for e in events], list(range(1, 21)))
+
+    def test_invalid_cursor_rejected(self):
+        with self.app.test_client() as client:
+            response = client.get('/events?time_range=date_range&start_date=2024-03-05'
+                                  '&end_date=2024-03-06&cursor=not-a-cursor')
+        self.assertEqual(response.status_code, 400)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,47 @@
+import os
+import sys
+import unittest
+from datetime import datetime
+
+# Add project root to path
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(project_root)
+
+from backend.database import EVENT_COLUMNS, build_events_query, rows_to_event_dicts
+from models.forex_event import ForexEvent
+
+
+class TestEventQueries(unittest.TestCase):
+    def test_rows_match_orm_to_dict(self):
+        """Core rows convert to the same dictionaries as ForexEvent.to_dict()"""
+        event = ForexEvent(
+            event_title='CPI m/m', currency='USD', impact='High',
+            time=datetime(2024, 3, 12, 12, 30), forecast='0.4%', previous='0.3%',
+            actual='0.4%', url='', source='forexfactory'
+        )
+        event.id = 7
+        row = tuple(getattr(event, name) for name in EVENT_COLUMNS)
+
+        self.assertEqual(rows_to_event_dicts([row]), [event.to_dict()])
+
+    def test_shared_timestamps_formatted_once(self):
+        """Repeated timestamps produce identical strings and None stays None"""
+        released = datetime(2024, 3, 12, 12, 30)
+        rows = [(released, None), (released, None)]
+        events = rows_to_event_dicts(rows, columns=('time', 'summary_generated_at'))
+
+        self.assertEqual(events[0]['time'], '2024-03-12T12:30:00')
+        self.assertIs(events[0]['time'], events[1]['time'])
+        self.assertIsNone(events[1]['summary_generated_at'])
+
+    def test_query_selects_only_requested_columns(self):
+        """The query reads only the requested columns and keeps the impact filters"""
+        query = build_events_query(impact_levels=['high', 'non-economic'], columns=('id', 'time'))
+        sql = str(query)
+
+        self.assertEqual([c.name for c in query.selected_columns], ['id', 'time'])
+        self.assertNotIn('ai_summary', sql)
+        self.assertIn('NOT IN', sql)
+
+if __name__ == '__main__':
+    unittest.main()
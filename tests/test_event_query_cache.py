@@ -0,0 +1,156 @@
+import os
+import sys
+import time
+import tempfile
+import threading
+import unittest
+import unittest.mock
+from datetime import datetime, timedelta
+
+import pytz
+
+# Add project root to path
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(project_root)
+
+from backend.events.change_sets import publish_change_set
+from backend.services.event_query_cache import EventQueryCache
+
+
+class FakeRedis:
+    def __init__(self):
+        self.data = {}
+
+    def get(self, key):
+        return self.data.get(key)
+
+    def set(self, key, value, ex=None):
+        self.data[key] = value
+
+
+class CountingLoader:
+    def __init__(self, delay=0.0):
+        self.calls = 0
+        self.delay = delay
+        self.lock = threading.Lock()
+
+    def __call__(self, start_time, end_time, currencies, impact_levels):
+        with self.lock:
+            self.calls += 1
+        time.sleep(self.delay)
+        # The query runs over the widened bucket; keep the row inside every caller's exact window
+        event_time = start_time + timedelta(minutes=5)
+        return [{'time': event_time.isoformat(), 'currencies': currencies, 'impacts': impact_levels}]
+
+
+class TestEventQueryCache(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.change_sets = os.path.join(self.tmp_dir.name, 'event_change_sets.json')
+        self.now = datetime(2024, 3, 12, 12, 0, 10, tzinfo=pytz.UTC)
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def make_cache(self, **kwargs):
+        return EventQueryCache(change_set_path=self.change_sets, sync_interval=0, **kwargs)
+
+    def test_equivalent_queries_share_an_entry(self):
+        """Times in the same bucket and reordered filters hit the same entry"""
+        cache = self.make_cache()
+        loader = CountingLoader()
+
+        first = cache.get_or_load(self.now, self.now + timedelta(days=1), ['usd', 'EUR'], ['High'], loader)
+        second = cache.get_or_load(self.now + timedelta(seconds=20), self.now + timedelta(days=1, seconds=20),
+                                   ['EUR', 'USD '], ['high'], loader)
+
+        self.assertIs(first, second)
+        self.assertEqual(loader.calls, 1)
+        self.assertEqual(first[0]['currencies'], ['EUR', 'USD'])
+        self.assertEqual(cache.stats()['hits'], 1)
+
+    def test_rows_are_trimmed_to_the_exact_window(self):
+        """Callers sharing a bucketed entry only get the events inside their own start and end"""
+        cache = self.make_cache()
+        bucket_start = self.now.replace(second=0)
+        # Naive UTC timestamps, as the database returns them
+        times = [bucket_start + timedelta(seconds=offset) for offset in (0, 5, 20, 3600, 3630)]
+        rows = [{'id': index, 'time': value.replace(tzinfo=None).isoformat()} for index, value in enumerate(times)]
+        calls = []
+
+        def loader(start_time, end_time, currencies, impact_levels):
+            calls.append((start_time, end_time))
+            return rows
+
+        narrow = cache.get_or_load(self.now, self.now + timedelta(hours=1), None, None, loader)
+        wide = cache.get_or_load(bucket_start, bucket_start + timedelta(seconds=3630), None, None, loader)
+
+        self.assertEqual(calls, [(bucket_start, bucket_start + timedelta(seconds=3660))])
+        self.assertEqual([event['id'] for event in narrow], [2, 3])
+        self.assertIs(wide, rows)
+
+    def test_concurrent_misses_run_one_query(self):
+        """Identical misses arriving together wait on a single query"""
+        cache = self.make_cache()
+        loader = CountingLoader(delay=0.1)
+        results = []
+
+        def request():
+            results.append(cache.get_or_load(self.now, self.now + timedelta(days=1), None, None, loader))
+
+        threads = [threading.Thread(target=request) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(loader.calls, 1)
+        self.assertEqual(len(results), 8)
+        self.assertTrue(all(result is results[0] for result in results))
+
+    def test_change_sets_invalidate_overlapping_entries(self):
+        """Only entries covering a changed event time are dropped"""
+        cache = self.make_cache()
+        loader = CountingLoader()
+        today = (self.now, self.now + timedelta(days=1))
+        next_week = (self.now + timedelta(days=7), self.now + timedelta(days=8))
+        for start, end in (today, next_week):
+            cache.get_or_load(start, end, None, None, loader)
+
+        publish_change_set([self.now + timedelta(hours=2)], path=self.change_sets)
+        for start, end in (today, next_week):
+            cache.get_or_load(start, end, None, None, loader)
+
+        # Only today's query ran again
+        self.assertEqual(loader.calls, 3)
+        self.assertEqual(cache.stats()['invalidated'], 1)
+
+    def test_aged_out_change_sets_clear_everything(self):
+        """If the change log no longer reaches back far enough the whole cache is dropped"""
+        cache = self.make_cache()
+        loader = CountingLoader()
+        cache.get_or_load(self.now, self.now + timedelta(days=1), None, None, loader)
+
+        with unittest.mock.patch('backend.events.change_sets.CHANGE_SET_HISTORY', 1):
+            publish_change_set([self.now + timedelta(days=30)], path=self.change_sets)
+            publish_change_set([self.now + timedelta(days=31)], path=self.change_sets)
+        cache.sync_changes(force=True)
+
+        self.assertEqual(cache.stats()['size'], 0)
+
+    def test_redis_tier_is_shared_between_caches(self):
+        """A second worker's cache is filled from Redis without querying"""
+        redis_client = FakeRedis()
+        loader = CountingLoader()
+        first = self.make_cache(redis_client=redis_client)
+        second = self.make_cache(redis_client=redis_client)
+
+        expected = first.get_or_load(self.now, self.now + timedelta(days=1), ['USD'], None, loader)
+        shared = second.get_or_load(self.now, self.now + timedelta(days=1), ['USD'], None, loader)
+
+        self.assertEqual(shared, expected)
+        self.assertEqual(loader.calls, 1)
+        self.assertEqual(second.stats()['redis_hits'], 1)
+
+if __name__ == '__main__':
+    unittest.main()
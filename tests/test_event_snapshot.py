@@ -0,0 +1,91 @@
+import os
+import sys
+import subprocess
+import tempfile
+import unittest
+from datetime import datetime
+
+import pytz
+
+# Add project root to path
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(project_root)
+
+from backend.events.snapshot import SnapshotReader, read_snapshot_header, write_snapshot
+
+EVENTS = [
+    {'time': '2024-03-12T12:30:00+00:00', 'currency': 'USD', 'impact': 'High', 'event_title': 'CPI m/m'},
+    {'time': '2024-03-13T09:00:00+00:00', 'currency': 'GBP', 'impact': 'High', 'event_title': 'GDP m/m'}
+]
+
+# Publishes a snapshot from a separate process, as the fetching worker would
+WRITER_SCRIPT = """
+import sys
+from datetime import datetime
+import pytz
+from backend.events.snapshot import write_snapshot
+events = [{'time': '2024-03-14T12:30:00+00:00', 'currency': 'USD', 'impact': 'High', 'event_title': 'PPI m/m'}]
+write_snapshot(events, datetime(2024, 3, 14, tzinfo=pytz.UTC), path=sys.argv[1])
+"""
+
+
+class TestEventSnapshot(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp_dir.name, 'events_snapshot.bin')
+        self.updated = datetime(2024, 3, 12, 8, 0, tzinfo=pytz.UTC)
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_reader_attaches_to_new_versions_only(self):
+        """The payload is parsed once per published version"""
+        reader = SnapshotReader(path=self.path, check_interval=0)
+        self.assertFalse(reader.refresh())
+
+        self.assertEqual(write_snapshot(EVENTS, self.updated, path=self.path), 1)
+        self.assertTrue(reader.refresh())
+        self.assertEqual(reader.events, EVENTS)
+        self.assertEqual(reader.last_updated, self.updated)
+        self.assertFalse(reader.refresh())
+
+        write_snapshot(EVENTS[:1], self.updated, path=self.path)
+        self.assertTrue(reader.refresh())
+        self.assertEqual(reader.version, 2)
+        self.assertEqual(reader.events, EVENTS[:1])
+        self.assertEqual(reader.stats()['reloads'], 2)
+
+    def test_writer_does_not_reload_its_own_snapshot(self):
+        """A process that adopts the snapshot it wrote skips parsing it back"""
+        reader = SnapshotReader(path=self.path, check_interval=0)
+        version = write_snapshot(EVENTS, self.updated, path=self.path)
+        reader.adopt(version, EVENTS, self.updated)
+
+        self.assertFalse(reader.refresh())
+        self.assertEqual(reader.stats()['reloads'], 0)
+
+    def test_snapshot_from_another_process(self):
+        """Workers see snapshots published by a different process"""
+        write_snapshot(EVENTS, self.updated, path=self.path)
+        reader = SnapshotReader(path=self.path, check_interval=0)
+        reader.refresh()
+
+        subprocess.run([sys.executable, '-c', WRITER_SCRIPT, self.path], cwd=project_root, check=True, timeout=60)
+
+        self.assertTrue(reader.refresh())
+        self.assertEqual(reader.version, 2)
+        self.assertEqual([e['event_title'] for e in reader.events], ['PPI m/m'])
+
+    def test_invalid_file_is_ignored(self):
+        """A file that isn't a snapshot leaves the reader as it was"""
+        with open(self.path, 'wb') as f:
+            f.write(b'not a snapshot at all, just some bytes')
+        reader = SnapshotReader(path=self.path, check_interval=0)
+
+        self.assertIsNone(read_snapshot_header(self.path))
+        self.assertFalse(reader.refresh())
+        self.assertIsNone(reader.events)
+        self.assertEqual(reader.stats()['errors'], 1)
+
+if __name__ == '__main__':
+    unittest.main()
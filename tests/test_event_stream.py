@@ -0,0 +1,152 @@
+import os
+import sys
+import json
+import socket
+import subprocess
+import unittest
+from unittest import mock
+
+# Add project root to path
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(project_root)
+
+from backend.events import event_store
+from backend.services.event_stream import EventStreamHub, SSEServer, format_sse
+
+CPI = {'time': '2024-03-12T12:30:00+00:00', 'currency': 'USD', 'impact': 'High',
+       'event_title': 'CPI m/m', 'forecast': '0.4%', 'previous': '0.3%', 'actual': ''}
+PPI = {'time': '2024-03-14T12:30:00+00:00', 'currency': 'USD', 'impact': 'High',
+       'event_title': 'PPI m/m', 'forecast': '0.3%', 'previous': '0.3%', 'actual': ''}
+
+
+def parse_messages(raw):
+    """Split a Server-Sent Events body into (event, data) pairs, skipping comments"""
+    messages = []
+    for block in raw.decode().split('\n\n'):
+        fields = dict(line.split(': ', 1) for line in block.split('\n') if ': ' in line and not line.startswith(':'))
+        if 'event' in fields:
+            messages.append((fields['event'], json.loads(fields['data'])))
+    return messages
+
+
+class TestEventStreamHub(unittest.TestCase):
+    def test_fan_out_and_overflow(self):
+        """Every subscriber gets each message; one that falls behind gets a single resync"""
+        hub = EventStreamHub(queue_size=3)
+        reader = hub.subscribe()
+        stalled = hub.subscribe()
+
+        for version in range(1, 6):
+            hub.publish('snapshot', {'version': version}, version)
+            self.assertEqual(parse_messages(reader.get(timeout=1)), [('snapshot', {'version': version})])
+
+        messages = []
+        while (message := stalled.get_nowait()) is not None:
+            messages.extend(parse_messages(message))
+        self.assertEqual(messages[0], ('resync', {'version': 4}))
+        self.assertEqual(stalled.overflows, 1)
+        self.assertEqual(hub.stats()['overflows'], 1)
+
+        # New subscribers start from the latest snapshot
+        late = hub.subscribe()
+        self.assertEqual(parse_messages(late.get(timeout=1)), [('snapshot', {'version': 5})])
+
+    def test_subscriber_limit(self):
+        hub = EventStreamHub()
+        first = hub.subscribe(limit=1)
+        self.assertIsNone(hub.subscribe(limit=1))
+        first.close()
+        self.assertIsNotNone(hub.subscribe(limit=1))
+
+
+class TestEventDiff(unittest.TestCase):
+    def test_diff_events(self):
+        released = dict(CPI, actual='0.5%')
+        nfp = dict(PPI, event_title='Non-Farm Employment Change')
+        diff = event_store.diff_events([CPI, PPI], [released, nfp])
+
+        self.assertEqual(diff['inserted'], [nfp])
+        self.assertEqual(diff['removed'], [PPI])
+        self.assertEqual(diff['updated'], [{'event': released, 'changes': {'actual': ['', '0.5%']}}])
+        self.assertEqual(event_store.diff_events([CPI], [dict(CPI)]),
+                         {'inserted': [], 'updated': [], 'removed': []})
+
+    def test_store_events_publishes_diff(self):
+        hub = EventStreamHub()
+        subscription = hub.subscribe()
+        with mock.patch.object(event_store, 'get_event_stream_hub', return_value=hub), \
+                mock.patch.dict(event_store.event_store, {'events': [CPI], 'version': 7}), \
+                mock.patch.object(event_store, 'publish_snapshot',
+                                  side_effect=lambda: event_store.event_store.update(version=8)), \
+                mock.patch.object(event_store, 'publish_event_diff') as publish_event_diff, \
+                mock.patch.object(event_store, 'store_weekly_events'), \
+                mock.patch('builtins.open', mock.mock_open()), \
+                mock.patch.object(event_store.os, 'makedirs'):
+            event_store.store_events([dict(CPI, actual='0.5%')])
+
+        snapshot = parse_messages(subscription.get(timeout=1))
+        diff = parse_messages(subscription.get(timeout=1))
+        self.assertEqual(snapshot[0][0], 'snapshot')
+        self.assertEqual(snapshot[0][1]['version'], 8)
+        self.assertEqual(publish_event_diff.call_args[0][:2], (8, 7))
+        self.assertEqual(diff[0][0], 'diff')
+        self.assertEqual(diff[0][1]['updated'][0]['changes'], {'actual': ['', '0.5%']})
+
+
+class TestWSGIStreamCap(unittest.TestCase):
+    def test_cap_leaves_request_threads_free(self):
+        """/events/stream never takes more than WORKER_THREADS - 2 request threads"""
+        script = ("from backend.services import event_stream as s; "
+                  "print(s.SSE_MAX_WSGI_CLIENTS, s.WORKER_THREADS)")
+        for threads, requested in (('4', ''), ('4', '50'), ('1', ''), ('16', '')):
+            env = dict(os.environ, WORKER_THREADS=threads, SSE_MAX_WSGI_CLIENTS=requested)
+            result = subprocess.run([sys.executable, '-c', script], cwd=project_root, env=env,
+                                    capture_output=True, text=True, timeout=60)
+            self.assertEqual(result.returncode, 0, result.stderr)
+            cap, pool = map(int, result.stdout.split()[-2:])
+            self.assertEqual(pool, int(threads))
+            self.assertEqual(cap, max(0, pool - 2))
+
+
+class TestSSEServer(unittest.TestCase):
+    def setUp(self):
+        self.hub = EventStreamHub()
+        self.server = SSEServer(self.hub, host='127.0.0.1', port=0, heartbeat_seconds=60)
+        self.server.start()
+        self.addCleanup(self.server.stop)
+
+    def connect(self, path='/events/stream'):
+        sock = socket.create_connection(('127.0.0.1', self.server.port), timeout=5)
+        self.addCleanup(sock.close)
+        sock.sendall(f"GET {path} HTTP/1.1\r\nHost: localhost\r\nAccept: text/event-stream\r\n\r\n".encode())
+        return sock
+
+    def read_until(self, sock, marker):
+        data = b''
+        while marker not in data:
+            chunk = sock.recv(4096)
+            if not chunk:
+                break
+            data += chunk
+        return data
+
+    def test_broadcasts_to_clients(self):
+        self.hub.publish('snapshot', {'version': 1}, 1)
+        clients = [self.connect() for _ in range(3)]
+        for sock in clients:
+            head = self.read_until(sock, b'"version":1}')
+            self.assertTrue(head.startswith(b'HTTP/1.1 200 OK'))
+            self.assertIn(b'text/event-stream', head)
+
+        self.hub.publish('diff', {'version': 2, 'updated': []}, 2)
+        for sock in clients:
+            body = self.read_until(sock, b'"version":2')
+            self.assertEqual(parse_messages(body), [('diff', {'version': 2, 'updated': []})])
+
+    def test_rejects_other_paths(self):
+        sock = self.connect('/events')
+        self.assertTrue(self.read_until(sock, b'\r\n\r\n').startswith(b'HTTP/1.1 404'))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,183 @@
+import os
+import sys
+import json
+import threading
+import time
+import unittest
+from unittest import mock
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Add project root to path
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(project_root)
+
+import requests
+
+from backend.services import paypal_client
+from backend.services.http_client import CircuitBreaker, CircuitOpenError, HttpClient, LatencyHistogram
+from backend.services.paypal_client import PayPalClient
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    """Local stand-in for the services the app calls out to."""
+    protocol_version = 'HTTP/1.1'  # keep-alive
+
+    def log_message(self, format, *args):
+        pass
+
+    def send_json(self, status, payload):
+        data = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_GET(self):
+        server = self.server
+        with server.lock:
+            server.connections.add(self.client_address)
+            server.hits[self.path] = server.hits.get(self.path, 0) + 1
+            hits = server.hits[self.path]
+        if self.path == '/flaky' and hits % 2 == 1:
+            self.send_json(503, {'error': 'overloaded'})
+        elif self.path == '/down':
+            self.send_json(500, {'error': 'down'})
+        else:
+            self.send_json(200, {'path': self.path, 'hits': hits})
+
+    def do_POST(self):
+        server = self.server
+        length = int(self.headers.get('Content-Length', 0))
+        self.rfile.read(length)
+        with server.lock:
+            server.hits[self.path] = server.hits.get(self.path, 0) + 1
+        if self.path == '/v1/oauth2/token':
+            with server.lock:
+                server.token_count += 1
+                token = f"token-{server.token_count}"
+            self.send_json(200, {'access_token': token, 'expires_in': 32400})
+            return
+        with server.lock:
+            server.request_ids.append((self.path, self.headers.get('PayPal-Request-Id')))
+        time.sleep(server.delay)
+        if self.headers.get('Authorization') in server.revoked:
+            self.send_json(401, {'error': 'invalid_token'})
+            return
+        self.send_json(201, {'id': 'ORDER-1', 'auth': self.headers.get('Authorization')})
+
+
+class TestHttpClient(unittest.TestCase):
+    def setUp(self):
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), StubHandler)
+        self.server.lock = threading.Lock()
+        self.server.connections = set()
+        self.server.hits = {}
+        self.server.token_count = 0
+        self.server.revoked = set()
+        self.server.request_ids = []
+        self.server.delay = 0
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.base_url = f"http://127.0.0.1:{self.server.server_address[1]}"
+        self.host = f"127.0.0.1:{self.server.server_address[1]}"
+        self.client = HttpClient(retries=2, retry_backoff=0)
+
+    def tearDown(self):
+        self.client.session.close()
+        self.server.shutdown()
+        self.server.server_close()
+
+    def test_reuses_connections_and_records_latency(self):
+        """Repeated calls share one keep-alive connection and land in the histogram"""
+        for _ in range(5):
+            self.assertEqual(self.client.get(f"{self.base_url}/ok").status_code, 200)
+
+        self.assertEqual(len(self.server.connections), 1)
+        stats = self.client.stats()[self.host]
+        self.assertEqual(stats['latency']['count'], 5)
+        self.assertEqual(sum(stats['latency']['buckets'].values()), 5)
+        self.assertEqual(stats['circuit'], 'closed')
+
+    def test_retries_idempotent_requests(self):
+        """A 503 on GET is retried; the caller only sees the successful response"""
+        response = self.client.get(f"{self.base_url}/flaky")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.server.hits['/flaky'], 2)
+        self.assertEqual(self.client.stats()[self.host]['errors'], 0)
+
+    def test_circuit_opens_and_recovers(self):
+        """Consecutive failures open the breaker; after the reset one trial call goes through"""
+        client = HttpClient(retries=0)
+        host_stats = client._host_stats(self.host)
+        host_stats.breaker = CircuitBreaker(failure_threshold=3, reset_seconds=0.2)
+
+        for _ in range(3):
+            self.assertEqual(client.get(f"{self.base_url}/down").status_code, 500)
+        with self.assertRaises(CircuitOpenError):
+            client.get(f"{self.base_url}/ok")
+        self.assertEqual(self.server.hits.get('/ok', 0), 0)
+
+        time.sleep(0.25)
+        self.assertEqual(client.get(f"{self.base_url}/ok").status_code, 200)
+        stats = client.stats()[self.host]
+        self.assertEqual(stats['circuit'], 'closed')
+        self.assertEqual(stats['errors'], 3)
+        self.assertEqual(stats['rejected'], 1)
+        client.session.close()
+
+    def test_histogram_quantiles(self):
+        histogram = LatencyHistogram(buckets=(10, 100))
+        for value in (1, 2, 3, 50, 500):
+            histogram.observe(value)
+        self.assertEqual(histogram.quantile(0.5), 10)
+        self.assertEqual(histogram.quantile(0.8), 100)
+        self.assertIsNone(histogram.quantile(1.0))
+        self.assertEqual(histogram.snapshot()['buckets'], {'le_10': 3, 'le_100': 1, 'inf': 1})
+
+    def test_paypal_token_is_cached(self):
+        """One OAuth token serves several calls and is replaced when PayPal rejects it"""
+        paypal = PayPalClient('id', 'secret', api_url=self.base_url, http=self.client)
+
+        self.assertEqual(paypal.create_order({'intent': 'CAPTURE'}).status_code, 201)
+        self.assertEqual(paypal.capture_order('ORDER-1').status_code, 201)
+        self.assertEqual(paypal.token_requests, 1)
+
+        self.server.revoked.add('Bearer token-1')
+        response = paypal.capture_order('ORDER-1')
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.json()['auth'], 'Bearer token-2')
+        self.assertEqual(paypal.token_requests, 2)
+
+    def test_paypal_request_ids(self):
+        """Each order gets its own PayPal-Request-Id, kept across retries of the same call"""
+        paypal = PayPalClient('id', 'secret', api_url=self.base_url, http=self.client)
+        paypal.create_order({'intent': 'CAPTURE'})
+        self.server.revoked.add('Bearer token-1')
+        paypal.create_order({'intent': 'CAPTURE'})
+        paypal.capture_order('ORDER-1')
+
+        (_, first), (_, rejected), (_, retried), capture = self.server.request_ids
+        self.assertTrue(first.startswith('create-'))
+        self.assertNotEqual(first, rejected)
+        self.assertEqual(rejected, retried)
+        self.assertEqual(capture, ('/v2/checkout/orders/ORDER-1/capture', 'capture-ORDER-1'))
+
+    def test_paypal_capture_timeout(self):
+        """Captures wait longer than other calls; a timed-out call is sent again with the same id"""
+        client = HttpClient(read_timeout=0.2, retries=0)
+        self.addCleanup(client.session.close)
+        paypal = PayPalClient('id', 'secret', api_url=self.base_url, http=client)
+        paypal.get_access_token()
+        self.server.delay = 0.4
+
+        with mock.patch.object(paypal_client, 'PAYPAL_CAPTURE_TIMEOUT_SECONDS', 5):
+            self.assertEqual(paypal.capture_order('ORDER-1').status_code, 201)
+        with self.assertRaises(requests.Timeout):
+            paypal.create_order({'intent': 'CAPTURE'})
+        time.sleep(0.5)
+        (_, create_id), (_, resent_id) = self.server.request_ids[1:]
+        self.assertEqual(create_id, resent_id)
+
+
+if __name__ == '__main__':
+    unittest.main()
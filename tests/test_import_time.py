@@ -0,0 +1,62 @@
+import os
+import sys
+import json
+import subprocess
+import unittest
+
+# Add project root to path
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(project_root)
+
+# Seconds allowed for importing the database module and route handlers
+IMPORT_TIME_BUDGET = float(os.getenv('IMPORT_TIME_BUDGET', '2.0'))
+
+IMPORT_SCRIPT = """
+import json, time
+started = time.perf_counter()
+import backend.database
+import backend.main
+import models.forex_event
+import models.email_subscription
+elapsed = time.perf_counter() - started
+print(json.dumps({
+    'elapsed': elapsed,
+    'engine_created': backend.database.get_engine(create=False) is not None
+}))
+"""
+
+HEALTH_SCRIPT = """
+import json
+from backend.database import check_database_health
+print(json.dumps(check_database_health()))
+"""
+
+
+def run_isolated(script, db_host):
+    """Run a script in a fresh interpreter pointed at the given database host."""
+    env = dict(os.environ, DB_HOST=db_host, DB_PORT='1', DB_CONNECT_TIMEOUT='2')
+    result = subprocess.run(
+        [sys.executable, '-c', script],
+        cwd=project_root, env=env, capture_output=True, text=True, timeout=60
+    )
+    if result.returncode != 0:
+        raise AssertionError(result.stderr)
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+class TestImportTime(unittest.TestCase):
+    def test_import_does_not_wait_for_database(self):
+        """Importing the database module doesn't connect, even if MySQL is unreachable"""
+        # 10.255.255.1 is non-routable, so any connection attempt would hang
+        result = run_isolated(IMPORT_SCRIPT, '10.255.255.1')
+        self.assertFalse(result['engine_created'])
+        self.assertLess(result['elapsed'], IMPORT_TIME_BUDGET)
+
+    def test_healthcheck_reports_unreachable_database(self):
+        """The explicit healthcheck reports an error instead of raising"""
+        result = run_isolated(HEALTH_SCRIPT, '127.0.0.1')
+        self.assertEqual(result['status'], 'error')
+        self.assertIn('error', result)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,62 @@
+import os
+import sys
+import subprocess
+import tempfile
+import unittest
+
+# Add project root to path
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(project_root)
+
+from backend.services.leader_lock import LeaderLock
+
+# Holds the lock in a separate process until stdin closes
+HOLDER_SCRIPT = """
+import sys
+from backend.services.leader_lock import LeaderLock
+lock = LeaderLock(sys.argv[1])
+print('leader' if lock.try_acquire() else 'follower', flush=True)
+sys.stdin.read()
+"""
+
+
+class TestLeaderLock(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp_dir.name, 'event_updater.lock')
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def start_holder(self):
+        holder = subprocess.Popen(
+            [sys.executable, '-c', HOLDER_SCRIPT, self.path],
+            cwd=project_root, stdin=subprocess.PIPE, stdout=subprocess.PIPE, text=True
+        )
+        self.assertEqual(holder.stdout.readline().strip(), 'leader')
+        return holder
+
+    def test_only_one_process_leads(self):
+        """A second process cannot lead while the first holds the lock"""
+        holder = self.start_holder()
+        try:
+            lock = LeaderLock(self.path)
+            self.assertFalse(lock.try_acquire())
+            self.assertEqual(lock.status()['leader_pid'], holder.pid)
+        finally:
+            holder.communicate('', timeout=30)
+
+    def test_follower_takes_over_when_leader_exits(self):
+        """The lock is freed when the leading process ends"""
+        holder = self.start_holder()
+        lock = LeaderLock(self.path)
+        self.assertFalse(lock.try_acquire())
+        holder.communicate('', timeout=30)
+
+        self.assertTrue(lock.try_acquire())
+        self.assertTrue(lock.status()['is_leader'])
+        lock.release()
+        self.assertFalse(lock.is_leader)
+
+if __name__ == '__main__':
+    unittest.main()
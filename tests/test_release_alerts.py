@@ -0,0 +1,199 @@
+import os
+import sys
+import time
+import threading
+import unittest
+from datetime import datetime, timedelta
+from unittest import mock
+
+import pytz
+import requests
+
+# Add project root to path
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(project_root)
+
+from backend.services.release_alerts import (
+    RELEASE_MIN_POLL_SECONDS,
+    AlertDispatcher,
+    ReleaseWindowPoller,
+    SubscriberIndex,
+    find_new_actuals,
+    send_release_email
+)
+
+
+class FakeSubscription:
+    def __init__(self, email, currencies, impact_levels):
+        self.email = email
+        self.verification_token = f"token-{email.split('@')[0]}"
+        self.currencies = currencies
+        self.impact_levels = impact_levels
+
+
+def feed_event(title, country='USD', impact='High', actual='', minutes_from_now=0):
+    event_time = datetime.now(pytz.UTC) + timedelta(minutes=minutes_from_now)
+    return {
+        'date': event_time.replace(second=0, microsecond=0).isoformat(),
+        'country': country,
+        'impact': impact,
+        'title': title,
+        'forecast': '0.3%',
+        'previous': '0.2%',
+        'actual': actual
+    }
+
+
+class TestReleaseAlerts(unittest.TestCase):
+    def setUp(self):
+        self.sent = []
+        self.sent_lock = threading.Lock()
+        self.index = SubscriberIndex(loader=lambda: [
+            FakeSubscription('usd@example.com', ['USD'], ['High']),
+            FakeSubscription('both@example.com', ['USD', 'EUR'], ['High', 'Medium']),
+            FakeSubscription('eur@example.com', ['EUR'], ['High'])
+        ])
+
+    def record_send(self, recipient, event, server):
+        with self.sent_lock:
+            self.sent.append((recipient[0], event['title']))
+
+    def test_find_new_actuals_only_reports_changes(self):
+        """Only events whose actual value appeared since the last fetch are reported"""
+        cpi = feed_event('CPI m/m')
+        nfp = feed_event('Non-Farm Employment Change', actual='150K')
+        previous = {(e['date'], e['country'], e['title']): e for e in [cpi, nfp]}
+
+        released_cpi = dict(cpi, actual='0.4%')
+        new_event = feed_event('Retail Sales m/m', actual='0.1%')
+
+        released = find_new_actuals(previous, [released_cpi, nfp, new_event])
+        self.assertEqual([e['title'] for e in released], ['CPI m/m'])
+
+    def test_poller_fans_out_release_to_interested_subscribers(self):
+        """A new actual value is delivered to every matching subscriber through the queue"""
+        feed = [feed_event('CPI m/m'), feed_event('German ZEW', country='EUR', impact='Medium')]
+        dispatcher = AlertDispatcher(self.index, sender=self.record_send, workers=2, connect=None)
+        poller = ReleaseWindowPoller(fetch=lambda: [dict(e) for e in feed], dispatcher=dispatcher)
+        dispatcher.start()
+        try:
+            self.assertEqual(poller.poll_once(), [])
+
+            feed[0]['actual'] = '0.4%'
+            feed[1]['actual'] = '12.5'
+            released = poller.poll_once()
+            dispatcher.deliveries.join()
+        finally:
+            dispatcher.stop()
+
+        self.assertEqual(len(released), 2)
+        # Medium impact releases don't trigger alerts by default
+        self.assertEqual(sorted(self.sent), [('both@example.com', 'CPI m/m'), ('usd@example.com', 'CPI m/m')])
+        stats = dispatcher.stats()
+        self.assertEqual(stats['sent'], 2)
+        self.assertEqual(stats['pending'], 0)
+        self.assertLess(stats['latency_max'], 1.0)
+
+    def test_poll_interval_tightens_around_release_times(self):
+        """The poller polls fast inside a release window and idles outside it"""
+        dispatcher = AlertDispatcher(self.index, sender=self.record_send)
+        poller = ReleaseWindowPoller(
+            fetch=lambda: [feed_event('CPI m/m', minutes_from_now=60)],
+            dispatcher=dispatcher, fast_interval=30, idle_interval=300
+        )
+        poller.poll_once()
+        now = datetime.now(pytz.UTC)
+
+        self.assertEqual(poller.next_interval(now), 300)
+        self.assertEqual(poller.next_interval(now + timedelta(minutes=59)), 30)
+        self.assertEqual(poller.next_interval(now + timedelta(minutes=70)), 30)
+        # Just before the window opens we only sleep until it does
+        self.assertAlmostEqual(poller.next_interval(now + timedelta(minutes=57)), 60, delta=60)
+
+    def test_poll_interval_floor_and_backoff(self):
+        """The rate-limited feed is never polled faster than the minimum; failures back off"""
+        responses = [None, requests.HTTPError(response=mock.Mock(status_code=429, headers={'Retry-After': '120'})),
+                     requests.ConnectionError(), requests.ConnectionError(), requests.ConnectionError(), None]
+
+        def fetch():
+            error = responses.pop(0)
+            if error:
+                raise error
+            return [feed_event('CPI m/m')]
+
+        dispatcher = AlertDispatcher(self.index, sender=self.record_send)
+        poller = ReleaseWindowPoller(fetch=fetch, dispatcher=dispatcher, fast_interval=5, idle_interval=300)
+        poller.poll_once()
+        # Inside the release window, but no faster than the minimum
+        self.assertEqual(poller.next_interval(), RELEASE_MIN_POLL_SECONDS)
+
+        intervals = []
+        for _ in range(4):
+            with self.assertRaises(requests.RequestException):
+                poller.poll_once()
+            intervals.append(poller.next_interval())
+        # Retry-After wins over the first backoff step (60s); then doubling up to the idle interval
+        self.assertEqual(intervals, [120, 120, 240, 300])
+
+        poller.poll_once()
+        self.assertEqual(poller.failures, 0)
+        self.assertEqual(poller.next_interval(), RELEASE_MIN_POLL_SECONDS)
+
+    def test_failed_fetch_keeps_snapshot(self):
+        """An empty fetch doesn't reset the diff baseline"""
+        feed = [feed_event('CPI m/m')]
+        responses = [[dict(feed[0])], [], [dict(feed[0], actual='0.4%')]]
+        dispatcher = AlertDispatcher(self.index, sender=self.record_send)
+        poller = ReleaseWindowPoller(fetch=lambda: responses.pop(0), dispatcher=dispatcher)
+
+        poller.poll_once()
+        poller.poll_once()
+        released = poller.poll_once()
+
+        self.assertEqual(len(released), 1)
+        self.assertEqual(dispatcher.deliveries.qsize(), 2)
+
+    def test_worker_reuses_smtp_connection(self):
+        """Each sender thread opens one connection for a burst and reconnects if it goes stale"""
+        connections = []
+        used = []
+
+        def connect():
+            server = mock.Mock(name=f"smtp-{len(connections)}")
+            connections.append(server)
+            return server
+
+        def send(recipient, event, server):
+            if server is connections[0] and len(used) == 2:
+                raise ConnectionError('Connection unexpectedly closed')
+            used.append(server)
+
+        self.index.refresh_if_stale()
+        dispatcher = AlertDispatcher(self.index, sender=send, workers=1, connect=connect)
+        dispatcher.start()
+        try:
+            dispatcher.publish(dict(feed_event('CPI m/m', actual='0.4%')), time.monotonic())
+            dispatcher.publish(dict(feed_event('PPI m/m', actual='0.2%')), time.monotonic())
+            dispatcher.deliveries.join()
+        finally:
+            dispatcher.stop()
+
+        # 4 deliveries: two over the first connection, then a fresh one after it dropped
+        self.assertEqual(used, [connections[0]] * 2 + [connections[1]] * 2)
+        self.assertEqual(dispatcher.stats()['connections'], 2)
+        self.assertEqual(dispatcher.stats()['sent'], 4)
+        connections[0].quit.assert_called_once()
+        connections[1].quit.assert_called_once()
+
+    def test_alert_email_has_unsubscribe_link(self):
+        server = mock.Mock()
+        with mock.patch('backend.main.email_service.get_smtp_settings', return_value={'username': 'alerts@example.com'}):
+            send_release_email(('usd@example.com', 'token-usd'), feed_event('CPI m/m', actual='0.4%'), server)
+
+        message = server.send_message.call_args[0][0]
+        self.assertEqual(message['To'], 'usd@example.com')
+        html = message.get_payload()[0].get_payload(decode=True).decode()
+        self.assertIn('/unsubscribe/token-usd', html)
+
+if __name__ == '__main__':
+    unittest.main()
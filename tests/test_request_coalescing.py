@@ -0,0 +1,133 @@
+import os
+import sys
+import json
+import time
+import threading
+import unittest
+from unittest import mock
+
+from flask import Flask
+
+# Add project root to path
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(project_root)
+
+from backend.main import route_handler
+from backend.services.single_flight import SingleFlight
+
+WEEK_EVENTS = [
+    {'time': '2024-03-12T12:30:00+00:00', 'currency': 'USD', 'impact': 'High',
+     'event_title': 'CPI m/m', 'forecast': '0.4%', 'previous': '0.3%'},
+    {'time': '2024-03-14T12:30:00+00:00', 'currency': 'USD', 'impact': 'High',
+     'event_title': 'PPI m/m', 'forecast': '0.3%', 'previous': '0.3%'}
+]
+
+
+class TestSingleFlight(unittest.TestCase):
+    def test_fan_in_metrics(self):
+        """Concurrent callers with one key share an execution and are counted"""
+        flight = SingleFlight('test')
+        started = threading.Event()
+
+        def slow():
+            started.set()
+            time.sleep(0.1)
+            return 'result'
+
+        results = []
+        leader = threading.Thread(target=lambda: results.append(flight.do('key', slow)))
+        leader.start()
+        started.wait()
+        followers = [threading.Thread(target=lambda: results.append(flight.do('key', slow))) for _ in range(4)]
+        for thread in followers:
+            thread.start()
+        for thread in [leader] + followers:
+            thread.join()
+
+        stats = flight.stats()
+        self.assertEqual(results, ['result'] * 5)
+        self.assertEqual(stats['executions'], 1)
+        self.assertEqual(stats['coalesced'], 4)
+        self.assertEqual(stats['fan_in'], 5.0)
+        self.assertEqual(stats['in_flight'], 0)
+
+    def test_errors_reach_every_waiter(self):
+        """A failure in the shared call is raised to every caller"""
+        flight = SingleFlight('test')
+        with self.assertRaises(ValueError):
+            flight.do('key', lambda: (_ for _ in ()).throw(ValueError('boom')))
+        self.assertEqual(flight.do('key', lambda: 'retry'), 'retry')
+
+
+class TestEventsRequestCoalescing(unittest.TestCase):
+    def setUp(self):
+        self.app = Flask(__name__)
+        self.app.add_url_rule('/events', 'events', lambda: route_handler.handle_events_request())
+        self.loads = 0
+        self.load_lock = threading.Lock()
+
+    def slow_file_load(self, **kwargs):
+        with self.load_lock:
+            self.loads += 1
+        time.sleep(0.2)
+        return [dict(event) for event in WEEK_EVENTS]
+
+    def test_identical_requests_share_file_load(self):
+        """A burst of identical week requests loads the week once and gets one body"""
+        responses = []
+        before = route_handler.file_load_flight.stats()['coalesced']
+
+        def request():
+            with self.app.test_client() as client:
+                responses.append(client.get('/events?time_range=week&currencies=USD&userId=burst-test'))
+
+        with mock.patch.object(route_handler, 'store_get_filtered_events', side_effect=self.slow_file_load), \
+                mock.patch.object(route_handler, 'get_user_timezone', return_value='Europe/London'):
+            threads = [threading.Thread(target=request) for _ in range(6)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+
+        self.assertEqual(self.loads, 1)
+        self.assertEqual(route_handler.file_load_flight.stats()['coalesced'] - before, 5)
+        bodies = {response.get_data() for response in responses}
+        self.assertEqual(len(bodies), 1)
+        events = json.loads(bodies.pop())
+        self.assertEqual([e['event_title'] for e in events], ['CPI m/m', 'PPI m/m'])
+        self.assertTrue(all(response.status_code == 200 for response in responses))
+
+    def test_batch_shares_one_load_per_range(self):
+        """Batch queries over the same week read it once; a bad query only fails itself"""
+        self.app.add_url_rule('/events/batch', 'events_batch', lambda: route_handler.handle_events_batch_request(),
+                              methods=['POST'])
+        events = WEEK_EVENTS + [{'time': '2024-03-13T09:30:00+00:00', 'currency': 'GBP', 'impact': 'Medium',
+                                 'event_title': 'GDP m/m', 'forecast': '0.1%', 'previous': '0.2%'}]
+
+        def file_load(**kwargs):
+            self.loads += 1
+            self.assertIsNone(kwargs.get('selected_currencies'))
+            return [dict(event) for event in events] if kwargs['time_range'] == 'week' else []
+
+        body = {'userId': 'batch-test', 'queries': {
+            'usd': {'time_range': 'week', 'currencies': ['USD'], 'fields': 'event_title'},
+            'gbp': {'time_range': 'week', 'currencies': 'GBP', 'impacts': 'Medium'},
+            'bad': {'time_range': 'specific_date', 'date': '12/03/2024'}
+        }}
+        with mock.patch.object(route_handler, 'store_get_filtered_events', side_effect=file_load), \
+                mock.patch.object(route_handler, 'get_user_timezone', return_value='Europe/London'), \
+                mock.patch.object(route_handler, 'QUERY_CACHE_ENABLED', False), \
+                mock.patch.object(route_handler, 'db_get_filtered_events', return_value=[]), \
+                self.app.test_client() as client:
+            response = client.post('/events/batch', json=body)
+
+        self.assertEqual(response.status_code, 200)
+        data = response.get_json()
+        self.assertEqual(self.loads, 2)  # the week, and the specific date before it fell back
+        self.assertEqual([e['event_title'] for e in data['results']['usd']], ['CPI m/m', 'PPI m/m'])
+        self.assertNotIn('forecast', data['results']['usd'][0])
+        self.assertEqual([e['event_title'] for e in data['results']['gbp']], ['GDP m/m'])
+        self.assertIn('Invalid date format', data['errors']['bad'])
+
+if __name__ == '__main__':
+    unittest.main()
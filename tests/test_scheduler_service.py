@@ -0,0 +1,71 @@
+import os
+import sys
+import json
+import unittest
+import urllib.error
+import urllib.request
+from unittest import mock
+
+# Add project root to path
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(project_root)
+
+from scripts import scheduler_service
+
+EXPECTED_EXECUTORS = {
+    'forex_update': 'default',
+    'weekly_events': 'default',
+    'generate_summaries': 'summaries',
+    'refresh_summaries': 'summaries',
+    'precompute_summaries': 'summaries',
+    'daily_updates': 'email',
+    'weekly_updates': 'email'
+}
+
+
+class TestSchedulerService(unittest.TestCase):
+    def setUp(self):
+        patch = mock.patch.object(scheduler_service, 'ENABLE_SERVICE_RESTART', False)
+        patch.start()
+        self.addCleanup(patch.stop)
+        self.scheduler = scheduler_service.create_scheduler()
+
+    def test_jobs_and_executors(self):
+        """Every job is registered on its executor; nothing runs until start()"""
+        self.assertFalse(self.scheduler.running)
+        self.assertEqual({job.id: job.executor for job in self.scheduler.get_jobs()}, EXPECTED_EXECUTORS)
+        self.assertEqual(self.scheduler.get_job('daily_updates').misfire_grace_time, 60)
+
+        with mock.patch.object(scheduler_service, 'ENABLE_SERVICE_RESTART', True):
+            scheduler = scheduler_service.create_scheduler()
+        self.assertEqual(scheduler.get_job('flask_service_restart').executor, 'default')
+
+    def test_status_endpoint(self):
+        """/status reports every job with its executor, before the scheduler has started"""
+        if not os.getenv('SCHEDULER_STATUS_PORT'):
+            self.assertEqual(scheduler_service.SCHEDULER_STATUS_PORT, 5051)
+        with mock.patch.object(scheduler_service, 'SCHEDULER_STATUS_PORT', 0):
+            server = scheduler_service.start_status_server(self.scheduler)
+        self.addCleanup(server.server_close)
+        self.addCleanup(server.shutdown)
+        base_url = f"http://127.0.0.1:{server.server_address[1]}"
+
+        with urllib.request.urlopen(f"{base_url}/status", timeout=5) as response:
+            self.assertEqual(response.headers['Content-Type'], 'application/json')
+            status = json.loads(response.read())
+
+        self.assertEqual(status['status'], 'stopped')
+        self.assertIsNone(status['release_alerts'])
+        jobs = {job['id']: job for job in status['jobs']}
+        self.assertEqual({job_id: job['executor'] for job_id, job in jobs.items()}, EXPECTED_EXECUTORS)
+        self.assertEqual(jobs['daily_updates']['runs'], 0)
+        self.assertFalse(jobs['daily_updates']['running'])
+        self.assertEqual(jobs['forex_update']['name'], 'Forex Calendar Update')
+
+        with self.assertRaises(urllib.error.HTTPError) as context:
+            urllib.request.urlopen(f"{base_url}/jobs", timeout=5)
+        self.assertEqual(context.exception.code, 404)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,69 @@
+import os
+import sys
+import time
+import threading
+import unittest
+from unittest import mock
+
+# Add project root to path
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(project_root)
+
+from backend.main import fixed_cache_handler, route_handler
+
+
+class TestStartupLifecycle(unittest.TestCase):
+    def setUp(self):
+        self.release_warm_up = threading.Event()
+        self.stop_updates = threading.Event()
+        self.event_count = 0
+        patches = [
+            mock.patch.dict(fixed_cache_handler.startup_state, {
+                'status': 'stopped', 'started_at': None, 'ready_at': None, 'error': None
+            }),
+            mock.patch.object(fixed_cache_handler, 'warm_up', side_effect=self.slow_warm_up),
+            mock.patch.object(fixed_cache_handler, 'update_cache', side_effect=self.stop_updates.wait),
+            mock.patch.object(route_handler, 'get_cache_status', side_effect=lambda: {'event_count': self.event_count})
+        ]
+        for patch in patches:
+            patch.start()
+            self.addCleanup(patch.stop)
+        self.addCleanup(self.stop_updates.set)
+        self.addCleanup(self.release_warm_up.set)
+
+    def slow_warm_up(self):
+        self.release_warm_up.wait(10)
+        self.event_count = 42
+
+    def wait_for_status(self, status):
+        deadline = time.monotonic() + 5
+        while fixed_cache_handler.startup_state['status'] != status and time.monotonic() < deadline:
+            time.sleep(0.01)
+
+    def test_start_returns_before_warm_up_finishes(self):
+        """Starting the lifecycle doesn't wait for the store to warm up"""
+        started = time.perf_counter()
+        fixed_cache_handler.start_background_tasks()
+        self.assertLess(time.perf_counter() - started, 0.5)
+
+        body, status = route_handler.handle_readiness_request()
+        self.assertEqual(status, 503)
+        self.assertEqual(body['status'], 'warming')
+        self.assertEqual(route_handler.handle_liveness_request()[1], 200)
+
+        self.release_warm_up.set()
+        self.wait_for_status('ready')
+        body, status = route_handler.handle_readiness_request()
+        self.assertEqual(status, 200)
+        self.assertEqual(body['cache']['event_count'], 42)
+
+    def test_repeated_starts_run_one_warm_up(self):
+        """The first-request hook can call start on every request"""
+        for _ in range(5):
+            fixed_cache_handler.start_background_tasks()
+        self.release_warm_up.set()
+        self.wait_for_status('ready')
+        self.assertEqual(fixed_cache_handler.warm_up.call_count, 1)
+
+if __name__ == '__main__':
+    unittest.main()
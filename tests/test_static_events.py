@@ -0,0 +1,151 @@
+import os
+import sys
+import gzip
+import json
+import tempfile
+import unittest
+from unittest import mock
+
+from flask import Flask
+
+# Add project root to path
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(project_root)
+
+from backend.main import static_events
+from backend.services.query_shapes import QueryShapeCounter
+
+WEEK_EVENTS = [
+    {'time': '2024-03-12T12:30:00+00:00', 'currency': 'USD', 'impact': 'High',
+     'event_title': 'CPI m/m', 'forecast': '0.4%', 'previous': '0.3%'},
+    {'time': '2024-03-14T12:30:00+00:00', 'currency': 'USD', 'impact': 'High',
+     'event_title': 'PPI m/m', 'forecast': '0.3%', 'previous': '0.3%'}
+]
+LONDON_WEEK = ('Europe/London', 'week', (), ())
+NEW_YORK_24H = ('America/New_York', '24h', ('EUR', 'USD'), ('High',))
+
+
+class TestStaticEvents(unittest.TestCase):
+    def setUp(self):
+        tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp_dir.cleanup)
+        self.static_dir = os.path.join(tmp_dir.name, 'static_events')
+        self.counter = QueryShapeCounter(directory=os.path.join(tmp_dir.name, 'query_shapes'))
+        for patch in (mock.patch.object(static_events, 'get_query_shape_counter', return_value=self.counter),
+                      mock.patch.object(static_events, 'load_events', return_value=('file', WEEK_EVENTS))):
+            patch.start()
+            self.addCleanup(patch.stop)
+
+    def test_shape_names_round_trip(self):
+        name = static_events.shape_filename('24h', ['USD', 'EUR'], ['High'])
+        self.assertEqual(name, '24h__EUR,USD__High.json')
+        self.assertEqual(static_events.parse_shape('America/New_York', name), NEW_YORK_24H)
+        for timezone, bad_name in (('Not/AZone', 'week__all__all.json'),
+                                   ('Europe/London', 'date_range__all__all.json'),
+                                   ('Europe/London', 'week.json')):
+            with self.assertRaises(ValueError):
+                static_events.parse_shape(timezone, bad_name)
+
+    def test_top_shapes_across_workers(self):
+        """Counts written by other worker processes are added in"""
+        other_worker = QueryShapeCounter(directory=self.counter.directory)
+        with mock.patch('os.getpid', return_value=99999999):
+            for _ in range(3):
+                other_worker.record(NEW_YORK_24H)
+            other_worker.flush()
+        for _ in range(2):
+            self.counter.record(LONDON_WEEK)
+        self.counter.record(NEW_YORK_24H)
+
+        self.assertEqual(self.counter.top(1), [(NEW_YORK_24H, 4)])
+        self.assertEqual(self.counter.top(5), [(NEW_YORK_24H, 4), (LONDON_WEEK, 2)])
+
+    def test_publish_matches_flask_response(self):
+        self.counter.record(LONDON_WEEK)
+        manifest = static_events.publish_static_events(directory=self.static_dir, top_n=5)
+        self.assertEqual([entry['path'] for entry in manifest['shapes']], ['Europe/London/week__all__all.json'])
+
+        path = os.path.join(self.static_dir, 'Europe', 'London', 'week__all__all.json')
+        with open(path, 'rb') as f:
+            body = f.read()
+        with open(path + '.gz', 'rb') as f:
+            self.assertEqual(gzip.decompress(f.read()), body)
+
+        # Flask serves the same bytes for a shape that isn't published
+        app = Flask(__name__)
+        with app.test_request_context():
+            response, status = static_events.handle_static_events_request('Europe/London', 'week__all__all.json')
+        self.assertEqual(status, 200)
+        self.assertEqual(response.get_data(), body)
+        self.assertEqual([event['time'] for event in json.loads(body)], ['2024-03-12 12:30', '2024-03-14 12:30'])
+
+    def test_fallback_body_equals_static_file(self):
+        """The fallback doesn't depend on the app's JSON settings, so its body stays equal to the file"""
+        events = [dict(WEEK_EVENTS[0], event_title='Índice de precios', actual=None)]
+        with mock.patch.object(static_events, 'load_events', return_value=('file', events)):
+            body = static_events.render_shape(LONDON_WEEK)
+            app = Flask(__name__)
+            app.json.sort_keys = False
+            app.json.ensure_ascii = False
+            with app.test_request_context():
+                response, status = static_events.handle_static_events_request('Europe/London', 'week__all__all.json')
+
+        self.assertEqual(status, 200)
+        self.assertEqual(response.get_data(), body)
+        self.assertEqual(json.loads(body)[0]['event_title'], 'Índice de precios')
+
+    def test_unpublished_shapes_are_removed(self):
+        static_events.publish_static_events(directory=self.static_dir, shapes=[(LONDON_WEEK, 2), (NEW_YORK_24H, 1)])
+        new_york = os.path.join(self.static_dir, 'America', 'New_York', '24h__EUR,USD__High.json')
+        self.assertTrue(os.path.exists(new_york + '.gz'))
+
+        static_events.publish_static_events(directory=self.static_dir, shapes=[(LONDON_WEEK, 2)])
+        self.assertFalse(os.path.exists(new_york))
+        self.assertFalse(os.path.exists(new_york + '.gz'))
+        self.assertTrue(os.path.exists(os.path.join(self.static_dir, 'manifest.json')))
+
+    def published(self, **kwargs):
+        manifest = static_events.publish_static_events(directory=self.static_dir, top_n=1, **kwargs)
+        return [entry['path'] for entry in manifest['shapes']]
+
+    def test_published_shapes_are_pinned(self):
+        """A shape nginx serves stops being counted by Flask, but stays published"""
+        self.counter.record(LONDON_WEEK)
+        self.assertEqual(self.published(), ['Europe/London/week__all__all.json'])
+        for _ in range(3):
+            self.counter.record(NEW_YORK_24H)
+        self.assertEqual(self.published(), ['Europe/London/week__all__all.json'])
+        # With complete counts the published shape only goes once it leaves the top 2 * N
+        self.assertEqual(self.published(pin_published=False), ['Europe/London/week__all__all.json'])
+        for _ in range(3):
+            self.counter.record(('Asia/Tokyo', 'week', (), ()))
+        self.assertEqual(self.published(pin_published=False), ['America/New_York/24h__EUR,USD__High.json'])
+
+    def test_access_log_counts_nginx_hits(self):
+        log_path = self.static_dir + '_access.log'
+        line = ('203.0.113.7 - - [12/Mar/2024:12:30:01 +0000] "GET /events/static/{} HTTP/1.1" {} 512 '
+                '"https://fxalert.co.uk/events" "Mozilla/5.0"\n')
+        with open(log_path, 'w') as f:
+            f.write(line.format('Europe/London/week__all__all.json', 200))
+        reader = static_events.AccessLogReader(log_path)
+        self.assertEqual(reader.read(), [])  # Starts at the end of the log
+
+        with open(log_path, 'a') as f:
+            f.write(line.format('Europe/London/week__all__all.json', 200))
+            f.write(line.format('America/New_York/24h__EUR,USD__High.json?v=3', 304))
+            f.write(line.format('Europe/London/week__all__all.json', 404))
+            f.write(line.format('manifest.json', 200))
+            f.write(line.format('Asia/Tokyo/week__all__all.json', 200)[:40])
+        self.assertEqual(reader.read(), [LONDON_WEEK, NEW_YORK_24H])
+
+        # The partly written line is read once it's complete; a rotated log starts over
+        with open(log_path, 'a') as f:
+            f.write(line.format('Asia/Tokyo/week__all__all.json', 200)[40:])
+        self.assertEqual(reader.read(), [('Asia/Tokyo', 'week', (), ())])
+        with open(log_path, 'w') as f:
+            f.write(line.format('Europe/London/week__all__all.json', 200))
+        self.assertEqual(reader.read(), [LONDON_WEEK])
+
+
+if __name__ == '__main__':
+    unittest.main()
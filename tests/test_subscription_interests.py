@@ -0,0 +1,89 @@
+import os
+import sys
+import unittest
+from unittest import mock
+
+from flask import Flask
+from sqlalchemy import create_engine, text
+from sqlalchemy.pool import StaticPool
+
+# Add project root to path
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(project_root)
+
+from backend import database
+from backend.main import subscription_handler
+from backend.services.release_alerts import SubscriberIndex, find_interested_subscribers
+from models.email_subscription import EmailSubscription, SubscriptionInterest
+
+
+class TestSubscriptionInterests(unittest.TestCase):
+    def setUp(self):
+        self.engine = create_engine('sqlite://', poolclass=StaticPool,
+                                    connect_args={'check_same_thread': False})
+        database.Base.metadata.create_all(self.engine, tables=[EmailSubscription.__table__,
+                                                               SubscriptionInterest.__table__])
+        patches = [
+            mock.patch.object(database, 'get_engine', return_value=self.engine),
+            mock.patch.object(subscription_handler, 'send_verification_email')
+        ]
+        for patch in patches:
+            patch.start()
+            self.addCleanup(patch.stop)
+        database.db_session.remove()
+        self.addCleanup(database.db_session.remove)
+        self.app = Flask(__name__, template_folder=os.path.join(project_root, 'templates'))
+
+    def subscribe(self, email, currencies, impacts):
+        with self.app.test_request_context(json={
+            'email': email, 'frequency': 'daily', 'currencies': currencies, 'impactLevels': impacts
+        }):
+            _, status = subscription_handler.handle_subscription_request()
+        self.assertEqual(status, 201)
+        subscription = EmailSubscription.query.filter_by(email=email).one()
+        database.db_session.remove()
+        return subscription
+
+    def verify(self, subscription):
+        with self.app.test_request_context():
+            subscription_handler.handle_verification_request(subscription.verification_token)
+        database.db_session.remove()
+
+    def test_interests_follow_subscribe_and_unsubscribe(self):
+        """Only verified subscribers match, and unsubscribing removes their interest rows"""
+        usd = self.subscribe('usd@example.com', ['USD'], ['High', 'Medium'])
+        both = self.subscribe('both@example.com', ['USD', 'EUR'], ['High'])
+        pending = self.subscribe('pending@example.com', ['USD'], ['High'])
+        self.verify(usd)
+        self.verify(both)
+
+        self.assertEqual(find_interested_subscribers('USD', 'High'), [('both@example.com', both.verification_token),
+                                                                     ('usd@example.com', usd.verification_token)])
+        self.assertEqual(find_interested_subscribers('EUR', 'High'), [('both@example.com', both.verification_token)])
+        self.assertEqual(SubscriberIndex().lookup('USD', 'Medium'), [('usd@example.com', usd.verification_token)])
+        self.assertEqual(find_interested_subscribers('EUR', 'Medium'), [])
+
+        with self.app.test_request_context():
+            subscription_handler.handle_unsubscribe_request(both.verification_token)
+        database.db_session.remove()
+        self.assertEqual(find_interested_subscribers('USD', 'High'), [('usd@example.com', usd.verification_token)])
+        with self.engine.connect() as conn:
+            remaining = conn.execute(text("SELECT COUNT(*) FROM subscription_interests")).scalar()
+        self.assertEqual(remaining, 3)  # usd: 2 pairs, pending: 1 pair
+
+    def test_match_query_uses_interest_index(self):
+        """Matching subscribers for an event searches the (currency, impact) index"""
+        captured = []
+        original = database.db_session.execute
+        with mock.patch.object(database.db_session, 'execute',
+                               side_effect=lambda query: captured.append(query) or original(query)):
+            find_interested_subscribers('USD', 'High')
+        sql = str(captured[0].compile(self.engine, compile_kwargs={'literal_binds': True}))
+        with self.engine.connect() as conn:
+            plan = ' '.join(row[-1] for row in conn.execute(text(f"EXPLAIN QUERY PLAN {sql}")))
+
+        self.assertIn('ix_subscription_interests_currency_impact', plan)
+        self.assertNotIn('SCAN', plan)
+
+if __name__ == '__main__':
+    unittest.main()
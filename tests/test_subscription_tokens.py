@@ -0,0 +1,67 @@
+import os
+import sys
+import unittest
+from unittest import mock
+
+from flask import Flask
+from sqlalchemy import create_engine, text
+from sqlalchemy.pool import StaticPool
+
+# Add project root to path
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(project_root)
+
+from backend import database
+from backend.main import subscription_handler
+from models.email_subscription import EmailSubscription, SubscriptionInterest
+
+
+class TestSubscriptionTokens(unittest.TestCase):
+    def setUp(self):
+        self.engine = create_engine('sqlite://', poolclass=StaticPool,
+                                    connect_args={'check_same_thread': False})
+        database.Base.metadata.create_all(self.engine, tables=[EmailSubscription.__table__,
+                                                               SubscriptionInterest.__table__])
+        patch = mock.patch.object(database, 'get_engine', return_value=self.engine)
+        patch.start()
+        self.addCleanup(patch.stop)
+        database.db_session.remove()
+        self.addCleanup(database.db_session.remove)
+
+        self.app = Flask(__name__, template_folder=os.path.join(project_root, 'templates'))
+        database.db_session.add(EmailSubscription(
+            email='trader@example.com', frequency='daily', currencies=['USD'],
+            impact_levels=['High'], verification_token='token-abcdefghijk'
+        ))
+        database.db_session.commit()
+
+    def test_lookup_uses_token_index(self):
+        """The token lookup is an index search, not a scan of email_subscriptions"""
+        query = EmailSubscription.query.filter(EmailSubscription.verification_token == 'x')
+        sql = str(query.statement.compile(self.engine, compile_kwargs={'literal_binds': True}))
+        with self.engine.connect() as conn:
+            plan = ' '.join(row[-1] for row in conn.execute(text(f"EXPLAIN QUERY PLAN {sql}")))
+
+        self.assertIn('ix_email_subscriptions_verification_token', plan)
+        self.assertNotIn('SCAN', plan)
+
+    def test_verified_token_still_unsubscribes(self):
+        """Verifying keeps the token, so the unsubscribe link in digest emails works"""
+        with self.app.test_request_context():
+            _, status = subscription_handler.handle_verification_request('token-abcdefghijk')
+            self.assertEqual(status, 200)
+            _, status = subscription_handler.handle_verification_request('token-abcdefghijk')
+            self.assertEqual(status, 200)
+
+            subscription = subscription_handler.find_subscription_by_token('token-abcdefghijk')
+            self.assertTrue(subscription.is_verified)
+
+            _, status = subscription_handler.handle_unsubscribe_request('token-abcdefghijk')
+            self.assertEqual(status, 200)
+            self.assertIsNone(subscription_handler.find_subscription_by_token('token-abcdefghijk'))
+
+            _, status = subscription_handler.handle_unsubscribe_request('token-abcdefghijk')
+            self.assertEqual(status, 400)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,237 @@
+import os
+import sys
+import json
+import tempfile
+import threading
+import time
+import unittest
+from datetime import datetime, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytz
+
+# Add project root to path
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(project_root)
+
+from backend.services.ai_summary_service import AISummaryService
+from backend.services.summary_cache import SummaryCache
+from backend.services.summary_pipeline import SummaryPipeline, TokenBucket
+
+
+class FakeCompletionHandler(BaseHTTPRequestHandler):
+    """Minimal OpenAI-compatible /chat/completions endpoint."""
+
+    def do_POST(self):
+        server = self.server
+        length = int(self.headers.get('Content-Length', 0))
+        body = json.loads(self.rfile.read(length))
+
+        with server.lock:
+            server.request_count += 1
+            count = server.request_count
+
+        # Fail every request listed in fail_on with a retryable 503
+        if count in server.fail_on:
+            self.send_response(503)
+            self.send_header('Content-Type', 'application/json')
+            self.end_headers()
+            self.wfile.write(json.dumps({'error': {'message': 'overloaded'}}).encode())
+            return
+
+        time.sleep(server.latency)
+        prompt = body['messages'][-1]['content']
+        title = prompt.split('Event: ')[1].split('\n')[0].strip()
+        payload = {
+            'id': f'chatcmpl-{count}',
+            'object': 'chat.completion',
+            'created': int(time.time()),
+            'model': body['model'],
+            'choices': [{
+                'index': 0,
+                'message': {'role': 'assistant', 'content': f'Summary for {title}'},
+                'finish_reason': 'stop'
+            }]
+        }
+        data = json.dumps(payload).encode()
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class FakeEvent:
+    def __init__(self, title, days_ahead=1):
+        self.event_title = title
+        self.currency = 'USD'
+        self.impact = 'High'
+        self.forecast = '0.3%'
+        self.previous = '0.2%'
+        self.time = datetime.now(pytz.UTC) + timedelta(days=days_ahead)
+        self.ai_summary = None
+        self.summary_generated_at = None
+
+
+class FakeSession:
+    def __init__(self):
+        self.commits = 0
+        self.rollbacks = 0
+
+    def commit(self):
+        self.commits += 1
+
+    def rollback(self):
+        self.rollbacks += 1
+
+
+class TestSummaryPipeline(unittest.TestCase):
+    def setUp(self):
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), FakeCompletionHandler)
+        self.server.lock = threading.Lock()
+        self.server.request_count = 0
+        self.server.fail_on = set()
+        self.server.latency = 0.05
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+
+        self.base_url = f'http://127.0.0.1:{self.server.server_address[1]}/v1'
+        self.ai_service = AISummaryService(api_key='test-key', base_url=self.base_url, use_cache=False)
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def test_generates_concurrently_and_commits_in_batches(self):
+        """Summaries are generated in parallel and committed in batches"""
+        events = [FakeEvent(f'Event {i}') for i in range(12)]
+        session = FakeSession()
+        pipeline = SummaryPipeline(
+            self.ai_service, session,
+            max_workers=6, requests_per_minute=6000, commit_batch_size=5
+        )
+
+        started = time.monotonic()
+        stats = pipeline.run(events)
+        elapsed = time.monotonic() - started
+
+        self.assertEqual(stats['generated'], 12)
+        self.assertEqual(stats['failed'], 0)
+        self.assertEqual(session.commits, 3)
+        for event in events:
+            self.assertEqual(event.ai_summary, f'Summary for {event.event_title}')
+            self.assertIsNotNone(event.summary_generated_at)
+        # Serial execution would take at least 12 * latency
+        self.assertLess(elapsed, 12 * self.server.latency)
+
+    def test_retries_transient_errors(self):
+        """A 503 from the API is retried with backoff"""
+        self.server.fail_on = {1}
+        events = [FakeEvent('Core CPI m/m')]
+        pipeline = SummaryPipeline(
+            self.ai_service, FakeSession(),
+            max_workers=1, requests_per_minute=6000, backoff_base=0.01
+        )
+
+        stats = pipeline.run(events)
+
+        self.assertEqual(stats['generated'], 1)
+        # One retry by the pipeline; the SDK doesn't retry on top of it
+        self.assertEqual(self.ai_service.client.max_retries, 0)
+        self.assertEqual(self.server.request_count, 2)
+
+    def test_failed_commit_cancels_queued_requests(self):
+        """A batch commit failure stops the run without requesting the remaining summaries"""
+        class FailingSession(FakeSession):
+            def commit(self):
+                raise RuntimeError('database is gone')
+
+        session = FailingSession()
+        events = [FakeEvent(f'Event {i}') for i in range(10)]
+        pipeline = SummaryPipeline(
+            self.ai_service, session,
+            max_workers=1, requests_per_minute=6000, commit_batch_size=1
+        )
+
+        with self.assertRaises(RuntimeError):
+            pipeline.run(events)
+
+        self.assertEqual(session.rollbacks, 1)
+        # The request that was running when the commit failed may finish; the rest never start
+        self.assertLessEqual(self.server.request_count, 2)
+
+    def test_recurring_events_hit_summary_cache(self):
+        """The same event in a later week reuses the cached summary"""
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            cache_file = os.path.join(tmp_dir, 'ai_summaries.json')
+            cache = SummaryCache(path=cache_file)
+            ai_service = AISummaryService(api_key='test-key', base_url=self.base_url, cache=cache)
+            pipeline = SummaryPipeline(ai_service, FakeSession(), max_workers=1, requests_per_minute=6000)
+
+            pipeline.run([FakeEvent('Non-Farm Employment Change', days_ahead=1)])
+            pipeline.run([FakeEvent('Non-Farm Employment Change', days_ahead=8)])
+
+            self.assertEqual(self.server.request_count, 1)
+            stats = cache.stats()
+            self.assertEqual(stats['hits'], 1)
+            self.assertEqual(stats['misses'], 1)
+            self.assertEqual(stats['hit_rate'], 0.5)
+
+            # The cache survives a restart
+            reloaded = SummaryCache(path=cache_file)
+            self.assertEqual(reloaded.stats()['size'], 1)
+
+    def test_summary_cache_evicts_least_recently_used(self):
+        """The cache respects its size limit and TTL"""
+        cache = SummaryCache(path=None, max_entries=2)
+        cache.set('a', 'summary a')
+        cache.set('b', 'summary b')
+        cache.get('a')
+        cache.set('c', 'summary c')
+        self.assertEqual(cache.get('a'), 'summary a')
+        self.assertIsNone(cache.get('b'))
+        self.assertEqual(cache.stats()['evictions'], 1)
+
+        expiring = SummaryCache(path=None, ttl_seconds=0)
+        expiring.set('a', 'summary a')
+        self.assertIsNone(expiring.get('a'))
+        self.assertEqual(expiring.stats()['expired'], 1)
+
+    def test_summary_cache_merges_saves_from_other_processes(self):
+        """Saving the cache keeps the summaries another process wrote to the file"""
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            cache_file = os.path.join(tmp_dir, 'ai_summaries.json')
+            worker = SummaryCache(path=cache_file)
+            scheduler = SummaryCache(path=cache_file)
+            worker.set('a', 'summary a')
+            scheduler.set('b', 'summary b')
+            worker.flush()
+            scheduler.flush()
+
+            reloaded = SummaryCache(path=cache_file)
+            self.assertEqual(reloaded.get('a'), 'summary a')
+            self.assertEqual(reloaded.get('b'), 'summary b')
+            # The later saver also picks up the other process's summaries
+            self.assertEqual(scheduler.get('a'), 'summary a')
+
+            # The size limit still holds, dropping the other process's entries first
+            small = SummaryCache(path=cache_file, max_entries=2)
+            small.set('c', 'summary c')
+            small.flush()
+            with open(cache_file, encoding='utf-8') as f:
+                self.assertEqual([key for key, _ in json.load(f)['entries']][-1], 'c')
+            self.assertEqual(SummaryCache(path=cache_file).stats()['size'], 2)
+
+    def test_token_bucket_limits_rate(self):
+        """The token bucket spaces out requests beyond its capacity"""
+        bucket = TokenBucket(rate_per_second=50, capacity=1)
+        started = time.monotonic()
+        for _ in range(6):
+            bucket.acquire()
+        self.assertGreaterEqual(time.monotonic() - started, 0.09)
+
+if __name__ == '__main__':
+    unittest.main()
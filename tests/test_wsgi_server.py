@@ -0,0 +1,62 @@
+import os
+import sys
+import time
+import threading
+import unittest
+import urllib.request
+
+# Add project root to path
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(project_root)
+
+from backend.wsgi_server import build_cheroot_server, decide_thread_change
+
+
+def slow_app(environ, start_response):
+    time.sleep(0.2)
+    start_response('200 OK', [('Content-Type', 'text/plain')])
+    return [b'ok']
+
+
+class TestThreadScaling(unittest.TestCase):
+    def test_grows_when_connections_wait(self):
+        self.assertEqual(decide_thread_change(120, 3, threads=4, idle=0, min_threads=4, max_threads=16), 2)
+        self.assertEqual(decide_thread_change(120, 3, threads=15, idle=0, min_threads=4, max_threads=16), 1)
+        self.assertEqual(decide_thread_change(120, 3, threads=16, idle=0, min_threads=4, max_threads=16), 0)
+
+    def test_shrinks_one_at_a_time_when_idle(self):
+        self.assertEqual(decide_thread_change(1, 0, threads=8, idle=5, min_threads=4, max_threads=16), -1)
+        self.assertEqual(decide_thread_change(1, 0, threads=4, idle=3, min_threads=4, max_threads=16), 0)
+        # Waits near the target hold the pool steady
+        self.assertEqual(decide_thread_change(30, 0, threads=8, idle=5, min_threads=4, max_threads=16), 0)
+
+
+class TestManagedServer(unittest.TestCase):
+    def test_queue_wait_is_measured_and_pool_grows(self):
+        """A burst larger than the pool shows up as queue wait and adds threads"""
+        server, autoscaler = build_cheroot_server(slow_app, host='127.0.0.1', port=0,
+                                                  min_threads=1, max_threads=4, autoscale=True)
+        server.prepare()
+        serve_thread = threading.Thread(target=server.serve, daemon=True)
+        serve_thread.start()
+        self.addCleanup(server.stop)
+        port = server.bind_addr[1]
+
+        def request():
+            with urllib.request.urlopen(f'http://127.0.0.1:{port}/', timeout=10) as response:
+                response.read()
+
+        clients = [threading.Thread(target=request) for _ in range(4)]
+        for client in clients:
+            client.start()
+        for client in clients:
+            client.join()
+
+        stats = autoscaler.monitor.stats()
+        self.assertEqual(stats['dequeued'], 4)
+        self.assertGreater(stats['wait_p95_ms'], 100)
+        self.assertGreater(autoscaler.adjust(), 0)
+        self.assertGreater(len(server.requests._threads), 1)
+
+if __name__ == '__main__':
+    unittest.main()